@@ -9,13 +9,18 @@ via three strategies:
 3. fuzzy_name - normalized word match from token name
 
 All functions are deterministic and side-effect free.
+
+The strategies take either a token list or a prebuilt TokenIndex (symbol
+map, word -> tokens postings for tokenize_name(), theme -> tokens).
+build_all_mappings() builds the index once for all markets, so the cost is
+O(tokens + markets x matches) instead of O(markets x tokens).
 """
 
 from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 
 
 # =============================================================================
@@ -136,13 +141,70 @@ def tokenize_name(name: str) -> Set[str]:
     return {t for t in tokens if t}
 
 
+# =============================================================================
+# Token Index
+# =============================================================================
+
+class TokenIndex:
+    """
+    Prebuilt lookup structures over a token universe.
+
+    - by_symbol: symbol.upper() -> token (last one wins, as in a dict build)
+    - name_words: tokenize_name(token.name) per token position
+    - word_postings: name word -> ascending token positions
+    - theme_tokens: theme -> THEME_TOKENS whitelist resolved to tokens
+
+    Immutable once built; safe to share across markets, threads and runs.
+    """
+
+    def __init__(self, tokens: Iterable[TokenSnapshot]):
+        self.tokens: Tuple[TokenSnapshot, ...] = tuple(tokens)
+        self.by_symbol: Dict[str, TokenSnapshot] = {t.symbol.upper(): t for t in self.tokens}
+
+        self.name_words: List[FrozenSet[str]] = []
+        postings: Dict[str, List[int]] = {}
+        for pos, token in enumerate(self.tokens):
+            words = frozenset(tokenize_name(token.name))
+            self.name_words.append(words)
+            for word in words:
+                postings.setdefault(word, []).append(pos)
+        self.word_postings: Dict[str, Tuple[int, ...]] = {w: tuple(p) for w, p in postings.items()}
+
+        self.theme_tokens: Dict[str, List[TokenSnapshot]] = {
+            theme: [self.by_symbol[s] for s in symbols if s in self.by_symbol]
+            for theme, symbols in THEME_TOKENS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def name_candidates(self, words: Iterable[str]) -> List[int]:
+        """Positions of tokens sharing at least one name word with `words`, in token order."""
+        positions: Set[int] = set()
+        for word in words:
+            positions.update(self.word_postings.get(word, ()))
+        return sorted(positions)
+
+
+Tokens = Union[List[TokenSnapshot], TokenIndex]
+
+
+def build_token_index(tokens: Iterable[TokenSnapshot]) -> TokenIndex:
+    """Build a TokenIndex over `tokens`."""
+    return TokenIndex(tokens)
+
+
+def _as_index(tokens: Tokens) -> TokenIndex:
+    return tokens if isinstance(tokens, TokenIndex) else TokenIndex(tokens)
+
+
 # =============================================================================
 # Mapping Strategies
 # =============================================================================
 
 def map_exact_symbol(
     market: PolymarketSnapshot,
-    tokens: List[TokenSnapshot]
+    tokens: Tokens
 ) -> List[MappingResult]:
     """
     Exact symbol matching strategy.
@@ -156,8 +218,8 @@ def map_exact_symbol(
     if not symbols_in_question:
         return results
     
-    # Create lookup by normalized symbol
-    token_by_symbol = {t.symbol.upper(): t for t in tokens}
+    # Lookup by normalized symbol
+    token_by_symbol = _as_index(tokens).by_symbol
     
     for symbol in symbols_in_question:
         if symbol in token_by_symbol:
@@ -178,7 +240,7 @@ def map_exact_symbol(
 
 def map_thematic(
     market: PolymarketSnapshot,
-    tokens: List[TokenSnapshot]
+    tokens: Tokens
 ) -> List[MappingResult]:
     """
     Thematic matching strategy.
@@ -203,45 +265,42 @@ def map_thematic(
         return results
     
     # Get tokens for this theme
-    theme_tokens = THEME_TOKENS.get(matched_theme, [])
-    token_by_symbol = {t.symbol.upper(): t for t in tokens}
-    
-    for symbol in theme_tokens:
-        if symbol in token_by_symbol:
-            token = token_by_symbol[symbol]
-            results.append(
-                MappingResult(
-                    market_id=market.id,
-                    token_mint=token.mint,
-                    token_symbol=token.symbol,
-                    relevance_score=RELEVANCE_SCORES["thematic"],
-                    mapping_type="thematic",
-                    matched_keywords=[matched_theme],
-                )
+    for token in _as_index(tokens).theme_tokens.get(matched_theme, []):
+        results.append(
+            MappingResult(
+                market_id=market.id,
+                token_mint=token.mint,
+                token_symbol=token.symbol,
+                relevance_score=RELEVANCE_SCORES["thematic"],
+                mapping_type="thematic",
+                matched_keywords=[matched_theme],
             )
+        )
     
     return results
 
 
 def map_fuzzy_name(
     market: PolymarketSnapshot,
-    tokens: List[TokenSnapshot]
+    tokens: Tokens
 ) -> List[MappingResult]:
     """
     Fuzzy name matching strategy.
     
     Tokenizes token names and matches individual words against question.
+    Candidates come from the index's word postings, not a scan of all tokens.
     Returns matches with relevance_score=0.6.
     """
     results = []
     normalized_question = normalize_text(market.question)
     question_words = set(normalized_question.split())
+    index = _as_index(tokens)
     
-    for token in tokens:
-        token_words = tokenize_name(token.name)
+    for pos in index.name_candidates(question_words):
+        token = index.tokens[pos]
         
         # Find overlapping words
-        matched_words = question_words.intersection(token_words)
+        matched_words = question_words.intersection(index.name_words[pos])
         
         if matched_words:
             results.append(
@@ -264,7 +323,7 @@ def map_fuzzy_name(
 
 def build_mappings(
     market: PolymarketSnapshot,
-    tokens: List[TokenSnapshot]
+    tokens: Tokens
 ) -> List[MappingResult]:
     """
     Build all mappings for a market using all strategies.
@@ -283,11 +342,12 @@ def build_mappings(
     """
     # Collect all results
     all_results: List[MappingResult] = []
+    index = _as_index(tokens)
     
     # Apply strategies in priority order
-    all_results.extend(map_exact_symbol(market, tokens))
-    all_results.extend(map_thematic(market, tokens))
-    all_results.extend(map_fuzzy_name(market, tokens))
+    all_results.extend(map_exact_symbol(market, index))
+    all_results.extend(map_thematic(market, index))
+    all_results.extend(map_fuzzy_name(market, index))
     
     if not all_results:
         return []
@@ -313,20 +373,22 @@ def build_mappings(
 
 def build_all_mappings(
     markets: List[PolymarketSnapshot],
-    tokens: List[TokenSnapshot]
+    tokens: Tokens
 ) -> List[MappingResult]:
     """
     Build mappings for all markets.
     
+    The token index is built once (or reused if `tokens` already is one).
     Deterministic order: markets sorted by ID, then by relevance score.
     """
     all_mappings: List[MappingResult] = []
+    index = _as_index(tokens)
     
     # Sort markets by ID for deterministic processing
     sorted_markets = sorted(markets, key=lambda x: x.id)
     
     for market in sorted_markets:
-        mappings = build_mappings(market, tokens)
+        mappings = build_mappings(market, index)
         all_mappings.extend(mappings)
     
     return all_mappings
@@ -1,6 +1,11 @@
 """config/hot_reload.py
 
 Thread-safe configuration reloader with file watching.
+
+Every successful (re)load publishes an immutable (deep-frozen) ConfigSnapshot
+by swapping a single reference, so readers never take a lock: they compare
+the snapshot's integer generation with the last one they saw and only pick
+up the new pre-merged config when it changed.
 """
 
 import time
@@ -10,6 +15,7 @@ import yaml
 import copy
 import logging
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Callable, Optional, Dict, Any
 
 from config.runtime_schema import RuntimeConfig
@@ -17,6 +23,73 @@ from config.runtime_schema import RuntimeConfig
 logger = logging.getLogger(__name__)
 
 
+def _read_only(*_args, **_kwargs):
+    raise TypeError("published config snapshots are read-only; copy.deepcopy() to modify")
+
+
+class FrozenDict(dict):
+    """dict that rejects mutation; copies (copy/deepcopy/pickle) are plain dicts.
+
+    Subclassing dict keeps isinstance(cfg, dict) checks in readers working.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return {copy.deepcopy(k, memo): copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """list counterpart of FrozenDict."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze_config(value: Any) -> Any:
+    """Recursively convert dicts/lists into FrozenDict/FrozenList (new objects)."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze_config(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze_config(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One published configuration generation.
+
+    `config` is the base config with the runtime overrides already merged in
+    (None when no merge function is set). It is shared by all readers, so it
+    is deep-frozen on construction: mutating it raises TypeError.
+    """
+    generation: int
+    runtime: RuntimeConfig
+    config: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self) -> None:
+        if self.config is not None and not isinstance(self.config, FrozenDict):
+            object.__setattr__(self, "config", freeze_config(self.config))
+
+
 class ConfigReloader:
     """
     Watches a configuration file for changes and atomically updates valid runtime parameters.
@@ -25,13 +98,16 @@ class ConfigReloader:
     def __init__(
         self, 
         config_path: str, 
-        on_reload: Optional[Callable[[RuntimeConfig], None]] = None
+        on_reload: Optional[Callable[[RuntimeConfig], None]] = None,
+        merge: Optional[Callable[[RuntimeConfig], Dict[str, Any]]] = None,
     ):
         self._config_path = Path(config_path)
         self._on_reload = on_reload
+        self._merge = merge
         
         # Internal state
         self._current_config: Optional[RuntimeConfig] = None
+        self._snapshot = ConfigSnapshot(generation=0, runtime=RuntimeConfig())
         self._last_mtime: float = 0.0
         self._lock = threading.RLock()
         
@@ -52,6 +128,7 @@ class ConfigReloader:
             with self._lock:
                 self._current_config = new_conf
                 self._last_mtime = self._config_path.stat().st_mtime
+                self._publish()
             logger.info(f"[config] Initial configuration loaded from {self._config_path}")
         except Exception as e:
             logger.error(f"[config] Failed to load initial config: {e}")
@@ -59,10 +136,38 @@ class ConfigReloader:
             # If strictly required, caller should check get_config()
 
     def get_config(self) -> Optional[RuntimeConfig]:
-        """Thread-safe access to current configuration snapshot."""
+        """Current runtime configuration (None until a valid file was loaded).
+
+        Lock-free: RuntimeConfig is frozen and the reference is swapped atomically.
+        """
+        return self._current_config
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Latest published snapshot (lock-free)."""
+        return self._snapshot
+
+    @property
+    def generation(self) -> int:
+        """Increases each time a new snapshot is published."""
+        return self._snapshot.generation
+
+    def set_merge(self, merge: Optional[Callable[[RuntimeConfig], Dict[str, Any]]]) -> ConfigSnapshot:
+        """Set the function building the full config from a RuntimeConfig and republish."""
         with self._lock:
-            # Return immutable copy (RuntimeConfig is frozen, so just ref is fine, but for safety in case of mutable fields in future)
-            return self._current_config
+            self._merge = merge
+            return self._publish()
+
+    def _publish(self) -> ConfigSnapshot:
+        """Build the next snapshot and swap it in. Caller holds self._lock."""
+        runtime = self._current_config or RuntimeConfig()
+        config = self._merge(runtime) if self._merge is not None else None
+        self._snapshot = ConfigSnapshot(
+            generation=self._snapshot.generation + 1,
+            runtime=runtime,
+            config=config,
+        )
+        return self._snapshot
 
     def start_watching(self) -> None:
         """Start the background watcher thread."""
@@ -125,6 +230,7 @@ class ConfigReloader:
                 old_conf = self._current_config
                 self._current_config = new_conf
                 self._last_mtime = new_mtime
+                self._publish()
 
             # Log changes
             if old_conf:
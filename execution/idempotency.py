@@ -5,18 +5,39 @@ PR-G.2 Idempotency Layer.
 Idempotency manager that prevents double-execution of trades:
 - Uses deterministic hash-based keys
 - File-backed JSONL persistence for crash recovery
-- Atomic lock acquisition with file renaming
-- TTL-based automatic cleanup
+- Append-only write-ahead log + in-memory hash index; each call only replays
+  the records other processes appended since it last looked
+- TTL expiry via an expiry heap; log compaction (inline or background thread)
+- Cross-process safe: every acquire/release holds an flock on <state_file>.lock
 """
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
+import heapq
 import json
+import logging
 import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms run without the file lock
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# WAL record ops. Snapshot lines written by compaction (and by older versions of
+# this module) carry no "op" and are treated as acquires.
+OP_ACQUIRE = "acquire"
+OP_RELEASE = "release"
+
+# Sweep at most this many expired heap entries per acquire (keeps acquire O(log n) amortized).
+_SWEEP_BATCH = 64
 
 
 class IdempotencyManager:
@@ -27,8 +48,16 @@ class IdempotencyManager:
 
     Design:
     - Keys are SHA256 hashes of (wallet + mint + side + bucketed_ts)
-    - Lock acquisition is atomic via temporary file rename pattern
-    - State persists across process restarts
+    - Every acquire/release appends one JSONL record to the state file (WAL)
+    - Any number of managers (threads, instances or processes) may share a
+      state file: acquire/release take an exclusive flock on <state_file>.lock
+      and check() a shared one, then replay the WAL tail from the last byte
+      offset this manager has seen before consulting the in-memory index
+    - A torn last line after a crash is skipped on replay, so a lock is only
+      reported acquired once its record is fully written
+    - Compaction rewrites live locks to a temp file and renames it over the
+      state file (same atomic-rename guarantee as before) under the exclusive
+      flock; other managers notice the new inode and replay it from the start
     """
 
     def __init__(
@@ -36,16 +65,46 @@ class IdempotencyManager:
         *,
         state_file: str = "/tmp/idempotency_state.jsonl",
         ttl_sec: int = 3600,
+        fsync: bool = False,
+        compact_min_records: int = 10_000,
+        compact_interval_sec: Optional[float] = None,
     ):
         """Initialize the idempotency manager.
 
         Args:
             state_file: Path to the JSONL file for persistence.
             ttl_sec: Time-to-live for locks in seconds.
+            fsync: fsync the log after every append (durable across power loss).
+            compact_min_records: Do not compact logs shorter than this.
+            compact_interval_sec: Start a background compactor with this period
+                (None = compact inline when dead records dominate the log).
         """
         self.state_file = Path(state_file)
         self.ttl_sec = ttl_sec
-        self._ensure_state_file()
+        self.fsync = fsync
+        self.compact_min_records = compact_min_records
+
+        self._locks: Dict[str, Dict[str, Any]] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._records = 0  # lines in the state file (live + dead)
+        self._lock = threading.RLock()
+        self._wal: Optional[Any] = None
+        # Replay position: (st_dev, st_ino) of the state file and bytes consumed
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+
+        self._lock_fd: Optional[Any] = None
+        self._flock_depth = 0
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+
+        with self._lock, self._file_lock():
+            self._ensure_state_file()
+            self._sync_locked(terminate_torn=True)
+        if compact_interval_sec is not None:
+            self.start_compactor(compact_interval_sec)
 
     def _ensure_state_file(self) -> None:
         """Create state file if it doesn't exist."""
@@ -82,49 +141,34 @@ class IdempotencyManager:
     def acquire_lock(self, *, key: str) -> bool:
         """Acquire an idempotency lock for the given key.
 
-        Uses atomic file operations:
-        1. Read existing locks
-        2. Check if key exists and is not expired
-        3. Write new lock to temp file
-        4. Atomically rename to state file
+        1. Catch up on records appended by other managers
+        2. Check the in-memory index (expired locks may be overwritten)
+        3. Append the lock record to the log
+        4. Update the index once the record is written
 
         Args:
             key: The idempotency key.
 
         Returns:
-            True if lock was acquired (new key), False if already exists.
+            True if lock was acquired (new key), False if already exists
+            or the record could not be written.
         """
-        now = time.time()
-
-        # Read current state
-        locks = self._read_locks()
-
-        # Check if key exists and is not expired
-        if key in locks:
-            expiry = locks[key].get("expiry", 0)
-            if now < expiry:
+        with self._lock, self._file_lock():
+            self._sync_locked(terminate_torn=True)
+            now = time.time()
+            lock = self._locks.get(key)
+            if lock is not None and now < lock.get("expiry", 0):
                 # Lock exists and is still valid
                 return False
-            # Lock has expired, will be overwritten
 
-        # Create new lock entry
-        locks[key] = {
-            "acquired_at": now,
-            "expiry": now + self.ttl_sec,
-        }
+            entry = {"acquired_at": now, "expiry": now + self.ttl_sec}
+            if not self._append({"key": key, "op": OP_ACQUIRE, **entry}):
+                return False
 
-        # Atomic write via temp file
-        temp_file = self.state_file.with_suffix(".tmp")
-        try:
-            with open(temp_file, "w") as f:
-                for k, v in locks.items():
-                    f.write(json.dumps({"key": k, **v}) + "\n")
-            temp_file.rename(self.state_file)
-        except OSError:
-            # Cleanup on failure
-            if temp_file.exists():
-                temp_file.unlink()
-            return False
+            self._locks[key] = entry
+            heapq.heappush(self._expiry_heap, (entry["expiry"], key))
+            self._sweep_locked(now, _SWEEP_BATCH)
+            self._maybe_compact_locked()
 
         return True
 
@@ -137,99 +181,280 @@ class IdempotencyManager:
         Returns:
             True if lock was released, False if key didn't exist.
         """
-        locks = self._read_locks()
-
-        if key not in locks:
-            return False
+        with self._lock, self._file_lock():
+            self._sync_locked(terminate_torn=True)
+            if key not in self._locks:
+                return False
 
-        del locks[key]
+            if not self._append({"key": key, "op": OP_RELEASE}):
+                return False
 
-        # Atomic write
-        temp_file = self.state_file.with_suffix(".tmp")
-        try:
-            with open(temp_file, "w") as f:
-                for k, v in locks.items():
-                    f.write(json.dumps({"key": k, **v}) + "\n")
-            temp_file.rename(self.state_file)
-        except OSError:
-            if temp_file.exists():
-                temp_file.unlink()
-            return False
+            del self._locks[key]
+            self._maybe_compact_locked()
 
         return True
 
-    def _read_locks(self) -> Dict[str, Dict[str, Any]]:
-        """Read all locks from the state file.
+    def prune(self) -> int:
+        """Remove expired locks (expiry heap sweep) and compact the log if needed.
 
         Returns:
-            Dict mapping keys to lock metadata.
+            Number of locks removed.
         """
-        locks: Dict[str, Dict[str, Any]] = {}
-
-        if not self.state_file.exists():
-            return locks
-
-        try:
-            with open(self.state_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                        locks[entry["key"]] = {
-                            "acquired_at": entry.get("acquired_at", 0),
-                            "expiry": entry.get("expiry", 0),
-                        }
-                    except (json.JSONDecodeError, KeyError):
-                        # Skip malformed lines
-                        continue
-        except OSError:
-            pass
+        with self._lock, self._file_lock():
+            self._sync_locked(terminate_torn=True)
+            removed = self._sweep_locked(time.time(), None)
+            self._maybe_compact_locked()
+        return removed
 
-        return locks
+    def check(self, *, key: str) -> bool:
+        """Check if a lock exists and is valid.
 
-    def prune(self) -> int:
-        """Remove expired locks from the state file.
+        Args:
+            key: The idempotency key.
 
         Returns:
-            Number of locks removed.
+            True if lock exists and is not expired, False otherwise.
         """
-        locks = self._read_locks()
-        now = time.time()
+        with self._lock, self._file_lock(shared=True):
+            self._sync_locked(terminate_torn=False)
+            lock = self._locks.get(key)
+        if lock is None:
+            return False
+        return time.time() < lock.get("expiry", 0)
 
-        # Filter out expired locks
-        active_locks = {k: v for k, v in locks.items() if v.get("expiry", 0) > now}
+    def compact(self) -> int:
+        """Rewrite the state file to hold only live locks.
 
-        removed = len(locks) - len(active_locks)
+        Runs under the exclusive file lock, so no other manager appends while
+        the snapshot is written and renamed over the log.
 
-        if removed > 0:
-            # Atomic write
-            temp_file = self.state_file.with_suffix(".tmp")
+        Returns:
+            Number of dead records dropped.
+        """
+        temp_file = self.state_file.with_suffix(".tmp")
+        with self._lock, self._file_lock():
+            self._sync_locked(terminate_torn=True)
+            self._sweep_locked(time.time(), None)
+            snapshot = list(self._locks.items())
+            records_before = self._records
             try:
                 with open(temp_file, "w") as f:
-                    for k, v in active_locks.items():
+                    for k, v in snapshot:
                         f.write(json.dumps({"key": k, **v}) + "\n")
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                self._close_wal()
                 temp_file.rename(self.state_file)
-            except OSError:
+            except OSError as e:
+                logger.warning(f"[idempotency] compaction failed: {e}")
                 if temp_file.exists():
                     temp_file.unlink()
+                return 0
+
+            st = self.state_file.stat()
+            self._file_id = (st.st_dev, st.st_ino)
+            self._offset = st.st_size
+            self._records = len(snapshot)
+
+        return records_before - len(snapshot)
+
+    def start_compactor(self, interval_sec: float) -> None:
+        """Start a daemon thread that prunes and compacts every interval_sec."""
+        if self._compactor is not None:
+            return
+        self._stop.clear()
+
+        def _run() -> None:
+            while not self._stop.is_set():
+                self._wake.wait(interval_sec)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    with self._lock:
+                        self._sweep_locked(time.time(), None)
+                        due = self._compaction_due_locked()
+                    if due:
+                        dropped = self.compact()
+                        logger.debug(f"[idempotency] compacted {dropped} dead records")
+                except Exception as e:  # pragma: no cover
+                    logger.warning(f"[idempotency] compactor failed: {e}")
+
+        self._compactor = threading.Thread(target=_run, name="idempotency-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop_compactor(self) -> None:
+        """Stop the background compactor (if running)."""
+        self._stop.set()
+        self._wake.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout=5.0)
+            self._compactor = None
+
+    def close(self) -> None:
+        """Stop the compactor and close the log."""
+        self.stop_compactor()
+        with self._lock:
+            self._close_wal()
+            if self._lock_fd is not None:
+                self._lock_fd.close()
+                self._lock_fd = None
+
+    def __len__(self) -> int:
+        """Number of locks in the index (expired ones may linger until swept)."""
+        with self._lock:
+            return len(self._locks)
+
+    # Internals (caller holds self._lock where noted)
+
+    @contextlib.contextmanager
+    def _file_lock(self, shared: bool = False) -> Iterator[None]:
+        """Hold the cross-process flock (caller holds self._lock; re-entrant)."""
+        if fcntl is None:
+            yield
+            return
+        if self._flock_depth:
+            # Already held by this manager (e.g. inline compaction inside acquire)
+            self._flock_depth += 1
+            try:
+                yield
+            finally:
+                self._flock_depth -= 1
+            return
+        if self._lock_fd is None:
+            self._lock_fd = open(self.state_file.with_name(self.state_file.name + ".lock"), "a")
+        fcntl.flock(self._lock_fd.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        self._flock_depth = 1
+        try:
+            yield
+        finally:
+            self._flock_depth = 0
+            fcntl.flock(self._lock_fd.fileno(), fcntl.LOCK_UN)
 
-        return removed
+    def _sync_locked(self, terminate_torn: bool) -> None:
+        """Replay records appended since the last sync (caller holds both locks).
 
-    def check(self, *, key: str) -> bool:
-        """Check if a lock exists and is valid.
+        A replaced (compacted) or truncated file is replayed from the start.
+        With terminate_torn (exclusive lock held), a torn last line is closed
+        off so the next record does not get glued onto it.
+        """
+        try:
+            st = self.state_file.stat()
+        except OSError:
+            self._ensure_state_file()
+            st = self.state_file.stat()
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._offset:
+            self._close_wal()
+            self._locks.clear()
+            self._expiry_heap = []
+            self._records = 0
+            self._offset = 0
+            self._file_id = file_id
+        if st.st_size == self._offset:
+            return
 
-        Args:
-            key: The idempotency key.
+        try:
+            with open(self.state_file, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            self._apply_line(raw)
+        self._offset += end
+
+        if end < len(data) and terminate_torn:
+            # Writers append whole lines under the exclusive lock, so a partial
+            # tail can only be left by a crashed writer.
+            if self._append_raw("\n"):
+                self._offset = self._wal_size()
+
+    def _apply_line(self, raw: bytes) -> None:
+        line = raw.strip()
+        if not line:
+            return
+        try:
+            entry = json.loads(line)
+            key = entry["key"]
+        except (ValueError, KeyError, TypeError):
+            # Skip malformed lines (including a torn write)
+            return
+        self._records += 1
+        if entry.get("op") == OP_RELEASE:
+            self._locks.pop(key, None)
+            return
+        lock = {
+            "acquired_at": entry.get("acquired_at", 0),
+            "expiry": entry.get("expiry", 0),
+        }
+        self._locks[key] = lock
+        heapq.heappush(self._expiry_heap, (lock["expiry"], key))
 
-        Returns:
-            True if lock exists and is not expired, False otherwise.
-        """
-        locks = self._read_locks()
+    def _open_wal(self) -> None:
+        self._wal = open(self.state_file, "a")
+
+    def _close_wal(self) -> None:
+        if self._wal is not None:
+            try:
+                self._wal.close()
+            finally:
+                self._wal = None
+
+    def _wal_size(self) -> int:
+        return os.fstat(self._wal.fileno()).st_size
 
-        if key not in locks:
+    def _append_raw(self, text: str) -> bool:
+        """Append text to the log (caller holds both locks)."""
+        try:
+            if self._wal is None:
+                self._open_wal()
+            self._wal.write(text)
+            self._wal.flush()
+            if self.fsync:
+                os.fsync(self._wal.fileno())
+        except OSError:
+            return False
+        return True
+
+    def _append(self, record: Dict[str, Any]) -> bool:
+        """Append one record to the log (caller holds both locks)."""
+        if not self._append_raw(json.dumps(record) + "\n"):
             return False
+        self._offset = self._wal_size()
+        self._records += 1
+        return True
+
+    def _sweep_locked(self, now: float, limit: Optional[int]) -> int:
+        """Pop expired heap heads; returns number of live locks removed."""
+        heap = self._expiry_heap
+        removed = 0
+        popped = 0
+        while heap and heap[0][0] <= now and (limit is None or popped < limit):
+            expiry, key = heapq.heappop(heap)
+            popped += 1
+            lock = self._locks.get(key)
+            # Skip stale heap items (key re-acquired or released).
+            if lock is None or lock.get("expiry", 0) != expiry:
+                continue
+            del self._locks[key]
+            removed += 1
+        return removed
 
-        expiry = locks[key].get("expiry", 0)
-        return time.time() < expiry
+    def _compaction_due_locked(self) -> bool:
+        return self._records >= self.compact_min_records and self._records > 2 * len(self._locks)
+
+    def _maybe_compact_locked(self) -> None:
+        # Released/overwritten keys leave stale heap items behind; rebuild when they dominate.
+        if len(self._expiry_heap) > 2 * len(self._locks) + 1024:
+            self._expiry_heap = [(v["expiry"], k) for k, v in self._locks.items()]
+            heapq.heapify(self._expiry_heap)
+        if not self._compaction_due_locked():
+            return
+        if self._compactor is not None:
+            self._wake.set()
+        else:
+            # Log at least doubled since the last compaction: amortized O(1) per record.
+            self.compact()
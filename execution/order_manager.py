@@ -12,11 +12,13 @@ HARD RULES:
 """
 
 import asyncio
+import bisect
+import heapq
 import logging
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from execution.order_state_machine import (
     PositionState,
@@ -29,6 +31,83 @@ from execution.order_state_machine import (
 
 logger = logging.getLogger(__name__)
 
+_INF = float("inf")
+
+
+class _MintBook:
+    """
+    Trigger index for the active positions of one mint.
+    
+    TP and SL levels are kept in ascending (price, seq, signal_id) lists so a
+    tick finds every crossed level with one bisect per list, for either side;
+    TTL deadlines sit in a heap. seq is the registration order, which on_tick
+    uses to report actions in the same order as a scan over positions would.
+    """
+    
+    __slots__ = ("tp", "sl", "deadlines", "entries")
+    
+    def __init__(self) -> None:
+        self.tp: List[Tuple[float, int, str]] = []
+        self.sl: List[Tuple[float, int, str]] = []
+        self.deadlines: List[Tuple[datetime, int, str]] = []
+        # signal_id -> (seq, tp_price, sl_price)
+        self.entries: Dict[str, Tuple[int, Optional[float], Optional[float]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def add(self, position: PositionState, seq: int) -> None:
+        sid = position.signal_id
+        self.entries[sid] = (seq, position.tp_price, position.sl_price)
+        if position.tp_price is not None:
+            bisect.insort(self.tp, (position.tp_price, seq, sid))
+        if position.sl_price is not None:
+            bisect.insort(self.sl, (position.sl_price, seq, sid))
+        heapq.heappush(self.deadlines, (position.ttl_expires_at, seq, sid))
+    
+    def remove(self, signal_id: str) -> None:
+        entry = self.entries.pop(signal_id, None)
+        if entry is None:
+            return
+        seq, tp, sl = entry
+        if tp is not None:
+            _remove_sorted(self.tp, (tp, seq, signal_id))
+        if sl is not None:
+            _remove_sorted(self.sl, (sl, seq, signal_id))
+        # Deadline heap items are dropped lazily (seq no longer matches);
+        # rebuild when stale ones dominate.
+        if len(self.deadlines) > 2 * len(self.entries) + 1024:
+            live = {sid: seq for sid, (seq, _, _) in self.entries.items()}
+            self.deadlines = [d for d in self.deadlines if live.get(d[2]) == d[1]]
+            heapq.heapify(self.deadlines)
+    
+    def expired(self, current_ts: datetime) -> List[Tuple[int, str]]:
+        """Pop every live deadline <= current_ts."""
+        out = []
+        heap = self.deadlines
+        while heap and heap[0][0] <= current_ts:
+            _, seq, sid = heapq.heappop(heap)
+            entry = self.entries.get(sid)
+            if entry is not None and entry[0] == seq:
+                out.append((seq, sid))
+        return out
+    
+    def crossed(self, current_price: float, side: str) -> Tuple[List[Tuple[float, int, str]], List[Tuple[float, int, str]]]:
+        """TP and SL entries triggered at current_price (same rules as PositionState.check_tp/check_sl)."""
+        lo = (current_price, -_INF)
+        hi = (current_price, _INF)
+        if side == "BUY":
+            # TP: price >= tp ; SL: price <= sl
+            return self.tp[:bisect.bisect_right(self.tp, hi)], self.sl[bisect.bisect_left(self.sl, lo):]
+        # SELL - TP: price <= tp ; SL: price >= sl
+        return self.tp[bisect.bisect_left(self.tp, lo):], self.sl[:bisect.bisect_right(self.sl, hi)]
+
+
+def _remove_sorted(items: List[Tuple[float, int, str]], item: Tuple[float, int, str]) -> None:
+    i = bisect.bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
+
 
 class OrderManager:
     """
@@ -72,6 +151,10 @@ class OrderManager:
         # Active positions
         self._positions: Dict[str, PositionState] = {}
         
+        # Per-mint trigger index over active positions (TP/SL levels, TTL deadlines)
+        self._books: Dict[str, _MintBook] = {}
+        self._seq = 0
+        
         # Position history for debugging
         self._history: List[Dict[str, Any]] = []
     
@@ -133,6 +216,7 @@ class OrderManager:
         )
         
         self._positions[signal_id] = position
+        self._index(position)
         
         logger.info(
             f"[order_mgr] Position opened: {signal_id} "
@@ -149,7 +233,11 @@ class OrderManager:
         side: str = "BUY",
     ) -> List[CloseAction]:
         """
-        Check all active positions on a price tick.
+        Check the active positions of `mint` on a price tick.
+        
+        Only triggered positions are touched: crossed TP/SL levels come from a
+        bisect over the mint's sorted levels and TTL expiries from its deadline
+        heap, so cost does not grow with the number of open positions.
         
         Args:
             mint: Token mint address
@@ -160,45 +248,71 @@ class OrderManager:
         Returns:
             List of CloseAction to perform.
         """
-        actions = []
+        book = self._books.get(mint)
+        if book is None:
+            return []
         
-        for signal_id, position in list(self._positions.items()):
-            # Skip if not for this mint or already closed
-            if position.mint != mint or not position.is_active:
-                continue
-            
-            # Check TTL expiration
-            if position.check_ttl(current_ts):
-                action = self._create_close_action(
-                    position,
-                    CloseReason.TTL_EXPIRED.value,
-                    current_price,
-                )
-                actions.append(action)
-                continue
-            
-            # Check take-profit
-            if position.check_tp(current_price, side):
-                action = self._create_close_action(
-                    position,
-                    CloseReason.TP_HIT.value,
-                    current_price,
-                )
-                actions.append(action)
-                continue
-            
-            # Check stop-loss
-            if position.check_sl(current_price, side):
-                action = self._create_close_action(
-                    position,
-                    CloseReason.SL_HIT.value,
-                    current_price,
-                )
-                actions.append(action)
+        # Collect every triggered position with its highest-priority reason:
+        # TTL first, then TP, then SL (same precedence as checking one position).
+        triggered: Dict[str, Tuple[int, str]] = {}
+        for seq, signal_id in book.expired(current_ts):
+            triggered[signal_id] = (seq, CloseReason.TTL_EXPIRED.value)
+        tp_hits, sl_hits = book.crossed(current_price, side)
+        for _, seq, signal_id in tp_hits:
+            triggered.setdefault(signal_id, (seq, CloseReason.TP_HIT.value))
+        for _, seq, signal_id in sl_hits:
+            triggered.setdefault(signal_id, (seq, CloseReason.SL_HIT.value))
+        
+        actions = []
+        for signal_id, (_, reason) in sorted(triggered.items(), key=lambda kv: kv[1][0]):
+            position = self._positions.get(signal_id)
+            if position is None or not position.is_active:
+                # Closed or deactivated outside the manager; drop it from the index.
+                self._unindex(signal_id, mint)
                 continue
+            action = self._create_close_action(position, reason, current_price)
+            actions.append(action)
         
         return actions
     
+    def update_brackets(
+        self,
+        signal_id: str,
+        tp_price: Optional[float] = None,
+        sl_price: Optional[float] = None,
+    ) -> bool:
+        """
+        Move TP and/or SL of an active position (keeps the trigger index in sync).
+        
+        Returns:
+            True if the position was active and updated.
+        """
+        position = self._positions.get(signal_id)
+        if position is None or not position.is_active:
+            return False
+        self._unindex(signal_id, position.mint)
+        if tp_price is not None:
+            position.tp_price = tp_price
+        if sl_price is not None:
+            position.sl_price = sl_price
+        self._index(position)
+        return True
+    
+    def _index(self, position: PositionState) -> None:
+        book = self._books.get(position.mint)
+        if book is None:
+            book = self._books[position.mint] = _MintBook()
+        self._seq += 1
+        book.add(position, self._seq)
+    
+    def _unindex(self, signal_id: str, mint: str) -> None:
+        book = self._books.get(mint)
+        if book is None:
+            return
+        book.remove(signal_id)
+        if not book:
+            del self._books[mint]
+    
     def force_close(
         self,
         signal_id: str,
@@ -263,6 +377,9 @@ class OrderManager:
         # Update position state
         old_status = position.status
         
+        # Neither PARTIAL nor CLOSED positions are checked on ticks
+        self._unindex(position.signal_id, position.mint)
+        
         if is_partial:
             position.status = PositionStatus.PARTIAL
             position.remaining_size_usd -= size_usd or 0
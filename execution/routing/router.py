@@ -6,10 +6,19 @@ Multi-DEX Router Simulator for best execution.
 Aggregates quotes from multiple liquidity sources and returns
 ranked route candidates for optimal swap execution.
 
+Concurrent mode (max_workers > 1) fans quotes out on a thread pool:
+- per-call deadline: whatever arrived by then is returned
+- hedging: sources still silent after hedge_after_ms get a second request
+- short-lived per-source quote cache keyed by (mint_in, mint_out, exact amount_in);
+  quotes that land after the deadline still fill the cache for the next call
+
 PR-U.4
 """
 import sys
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 from execution.routing.interfaces import LiquiditySource
 from execution.routing.types import SimulatedQuote, RouteCandidate
 
@@ -23,10 +32,43 @@ class LiquidityRouter:
     PR-U.4
     """
     
-    def __init__(self):
-        """Initialize an empty router."""
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        deadline_ms: Optional[float] = None,
+        hedge_after_ms: Optional[float] = None,
+        quote_cache_ttl_ms: float = 0.0,
+    ):
+        """
+        Initialize an empty router.
+        
+        Args:
+            max_workers: Quote sources concurrently on a pool of this size
+                         (None or 1 = one after another, as before)
+            deadline_ms: Default per-call deadline in concurrent mode (None = wait for all)
+            hedge_after_ms: Re-send to sources that have not answered after this long
+                            (None = no hedging)
+            quote_cache_ttl_ms: Reuse a source's quote for the same exact amount_in
+                                for this long (0 = no cache). Quotes are never
+                                rescaled to other sizes: price impact is non-linear.
+        """
         self._sources: List[LiquiditySource] = []
         self._source_names: set = set()
+        
+        self.max_workers = max_workers
+        self.deadline_ms = deadline_ms
+        self.hedge_after_ms = hedge_after_ms
+        self.quote_cache_ttl_ms = quote_cache_ttl_ms
+        
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # (source_name, mint_in, mint_out, amount_in) -> (expires_at_monotonic, candidate)
+        self._quote_cache: Dict[Tuple[str, str, str, int], Tuple[float, RouteCandidate]] = {}
+        self.stats: Dict[str, int] = {
+            "cache_hits": 0,
+            "hedges": 0,
+            "deadline_misses": 0,
+        }
     
     def register_source(self, source: LiquiditySource) -> None:
         """
@@ -104,6 +146,7 @@ class LiquidityRouter:
         mint_in: str,
         mint_out: str,
         amount_in: int,
+        deadline_ms: Optional[float] = None,
     ) -> List[RouteCandidate]:
         """
         Get quotes from all registered sources.
@@ -112,24 +155,156 @@ class LiquidityRouter:
             mint_in: Input token mint address
             mint_out: Output token mint address
             amount_in: Input amount in atomic units
+            deadline_ms: Concurrent mode only: return what arrived by then
+                         (default: the router's deadline_ms)
             
         Returns:
-            List of RouteCandidate (may be empty if all sources fail)
+            List of RouteCandidate in registration order (may be empty if all sources fail)
         """
-        results: List[RouteCandidate] = []
+        return self._gather(mint_in, mint_out, amount_in, deadline_ms)
+    
+    def _gather(
+        self,
+        mint_in: str,
+        mint_out: str,
+        amount_in: int,
+        deadline_ms: Optional[float],
+    ) -> List[RouteCandidate]:
+        sources = list(self._sources)
+        answers: Dict[int, Optional[RouteCandidate]] = {}
+        
+        if self.quote_cache_ttl_ms > 0:
+            for i, source in enumerate(sources):
+                cached = self._cache_get(source.get_name(), mint_in, mint_out, amount_in)
+                if cached is not None:
+                    answers[i] = cached
+        
+        if self.max_workers is None or self.max_workers <= 1:
+            for i, source in enumerate(sources):
+                if i not in answers:
+                    answers[i] = self._collect_quote_cached(source, mint_in, mint_out, amount_in)
+        else:
+            self._fan_out(sources, answers, mint_in, mint_out, amount_in, deadline_ms)
+        
+        # Registration order, independent of which source answered first
+        return [answers[i] for i in sorted(answers) if answers[i] is not None]
+    
+    def _fan_out(
+        self,
+        sources: List[LiquiditySource],
+        answers: Dict[int, Optional[RouteCandidate]],
+        mint_in: str,
+        mint_out: str,
+        amount_in: int,
+        deadline_ms: Optional[float],
+    ) -> None:
+        """Query sources missing from `answers` concurrently until all answer or the deadline passes."""
+        pool = self._get_pool()
+        pending: Dict[Future, int] = {}
+        for i, source in enumerate(sources):
+            if i not in answers:
+                pending[pool.submit(self._collect_quote_cached, source, mint_in, mint_out, amount_in)] = i
+        
+        if deadline_ms is None:
+            deadline_ms = self.deadline_ms
+        start = time.monotonic()
+        deadline = start + deadline_ms / 1000.0 if deadline_ms is not None else None
+        hedge_at = start + self.hedge_after_ms / 1000.0 if self.hedge_after_ms is not None else None
         
-        for source in self._sources:
-            candidate = self._collect_quote(source, mint_in, mint_out, amount_in)
-            if candidate is not None:
-                results.append(candidate)
+        while pending:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            wake = [t for t in (deadline, hedge_at) if t is not None]
+            timeout = max(0.0, min(wake) - now) if wake else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for fut in done:
+                i = pending.pop(fut)
+                if i in answers:
+                    continue
+                candidate = fut.result()
+                if candidate is None and i in pending.values():
+                    # Failed leg of a hedged source: wait for the other one
+                    continue
+                answers[i] = candidate
+                # The other leg of a hedged source is no longer needed
+                for other, j in list(pending.items()):
+                    if j == i:
+                        other.cancel()
+                        del pending[other]
+            
+            if hedge_at is not None and time.monotonic() >= hedge_at:
+                hedge_at = None
+                for i in sorted(set(pending.values())):
+                    pending[pool.submit(self._collect_quote_cached, sources[i], mint_in, mint_out, amount_in)] = i
+                    with self._lock:
+                        self.stats["hedges"] += 1
         
-        return results
+        if pending:
+            # Deadline passed: late answers only warm the cache (see _collect_quote_cached)
+            with self._lock:
+                self.stats["deadline_misses"] += len(set(pending.values()))
+    
+    def _collect_quote_cached(
+        self,
+        source: LiquiditySource,
+        mint_in: str,
+        mint_out: str,
+        amount_in: int,
+    ) -> Optional[RouteCandidate]:
+        candidate = self._collect_quote(source, mint_in, mint_out, amount_in)
+        if candidate is not None and self.quote_cache_ttl_ms > 0:
+            key = (candidate.source_name, mint_in, mint_out, amount_in)
+            expires_at = time.monotonic() + self.quote_cache_ttl_ms / 1000.0
+            with self._lock:
+                self._quote_cache[key] = (expires_at, candidate)
+        return candidate
+    
+    def _cache_get(
+        self,
+        source_name: str,
+        mint_in: str,
+        mint_out: str,
+        amount_in: int,
+    ) -> Optional[RouteCandidate]:
+        key = (source_name, mint_in, mint_out, amount_in)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._quote_cache.get(key)
+            if hit is None:
+                return None
+            expires_at, candidate = hit
+            if now >= expires_at:
+                del self._quote_cache[key]
+                return None
+            self.stats["cache_hits"] += 1
+        return candidate
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="router-quote")
+            return self._pool
+    
+    def clear_quote_cache(self) -> None:
+        """Drop all cached quotes."""
+        with self._lock:
+            self._quote_cache.clear()
+    
+    def close(self) -> None:
+        """Shut down the quote pool (in-flight quotes are not waited for)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
     
     def find_best_route(
         self,
         mint_in: str,
         mint_out: str,
         amount_in: int,
+        deadline_ms: Optional[float] = None,
     ) -> Optional[RouteCandidate]:
         """
         Find the best route for swapping.
@@ -140,11 +315,12 @@ class LiquidityRouter:
             mint_in: Input token mint address
             mint_out: Output token mint address
             amount_in: Input amount in atomic units
+            deadline_ms: Concurrent mode only: best quote received by then
             
         Returns:
             Best RouteCandidate or None if no quotes available
         """
-        all_quotes = self.get_all_quotes(mint_in, mint_out, amount_in)
+        all_quotes = self.get_all_quotes(mint_in, mint_out, amount_in, deadline_ms=deadline_ms)
         
         if not all_quotes:
             return None
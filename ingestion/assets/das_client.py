@@ -10,6 +10,8 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 import time
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
+
 from .normalization import AssetData, AssetMetadata, normalize_asset, normalize_metadata
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,9 @@ BATCH_SIZE = 1000  # For getAssetBatch
 MAX_RETRIES = 3
 INITIAL_DELAY_MS = 100
 
+# EnrichmentCache source name (metadata is effectively immutable: long TTL)
+CACHE_SOURCE = "helius_das"
+
 
 @dataclass
 class PaginationState:
@@ -52,6 +57,7 @@ class HeliusDasClient:
         page_size: int = DEFAULT_PAGE_SIZE,
         max_retries: int = MAX_RETRIES,
         initial_delay_ms: int = INITIAL_DELAY_MS,
+        cache: Optional[EnrichmentCache] = None,
     ):
         """
         Initialize HeliusDasClient.
@@ -62,6 +68,7 @@ class HeliusDasClient:
             page_size: Page size for pagination (max 1000)
             max_retries: Max retries for rate limiting
             initial_delay_ms: Initial delay for exponential backoff
+            cache: EnrichmentCache to use (default: the process-wide one)
         """
         self._api_key = api_key
         self._rpc_url = rpc_url
@@ -70,7 +77,7 @@ class HeliusDasClient:
         self._initial_delay_ms = initial_delay_ms
         
         # Cache for batch metadata
-        self._metadata_cache: Dict[str, AssetMetadata] = {}
+        self._metadata_cache = cache or get_enrichment_cache()
     
     def _make_request(
         self,
@@ -236,22 +243,20 @@ class HeliusDasClient:
         Returns:
             Normalized AssetMetadata or None
         """
-        # Check cache first
-        if asset_id in self._metadata_cache:
-            return self._metadata_cache[asset_id]
-        
+        # Cache first; concurrent misses share one request, None is not cached
+        return self._metadata_cache.get_or_load(
+            CACHE_SOURCE, asset_id, lambda: self._fetch_asset(asset_id, http_callable)
+        )
+    
+    def _fetch_asset(self, asset_id: str, http_callable: Optional[Any]) -> Optional[AssetMetadata]:
+        """Fetch and normalize one asset (None on failure)."""
         try:
             result = self._make_request(
                 "getAsset",
                 {"id": asset_id},
                 http_callable=http_callable,
             )
-            
-            normalized = normalize_metadata(result)
-            if normalized is not None:
-                self._metadata_cache[asset_id] = normalized
-            
-            return normalized
+            return normalize_metadata(result)
             
         except Exception as e:
             logger.warning(f"[das] Failed to fetch asset {asset_id}: {e}")
@@ -291,7 +296,7 @@ class HeliusDasClient:
                     normalized = normalize_metadata(item)
                     if normalized is not None:
                         results[asset_id] = normalized
-                        self._metadata_cache[asset_id] = normalized
+                        self._metadata_cache.set(CACHE_SOURCE, asset_id, normalized)
                         
             except Exception as e:
                 logger.warning(f"[das] Failed to fetch asset batch: {e}")
@@ -352,9 +357,12 @@ class HeliusDasClient:
     
     def clear_cache(self) -> None:
         """Clear metadata cache."""
-        self._metadata_cache.clear()
+        self._metadata_cache.clear(CACHE_SOURCE)
         logger.debug("[das] Cache cleared")
     
-    def get_cache_info(self) -> Dict[str, int]:
+    def get_cache_info(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        return {"cached_assets": len(self._metadata_cache)}
+        return {
+            "cached_assets": self._metadata_cache.size(CACHE_SOURCE),
+            "metrics": self._metadata_cache.metrics(CACHE_SOURCE),
+        }
@@ -0,0 +1,124 @@
+"""
+ingestion/dex/accounts.py
+
+Batch account decoding helpers shared by the Raydium / Orca / Meteora layouts.
+
+A pool-state refresh fetches thousands of accounts with getMultipleAccounts.
+Instead of building one dataclass per account, the per-DEX `decode_*s()`
+functions unpack every buffer in place (struct.unpack_from at fixed offsets,
+no slicing) and return one AccountColumns with a list per field. Pubkeys are
+base58-encoded through an LRU, so the same mints/vaults seen every cycle are
+encoded once and share a single str object.
+"""
+import base64
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+# Number of distinct pubkeys kept encoded per layout module
+PUBKEY_CACHE_SIZE = 65536
+
+Buffer = Union[bytes, bytearray, memoryview]
+RowDecoder = Callable[[Buffer], Tuple[Any, ...]]
+
+
+@dataclass
+class AccountColumns:
+    """
+    Columnar decode result.
+
+    `columns[name][k]` is field `name` of the k-th decoded account, and
+    `index[k]` is that account's position in the input. Accounts that were
+    missing (None) or failed to decode are reported in `errors` instead.
+    """
+    fields: Tuple[str, ...]
+    columns: Dict[str, list]
+    index: List[int] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, name: str) -> list:
+        return self.columns[name]
+
+    def row(self, k: int) -> Dict[str, Any]:
+        """Field dict of the k-th decoded account."""
+        return {name: self.columns[name][k] for name in self.fields}
+
+    def array(self, name: str):
+        """Column as a NumPy array (requires numpy; u128 columns become object arrays)."""
+        if np is None:
+            raise ImportError("numpy is required for AccountColumns.array()")
+        values = self.columns[name]
+        try:
+            return np.asarray(values, dtype=np.int64)
+        except (OverflowError, TypeError, ValueError):
+            return np.asarray(values, dtype=object)
+
+
+def decode_columns(
+    buffers: Iterable[Optional[Buffer]],
+    fields: Sequence[str],
+    decode_row: RowDecoder,
+) -> AccountColumns:
+    """
+    Decode account buffers into columns with `decode_row` (one tuple per account,
+    values in `fields` order).
+    """
+    rows = []
+    index = []
+    errors: Dict[int, str] = {}
+    for i, buf in enumerate(buffers):
+        if buf is None:
+            errors[i] = "account not found"
+            continue
+        try:
+            rows.append(decode_row(buf))
+        except (ValueError, struct.error) as e:
+            errors[i] = str(e)
+            continue
+        index.append(i)
+
+    fields = tuple(fields)
+    if rows:
+        columns = {name: list(col) for name, col in zip(fields, zip(*rows))}
+    else:
+        columns = {name: [] for name in fields}
+    return AccountColumns(fields=fields, columns=columns, index=index, errors=errors)
+
+
+def account_buffers(response: Any) -> List[Optional[bytes]]:
+    """
+    Extract raw account data from a getMultipleAccounts response.
+
+    Accepts the full JSON-RPC response, its "result", or the "value" list.
+    Entries for missing accounts (null) map to None. Account data must be
+    requested with "encoding": "base64".
+    """
+    if isinstance(response, dict):
+        response = response.get("result", response)
+    if isinstance(response, dict):
+        response = response.get("value")
+    if not isinstance(response, list):
+        raise ValueError("getMultipleAccounts response has no account list")
+
+    b64decode = base64.b64decode
+    out: List[Optional[bytes]] = []
+    for account in response:
+        if not account:
+            out.append(None)
+            continue
+        data = account.get("data")
+        if isinstance(data, list):
+            if len(data) > 1 and data[1] != "base64":
+                raise ValueError(f"Unsupported account encoding: {data[1]}")
+            data = data[0]
+        out.append(b64decode(data) if isinstance(data, str) else None)
+    return out
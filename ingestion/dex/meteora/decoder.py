@@ -6,11 +6,13 @@ Meteora DLMM Decoder - High-level interface for LbPair data decoding.
 PR-U.3
 """
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from ..accounts import AccountColumns
 from .layouts import (
     LbPairState,
     decode_lb_pair,
+    decode_lb_pairs,
     guess_encoding_and_decode,
 )
 
@@ -49,6 +51,22 @@ class MeteoraDecoder:
             logger.error(f"[meteora] Failed to decode pool: {e}")
             raise
     
+    def decode_lb_pairs(self, buffers: Iterable[Optional[bytes]]) -> AccountColumns:
+        """
+        Decode many LbPairs at once into columnar state.
+        
+        Args:
+            buffers: Raw account data per pool, e.g. account_buffers(response)
+                of a getMultipleAccounts call (None for missing accounts)
+            
+        Returns:
+            AccountColumns keyed by LbPairState field names
+        """
+        pools = decode_lb_pairs(buffers)
+        if pools.errors:
+            logger.warning(f"[meteora] {len(pools.errors)} pool account(s) failed to decode")
+        return pools
+    
     def decode_from_string(self, data: str) -> LbPairState:
         """
         Decode LbPair from base64 or hex string.
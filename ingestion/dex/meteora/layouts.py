@@ -6,8 +6,11 @@ Meteora DLMM LbPair account layout definitions.
 PR-U.3
 """
 import struct
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..accounts import PUBKEY_CACHE_SIZE, AccountColumns, decode_columns
 
 
 # Solana pubkey (32 bytes, base58 encoded)
@@ -83,9 +86,13 @@ def pubkey_to_string(data: bytes) -> str:
         return data.hex()
 
 
+# LRU-cached pubkey_to_string: repeated pubkeys are encoded once and share one str
+intern_pubkey = lru_cache(maxsize=PUBKEY_CACHE_SIZE)(pubkey_to_string)
+
+
 def parse_pubkey(data: bytes, offset: int) -> str:
     """Parse a pubkey from data at offset."""
-    return pubkey_to_string(data[offset:offset + PUBKEY_LENGTH])
+    return intern_pubkey(bytes(data[offset:offset + PUBKEY_LENGTH]))
 
 
 # Meteora LbPair account layout (without discriminator)
@@ -114,13 +121,42 @@ LAYOUT_SIZE = 208
 
 # Pubkey offset in raw_data (after skipping discriminator)
 PUBKEY_OFFSETS = {
-    'token_x_mint': 16,    # After: H(2) + H(2) + i(4) + Q(8) = 16
-    'token_y_mint': 48,    # 16 + 32 = 48
-    'token_x_vault': 80,   # 48 + 32 = 80
-    'token_y_vault': 112,  # 80 + 32 = 112
-    'oracle': 144,         # 112 + 32 = 144
+    'token_x_mint': 24,    # After: H(2) + H(2) + i(4) + Q(8) + Q(8) = 24
+    'token_y_mint': 56,    # 24 + 32 = 56
+    'token_x_vault': 88,   # 56 + 32 = 88
+    'token_y_vault': 120,  # 88 + 32 = 120
+    'oracle': 152,         # 120 + 32 = 152
 }
 
+# Column names of decode_lb_pairs(), in LbPairState field order
+LB_PAIR_FIELDS = tuple(f.name for f in fields(LbPairState))
+
+
+def _decode_lb_pair_row(data: bytes) -> Tuple[Any, ...]:
+    """Unpack one LbPair account in place into a tuple in LB_PAIR_FIELDS order."""
+    if len(data) < 8 + LAYOUT_SIZE:
+        raise ValueError(
+            f"Data too short: got {len(data)} bytes, need at least {8 + LAYOUT_SIZE}"
+        )
+    
+    # Unpack after the discriminator without copying the account data
+    u = LB_PAIR_LAYOUT.unpack_from(data, 8)
+    
+    return (
+        u[0],                  # bin_step
+        u[1],                  # base_factor
+        u[2],                  # active_id
+        intern_pubkey(u[5]),   # token_x_mint
+        intern_pubkey(u[6]),   # token_y_mint
+        intern_pubkey(u[7]),   # token_x_vault
+        intern_pubkey(u[8]),   # token_y_vault
+        intern_pubkey(u[9]),   # oracle
+        u[10],                 # token_x_decimals
+        u[11],                 # token_y_decimals
+        u[12],                 # searcher_fee
+        u[13],                 # withdraw_fee
+    )
+
 
 def decode_lb_pair(data: bytes) -> LbPairState:
     """
@@ -135,55 +171,17 @@ def decode_lb_pair(data: bytes) -> LbPairState:
     Raises:
         ValueError: If data is too short or invalid
     """
-    if len(data) < 8 + LAYOUT_SIZE:
-        raise ValueError(
-            f"Data too short: got {len(data)} bytes, need at least {8 + LAYOUT_SIZE}"
-        )
-    
-    # Skip discriminator
-    raw_data = data[8:]
-    
-    if len(raw_data) < LAYOUT_SIZE:
-        raise ValueError(
-            f"Data too short after skipping discriminator: got {len(raw_data)}, "
-            f"need {LAYOUT_SIZE}"
-        )
-    
-    # Unpack the layout
-    unpacked = LB_PAIR_LAYOUT.unpack(raw_data)
-    
-    # Parse fields (indices start from 0 since we skipped discriminator)
-    bin_step = unpacked[0]
-    base_factor = unpacked[1]
-    active_id = unpacked[2]
-    
-    # Token mints at fixed offsets (from PUBKEY_OFFSETS)
-    token_x_mint = parse_pubkey(raw_data, PUBKEY_OFFSETS['token_x_mint'])
-    token_y_mint = parse_pubkey(raw_data, PUBKEY_OFFSETS['token_y_mint'])
-    token_x_vault = parse_pubkey(raw_data, PUBKEY_OFFSETS['token_x_vault'])
-    token_y_vault = parse_pubkey(raw_data, PUBKEY_OFFSETS['token_y_vault'])
-    oracle = parse_pubkey(raw_data, PUBKEY_OFFSETS['oracle'])
-    
-    token_x_decimals = unpacked[10]  # index 10
-    token_y_decimals = unpacked[11]  # index 11
-    
-    searcher_fee = unpacked[12]  # index 12
-    withdraw_fee = unpacked[13]  # index 13
+    return LbPairState(*_decode_lb_pair_row(data))
+
+
+def decode_lb_pairs(buffers: Iterable[Optional[bytes]]) -> AccountColumns:
+    """
+    Decode many LbPair accounts (e.g. accounts.account_buffers() of a
+    getMultipleAccounts response) into columns named by LB_PAIR_FIELDS.
     
-    return LbPairState(
-        bin_step=bin_step,
-        base_factor=base_factor,
-        active_id=active_id,
-        token_x_mint=token_x_mint,
-        token_y_mint=token_y_mint,
-        token_x_vault=token_x_vault,
-        token_y_vault=token_y_vault,
-        oracle=oracle,
-        token_x_decimals=token_x_decimals,
-        token_y_decimals=token_y_decimals,
-        searcher_fee=searcher_fee,
-        withdraw_fee=withdraw_fee,
-    )
+    Missing or undecodable accounts are reported in the result's `errors`.
+    """
+    return decode_columns(buffers, LB_PAIR_FIELDS, _decode_lb_pair_row)
 
 
 def decode_base64(data: str) -> bytes:
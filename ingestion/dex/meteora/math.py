@@ -6,9 +6,17 @@ Meteora DLMM Math - Pure math functions for bin calculations.
 PR-U.3
 
 All functions are pure (no I/O).
+
+MeteoraMath uses precomputed power tables per bin_step (ingestion/dex/fastmath);
+the *_decimal functions are the 80-digit Decimal reference they are checked
+against in verification mode.
 """
+import math
 from decimal import Decimal, getcontext
-from typing import Tuple
+from functools import lru_cache
+from typing import Any, Sequence, Tuple
+
+from ..fastmath import PowerTable, broadcast, np, pow10, pow10_many, verification_enabled, verify
 
 
 # Set high precision for decimal operations
@@ -19,6 +27,75 @@ getcontext().prec = 80
 # This offset fits within i32 range
 BIN_ID_OFFSET = 2**23  # 8388608
 
+LN10 = math.log(10)
+
+
+@lru_cache(maxsize=None)
+def bin_power_table(bin_step: int) -> PowerTable:
+    """Powers of (1 + bin_step/10000) for bin offsets within ±BIN_ID_OFFSET."""
+    return PowerTable(Decimal(1) + Decimal(bin_step) / Decimal(10000), BIN_ID_OFFSET)
+
+
+@lru_cache(maxsize=None)
+def _ln_bin_base(bin_step: int) -> float:
+    return float((Decimal(1) + Decimal(bin_step) / Decimal(10000)).ln())
+
+
+# -------------------------------------------------------------------------
+# Decimal reference implementations
+# -------------------------------------------------------------------------
+
+def price_from_id_decimal(active_id: int, bin_step: int, decimals_x: int, decimals_y: int) -> float:
+    """Reference for MeteoraMath.get_price_from_id (80-digit Decimal)."""
+    if bin_step <= 0:
+        raise ValueError("bin_step must be positive")
+    
+    # Calculate offset-adjusted bin ID
+    adjusted_id = active_id - BIN_ID_OFFSET
+    
+    # Base = 1 + bin_step/10000
+    base = Decimal(1) + Decimal(bin_step) / Decimal(10000)
+    
+    # Price_raw = base^adjusted_id
+    price_raw = base ** Decimal(adjusted_id)
+    
+    # Adjust for decimals
+    decimal_adjustment = Decimal(10) ** (decimals_x - decimals_y)
+    price_real = price_raw * decimal_adjustment
+    
+    return float(price_real)
+
+
+def id_from_price_decimal(price: float, bin_step: int, decimals_x: int, decimals_y: int) -> int:
+    """Reference for MeteoraMath.get_id_from_price (80-digit Decimal)."""
+    if price <= 0:
+        raise ValueError("price must be positive")
+    
+    # Adjust for decimals
+    decimal_adjustment = Decimal(10) ** (decimals_y - decimals_x)
+    price_raw = Decimal(price) * decimal_adjustment
+    
+    # Base = 1 + bin_step/10000
+    base = Decimal(1) + Decimal(bin_step) / Decimal(10000)
+    
+    # adjusted_id = log_base(price_raw) = ln(price_raw) / ln(base)
+    adjusted_id = (price_raw.ln()) / (base.ln())
+    
+    # Add offset to get actual bin ID
+    return int(round(adjusted_id)) + BIN_ID_OFFSET
+
+
+def price_offset_decimal(base_price: float, offset_bps: int, bin_step: int) -> float:
+    """Reference for MeteoraMath.get_price_offset (80-digit Decimal)."""
+    factor = (Decimal(1) + Decimal(bin_step) / Decimal(10000)) ** Decimal(offset_bps)
+    return float(Decimal(base_price) * factor)
+
+
+def liquidity_depth_decimal(bin_step: int, active_id: int, total_liquidity: int) -> float:
+    """Reference for MeteoraMath.estimate_liquidity_depth (80-digit Decimal)."""
+    base = Decimal(1) + Decimal(bin_step) / Decimal(10000)
+    return float(Decimal(total_liquidity) / (base ** Decimal(abs(active_id - BIN_ID_OFFSET))))
+
 
 class MeteoraMath:
     """
@@ -58,21 +135,67 @@ class MeteoraMath:
         if bin_step <= 0:
             raise ValueError("bin_step must be positive")
         
-        # Calculate offset-adjusted bin ID
-        adjusted_id = active_id - BIN_ID_OFFSET
+        price = bin_power_table(bin_step).pow(active_id - BIN_ID_OFFSET) * pow10(decimals_x - decimals_y)
+        return verify(
+            "get_price_from_id", price,
+            lambda: price_from_id_decimal(active_id, bin_step, decimals_x, decimals_y),
+        )
+    
+    @staticmethod
+    def get_prices_from_ids(
+        active_ids: Sequence[int],
+        bin_step: Any,
+        decimals_x: Any,
+        decimals_y: Any,
+    ):
+        """
+        Vectorized get_price_from_id for many bins or pools.
+        
+        Args:
+            active_ids: Bin IDs
+            bin_step: Bin step, or one per bin ID
+            decimals_x: Decimals of token X, or one per bin ID
+            decimals_y: Decimals of token Y, or one per bin ID
+            
+        Returns:
+            float64 ndarray of prices (a list when numpy is not installed)
+        """
+        if np is None:
+            n = len(active_ids)
+            return [
+                MeteoraMath.get_price_from_id(a, s, dx, dy)
+                for a, s, dx, dy in zip(
+                    active_ids, broadcast(bin_step, n), broadcast(decimals_x, n), broadcast(decimals_y, n)
+                )
+            ]
         
-        # Base = 1 + bin_step/10000
-        base = Decimal(1) + Decimal(bin_step) / Decimal(10000)
+        exps = np.asarray(active_ids, dtype=np.int64) - BIN_ID_OFFSET
+        steps = np.asarray(bin_step, dtype=np.int64)
+        if np.any(steps <= 0):
+            raise ValueError("bin_step must be positive")
         
-        # Price_raw = base^adjusted_id
-        # Use Decimal for high precision
-        price_raw = base ** Decimal(adjusted_id)
+        if steps.ndim == 0:
+            prices = bin_power_table(int(steps)).pow_many(exps)
+        else:
+            steps = np.broadcast_to(steps, exps.shape)
+            prices = np.empty(exps.shape)
+            for step in np.unique(steps):
+                mask = steps == step
+                prices[mask] = bin_power_table(int(step)).pow_many(exps[mask])
         
-        # Adjust for decimals
-        decimal_adjustment = Decimal(10) ** (decimals_x - decimals_y)
-        price_real = price_raw * decimal_adjustment
+        prices *= pow10_many(np.subtract(decimals_x, decimals_y))
         
-        return float(price_real)
+        if verification_enabled():
+            n = len(prices)
+            for a, s, dx, dy, p in zip(
+                exps + BIN_ID_OFFSET, np.broadcast_to(steps, (n,)),
+                np.broadcast_to(decimals_x, (n,)), np.broadcast_to(decimals_y, (n,)), prices,
+            ):
+                verify(
+                    "get_prices_from_ids", float(p),
+                    lambda: price_from_id_decimal(int(a), int(s), int(dx), int(dy)),
+                )
+        return prices
     
     @staticmethod
     def get_id_from_price(
@@ -101,20 +224,14 @@ class MeteoraMath:
         if price <= 0:
             raise ValueError("price must be positive")
         
-        # Adjust for decimals
-        decimal_adjustment = Decimal(10) ** (decimals_y - decimals_x)
-        price_raw = Decimal(price) * decimal_adjustment
-        
-        # Base = 1 + bin_step/10000
-        base = Decimal(1) + Decimal(bin_step) / Decimal(10000)
-        
-        # adjusted_id = log_base(price_raw) = ln(price_raw) / ln(base)
-        adjusted_id = (price_raw.ln()) / (base.ln())
-        
-        # Add offset to get actual bin ID
+        # adjusted_id = ln(price × 10^(decimals_y - decimals_x)) / ln(base)
+        adjusted_id = (math.log(price) + (decimals_y - decimals_x) * LN10) / _ln_bin_base(bin_step)
         active_id = int(round(adjusted_id)) + BIN_ID_OFFSET
         
-        return active_id
+        return verify(
+            "get_id_from_price", active_id,
+            lambda: id_from_price_decimal(price, bin_step, decimals_x, decimals_y),
+        )
     
     @staticmethod
     def get_bin_range_price(
@@ -164,10 +281,12 @@ class MeteoraMath:
             New price
         """
         # Each bin move multiplies/divides by (1 + bin_step/10000)
-        factor = (Decimal(1) + Decimal(bin_step) / Decimal(10000)) ** Decimal(offset_bps)
-        new_price = Decimal(base_price) * factor
+        new_price = base_price * bin_power_table(bin_step).pow(offset_bps)
         
-        return float(new_price)
+        return verify(
+            "get_price_offset", new_price,
+            lambda: price_offset_decimal(base_price, offset_bps, bin_step),
+        )
     
     @staticmethod
     def estimate_liquidity_depth(
@@ -188,10 +307,12 @@ class MeteoraMath:
         """
         # Simplified: liquidity is distributed across bins
         # Higher bin_step = wider distribution = less depth per bin
-        base = Decimal(1) + Decimal(bin_step) / Decimal(10000)
-        depth_factor = Decimal(total_liquidity) / (base ** Decimal(abs(active_id - BIN_ID_OFFSET)))
+        depth_factor = total_liquidity / bin_power_table(bin_step).pow(abs(active_id - BIN_ID_OFFSET))
         
-        return float(depth_factor)
+        return verify(
+            "estimate_liquidity_depth", depth_factor,
+            lambda: liquidity_depth_decimal(bin_step, active_id, total_liquidity),
+        )
 
 
 # Convenience functions (pure wrappers)
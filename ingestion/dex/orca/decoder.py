@@ -6,11 +6,13 @@ Orca Whirlpools Decoder - High-level interface for Whirlpool data decoding.
 PR-U.2
 """
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from ..accounts import AccountColumns
 from .layouts import (
     WhirlpoolState,
     decode_whirlpool,
+    decode_whirlpools,
     guess_encoding_and_decode,
     WHIRLPOOL_DISCRIMINATOR,
 )
@@ -54,6 +56,22 @@ class OrcaDecoder:
             logger.error(f"[orca] Failed to decode pool: {e}")
             raise
     
+    def decode_whirlpools(self, buffers: Iterable[Optional[bytes]]) -> AccountColumns:
+        """
+        Decode many Whirlpools at once into columnar state.
+        
+        Args:
+            buffers: Raw account data per pool, e.g. account_buffers(response)
+                of a getMultipleAccounts call (None for missing accounts)
+            
+        Returns:
+            AccountColumns keyed by WhirlpoolState field names
+        """
+        pools = decode_whirlpools(buffers)
+        if pools.errors:
+            logger.warning(f"[orca] {len(pools.errors)} pool account(s) failed to decode")
+        return pools
+    
     def decode_from_string(self, data: str) -> WhirlpoolState:
         """
         Decode Whirlpool from base64 or hex string.
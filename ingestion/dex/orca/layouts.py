@@ -6,8 +6,11 @@ Orca Whirlpools CLMM account layout definitions.
 PR-U.2
 """
 import struct
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..accounts import PUBKEY_CACHE_SIZE, AccountColumns, decode_columns
 
 
 # Solana pubkey (32 bytes, base58 encoded)
@@ -76,9 +79,13 @@ def pubkey_to_string(data: bytes) -> str:
     return base58.b58encode(data).decode('utf-8')
 
 
+# LRU-cached pubkey_to_string: repeated pubkeys are encoded once and share one str
+intern_pubkey = lru_cache(maxsize=PUBKEY_CACHE_SIZE)(pubkey_to_string)
+
+
 def parse_pubkey(data: bytes, offset: int) -> str:
     """Parse a pubkey from data at offset."""
-    return pubkey_to_string(data[offset:offset + PUBKEY_LENGTH])
+    return intern_pubkey(bytes(data[offset:offset + PUBKEY_LENGTH]))
 
 
 # Orca Whirlpool account layout
@@ -126,6 +133,52 @@ WHIRLPOOL_CORE_LAYOUT = struct.Struct(
 )
 
 
+# Column names of decode_whirlpools(), in WhirlpoolState field order
+WHIRLPOOL_FIELDS = tuple(f.name for f in fields(WhirlpoolState))
+
+
+def _decode_whirlpool_row(data: bytes) -> Tuple[Any, ...]:
+    """
+    Unpack one Whirlpool account in place into a tuple in WHIRLPOOL_FIELDS order.
+    
+    Uses the full layout (with oracles) when the account is long enough,
+    otherwise the core layout.
+    """
+    full = len(data) >= 8 + WHIRLPOOL_LAYOUT.size
+    if full:
+        u = WHIRLPOOL_LAYOUT.unpack_from(data, 8)
+        # liquidity: u64 + low half of liquidity_remaining
+        liquidity = (int.from_bytes(u[8][:8], "little") << 64) | u[7]
+        oracle_a = intern_pubkey(u[15])
+        oracle_b = intern_pubkey(u[16])
+    elif len(data) >= 8 + WHIRLPOOL_CORE_LAYOUT.size:
+        u = WHIRLPOOL_CORE_LAYOUT.unpack_from(data, 8)
+        liquidity = (u[8] << 64) | u[7]
+        oracle_a = ""  # Not in core layout
+        oracle_b = ""  # Not in core layout
+    else:
+        raise ValueError(
+            f"Data too short: got {len(data)} bytes, "
+            f"need at least {8 + WHIRLPOOL_CORE_LAYOUT.size} for core layout"
+        )
+    
+    return (
+        intern_pubkey(u[1]),       # whirlpools_config
+        u[2],                      # tick_spacing
+        u[3],                      # tick_current_index
+        (u[5] << 64) | u[4],       # sqrt_price from two u64
+        liquidity,
+        intern_pubkey(u[9]),       # token_mint_a
+        intern_pubkey(u[10]),      # token_mint_b
+        intern_pubkey(u[11]),      # token_vault_a
+        intern_pubkey(u[12]),      # token_vault_b
+        oracle_a,
+        oracle_b,
+        u[13],                     # token_decimal_a
+        u[14],                     # token_decimal_b
+    )
+
+
 def decode_whirlpool(data: bytes) -> WhirlpoolState:
     """
     Decode Orca Whirlpool state from raw bytes.
@@ -139,129 +192,17 @@ def decode_whirlpool(data: bytes) -> WhirlpoolState:
     Raises:
         ValueError: If data is too short or invalid
     """
-    # First try core layout (smaller)
-    if len(data) >= 8 + WHIRLPOOL_CORE_LAYOUT.size:
-        try:
-            return _decode_core_layout(data)
-        except Exception:
-            pass
-    
-    # Try full layout if we have enough data
-    if len(data) >= 8 + WHIRLPOOL_LAYOUT.size:
-        try:
-            return _decode_full_layout(data)
-        except Exception:
-            pass
-    
-    raise ValueError(
-        f"Data too short: got {len(data)} bytes, "
-        f"need at least {8 + WHIRLPOOL_CORE_LAYOUT.size} for core layout"
-    )
+    return WhirlpoolState(*_decode_whirlpool_row(data))
 
 
-def _decode_core_layout(data: bytes) -> WhirlpoolState:
-    """Decode using core layout (without oracles)."""
-    # Skip discriminator
-    raw_data = data[8:]
-    
-    unpacked = WHIRLPOOL_CORE_LAYOUT.unpack(raw_data)
-    
-    whirlpools_config = parse_pubkey(raw_data, 0)
-    offset = 32
-    
-    tick_spacing = unpacked[1]
-    tick_current_index = unpacked[2]
-    
-    # Reconstruct sqrt_price from two u64
-    sqrt_price_lower = unpacked[3]
-    sqrt_price_upper = unpacked[4]
-    sqrt_price = (sqrt_price_upper << 64) | sqrt_price_lower
-    
-    # Reconstruct liquidity from two u64
-    liquidity_lower = unpacked[6]
-    liquidity_upper = unpacked[7]
-    liquidity = (liquidity_upper << 64) | liquidity_lower
-    
-    offset = 40  # After: config(32) + spacing(2) + pad(1) + tick(4) + sqrt(16) + liq(16)
-    
-    token_mint_a = parse_pubkey(raw_data, offset); offset += 32
-    token_mint_b = parse_pubkey(raw_data, offset); offset += 32
-    token_vault_a = parse_pubkey(raw_data, offset); offset += 32
-    token_vault_b = parse_pubkey(raw_data, offset); offset += 32
-    
-    token_decimal_a = unpacked[13]
-    token_decimal_b = unpacked[14]
-    
-    return WhirlpoolState(
-        whirlpools_config=whirlpools_config,
-        tick_spacing=tick_spacing,
-        tick_current_index=tick_current_index,
-        sqrt_price=sqrt_price,
-        liquidity=liquidity,
-        token_mint_a=token_mint_a,
-        token_mint_b=token_mint_b,
-        token_vault_a=token_vault_a,
-        token_vault_b=token_vault_b,
-        oracle_a="",  # Not in core layout
-        oracle_b="",  # Not in core layout
-        token_decimal_a=token_decimal_a,
-        token_decimal_b=token_decimal_b,
-    )
-
-
-def _decode_full_layout(data: bytes) -> WhirlpoolState:
-    """Decode using full layout (with oracles)."""
-    raw_data = data[8:]
-    
-    unpacked = WHIRLPOOL_LAYOUT.unpack(raw_data)
-    
-    whirlpools_config = parse_pubkey(raw_data, 0)
-    offset = 32
-    
-    tick_spacing = unpacked[1]
-    tick_current_index = unpacked[2]
-    
-    # Reconstruct sqrt_price from two u64
-    sqrt_price_lower = unpacked[3]
-    sqrt_price_upper = unpacked[4]
-    sqrt_price = (sqrt_price_upper << 64) | sqrt_price_lower
-    
-    # Reconstruct liquidity from u64 + remaining
-    liquidity_lower = unpacked[6]
-    liquidity_extra = unpacked[7]
-    # Combine: full_u128 = (extra << 64) | lower
-    liquidity = (liquidity_extra << 64) | liquidity_lower
-    
-    offset = 40  # After: config(32) + spacing(2) + pad(1) + tick(4) + sqrt(16) + liq(16)
-    
-    token_mint_a = parse_pubkey(raw_data, offset); offset += 32
-    token_mint_b = parse_pubkey(raw_data, offset); offset += 32
-    token_vault_a = parse_pubkey(raw_data, offset); offset += 32
-    token_vault_b = parse_pubkey(raw_data, offset); offset += 32
-    
-    token_decimal_a = unpacked[13]
-    token_decimal_b = unpacked[14]
-    
-    offset = 152  # Skip to oracle positions
-    
-    oracle_a = parse_pubkey(raw_data, offset); offset += 32
-    oracle_b = parse_pubkey(raw_data, offset)
+def decode_whirlpools(buffers: Iterable[Optional[bytes]]) -> AccountColumns:
+    """
+    Decode many Whirlpool accounts (e.g. accounts.account_buffers() of a
+    getMultipleAccounts response) into columns named by WHIRLPOOL_FIELDS.
     
-    return WhirlpoolState(
-        whirlpools_config=whirlpools_config,
-        tick_spacing=tick_spacing,
-        tick_current_index=tick_current_index,
-        sqrt_price=sqrt_price,
-        liquidity=liquidity,
-        token_mint_a=token_mint_a,
-        token_mint_b=token_mint_b,
-        token_vault_a=token_vault_a,
-        token_vault_b=token_vault_b,
-        oracle_a=oracle_a,
-        oracle_b=oracle_b,
-        token_decimal_a=token_decimal_a,
-        token_decimal_b=token_decimal_b,
-    )
+    Missing or undecodable accounts are reported in the result's `errors`.
+    """
+    return decode_columns(buffers, WHIRLPOOL_FIELDS, _decode_whirlpool_row)
 
 
 def decode_base64(data: str) -> bytes:
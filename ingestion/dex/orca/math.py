@@ -6,9 +6,27 @@ Orca Whirlpools CLMM Math - Pure math functions for CLMM calculations.
 PR-U.2
 
 All functions are pure (no I/O).
+
+OrcaMath converts sqrt prices with exact Q64.64 integer arithmetic and ticks
+through precomputed 1.0001^tick tables (ingestion/dex/fastmath); the *_decimal
+functions are the 80-digit Decimal reference they are checked against in
+verification mode.
 """
-from decimal import Decimal, getcontext
-from typing import Tuple
+import math
+from decimal import Decimal, getcontext, localcontext
+from functools import lru_cache
+from typing import Any, Sequence, Tuple
+
+from ..fastmath import (
+    DECIMAL_PRECISION,
+    PowerTable,
+    broadcast,
+    np,
+    pow10,
+    pow10_many,
+    verification_enabled,
+    verify,
+)
 
 
 # Set high precision for decimal operations
@@ -18,9 +36,88 @@ getcontext().prec = 80
 Q64_SHIFT = 64
 Q64_SCALE = 1 << Q64_SHIFT
 
+Q128_SCALE = 1 << 128
+
 # 1.0001 base for tick-to-price conversion
 TICK_BASE = Decimal("1.0001")
 
+# Whirlpool tick index bounds
+MAX_TICK_INDEX = 443636
+
+LN_TICK_BASE = math.log(1.0001)
+LN10 = math.log(10)
+
+_Q64_DEC = Decimal(Q64_SCALE)
+
+
+@lru_cache(maxsize=None)
+def tick_power_table() -> PowerTable:
+    """1.0001^tick for every tick index (shared by all tick spacings)."""
+    return PowerTable(TICK_BASE, MAX_TICK_INDEX)
+
+
+@lru_cache(maxsize=None)
+def sqrt_tick_power_table() -> PowerTable:
+    """1.0001^(tick/2) as 80-digit Decimals, for exact Q64.64 sqrt prices."""
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        sqrt_base = TICK_BASE.sqrt()
+    return PowerTable(sqrt_base, MAX_TICK_INDEX, keep_decimal=True)
+
+
+# -------------------------------------------------------------------------
+# Decimal reference implementations
+# -------------------------------------------------------------------------
+
+def sqrt_price_x64_to_price_decimal(sqrt_price: int, decimals_a: int, decimals_b: int) -> float:
+    """Reference for OrcaMath.sqrt_price_x64_to_price (80-digit Decimal)."""
+    if sqrt_price <= 0:
+        raise ValueError("sqrt_price must be positive")
+    
+    # Price_raw = (sqrt_price / 2^64)^2
+    price_raw = (Decimal(sqrt_price) / Decimal(Q64_SCALE)) ** 2
+    
+    # Adjust for decimals: Price_real = Price_raw × 10^(decimals_a - decimals_b)
+    decimal_adjustment = Decimal(10) ** (decimals_a - decimals_b)
+    return float(price_raw * decimal_adjustment)
+
+
+def price_to_sqrt_price_x64_decimal(price: float, decimals_a: int, decimals_b: int) -> int:
+    """Reference for OrcaMath.price_to_sqrt_price_x64 (80-digit Decimal)."""
+    if price <= 0:
+        raise ValueError("price must be positive")
+    
+    decimal_adjustment = Decimal(10) ** (decimals_b - decimals_a)
+    price_raw = Decimal(price) * decimal_adjustment
+    
+    # sqrt_price = sqrt(price_raw) × 2^64
+    return int(price_raw.sqrt() * Decimal(Q64_SCALE))
+
+
+def tick_to_price_decimal(tick: int, decimals_a: int, decimals_b: int) -> float:
+    """Reference for OrcaMath.tick_to_price (80-digit Decimal)."""
+    price_base = TICK_BASE ** Decimal(tick)
+    decimal_adjustment = Decimal(10) ** (decimals_a - decimals_b)
+    return float(price_base * decimal_adjustment)
+
+
+def price_to_tick_decimal(price: float, decimals_a: int, decimals_b: int, tick_spacing: int) -> int:
+    """Reference for OrcaMath.price_to_tick (80-digit Decimal)."""
+    decimal_adjustment = Decimal(10) ** (decimals_b - decimals_a)
+    price_raw = Decimal(price) * decimal_adjustment
+    
+    # tick = log_1.0001(price_raw)
+    tick = (price_raw / TICK_BASE).ln() / TICK_BASE.ln()
+    
+    # Round to nearest tick_spacing
+    tick_int = int(round(tick))
+    return (tick_int // tick_spacing) * tick_spacing
+
+
+def tick_to_sqrt_price_x64_decimal(tick: int) -> int:
+    """Reference for OrcaMath.tick_to_sqrt_price_x64 (80-digit Decimal)."""
+    return int((TICK_BASE ** (Decimal(tick) / 2)) * Decimal(Q64_SCALE))
+
 
 class OrcaMath:
     """
@@ -53,18 +150,60 @@ class OrcaMath:
         if sqrt_price <= 0:
             raise ValueError("sqrt_price must be positive")
         
-        # Convert to Decimal for high precision
-        sqrt_price_dec = Decimal(sqrt_price)
-        scale_dec = Decimal(Q64_SCALE)
+        # Exact: sqrt_price^2 × 10^(decimals_a - decimals_b) / 2^128, rounded once
+        exp = decimals_a - decimals_b
+        if exp >= 0:
+            price = (sqrt_price * sqrt_price * 10 ** exp) / Q128_SCALE
+        else:
+            price = (sqrt_price * sqrt_price) / (Q128_SCALE * 10 ** -exp)
         
-        # Price_raw = (sqrt_price / 2^64)^2
-        price_raw = (sqrt_price_dec / scale_dec) ** 2
+        return verify(
+            "sqrt_price_x64_to_price", price,
+            lambda: sqrt_price_x64_to_price_decimal(sqrt_price, decimals_a, decimals_b),
+        )
+    
+    @staticmethod
+    def sqrt_prices_x64_to_prices(
+        sqrt_prices: Sequence[int],
+        decimals_a: Any,
+        decimals_b: Any,
+    ):
+        """
+        Vectorized sqrt_price_x64_to_price for many pools.
         
-        # Adjust for decimals: Price_real = Price_raw × 10^(decimals_a - decimals_b)
-        decimal_adjustment = Decimal(10) ** (decimals_a - decimals_b)
-        price_real = price_raw * decimal_adjustment
+        With numpy the sqrt prices are converted to float64 first (a few ulp
+        instead of the exact scalar rounding).
         
-        return float(price_real)
+        Args:
+            sqrt_prices: Sqrt prices (Q64.64 integers)
+            decimals_a: Decimals of token A, or one per pool
+            decimals_b: Decimals of token B, or one per pool
+            
+        Returns:
+            float64 ndarray of prices (a list when numpy is not installed)
+        """
+        if np is None:
+            n = len(sqrt_prices)
+            return [
+                OrcaMath.sqrt_price_x64_to_price(sp, da, db)
+                for sp, da, db in zip(sqrt_prices, broadcast(decimals_a, n), broadcast(decimals_b, n))
+            ]
+        
+        ratio = np.asarray(sqrt_prices, dtype=np.float64) * (1.0 / Q64_SCALE)
+        if np.any(ratio <= 0):
+            raise ValueError("sqrt_price must be positive")
+        prices = ratio * ratio * pow10_many(np.subtract(decimals_a, decimals_b))
+        
+        if verification_enabled():
+            n = len(prices)
+            for sp, da, db, p in zip(
+                sqrt_prices, np.broadcast_to(decimals_a, (n,)), np.broadcast_to(decimals_b, (n,)), prices,
+            ):
+                verify(
+                    "sqrt_prices_x64_to_prices", float(p),
+                    lambda: sqrt_price_x64_to_price_decimal(int(sp), int(da), int(db)),
+                )
+        return prices
     
     @staticmethod
     def price_to_sqrt_price_x64(
@@ -88,14 +227,19 @@ class OrcaMath:
         if price <= 0:
             raise ValueError("price must be positive")
         
-        # Adjust for decimals
-        decimal_adjustment = Decimal(10) ** (decimals_b - decimals_a)
-        price_raw = Decimal(price) * decimal_adjustment
-        
-        # sqrt_price = sqrt(price_raw) × 2^64
-        sqrt_price = price_raw.sqrt() * Decimal(Q64_SCALE)
+        # Exact: floor(sqrt(price × 10^(decimals_b - decimals_a) × 2^128))
+        num, den = price.as_integer_ratio()
+        exp = decimals_b - decimals_a
+        if exp >= 0:
+            num *= 10 ** exp
+        else:
+            den *= 10 ** -exp
+        sqrt_price = math.isqrt((num << 128) // den)
         
-        return int(sqrt_price)
+        return verify(
+            "price_to_sqrt_price_x64", sqrt_price,
+            lambda: price_to_sqrt_price_x64_decimal(price, decimals_a, decimals_b),
+        )
     
     @staticmethod
     def tick_to_price(
@@ -117,14 +261,50 @@ class OrcaMath:
         Returns:
             Price of token A in terms of token B
         """
-        # Price_base = 1.0001^tick
-        price_base = TICK_BASE ** Decimal(tick)
+        price = tick_power_table().pow(tick) * pow10(decimals_a - decimals_b)
         
-        # Adjust for decimals
-        decimal_adjustment = Decimal(10) ** (decimals_a - decimals_b)
-        price_real = price_base * decimal_adjustment
+        return verify(
+            "tick_to_price", price,
+            lambda: tick_to_price_decimal(tick, decimals_a, decimals_b),
+        )
+    
+    @staticmethod
+    def ticks_to_prices(
+        ticks: Sequence[int],
+        decimals_a: Any,
+        decimals_b: Any,
+    ):
+        """
+        Vectorized tick_to_price for many ticks or pools.
         
-        return float(price_real)
+        Args:
+            ticks: Tick indices
+            decimals_a: Decimals of token A, or one per tick
+            decimals_b: Decimals of token B, or one per tick
+            
+        Returns:
+            float64 ndarray of prices (a list when numpy is not installed)
+        """
+        if np is None:
+            n = len(ticks)
+            return [
+                OrcaMath.tick_to_price(t, da, db)
+                for t, da, db in zip(ticks, broadcast(decimals_a, n), broadcast(decimals_b, n))
+            ]
+        
+        prices = tick_power_table().pow_many(ticks)
+        prices *= pow10_many(np.subtract(decimals_a, decimals_b))
+        
+        if verification_enabled():
+            n = len(prices)
+            for t, da, db, p in zip(
+                ticks, np.broadcast_to(decimals_a, (n,)), np.broadcast_to(decimals_b, (n,)), prices,
+            ):
+                verify(
+                    "ticks_to_prices", float(p),
+                    lambda: tick_to_price_decimal(int(t), int(da), int(db)),
+                )
+        return prices
     
     @staticmethod
     def price_to_tick(
@@ -145,18 +325,17 @@ class OrcaMath:
         Returns:
             Nearest tick index (rounded to tick_spacing)
         """
-        # Adjust for decimals
-        decimal_adjustment = Decimal(10) ** (decimals_b - decimals_a)
-        price_raw = Decimal(price) * decimal_adjustment
-        
-        # tick = log_1.0001(price_raw)
-        tick = (price_raw / TICK_BASE).ln() / TICK_BASE.ln()
+        # tick = log_1.0001(price_raw / 1.0001), price_raw = price × 10^(decimals_b - decimals_a)
+        tick = (math.log(price) + (decimals_b - decimals_a) * LN10) / LN_TICK_BASE - 1
         
         # Round to nearest tick_spacing
         tick_int = int(round(tick))
         tick_int = (tick_int // tick_spacing) * tick_spacing
         
-        return tick_int
+        return verify(
+            "price_to_tick", tick_int,
+            lambda: price_to_tick_decimal(price, decimals_a, decimals_b, tick_spacing),
+        )
     
     @staticmethod
     def get_liquidity_usd_estimate(
@@ -255,9 +434,12 @@ class OrcaMath:
             Sqrt price as integer (Q64.64 format)
         """
         # sqrt_price = 1.0001^(tick/2) × 2^64
-        sqrt_price_dec = (TICK_BASE ** (Decimal(tick) / 2)) * Decimal(Q64_SCALE)
+        sqrt_price = int(sqrt_tick_power_table().pow_decimal(tick, _Q64_DEC))
         
-        return int(sqrt_price_dec)
+        return verify(
+            "tick_to_sqrt_price_x64", sqrt_price,
+            lambda: tick_to_sqrt_price_x64_decimal(tick),
+        )
     
     @staticmethod
     def calculate_price_impact(
@@ -6,12 +6,14 @@ Raydium Pool Decoder - High-level interface for pool data decoding.
 PR-U.1
 """
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from ..accounts import AccountColumns
 from .layouts import (
     PoolState,
     VaultState,
     decode_pool_state,
+    decode_pool_states,
     decode_vault_state,
     guess_encoding_and_decode,
 )
@@ -48,6 +50,22 @@ class RaydiumDecoder:
             logger.error(f"[raydium] Failed to decode pool: {e}")
             raise
     
+    def decode_pools(self, buffers: Iterable[Optional[bytes]]) -> AccountColumns:
+        """
+        Decode many pools at once into columnar state.
+        
+        Args:
+            buffers: Raw account data per pool, e.g. account_buffers(response)
+                of a getMultipleAccounts call (None for missing accounts)
+            
+        Returns:
+            AccountColumns keyed by PoolState field names
+        """
+        pools = decode_pool_states(buffers)
+        if pools.errors:
+            logger.warning(f"[raydium] {len(pools.errors)} pool account(s) failed to decode")
+        return pools
+    
     def decode_pool_from_string(self, data: str) -> PoolState:
         """
         Decode pool from base64 or hex string.
@@ -6,8 +6,11 @@ Raydium AMM v4 account layout definitions.
 PR-U.1
 """
 import struct
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..accounts import PUBKEY_CACHE_SIZE, AccountColumns, decode_columns
 
 
 # Solana pubkey (32 bytes, base58 encoded)
@@ -116,9 +119,13 @@ def pubkey_to_string(data: bytes) -> str:
     return base58.b58encode(data).decode('utf-8')
 
 
+# LRU-cached pubkey_to_string: repeated pubkeys are encoded once and share one str
+intern_pubkey = lru_cache(maxsize=PUBKEY_CACHE_SIZE)(pubkey_to_string)
+
+
 def parse_pubkey(data: bytes, offset: int) -> str:
     """Parse a pubkey from data at offset."""
-    return pubkey_to_string(data[offset:offset + PUBKEY_LENGTH])
+    return intern_pubkey(bytes(data[offset:offset + PUBKEY_LENGTH]))
 
 
 # Raydium AMM v4 layout
@@ -126,11 +133,28 @@ def parse_pubkey(data: bytes, offset: int) -> str:
 AMM_V4_LAYOUT = struct.Struct(
     # Format: 8-byte discriminator is skipped, then:
     # 8 x u64 (status, nonce, order_num, depth, coin_decimals, pc_decimals, state, reset_flag)
-    # 9 x 32-byte pubkeys (coin_mint, pc_mint, lp_mint, coin_vault, pc_vault, authority, open_orders, market, market_program, target_orders)
+    # 10 x 32-byte pubkeys (coin_mint, pc_mint, lp_mint, coin_vault, pc_vault, authority, open_orders, market, market_program, target_orders)
     # 4 x u64 (quote_decimals, padding, padding2, padding3)
-    '8sQ9Q32s32s32s32s32s32s32s32s32s4Q'
+    '<8Q' + '32s' * 10 + '4Q'
 )
 
+# Column names of decode_pool_states(), in PoolState field order
+POOL_STATE_FIELDS = tuple(f.name for f in fields(PoolState))
+
+
+def _decode_pool_state_row(data: bytes) -> Tuple[Any, ...]:
+    """Unpack one AMM v4 account in place into a tuple in POOL_STATE_FIELDS order."""
+    if len(data) < 8 + AMM_V4_LAYOUT.size:
+        raise ValueError(
+            f"Data too short: got {len(data)} bytes, need at least {8 + AMM_V4_LAYOUT.size}"
+        )
+    
+    # Skip 8-byte discriminator without copying the account data
+    u = AMM_V4_LAYOUT.unpack_from(data, 8)
+    
+    # status .. reset_flag, 10 pubkeys, quote_decimals, padding
+    return u[:8] + tuple(map(intern_pubkey, u[8:18])) + u[18:20]
+
 
 def decode_pool_state(data: bytes) -> PoolState:
     """
@@ -145,71 +169,17 @@ def decode_pool_state(data: bytes) -> PoolState:
     Raises:
         ValueError: If data is too short
     """
-    if len(data) < 8 + AMM_V4_LAYOUT.size:
-        raise ValueError(
-            f"Data too short: got {len(data)} bytes, need at least {8 + AMM_V4_LAYOUT.size}"
-        )
-    
-    # Skip 8-byte discriminator at the beginning
-    raw_data = data[8:]
-    
-    if len(raw_data) < AMM_V4_LAYOUT.size:
-        raise ValueError(
-            f"Data too short after skipping discriminator: got {len(raw_data)}, "
-            f"need {AMM_V4_LAYOUT.size}"
-        )
-    
-    # Unpack the layout
-    unpacked = AMM_V4_LAYOUT.unpack(raw_data)
-    
-    # Parse pubkeys
-    offset = 0
-    
-    status = unpacked[offset]; offset += 1
-    nonce = unpacked[offset]; offset += 1
-    order_num = unpacked[offset]; offset += 1
-    depth = unpacked[offset]; offset += 1
-    coin_decimals = unpacked[offset]; offset += 1
-    pc_decimals = unpacked[offset]; offset += 1
-    state = unpacked[offset]; offset += 1
-    reset_flag = unpacked[offset]; offset += 1
-    
-    coin_mint = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    pc_mint = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    lp_mint = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    coin_vault = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    pc_vault = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    authority = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    open_orders = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    market = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    market_program = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    target_orders = parse_pubkey(raw_data, offset); offset += PUBKEY_LENGTH
-    
-    quote_decimals = unpacked[offset]; offset += 1
-    padding = unpacked[offset]
+    return PoolState(*_decode_pool_state_row(data))
+
+
+def decode_pool_states(buffers: Iterable[Optional[bytes]]) -> AccountColumns:
+    """
+    Decode many AMM v4 accounts (e.g. accounts.account_buffers() of a
+    getMultipleAccounts response) into columns named by POOL_STATE_FIELDS.
     
-    return PoolState(
-        status=status,
-        nonce=nonce,
-        order_num=order_num,
-        depth=depth,
-        coin_decimals=coin_decimals,
-        pc_decimals=pc_decimals,
-        state=state,
-        reset_flag=reset_flag,
-        coin_mint=coin_mint,
-        pc_mint=pc_mint,
-        lp_mint=lp_mint,
-        coin_vault=coin_vault,
-        pc_vault=pc_vault,
-        authority=authority,
-        open_orders=open_orders,
-        market=market,
-        market_program=market_program,
-        target_orders=target_orders,
-        quote_decimals=quote_decimals,
-        padding=padding,
-    )
+    Missing or undecodable accounts are reported in the result's `errors`.
+    """
+    return decode_columns(buffers, POOL_STATE_FIELDS, _decode_pool_state_row)
 
 
 def decode_base64(data: str) -> bytes:
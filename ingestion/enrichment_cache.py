@@ -0,0 +1,592 @@
+"""
+ingestion/enrichment_cache.py
+
+EnrichmentCache — one cache subsystem for enrichment, quote and metadata lookups.
+
+Tiers:
+- memory: bounded LRU per source (ingestion.rpc.cache.RpcCache)
+- disk (optional): SQLite table keyed by (source, key) with pickled values. It
+  survives restarts, so a warm restart is served from disk instead of refetching
+  from rate-limited APIs
+
+Per-source policy (SourcePolicy / register_source):
+- ttl_sec: how long an entry is fresh
+- stale_ttl_sec: how long after that the entry is still served while one
+  background refresh runs (stale-while-revalidate)
+- ttl_jitter: +/- fraction applied to ttl_sec so entries written together
+  (e.g. a batch or a restart) do not all expire together
+- max_entries: memory tier bound for the source
+- persist: whether the source is written to the disk tier
+
+Loads are single-flight: concurrent misses for the same (source, key) share one
+loader call (threads via get_or_load, asyncio tasks via aget_or_load). A loader
+result of None is returned but not cached. A failed refresh keeps serving the
+stale value until its stale window runs out.
+
+get_enrichment_cache() returns the process-wide instance every client defaults
+to (solanafm, pumpfun, deployer_reputation, jupiter_quote, pyth, helius_das,
+token_state, live_snapshot); clients still accept an explicit `cache`.
+configure_enrichment_cache() replaces it at startup, e.g. to add the disk tier
+(paper_pipeline / realtime runner do so from the `enrichment_cache` config).
+"""
+import asyncio
+import logging
+import pickle
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+from ingestion.rpc.cache import RpcCache
+
+logger = logging.getLogger(__name__)
+
+# ttl_sec arguments: fixed seconds, or a function of the value being cached.
+TtlArg = Union[None, float, Callable[[Any], float]]
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    """Caching policy for one source."""
+    ttl_sec: float = 300.0
+    stale_ttl_sec: float = 0.0
+    ttl_jitter: float = 0.0
+    max_entries: Optional[int] = 10_000
+    persist: bool = True
+
+
+# Defaults for the built-in sources; callers may still pass ttl_sec per call.
+DEFAULT_POLICIES: Dict[str, SourcePolicy] = {
+    "solanafm": SourcePolicy(ttl_sec=3600, stale_ttl_sec=3600, ttl_jitter=0.1),
+    "pumpfun": SourcePolicy(ttl_sec=3600, stale_ttl_sec=3600, ttl_jitter=0.1),
+    "deployer_reputation": SourcePolicy(ttl_sec=3600, stale_ttl_sec=86400, ttl_jitter=0.1),
+    "helius_das": SourcePolicy(ttl_sec=86400, stale_ttl_sec=7 * 86400, ttl_jitter=0.1, max_entries=100_000),
+    # Prices and quotes go stale in seconds: memory only, no stale serving.
+    "jupiter_quote": SourcePolicy(ttl_sec=10, persist=False),
+    "pyth": SourcePolicy(ttl_sec=5, persist=False),
+    "token_state": SourcePolicy(ttl_sec=30, persist=False),
+    "live_snapshot": SourcePolicy(ttl_sec=30, persist=False),
+}
+
+_METRIC_KEYS = ("hits", "stale_hits", "misses", "disk_hits", "loads", "load_errors", "coalesced", "refreshes")
+
+
+class _Entry(NamedTuple):
+    value: Any
+    fresh_until: float  # Unix timestamp
+    stale_until: float  # Unix timestamp (>= fresh_until)
+
+
+class _Flight:
+    """One in-progress load shared by concurrent callers (thread side)."""
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _SqliteTier:
+    """Disk tier: one row per (source, key); value is a pickle."""
+
+    def __init__(self, path: Union[str, Path]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " source TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+            " fresh_until REAL NOT NULL, stale_until REAL NOT NULL,"
+            " PRIMARY KEY (source, key))"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, source: str, key: str) -> Optional[Tuple[bytes, float, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM entries WHERE source = ? AND key = ?",
+                (source, key),
+            ).fetchone()
+
+    def put(self, source: str, key: str, blob: bytes, fresh_until: float, stale_until: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (source, key, value, fresh_until, stale_until)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (source, key, blob, fresh_until, stale_until),
+            )
+
+    def delete(self, source: str, key: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM entries WHERE source = ? AND key = ?", (source, key))
+            return cur.rowcount > 0
+
+    def clear(self, source: Optional[str] = None) -> None:
+        with self._lock:
+            if source is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE source = ?", (source,))
+
+    def prune(self, now: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM entries WHERE stale_until < ?", (now,)).rowcount
+
+    def count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            if source is None:
+                return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM entries WHERE source = ?", (source,)).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EnrichmentCache:
+    """
+    Tiered (memory LRU + optional SQLite) cache with single-flight loads and
+    stale-while-revalidate refresh, keyed by (source, key).
+
+    Keys are strings; values must be picklable for sources that persist.
+    """
+
+    def __init__(
+        self,
+        disk_path: Optional[Union[str, Path]] = None,
+        policies: Optional[Mapping[str, SourcePolicy]] = None,
+        default_policy: Optional[SourcePolicy] = None,
+        refresh_workers: int = 4,
+    ):
+        """
+        Initialize EnrichmentCache.
+
+        Args:
+            disk_path: SQLite file for the disk tier (None = memory only)
+            policies: Per-source policies, merged over DEFAULT_POLICIES
+            default_policy: Policy for sources without one
+            refresh_workers: Threads running background (stale) refreshes
+        """
+        self._policies: Dict[str, SourcePolicy] = dict(DEFAULT_POLICIES)
+        if policies:
+            self._policies.update(policies)
+        self._default_policy = default_policy or SourcePolicy()
+        self._refresh_workers = refresh_workers
+
+        self._lock = threading.RLock()
+        self._memory: Dict[str, RpcCache] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._flights: Dict[Tuple[str, str], _Flight] = {}
+        self._aflights: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.disk_path: Optional[Path] = Path(disk_path) if disk_path is not None else None
+        self._disk: Optional[_SqliteTier] = None
+        if disk_path is not None:
+            self._disk = _SqliteTier(disk_path)
+            pruned = self._disk.prune(time.time())
+            if pruned:
+                logger.debug(f"[enrichment_cache] pruned {pruned} expired disk entries")
+
+    # Policies
+
+    def register_source(self, source: str, policy: Optional[SourcePolicy] = None, **overrides: Any) -> SourcePolicy:
+        """Set the policy for a source (fields in overrides replace the current policy's)."""
+        with self._lock:
+            base = policy or self._policies.get(source, self._default_policy)
+            policy = replace(base, **overrides) if overrides else base
+            self._policies[source] = policy
+            # Rebuild the memory tier bound lazily on next use.
+            mem = self._memory.pop(source, None)
+            if mem is not None:
+                mem.clear()
+            return policy
+
+    def policy(self, source: str) -> SourcePolicy:
+        return self._policies.get(source, self._default_policy)
+
+    # Plain access (no loading)
+
+    def get(self, source: str, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Cached value, or None if missing (or only stale and allow_stale is False)."""
+        now = time.time()
+        entry = self._lookup(source, key, now)
+        m = self._metrics_for(source)
+        if entry is None:
+            m["misses"] += 1
+            return None
+        if now < entry.fresh_until:
+            m["hits"] += 1
+            return entry.value
+        if allow_stale:
+            m["stale_hits"] += 1
+            return entry.value
+        m["misses"] += 1
+        return None
+
+    def set(self, source: str, key: str, value: Any, ttl_sec: TtlArg = None) -> None:
+        """Store a value in both tiers."""
+        self._store(source, key, value, ttl_sec)
+
+    def invalidate(self, source: str, key: str) -> bool:
+        """Remove one key from both tiers; True if it was cached."""
+        removed = self._mem(source).delete(key)
+        if self._disk is not None and self.policy(source).persist:
+            removed = self._disk.delete(source, key) or removed
+        return removed
+
+    def clear(self, source: Optional[str] = None) -> None:
+        """Clear one source (or everything) from both tiers."""
+        with self._lock:
+            mems = list(self._memory.values()) if source is None else [self._mem(source)]
+        for mem in mems:
+            mem.clear()
+        if self._disk is not None:
+            self._disk.clear(source)
+
+    def size(self, source: Optional[str] = None) -> int:
+        """Entries in the memory tier."""
+        with self._lock:
+            if source is not None:
+                mem = self._memory.get(source)
+                return len(mem) if mem is not None else 0
+            return sum(len(mem) for mem in self._memory.values())
+
+    def metrics(self, source: Optional[str] = None) -> Dict[str, Any]:
+        """Counters per source ({source: {...}}), or for one source."""
+        with self._lock:
+            sources = [source] if source is not None else sorted(set(self._metrics) | set(self._memory))
+            out: Dict[str, Any] = {}
+            for s in sources:
+                m = dict(self._metrics.get(s) or dict.fromkeys(_METRIC_KEYS, 0))
+                mem = self._memory.get(s)
+                mem_metrics = mem.get_metrics() if mem is not None else {}
+                m["size"] = mem_metrics.get("size", 0)
+                m["evicted_lru"] = mem_metrics.get("evicted_lru", 0)
+                m["expired"] = mem_metrics.get("expired", 0)
+                served = m["hits"] + m["stale_hits"]
+                total = served + m["misses"]
+                m["hit_rate"] = served / total if total > 0 else 0.0
+                out[s] = m
+        if self._disk is not None:
+            for s, m in out.items():
+                m["disk_size"] = self._disk.count(s)
+        return out[source] if source is not None else out
+
+    # Loading
+
+    def get_or_load(self, source: str, key: str, loader: Callable[[], Any], ttl_sec: TtlArg = None) -> Any:
+        """
+        Return the cached value, loading it with `loader()` on a miss.
+
+        Fresh hit: returned as is. Stale hit: returned, and one background
+        refresh is started. Miss: concurrent callers share one loader call; an
+        exception from it is raised in every waiting caller.
+        """
+        now = time.time()
+        entry = self._lookup(source, key, now)
+        m = self._metrics_for(source)
+        if entry is not None:
+            if now < entry.fresh_until:
+                m["hits"] += 1
+                return entry.value
+            m["stale_hits"] += 1
+            self._refresh_in_background(source, key, loader, ttl_sec)
+            return entry.value
+        m["misses"] += 1
+
+        fk = (source, key)
+        with self._lock:
+            flight = self._flights.get(fk)
+            leader = flight is None
+            if leader:
+                flight = self._flights[fk] = _Flight()
+            else:
+                m["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._load(source, key, loader, ttl_sec)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(fk, None)
+            flight.event.set()
+
+    async def aget_or_load(
+        self,
+        source: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_sec: TtlArg = None,
+    ) -> Any:
+        """Async get_or_load: loader is a coroutine function; misses share one task per event loop."""
+        now = time.time()
+        entry = self._lookup(source, key, now)
+        m = self._metrics_for(source)
+        if entry is not None:
+            if now < entry.fresh_until:
+                m["hits"] += 1
+                return entry.value
+            m["stale_hits"] += 1
+            self._arefresh_in_background(source, key, loader, ttl_sec)
+            return entry.value
+        m["misses"] += 1
+
+        loop = asyncio.get_running_loop()
+        fk = (source, key)
+        with self._lock:
+            fut = self._aflights.get(fk)
+            if fut is not None and fut.get_loop() is loop and not fut.done():
+                m["coalesced"] += 1
+            else:
+                fut = None
+        if fut is not None:
+            return await asyncio.shield(fut)
+        return await self._aload_shared(source, key, loader, ttl_sec, loop)
+
+    def close(self) -> None:
+        """Stop refresh workers and close the disk tier."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    # Internals
+
+    def _mem(self, source: str) -> RpcCache:
+        mem = self._memory.get(source)
+        if mem is None:
+            with self._lock:
+                mem = self._memory.get(source)
+                if mem is None:
+                    policy = self.policy(source)
+                    mem = self._memory[source] = RpcCache(
+                        default_ttl=policy.ttl_sec + policy.stale_ttl_sec,
+                        max_entries=policy.max_entries,
+                    )
+        return mem
+
+    def _metrics_for(self, source: str) -> Dict[str, int]:
+        m = self._metrics.get(source)
+        if m is None:
+            with self._lock:
+                m = self._metrics.setdefault(source, dict.fromkeys(_METRIC_KEYS, 0))
+        return m
+
+    def _lookup(self, source: str, key: str, now: float) -> Optional[_Entry]:
+        """Memory tier, then disk tier (promoted to memory); None if missing or past stale_until."""
+        mem = self._mem(source)
+        entry = mem.get(key)
+        if entry is not None:
+            return entry
+        if self._disk is None or not self.policy(source).persist:
+            return None
+
+        row = self._disk.get(source, key)
+        if row is None:
+            return None
+        blob, fresh_until, stale_until = row
+        if stale_until <= now:
+            return None
+        try:
+            value = pickle.loads(blob)
+        except Exception as e:
+            logger.warning(f"[enrichment_cache] dropping unreadable disk entry {source}:{key}: {e}")
+            self._disk.delete(source, key)
+            return None
+        entry = _Entry(value, fresh_until, stale_until)
+        mem.set(key, entry, ttl=stale_until - now)
+        self._metrics_for(source)["disk_hits"] += 1
+        return entry
+
+    def _store(self, source: str, key: str, value: Any, ttl_sec: TtlArg) -> None:
+        policy = self.policy(source)
+        if callable(ttl_sec):
+            ttl = float(ttl_sec(value))
+        else:
+            ttl = float(ttl_sec) if ttl_sec is not None else policy.ttl_sec
+        if policy.ttl_jitter:
+            ttl *= 1.0 + random.uniform(-policy.ttl_jitter, policy.ttl_jitter)
+        now = time.time()
+        fresh_until = now + ttl
+        stale_until = fresh_until + policy.stale_ttl_sec
+        if stale_until <= now:
+            return
+
+        self._mem(source).set(key, _Entry(value, fresh_until, stale_until), ttl=stale_until - now)
+        if self._disk is not None and policy.persist:
+            try:
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.debug(f"[enrichment_cache] {source}:{key} not persisted: {e}")
+                return
+            try:
+                self._disk.put(source, key, blob, fresh_until, stale_until)
+            except sqlite3.Error as e:
+                logger.warning(f"[enrichment_cache] disk write failed for {source}:{key}: {e}")
+
+    def _load(self, source: str, key: str, loader: Callable[[], Any], ttl_sec: TtlArg) -> Any:
+        m = self._metrics_for(source)
+        try:
+            value = loader()
+        except BaseException:
+            m["load_errors"] += 1
+            raise
+        m["loads"] += 1
+        if value is not None:
+            self._store(source, key, value, ttl_sec)
+        return value
+
+    def _refresh_in_background(self, source: str, key: str, loader: Callable[[], Any], ttl_sec: TtlArg) -> None:
+        fk = (source, key)
+        with self._lock:
+            if fk in self._flights:
+                return
+            flight = self._flights[fk] = _Flight()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._refresh_workers, thread_name_prefix="enrichment-refresh"
+                )
+            executor = self._executor
+            self._metrics_for(source)["refreshes"] += 1
+
+        def _run() -> None:
+            try:
+                flight.value = self._load(source, key, loader, ttl_sec)
+            except Exception as e:
+                # Keep serving the stale value; the next stale hit retries.
+                flight.error = e
+                logger.warning(f"[enrichment_cache] refresh failed for {source}:{key}: {e}")
+            finally:
+                with self._lock:
+                    self._flights.pop(fk, None)
+                flight.event.set()
+
+        executor.submit(_run)
+
+    async def _aload_shared(
+        self,
+        source: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_sec: TtlArg,
+        loop: asyncio.AbstractEventLoop,
+    ) -> Any:
+        fk = (source, key)
+        fut: "asyncio.Future[Any]" = loop.create_future()
+        with self._lock:
+            self._aflights[fk] = fut
+        m = self._metrics_for(source)
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            m["load_errors"] += 1
+            fut.cancel()
+            raise
+        except BaseException as e:
+            m["load_errors"] += 1
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            m["loads"] += 1
+            if value is not None:
+                self._store(source, key, value, ttl_sec)
+            fut.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._aflights.get(fk) is fut:
+                    del self._aflights[fk]
+
+    def _arefresh_in_background(
+        self,
+        source: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_sec: TtlArg,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        fk = (source, key)
+        with self._lock:
+            fut = self._aflights.get(fk)
+            if fut is not None and fut.get_loop() is loop and not fut.done():
+                return
+            self._metrics_for(source)["refreshes"] += 1
+
+        async def _run() -> None:
+            try:
+                await self._aload_shared(source, key, loader, ttl_sec, loop)
+            except Exception as e:
+                logger.warning(f"[enrichment_cache] refresh failed for {source}:{key}: {e}")
+
+        task = loop.create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+_default_cache: Optional[EnrichmentCache] = None
+_default_lock = threading.Lock()
+
+
+def get_enrichment_cache() -> EnrichmentCache:
+    """Process-wide EnrichmentCache (memory only unless configure_enrichment_cache() was called)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = EnrichmentCache()
+    return _default_cache
+
+
+def configure_enrichment_cache(
+    disk_path: Optional[Union[str, Path]] = None,
+    policies: Optional[Mapping[str, SourcePolicy]] = None,
+    **kwargs: Any,
+) -> EnrichmentCache:
+    """Replace the process-wide cache (closing the previous one) and return it."""
+    global _default_cache
+    with _default_lock:
+        previous = _default_cache
+        _default_cache = EnrichmentCache(disk_path=disk_path, policies=policies, **kwargs)
+    if previous is not None:
+        previous.close()
+    return _default_cache
+
+
+def configure_enrichment_cache_from_config(cfg: Mapping[str, Any]) -> EnrichmentCache:
+    """
+    Set up the process-wide cache from the strategy config at startup.
+
+    Reads run.enrichment_cache.disk_path (null/absent = memory only). The
+    current cache is kept when it already uses that path, so calling this
+    more than once does not close a cache other clients hold.
+    """
+    section = ((cfg.get("run") or {}).get("enrichment_cache") or {})
+    disk_path = section.get("disk_path")
+    current = get_enrichment_cache()
+    wanted = Path(disk_path) if disk_path else None
+    if current.disk_path == wanted:
+        return current
+    cache = configure_enrichment_cache(disk_path=wanted)
+    logger.info(f"[enrichment_cache] disk tier: {wanted or 'disabled'}")
+    return cache
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 import time
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
+
 from .pyth_ids import get_feed_id
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,9 @@ HERMES_V2_ENDPOINT = "/v2/updates/price/latest"
 # Cache TTL
 DEFAULT_CACHE_TTL = 5  # seconds
 
+# EnrichmentCache source name
+CACHE_SOURCE = "pyth"
+
 
 @dataclass
 class PriceData:
@@ -78,6 +83,7 @@ class PythClient:
         base_url: str = HERMES_BASE_URL,
         cache_ttl: int = DEFAULT_CACHE_TTL,
         request_timeout: float = 10.0,
+        cache: Optional[EnrichmentCache] = None,
     ):
         """
         Initialize PythClient.
@@ -86,41 +92,19 @@ class PythClient:
             base_url: Hermes API base URL
             cache_ttl: Cache TTL in seconds
             request_timeout: Request timeout in seconds
+            cache: EnrichmentCache to use (default: the process-wide one)
         """
         self._base_url = base_url
         self._cache_ttl = cache_ttl
         self._timeout = request_timeout
         
         # Cache for price data
-        self._price_cache: Dict[str, Dict[str, Any]] = {}
+        self._price_cache = cache or get_enrichment_cache()
         
     def _get_cache_key(self, symbol: str) -> str:
         """Generate cache key for symbol."""
         return f"pyth:{symbol.upper()}"
     
-    def _get_cached_price(self, symbol: str) -> Optional[PriceData]:
-        """Get cached price if valid."""
-        key = self._get_cache_key(symbol)
-        cached = self._price_cache.get(key)
-        
-        if cached is None:
-            return None
-        
-        # Check if cache is expired
-        if time.time() - cached["cached_at"] > self._cache_ttl:
-            del self._price_cache[key]
-            return None
-        
-        return cached["data"]
-    
-    def _cache_price(self, symbol: str, data: PriceData) -> None:
-        """Cache price data."""
-        key = self._get_cache_key(symbol)
-        self._price_cache[key] = {
-            "data": data,
-            "cached_at": time.time(),
-        }
-    
     def fetch_price(
         self,
         symbol: str,
@@ -138,13 +122,18 @@ class PythClient:
         Returns:
             PriceData or None if unavailable
         """
-        # Check cache first
+        # Cache first; concurrent misses share one request, None is not cached
         if use_cache:
-            cached = self._get_cached_price(symbol)
-            if cached is not None:
-                logger.debug(f"[pyth] Cache hit for {symbol}")
-                return cached
-        
+            return self._price_cache.get_or_load(
+                CACHE_SOURCE,
+                self._get_cache_key(symbol),
+                lambda: self._request_price(symbol, http_callable),
+                ttl_sec=self._cache_ttl,
+            )
+        return self._request_price(symbol, http_callable)
+    
+    def _request_price(self, symbol: str, http_callable: Optional[Any]) -> Optional[PriceData]:
+        """Request and parse one price from Hermes (None on failure)."""
         try:
             # Get feed ID
             feed_id = get_feed_id(symbol)
@@ -164,13 +153,7 @@ class PythClient:
             
             # Parse response
             data = response.json()
-            price_data = self._parse_hermes_response(data, symbol, feed_id)
-            
-            # Cache if valid
-            if price_data is not None:
-                self._cache_price(symbol, price_data)
-            
-            return price_data
+            return self._parse_hermes_response(data, symbol, feed_id)
             
         except Exception as e:
             logger.warning(f"[pyth] Failed to fetch price for {symbol}: {e}")
@@ -274,17 +257,16 @@ class PythClient:
             symbol: Specific symbol to clear, or None to clear all
         """
         if symbol is None:
-            self._price_cache.clear()
+            self._price_cache.clear(CACHE_SOURCE)
             logger.debug("[pyth] Cache cleared")
         else:
-            key = self._get_cache_key(symbol)
-            if key in self._price_cache:
-                del self._price_cache[key]
+            if self._price_cache.invalidate(CACHE_SOURCE, self._get_cache_key(symbol)):
                 logger.debug(f"[pyth] Cache cleared for {symbol}")
     
     def get_cache_info(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return {
-            "cached_items": len(self._price_cache),
+            "cached_items": self._price_cache.size(CACHE_SOURCE),
             "cache_ttl": self._cache_ttl,
+            "metrics": self._price_cache.metrics(CACHE_SOURCE),
         }
@@ -5,31 +5,60 @@ PR-PM.4: Polymarket → Solana Token Mapping Pipeline
 
 Orchestrates loading of Polymarket snapshots and token snapshots,
 computes mappings, and exports results to parquet.
+
+The token index (analysis.token_mapping.TokenIndex) is reused across runs:
+in-process while the token file is unchanged, and across processes via an
+optional pickle (--token-index) stamped with the token file's size/mtime.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
 import sys
 import time
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add analysis to path
 sys.path.insert(0, str(Path(__file__).parent / ".."))
 
 import duckdb
 
+import analysis.token_mapping as token_mapping_module
 from analysis.token_mapping import (
+    THEME_TOKENS,
     PolymarketSnapshot,
+    TokenIndex,
     TokenSnapshot,
     build_all_mappings,
+    build_token_index,
     compute_mapping_stats,
 )
 
 
 SCHEMA_VERSION = "pm4_v1"
+TOKEN_INDEX_VERSION = 1
+
+
+def _index_code_hash() -> str:
+    """Hash of what a pickled TokenIndex depends on besides the token file:
+    the THEME_TOKENS whitelist and the analysis.token_mapping source."""
+    h = hashlib.sha256(json.dumps(THEME_TOKENS, sort_keys=True).encode("utf-8"))
+    try:
+        h.update(Path(token_mapping_module.__file__).read_bytes())
+    except (OSError, TypeError):
+        pass
+    return h.hexdigest()
+
+
+_INDEX_CODE_HASH = _index_code_hash()
+
+# tokens_path -> (fingerprint, index) for repeated runs in one process
+_INDEX_CACHE: Dict[str, Tuple[Tuple[Any, ...], TokenIndex]] = {}
 
 
 def load_polymarket_snapshots(path: str) -> List[PolymarketSnapshot]:
@@ -106,6 +135,47 @@ def load_token_snapshots(path: str) -> List[TokenSnapshot]:
     return tokens
 
 
+def _token_file_fingerprint(path: str) -> Tuple[Any, ...]:
+    st = os.stat(path)
+    return (TOKEN_INDEX_VERSION, _INDEX_CODE_HASH, os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def load_token_index(tokens_path: str, index_path: Optional[str] = None) -> TokenIndex:
+    """
+    TokenIndex for `tokens_path`, rebuilt only when the token file, THEME_TOKENS
+    or the analysis.token_mapping code changes.
+
+    Reuses the in-process copy, else a pickled index at `index_path` whose
+    fingerprint matches; otherwise loads the tokens, builds the index and
+    (if `index_path` is set) writes it for the next run.
+    """
+    fingerprint = _token_file_fingerprint(tokens_path)
+    cached = _INDEX_CACHE.get(tokens_path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    index = None
+    if index_path and os.path.exists(index_path):
+        try:
+            with open(index_path, "rb") as f:
+                stored_fingerprint, stored_index = pickle.load(f)
+            if stored_fingerprint == fingerprint:
+                index = stored_index
+        except Exception as e:
+            print(f"[token_mapping] ignoring unreadable token index {index_path}: {e}", file=sys.stderr)
+
+    if index is None:
+        index = build_token_index(load_token_snapshots(tokens_path))
+        if index_path:
+            tmp_path = f"{index_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((fingerprint, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, index_path)
+
+    _INDEX_CACHE[tokens_path] = (fingerprint, index)
+    return index
+
+
 def export_mappings(
     mappings: List[Any],
     output_path: str,
@@ -166,6 +236,7 @@ def run(
     output_path: str,
     dry_run: bool = False,
     summary_json: bool = False,
+    token_index_path: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Run the token mapping pipeline.
@@ -176,6 +247,7 @@ def run(
         output_path: Path for output Parquet
         dry_run: If True, don't write output
         summary_json: If True, output summary as JSON to stdout
+        token_index_path: Optional pickle to reuse the token index across runs
     
     Returns:
         Summary dict with mapping statistics
@@ -184,10 +256,10 @@ def run(
     
     # Load data
     markets = load_polymarket_snapshots(polymarket_path)
-    tokens = load_token_snapshots(tokens_path)
+    token_index = load_token_index(tokens_path, token_index_path)
     
     # Build mappings
-    mappings = build_all_mappings(markets, tokens)
+    mappings = build_all_mappings(markets, token_index)
     
     # Compute stats
     stats = compute_mapping_stats(mappings)
@@ -216,6 +288,7 @@ def main() -> int:
     parser.add_argument("--output", required=True, help="Output Parquet path")
     parser.add_argument("--dry-run", action="store_true", help="Don't write output")
     parser.add_argument("--summary-json", action="store_true", help="Output summary JSON to stdout")
+    parser.add_argument("--token-index", default=None, help="Token index cache file (reused while the token file is unchanged)")
     
     args = parser.parse_args()
     
@@ -226,6 +299,7 @@ def main() -> int:
             output_path=args.output,
             dry_run=args.dry_run,
             summary_json=args.summary_json,
+            token_index_path=args.token_index,
         )
         return 0
     except Exception as e:
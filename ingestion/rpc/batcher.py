@@ -2,12 +2,19 @@
 ingestion/rpc/batcher.py
 
 RpcBatcher — queues requests and batches them for efficient RPC calls.
+
+Producers never wait for HTTP: queue_request only appends to the fill buffer
+under a short lock. Full buffers are swapped out (double buffering) and handed
+to a pool of sender threads, so up to max_in_flight batches run concurrently;
+a dispatcher thread flushes partial buffers after batch_delay_ms. Identical
+(method, params) requests that are queued or in flight share one future.
 """
 import logging
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -27,149 +34,245 @@ class BatchFuture:
     def __init__(self):
         self._result = None
         self._ready = threading.Event()
-    
+
     def set_result(self, value: Any):
         self._result = value
         self._ready.set()
-    
+
+    def done(self) -> bool:
+        return self._ready.is_set()
+
     def get(self, timeout: Optional[float] = None) -> Any:
         self._ready.wait(timeout=timeout)
         return self._result
 
 
+# Dispatcher thread exits after this long without queued requests (restarted on demand).
+_DISPATCHER_IDLE_SEC = 1.0
+
+
+def _coalesce_key(item: BatchItem) -> Tuple[str, str]:
+    return item.method, repr(item.params)
+
+
 class RpcBatcher:
     """
     Batches RPC requests for efficient transmission.
-    
+
     Features:
     - Queues requests and flushes when batch is full (MAX_BATCH_SIZE)
     - Timer-based flushing (batch_delay_ms) for smaller batches
-    - Thread-safe operation
-    
+    - Thread-safe operation; HTTP runs on sender threads, never under the queue lock
+    - Up to max_in_flight batches in flight; identical pending requests are coalesced
+
     PR-T.1
     """
-    
+
     MAX_BATCH_SIZE = 100  # Per Solana JSON RPC spec
-    
+
     def __init__(
         self,
         max_batch_size: int = MAX_BATCH_SIZE,
         batch_delay_ms: float = 10.0,
         http_callable: Optional[Callable[[list], list]] = None,
+        max_in_flight: int = 4,
+        coalesce: bool = True,
     ):
         """
         Initialize RpcBatcher.
-        
+
         Args:
             max_batch_size: Maximum items per batch
             batch_delay_ms: Max delay before flushing (milliseconds)
             http_callable: Function to execute batched requests
+            max_in_flight: Batches sent concurrently (sender threads)
+            coalesce: Share one future between identical pending (method, params) requests
         """
         self._max_batch_size = max_batch_size
         self._batch_delay_ms = batch_delay_ms
         self._http_callable = http_callable
-        
+        self._max_in_flight = max(1, int(max_in_flight))
+        self._coalesce = coalesce
+
         self._queue: List[BatchItem] = []
-        self._lock = threading.Lock()
-        self._timer: Optional[threading.Timer] = None
+        self._pending: Dict[Tuple[str, str], BatchFuture] = {}
+        # Reentrant: a sender's done-callback may run inline while the lock is held.
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._deadline = 0.0
+        self._closed = False
         self._last_flush_time = 0.0
-        
+
+        self._senders: Optional[ThreadPoolExecutor] = None
+        self._outstanding: Set[Future] = set()
+        self._dispatcher: Optional[threading.Thread] = None
+
         # Metrics
         self._batches_sent = 0
         self._requests_batched = 0
-        
+        self._requests_coalesced = 0
+        self._in_flight = 0
+        self._max_in_flight_seen = 0
+
     def queue_request(self, item: BatchItem) -> BatchFuture:
         """
         Queue a request for batching.
-        
+
         Args:
             item: The batch item to queue
-            
+
         Returns:
-            BatchFuture that will hold the result
+            BatchFuture that will hold the result (shared with identical pending requests)
         """
-        future = BatchFuture()
-        item.callback = future.set_result  # Wrap callback to use future
-        
-        with self._lock:
+        key = _coalesce_key(item) if self._coalesce else None
+
+        with self._cond:
+            if key is not None:
+                shared = self._pending.get(key)
+                if shared is not None:
+                    self._requests_coalesced += 1
+                    return shared
+
+            future = BatchFuture()
+            item.callback = future.set_result  # Wrap callback to use future
+            if key is not None:
+                self._pending[key] = future
             self._queue.append(item)
-            
+
             # Check if we should flush
             if len(self._queue) >= self._max_batch_size:
-                self._flush()
-            elif self._timer is None:
-                # Start timer for delayed flush
-                self._timer = threading.Timer(
-                    self._batch_delay_ms / 1000.0,
-                    self._on_timer,
-                )
-                self._timer.start()
-        
+                self._seal_locked()
+            elif len(self._queue) == 1:
+                # First item of a new buffer starts the delay window
+                self._deadline = time.monotonic() + self._batch_delay_ms / 1000.0
+                self._ensure_dispatcher_locked()
+                self._cond.notify()
+
         return future
-    
-    def _on_timer(self) -> None:
-        """Called when timer expires - flush the batch."""
-        with self._lock:
-            if self._queue:
-                self._flush()
-            self._timer = None
-    
-    def _flush(self) -> None:
-        """Execute the current batch."""
+
+    def _ensure_dispatcher_locked(self) -> None:
+        if self._dispatcher is None and not self._closed:
+            self._dispatcher = threading.Thread(target=self._run_dispatcher, name="rpc-batcher", daemon=True)
+            self._dispatcher.start()
+
+    def _run_dispatcher(self) -> None:
+        """Flush partial buffers once their delay window has passed."""
+        with self._cond:
+            while not self._closed:
+                if not self._queue:
+                    # Exit when idle so an unused batcher does not pin a thread.
+                    if not self._cond.wait(timeout=_DISPATCHER_IDLE_SEC) and not self._queue:
+                        self._dispatcher = None
+                        return
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(timeout=remaining)
+                    continue
+                self._seal_locked()
+
+    def _seal_locked(self) -> None:
+        """Swap out the fill buffer and hand it to a sender thread."""
         if not self._queue:
             return
-        
-        # Take all items from queue
         items = self._queue
         self._queue = []
-        
-        # Cancel timer if active
-        if self._timer is not None:
-            self._timer.cancel()
-            self._timer = None
-        
         self._last_flush_time = time.time()
-        
-        # Execute batch if callable provided
-        if self._http_callable:
+
+        if not self._http_callable:
+            # Nothing to send to; drop the batch (futures stay unresolved, as before)
+            for item in items:
+                self._pending.pop(_coalesce_key(item), None)
+            return
+
+        if self._senders is None:
+            self._senders = ThreadPoolExecutor(max_workers=self._max_in_flight, thread_name_prefix="rpc-sender")
+        fut = self._senders.submit(self._send, items)
+        self._outstanding.add(fut)
+        fut.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, fut: Future) -> None:
+        with self._lock:
+            self._outstanding.discard(fut)
+
+    def _send(self, items: List[BatchItem]) -> None:
+        """Execute one batch (sender thread) and resolve its futures."""
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight_seen = max(self._max_in_flight_seen, self._in_flight)
+        try:
             try:
                 responses = self._http_callable(items)
-                self._batches_sent += 1
-                self._requests_batched += len(items)
-                
-                # Dispatch responses
-                for item, response in zip(items, responses):
-                    try:
-                        item.callback(response)
-                    except Exception as e:
-                        logger.error(f"[batcher] Error in callback: {e}")
-                        
+                outcome: Optional[Exception] = None
             except Exception as e:
                 logger.error(f"[batcher] Batch execution failed: {e}")
+                responses, outcome = None, e
+
+            with self._lock:
+                # Later identical requests start a new round trip from here on.
+                for item in items:
+                    self._pending.pop(_coalesce_key(item), None)
+                if outcome is None:
+                    self._batches_sent += 1
+                    self._requests_batched += len(items)
+
+            if outcome is not None:
                 # Signal error to all futures
                 for item in items:
-                    item.callback(e)
-    
+                    item.callback(outcome)
+                return
+
+            # Dispatch responses
+            for item, response in zip(items, responses):
+                try:
+                    item.callback(response)
+                except Exception as e:
+                    logger.error(f"[batcher] Error in callback: {e}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
     def flush(self) -> None:
-        """Manually flush any pending requests."""
-        with self._lock:
-            if self._queue:
-                self._flush()
-    
+        """Send any pending requests and wait until every batch queued so far has completed."""
+        with self._cond:
+            self._seal_locked()
+            outstanding = list(self._outstanding)
+        if outstanding:
+            wait(outstanding)
+
+    def close(self) -> None:
+        """Flush, then stop the dispatcher and sender threads."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._senders is not None:
+            self._senders.shutdown(wait=True)
+
     def get_queue_size(self) -> int:
         """Get current queue size."""
         with self._lock:
             return len(self._queue)
-    
+
     def get_metrics(self) -> Dict[str, int]:
         """Get batcher metrics."""
-        return {
-            "batches_sent": self._batches_sent,
-            "requests_batched": self._requests_batched,
-            "pending_requests": len(self._queue),
-        }
-    
+        with self._lock:
+            return {
+                "batches_sent": self._batches_sent,
+                "requests_batched": self._requests_batched,
+                "requests_coalesced": self._requests_coalesced,
+                "pending_requests": len(self._queue),
+                "in_flight_batches": self._in_flight,
+                "max_in_flight_seen": self._max_in_flight_seen,
+            }
+
     def __del__(self):
-        """Cleanup timer on destruction."""
-        if self._timer is not None:
-            self._timer.cancel()
+        """Stop background threads on destruction."""
+        try:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            if self._senders is not None:
+                self._senders.shutdown(wait=False)
+        except Exception:
+            pass
@@ -1,59 +1,141 @@
 """
 ingestion/rpc/cache.py
 
-RpcCache — simple in-memory TTL cache for RPC responses.
+RpcCache — bounded in-memory LRU/TTL cache for RPC responses.
+
+Memory stays flat in long-running processes:
+- max_entries / max_bytes bounds with LRU eviction
+- expiry heap: expired entries are swept on every write (amortized) and,
+  optionally, by a background sweeper thread, not only when the key is read
+- per-method TTL classes (TTL_CLASSES / METHOD_TTL_CLASS) used by
+  SmartRpcClient._get_ttl_for_method
 """
+import heapq
 import logging
+import sys
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# TTL classes (seconds)
+TTL_CLASSES: Dict[str, float] = {
+    "immutable": 86400,  # mint decimals/authority, finalized transactions
+    "block": 1,          # balances and other per-block state
+    "price": 2,          # prices
+}
+
+# RPC method -> TTL class. Methods not listed use the cache default TTL.
+METHOD_TTL_CLASS: Dict[str, str] = {
+    "getMint": "immutable",
+    "getAccountInfo": "immutable",
+    "getTransaction": "immutable",
+    "getBalance": "block",
+    "getTokenAccountBalance": "block",
+    "getPrice": "price",
+}
+
+# Sweep at most this many expired heap entries per write (keeps set() O(log n) amortized).
+_SWEEP_BATCH = 64
+
+
+def ttl_for_method(method: str, default: float) -> float:
+    """TTL for an RPC method via its TTL class, or `default` if unclassified."""
+    cls = METHOD_TTL_CLASS.get(method)
+    if cls is None:
+        return default
+    return TTL_CLASSES[cls]
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Approximate deep size in bytes of a JSON-like RPC response."""
+    size = sys.getsizeof(value)
+    if _depth > 8:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            size += approx_size(v, _depth + 1)
+    return size
+
 
 @dataclass
 class CacheEntry:
     """Represents a cached value with TTL."""
     value: Any
     expires_at: float  # Unix timestamp
+    size: int = 0
 
 
 class RpcCache:
     """
-    Simple in-memory TTL cache for RPC responses.
-    
+    Bounded in-memory LRU/TTL cache for RPC responses.
+
     Features:
     - Thread-safe operations
-    - TTL-based expiration
+    - TTL-based expiration (expiry heap + sweeping, optional background sweeper)
+    - LRU eviction by max_entries and max_bytes
     - No external dependencies (no Redis)
-    
+
     PR-T.1
     """
-    
-    def __init__(self, default_ttl: int = 300):
+
+    def __init__(
+        self,
+        default_ttl: float = 300,
+        max_entries: Optional[int] = 100_000,
+        max_bytes: Optional[int] = None,
+        sweep_interval_sec: Optional[float] = None,
+        size_fn: Optional[Callable[[Any], int]] = None,
+    ):
         """
         Initialize RpcCache.
-        
+
         Args:
             default_ttl: Default TTL for cache entries (seconds)
+            max_entries: Max live entries (None = unbounded)
+            max_bytes: Max approximate bytes of cached values (None = not tracked)
+            sweep_interval_sec: Start a background sweeper with this period (None = no thread)
+            size_fn: Value size estimator used with max_bytes (default: approx_size)
         """
         self._default_ttl = default_ttl
-        self._cache: Dict[str, CacheEntry] = {}
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._size_fn = size_fn or approx_size
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._bytes = 0
         self._lock = threading.RLock()
-        
+
         # Metrics
         self._hits = 0
         self._misses = 0
         self._evictions = 0
-    
+        self._expired = 0
+        self._evicted_lru = 0
+
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval_sec:
+            self.start_sweeper(sweep_interval_sec)
+
+    @property
+    def default_ttl(self) -> float:
+        return self._default_ttl
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get a value from cache.
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value or None if not found/expired
         """
@@ -62,77 +144,106 @@ class RpcCache:
             if entry is None:
                 self._misses += 1
                 return None
-            
+
             # Check if expired
             if time.time() > entry.expires_at:
-                del self._cache[key]
+                self._remove(key)
+                self._expired += 1
                 self._evictions += 1
                 self._misses += 1
                 return None
-            
+
+            self._cache.move_to_end(key)
             self._hits += 1
             return entry.value
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
         """
         Set a value in cache.
-        
+
         Args:
             key: Cache key
             value: Value to cache
             ttl: TTL in seconds (uses default if not provided)
         """
         effective_ttl = ttl if ttl is not None else self._default_ttl
-        
+        now = time.time()
+        expires_at = now + effective_ttl
+        size = self._size_fn(value) if self._max_bytes is not None else 0
+
         with self._lock:
-            self._cache[key] = CacheEntry(
-                value=value,
-                expires_at=time.time() + effective_ttl,
-            )
-    
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = CacheEntry(value=value, expires_at=expires_at, size=size)
+            self._bytes += size
+            self._seq += 1
+            heapq.heappush(self._expiry_heap, (expires_at, self._seq, key))
+
+            self._sweep_locked(now, _SWEEP_BATCH)
+            self._enforce_bounds_locked()
+            # Overwritten keys leave stale heap items behind; rebuild when they dominate.
+            if len(self._expiry_heap) > 2 * len(self._cache) + 1024:
+                self._rebuild_heap_locked()
+
     def delete(self, key: str) -> bool:
         """
         Delete a key from cache.
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             True if key was deleted, False if not found
         """
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
                 return True
             return False
-    
+
     def clear(self) -> None:
         """Clear all cached values."""
         with self._lock:
             self._cache.clear()
-    
+            self._expiry_heap.clear()
+            self._bytes = 0
+
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries.
-        
+
         Returns:
             Number of entries removed
         """
-        now = time.time()
-        to_remove = []
-        
         with self._lock:
-            for key, entry in self._cache.items():
-                if now > entry.expires_at:
-                    to_remove.append(key)
-            
-            for key in to_remove:
-                del self._cache[key]
-        
-        self._evictions += len(to_remove)
-        return len(to_remove)
-    
-    def get_metrics(self) -> Dict[str, int]:
+            return self._sweep_locked(time.time(), None)
+
+    def start_sweeper(self, interval_sec: float) -> None:
+        """Start a daemon thread calling cleanup_expired() every interval_sec."""
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+
+        def _run() -> None:
+            while not self._stop.wait(interval_sec):
+                try:
+                    removed = self.cleanup_expired()
+                    if removed:
+                        logger.debug(f"[rpc_cache] swept {removed} expired entries")
+                except Exception as e:  # pragma: no cover
+                    logger.warning(f"[rpc_cache] sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=_run, name="rpc-cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper (if running)."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5.0)
+            self._sweeper = None
+
+    def get_metrics(self) -> Dict[str, Any]:
         """Get cache metrics."""
         with self._lock:
             total = self._hits + self._misses
@@ -140,19 +251,61 @@ class RpcCache:
                 "hits": self._hits,
                 "misses": self._misses,
                 "evictions": self._evictions,
+                "expired": self._expired,
+                "evicted_lru": self._evicted_lru,
                 "size": len(self._cache),
+                "bytes": self._bytes,
                 "hit_rate": self._hits / total if total > 0 else 0.0,
             }
-    
+
     def get_size(self) -> int:
         """Get current cache size."""
         with self._lock:
             return len(self._cache)
-    
+
     def __contains__(self, key: str) -> bool:
         """Check if key exists (and is not expired)."""
         return self.get(key) is not None
-    
+
     def __len__(self) -> int:
         """Get cache size."""
         return self.get_size()
+
+    # Internals (caller holds self._lock)
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+
+    def _sweep_locked(self, now: float, limit: Optional[int]) -> int:
+        """Pop expired heap heads; returns number of live entries removed."""
+        heap = self._expiry_heap
+        removed = 0
+        popped = 0
+        while heap and heap[0][0] < now and (limit is None or popped < limit):
+            expires_at, _, key = heapq.heappop(heap)
+            popped += 1
+            entry = self._cache.get(key)
+            # Skip stale heap items (key overwritten or already removed).
+            if entry is None or entry.expires_at != expires_at:
+                continue
+            self._remove(key)
+            removed += 1
+        self._expired += removed
+        self._evictions += removed
+        return removed
+
+    def _enforce_bounds_locked(self) -> None:
+        while self._cache and (
+            (self._max_entries is not None and len(self._cache) > self._max_entries)
+            or (self._max_bytes is not None and self._bytes > self._max_bytes and len(self._cache) > 1)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self._evicted_lru += 1
+            self._evictions += 1
+
+    def _rebuild_heap_locked(self) -> None:
+        self._expiry_heap = [(e.expires_at, i, k) for i, (k, e) in enumerate(self._cache.items())]
+        heapq.heapify(self._expiry_heap)
+        self._seq = len(self._expiry_heap)
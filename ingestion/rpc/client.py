@@ -8,7 +8,7 @@ from typing import Any, Callable, Dict, List, Optional
 import time
 
 from .batcher import RpcBatcher, BatchItem, BatchFuture
-from .cache import RpcCache
+from .cache import TTL_CLASSES, RpcCache, ttl_for_method
 from .failover import FailoverManager
 
 logger = logging.getLogger(__name__)
@@ -27,10 +27,10 @@ class SmartRpcClient:
     PR-T.1, PR-T.2
     """
     
-    # Cache TTL policies (seconds)
-    TTL_MINT_INFO = 86400       # 24 hours for mint decimals, authority
-    TTL_BALANCE = 1             # 1 second (per-block) for balances
-    TTL_PRICE = 2               # 2 seconds for prices
+    # Cache TTL policies (seconds); per-method classes live in cache.METHOD_TTL_CLASS
+    TTL_MINT_INFO = TTL_CLASSES["immutable"]  # 24 hours for mint decimals, authority
+    TTL_BALANCE = TTL_CLASSES["block"]        # 1 second (per-block) for balances
+    TTL_PRICE = TTL_CLASSES["price"]          # 2 seconds for prices
     
     # Batch configuration
     MAX_BATCH_SIZE = 100        # Per Solana JSON RPC spec
@@ -43,6 +43,10 @@ class SmartRpcClient:
         max_retries: int = 5,
         initial_delay_ms: float = 100.0,
         failover_manager: Optional[FailoverManager] = None,
+        cache_max_entries: Optional[int] = 100_000,
+        cache_max_bytes: Optional[int] = None,
+        cache_sweep_interval_sec: Optional[float] = None,
+        max_in_flight_batches: int = 4,
     ):
         """
         Initialize SmartRpcClient.
@@ -54,13 +58,23 @@ class SmartRpcClient:
             max_retries: Max retries for 429 errors
             initial_delay_ms: Initial delay for exponential backoff (ms)
             failover_manager: Optional FailoverManager instance
+            cache_max_entries: Max cached responses (LRU eviction beyond it)
+            cache_max_bytes: Max approximate bytes of cached responses
+            cache_sweep_interval_sec: Background expiry sweep period (None = sweep on writes only)
+            max_in_flight_batches: Batches sent concurrently by the batcher
         """
         self._http_callable = http_callable
-        self._cache = RpcCache(default_ttl=cache_ttl)
+        self._cache = RpcCache(
+            default_ttl=cache_ttl,
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes,
+            sweep_interval_sec=cache_sweep_interval_sec,
+        )
         self._batcher = RpcBatcher(
             max_batch_size=self.MAX_BATCH_SIZE,
             batch_delay_ms=batch_delay_ms,
             http_callable=self._execute_batch if http_callable else None,
+            max_in_flight=max_in_flight_batches,
         )
         self._max_retries = max_retries
         self._initial_delay_ms = initial_delay_ms
@@ -156,15 +170,9 @@ class SmartRpcClient:
         # All endpoints failed
         raise last_error if last_error else RuntimeError("All endpoints failed")
     
-    def _get_ttl_for_method(self, method: str) -> int:
-        """Get TTL based on RPC method."""
-        if method in ("getMint", "getAccountInfo"):  # Mint info (decimals, authority)
-            return self.TTL_MINT_INFO
-        elif method == "getBalance":
-            return self.TTL_BALANCE
-        elif method == "getPrice":
-            return self.TTL_PRICE
-        return self._cache.default_ttl
+    def _get_ttl_for_method(self, method: str) -> float:
+        """Get TTL based on the RPC method's TTL class."""
+        return ttl_for_method(method, default=self._cache.default_ttl)
     
     def request(
         self,
@@ -299,6 +307,7 @@ class SmartRpcClient:
                 else 0.0
             ),
             "failover_count": self._failover_count,
+            "cache": self._cache.get_metrics(),
         }
     
     def clear_cache(self) -> None:
@@ -14,12 +14,17 @@ from typing import Optional
 
 import aiohttp
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
+
 # Configuration
 SOLANAFM_BASE_URL = "https://public-api.solanafm.com"
 SOLANAFM_RATE_LIMIT_DELAY = 1.05  # seconds
 SOLANAFM_CACHE_TTL = 3600  # 1 hour
 SOLANAFM_TIMEOUT = 10.0  # seconds
 
+# EnrichmentCache source name (shared process-wide cache by default)
+CACHE_SOURCE = "deployer_reputation"
+
 
 @dataclass
 class DeployerReputation:
@@ -31,8 +36,6 @@ class DeployerReputation:
     last_updated: int
 
 
-# Global cache
-_deployer_cache: dict[str, tuple[float, DeployerReputation]] = {}
 _last_request_time = 0.0
 _cache_lock = asyncio.Lock()
 
@@ -52,10 +55,12 @@ class DeployerReputationCache:
         cache_dir: Optional[Path] = None,
         api_key: Optional[str] = None,
         timeout: float = SOLANAFM_TIMEOUT,
+        cache: Optional[EnrichmentCache] = None,
     ):
-        self.cache_dir = cache_dir or Path("data/cache")
+        self.cache_dir = cache_dir  # Kept for compatibility; persistence is the EnrichmentCache disk tier
         self.api_key = api_key
         self.timeout = timeout
+        self.cache = cache or get_enrichment_cache()
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _get_session(self) -> aiohttp.ClientSession:
@@ -80,62 +85,6 @@ class DeployerReputationCache:
                 await asyncio.sleep(SOLANAFM_RATE_LIMIT_DELAY - elapsed)
             _last_request_time = time.monotonic()
     
-    def _get_cached(self, address: str) -> Optional[DeployerReputation]:
-        """Get cached reputation if valid."""
-        global _deployer_cache
-        cached = _deployer_cache.get(address)
-        if cached:
-            data, cached_at = cached
-            if time.monotonic() - cached_at < SOLANAFM_CACHE_TTL:
-                return data
-            del _deployer_cache[address]
-        return None
-    
-    def _set_cached(self, address: str, data: DeployerReputation) -> None:
-        """Cache reputation data."""
-        global _deployer_cache
-        _deployer_cache[address] = (data, time.monotonic())
-    
-    def _load_from_disk(self, address: str) -> Optional[DeployerReputation]:
-        """Load from disk cache."""
-        if not self.cache_dir.exists():
-            return None
-        
-        cache_file = self.cache_dir / f"deployer_reputation.json"
-        if not cache_file.exists():
-            return None
-        
-        try:
-            data = json.loads(cache_file.read_text())
-            if address in data:
-                entry = data[address]
-                return DeployerReputation(
-                    address=address,
-                    total_tokens=entry.get("total_tokens", 0),
-                    successful_tokens=entry.get("successful_tokens", 0),
-                    score=entry.get("score", 0.0),
-                    last_updated=entry.get("last_updated", 0),
-                )
-        except Exception as e:
-            print(f"[deployer_reputation] Failed to load cache: {e}")
-        return None
-    
-    def _save_to_disk(self, reputations: dict[str, DeployerReputation]) -> None:
-        """Save reputations to disk cache."""
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_file = self.cache_dir / f"deployer_reputation.json"
-        
-        data = {}
-        for addr, rep in reputations.items():
-            data[addr] = {
-                "total_tokens": rep.total_tokens,
-                "successful_tokens": rep.successful_tokens,
-                "score": rep.score,
-                "last_updated": rep.last_updated,
-            }
-        
-        cache_file.write_text(json.dumps(data, indent=2))
-    
     async def get_reputation(
         self,
         address: str,
@@ -151,18 +100,19 @@ class DeployerReputationCache:
         Returns:
             DeployerReputation with score in [-1.0, +1.0]
         """
-        # Check memory cache
-        cached = self._get_cached(address)
-        if cached:
-            return cached
-        
-        # Check disk cache
-        disk_cache = self._load_from_disk(address)
-        if disk_cache:
-            self._set_cached(address, disk_cache)
-            return disk_cache
-        
-        if not allow_external:
+        if allow_external:
+            # Memory / persistent cache; concurrent fetches share one API call.
+            # Neutral fallbacks (None on API error) are not cached.
+            reputation = await self.cache.aget_or_load(
+                CACHE_SOURCE,
+                address,
+                lambda: self._fetch_reputation(address),
+                ttl_sec=SOLANAFM_CACHE_TTL,
+            )
+        else:
+            # Cache only: never joins (or starts) an external fetch
+            reputation = self.cache.get(CACHE_SOURCE, address)
+        if reputation is None:
             # Return neutral reputation
             return DeployerReputation(
                 address=address,
@@ -171,8 +121,10 @@ class DeployerReputationCache:
                 score=0.0,
                 last_updated=0,
             )
-        
-        # Fetch from API
+        return reputation
+    
+    async def _fetch_reputation(self, address: str) -> Optional[DeployerReputation]:
+        """Fetch and score deployer history from the API (None on API error)."""
         session = await self._get_session()
         url = f"{SOLANAFM_BASE_URL}/v1/accounts/{address}/tokens"
         
@@ -182,9 +134,7 @@ class DeployerReputationCache:
             async with session.get(url) as resp:
                 if resp.status != 200:
                     print(f"[deployer_reputation] API error {resp.status}")
-                    return DeployerReputation(
-                        address=address, total_tokens=0, successful_tokens=0, score=0.0, last_updated=0
-                    )
+                    return None
                 
                 data = await resp.json()
             
@@ -196,7 +146,7 @@ class DeployerReputationCache:
             score = (2 * successful / max(1, total)) - 1.0 if total > 0 else 0.0
             score = max(-1.0, min(1.0, score))
             
-            reputation = DeployerReputation(
+            return DeployerReputation(
                 address=address,
                 total_tokens=total,
                 successful_tokens=successful,
@@ -204,14 +154,9 @@ class DeployerReputationCache:
                 last_updated=int(time.time()),
             )
             
-            self._set_cached(address, reputation)
-            return reputation
-            
         except Exception as e:
             print(f"[deployer_reputation] Error fetching {address}: {e}")
-            return DeployerReputation(
-                address=address, total_tokens=0, successful_tokens=0, score=0.0, last_updated=0
-            )
+            return None
     
     def _is_successful_token(self, token_data: dict) -> bool:
         """Check if token is considered successful."""
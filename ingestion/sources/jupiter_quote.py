@@ -20,12 +20,13 @@ import json
 import sys
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 import requests
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
+
 # Constants
 JUPITER_API_BASE = "https://quote-api.jup.ag/v6/quote"
 SOL_MINT = "So11111111111111111111111111111111111111112"
@@ -33,6 +34,9 @@ DEFAULT_SLIPPAGE_BPS = 50
 CACHE_TTL_SECONDS = 10
 REQUEST_DELAY_SECONDS = 0.35
 
+# EnrichmentCache source name
+CACHE_SOURCE = "jupiter_quote"
+
 
 @dataclass
 class SwapInfo:
@@ -130,54 +134,29 @@ class JupiterRoute:
         )
 
 
-class CacheEntry:
-    """Cache entry with TTL tracking."""
-    
-    def __init__(self, route: JupiterRoute, timestamp: datetime):
-        self.route = route
-        self.timestamp = timestamp
-    
-    def is_valid(self) -> bool:
-        """Check if cache entry is still valid."""
-        return datetime.now() - self.timestamp < timedelta(seconds=CACHE_TTL_SECONDS)
-
-
 class JupiterQuoteFetcher:
     """
     Fetches Jupiter route quotes from API or fixtures.
     
     Features:
     - Deterministic fixture mode for testing
-    - In-memory caching (10 second TTL)
+    - EnrichmentCache (10 second TTL, concurrent requests for one quote share a call)
     - Graceful degradation on API errors
     - Rate limiting for free-tier compliance
     """
     
-    def __init__(self, cache_ttl: int = CACHE_TTL_SECONDS):
-        self.cache: Dict[Tuple[str, str, str], CacheEntry] = {}
+    def __init__(self, cache_ttl: int = CACHE_TTL_SECONDS, cache: Optional[EnrichmentCache] = None):
+        self.cache = cache or get_enrichment_cache()
         self.cache_ttl = cache_ttl
         self._session = requests.Session()
     
-    def _make_cache_key(self, in_mint: str, out_mint: str, in_amount: str) -> Tuple[str, str, str]:
+    def _make_cache_key(self, in_mint: str, out_mint: str, in_amount: str) -> str:
         """Create cache key from quote parameters."""
-        return (in_mint, out_mint, in_amount)
-    
-    def _get_cached(self, in_mint: str, out_mint: str, in_amount: str) -> Optional[JupiterRoute]:
-        """Retrieve cached quote if valid."""
-        key = self._make_cache_key(in_mint, out_mint, in_amount)
-        entry = self.cache.get(key)
-        if entry and entry.is_valid():
-            return entry.route
-        return None
-    
-    def _set_cached(self, in_mint: str, out_mint: str, in_amount: str, route: JupiterRoute) -> None:
-        """Cache a successful quote."""
-        key = self._make_cache_key(in_mint, out_mint, in_amount)
-        self.cache[key] = CacheEntry(route, datetime.now())
+        return f"{in_mint}:{out_mint}:{in_amount}"
     
     def _clear_cache(self) -> None:
         """Clear all cached entries."""
-        self.cache.clear()
+        self.cache.clear(CACHE_SOURCE)
     
     def normalize_quote(
         self,
@@ -303,12 +282,18 @@ class JupiterQuoteFetcher:
         if not allow_jupiter:
             return None
         
-        # Check cache first
+        # Cache first; failed requests (None) are not cached
         if use_cache:
-            cached = self._get_cached(in_mint, out_mint, in_amount)
-            if cached:
-                return cached
-        
+            return self.cache.get_or_load(
+                CACHE_SOURCE,
+                self._make_cache_key(in_mint, out_mint, in_amount),
+                lambda: self._request_quote(in_mint, out_mint, in_amount),
+                ttl_sec=self.cache_ttl,
+            )
+        return self._request_quote(in_mint, out_mint, in_amount)
+    
+    def _request_quote(self, in_mint: str, out_mint: str, in_amount: str) -> Optional[JupiterRoute]:
+        """Request and normalize one quote from the Jupiter API (None on failure)."""
         # Build API URL
         params = {
             "inputMint": in_mint,
@@ -327,13 +312,7 @@ class JupiterQuoteFetcher:
             raw = response.json()
             
             # Normalize response
-            route = self.normalize_quote(raw, in_mint, out_mint, in_amount)
-            
-            # Cache successful result
-            if use_cache:
-                self._set_cached(in_mint, out_mint, in_amount, route)
-            
-            return route
+            return self.normalize_quote(raw, in_mint, out_mint, in_amount)
             
         except requests.exceptions.Timeout:
             print(f"[jupiter_quote] WARNING: API timeout for {in_mint} -> {out_mint}", file=sys.stderr)
@@ -15,12 +15,17 @@ from typing import Optional
 
 import aiohttp
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
+
 # Configuration
 PUMPFUN_API_URL = "https://frontend-api.pump.fun"
 PUMPFUN_RATE_LIMIT_DELAY = 1.05  # seconds
 PUMPFUN_CACHE_TTL = 3600  # 1 hour
 PUMPFUN_TIMEOUT = 10.0  # seconds
 
+# EnrichmentCache source name (shared process-wide cache by default)
+CACHE_SOURCE = "pumpfun"
+
 
 @dataclass
 class PumpFunCoinData:
@@ -35,8 +40,6 @@ class PumpFunCoinData:
     total_supply: Optional[float] = None
 
 
-# Global cache
-_pumpfun_cache: dict[str, tuple[float, PumpFunCoinData]] = {}
 _last_request_time = 0.0
 _cache_lock = asyncio.Lock()
 
@@ -47,7 +50,7 @@ class PumpFunDetector:
     
     Features:
     - Rate limiting (1 req/sec)
-    - In-memory caching (1 hour TTL)
+    - Shared EnrichmentCache (1 hour TTL, single-flight, stale-while-revalidate)
     - Graceful degradation on API errors
     """
     
@@ -55,9 +58,11 @@ class PumpFunDetector:
         self,
         cache_dir: Optional[Path] = None,
         timeout: float = PUMPFUN_TIMEOUT,
+        cache: Optional[EnrichmentCache] = None,
     ):
         self.cache_dir = cache_dir
         self.timeout = timeout
+        self.cache = cache or get_enrichment_cache()
         self._session: Optional[aiohttp.ClientSession] = None
     
     async def _get_session(self) -> aiohttp.ClientSession:
@@ -78,33 +83,19 @@ class PumpFunDetector:
                 await asyncio.sleep(PUMPFUN_RATE_LIMIT_DELAY - elapsed)
             _last_request_time = time.monotonic()
     
-    def _get_cached(self, mint: str) -> Optional[PumpFunCoinData]:
-        """Get cached data if valid."""
-        global _pumpfun_cache
-        cached = _pumpfun_cache.get(mint)
-        if cached:
-            data, cached_at = cached
-            if time.monotonic() - cached_at < PUMPFUN_CACHE_TTL:
-                return data
-            del _pumpfun_cache[mint]
-        return None
-    
-    def _set_cached(self, mint: str, data: PumpFunCoinData) -> None:
-        """Cache data."""
-        global _pumpfun_cache
-        _pumpfun_cache[mint] = (data, time.monotonic())
-    
     async def get_coin_data(self, mint: str) -> Optional[PumpFunCoinData]:
         """
         Get Pump.fun coin data by mint address.
         
-        Returns None if not found or API error.
+        Returns None if not found or API error (not cached).
+        Concurrent calls for the same mint share one request.
         """
-        # Check cache
-        cached = self._get_cached(mint)
-        if cached:
-            return cached
-        
+        return await self.cache.aget_or_load(
+            CACHE_SOURCE, mint, lambda: self._fetch_coin_data(mint), ttl_sec=PUMPFUN_CACHE_TTL
+        )
+    
+    async def _fetch_coin_data(self, mint: str) -> Optional[PumpFunCoinData]:
+        """Fetch coin data from the API (None if not found or API error)."""
         # Fetch from API
         session = await self._get_session()
         url = f"{PUMPFUN_API_URL}/coins/{mint}"
@@ -132,7 +123,6 @@ class PumpFunDetector:
                 total_supply=data.get("total_supply"),
             )
             
-            self._set_cached(mint, coin)
             return coin
             
         except asyncio.TimeoutError:
@@ -20,6 +20,7 @@ from pathlib import Path
 from typing import Optional
 
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
 from strategy.schemas.solanafm_enrichment_schema import (
     validate_solanafm_enrichment,
     SolanaFMEnrichment,
@@ -33,16 +34,9 @@ SOLANAFM_SUCCESS_TTL = 3600  # 1 hour
 SOLANAFM_ERROR_TTL = 300  # 5 minutes
 SOLANAFM_TIMEOUT = 10.0  # seconds
 
+# EnrichmentCache source name (shared process-wide cache by default)
+CACHE_SOURCE = "solanafm"
 
-@dataclass
-class CachedEnrichment:
-    """Wrapper for cached enrichment data with timestamp."""
-    data: SolanaFMEnrichment
-    cached_at: float
-
-
-# Global cache - in production, use Redis
-_enrichment_cache: dict[str, CachedEnrichment] = {}
 _last_request_time = 0.0
 _cache_lock = asyncio.Lock()
 
@@ -54,7 +48,7 @@ class SolanaFMEnricher:
     
     Features:
     - Rate limiting (1 req/sec)
-    - In-memory caching with TTL
+    - Shared EnrichmentCache (TTL, single-flight, stale-while-revalidate)
     - Graceful degradation on API errors
     - Optional fixture mode for testing
     """
@@ -64,9 +58,12 @@ class SolanaFMEnricher:
     timeout: float = SOLANAFM_TIMEOUT
     use_fixtures: bool = False
     fixture_path: Optional[Path] = None
+    cache: Optional[EnrichmentCache] = None
     
     def __post_init__(self):
         """Initialize session and load fixtures if needed."""
+        if self.cache is None:
+            self.cache = get_enrichment_cache()
         self._session = None
         self._fixtures: dict[str, SolanaFMEnrichment] = {}
         
@@ -107,22 +104,9 @@ class SolanaFMEnricher:
                 await asyncio.sleep(SOLANAFM_RATE_LIMIT_DELAY - elapsed)
             _last_request_time = time.monotonic()
     
-    def _get_cached(self, mint: str) -> Optional[SolanaFMEnrichment]:
-        """Get cached enrichment if valid."""
-        global _enrichment_cache
-        cached = _enrichment_cache.get(mint)
-        if cached:
-            now = time.monotonic()
-            ttl = SOLANAFM_SUCCESS_TTL if cached.data.is_verified else SOLANAFM_ERROR_TTL
-            if now - cached.cached_at < ttl:
-                return cached.data
-            del _enrichment_cache[mint]
-        return None
-    
-    def _set_cached(self, mint: str, data: SolanaFMEnrichment) -> None:
-        """Cache enrichment data."""
-        global _enrichment_cache
-        _enrichment_cache[mint] = CachedEnrichment(data=data, cached_at=time.monotonic())
+    @staticmethod
+    def _ttl_for(data: SolanaFMEnrichment) -> float:
+        return SOLANAFM_SUCCESS_TTL if data.is_verified else SOLANAFM_ERROR_TTL
     
     async def _fetch_from_api(self, mint: str) -> Optional[SolanaFMEnrichment]:
         """Fetch enrichment data from SolanaFM API."""
@@ -216,17 +200,17 @@ class SolanaFMEnricher:
         
         Returns cached data if available, otherwise fetches from API
         or fixture. Falls back to minimal enrichment on failure.
+        Concurrent calls for the same mint share one fetch.
         """
-        # Check cache first
-        cached = self._get_cached(mint)
-        if cached:
-            return cached
-        
+        return await self.cache.aget_or_load(
+            CACHE_SOURCE, mint, lambda: self._load_enrichment(mint), ttl_sec=self._ttl_for
+        )
+    
+    async def _load_enrichment(self, mint: str) -> SolanaFMEnrichment:
+        """Fixture or API enrichment, falling back to a minimal one (never None)."""
         # Return fixture if in fixture mode
         if self.use_fixtures and mint in self._fixtures:
-            fixture = self._fixtures[mint]
-            self._set_cached(mint, fixture)
-            return fixture
+            return self._fixtures[mint]
         
         # Fetch from API
         result = await self._fetch_from_api(mint)
@@ -244,9 +228,6 @@ class SolanaFMEnricher:
                 enrichment_ts=int(time.time()),
                 source="fallback"
             )
-        
-        # Cache the result
-        self._set_cached(mint, result)
         return result
     
     async def get_enrichments_batch(self, mints: list[str]) -> dict[str, SolanaFMEnrichment]:
@@ -1,7 +1,7 @@
 """Token State Provider with caching and adapter orchestration.
 
 Provides a unified interface for fetching token state data with:
-- In-memory caching with TTL support
+- EnrichmentCache caching with TTL support (concurrent misses share one fetch)
 - Primary/Secondary adapter orchestration
 - Rate limit protection via adapter's min_interval_sec
 """
@@ -9,9 +9,10 @@ Provides a unified interface for fetching token state data with:
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional
 
 from integration.token_snapshot_store import TokenSnapshot
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
 from .adapters import BaseAdapter, DexScreenerAdapter, JupiterAdapter
 
 
@@ -23,12 +24,14 @@ class TokenStateProvider:
     """
 
     DEFAULT_TTL_SEC: float = 30.0
+    CACHE_SOURCE: str = "token_state"
 
     def __init__(
         self,
         primary_adapter: Optional[JupiterAdapter] = None,
         secondary_adapter: Optional[DexScreenerAdapter] = None,
         ttl_sec: float = DEFAULT_TTL_SEC,
+        cache: Optional[EnrichmentCache] = None,
     ) -> None:
         """Initialize the token state provider.
 
@@ -38,11 +41,14 @@ class TokenStateProvider:
             secondary_adapter: Optional secondary adapter for enrichment.
                 When provided, fetched data will be merged with primary data.
             ttl_sec: Cache TTL in seconds. Defaults to 30 seconds.
+            cache: EnrichmentCache to use. Defaults to the process-wide
+                cache; pass a separate one to isolate providers with
+                different adapters.
         """
         self._primary_adapter = primary_adapter or JupiterAdapter()
         self._secondary_adapter = secondary_adapter
         self._ttl_sec = ttl_sec
-        self._cache: Dict[str, Tuple[float, TokenSnapshot]] = {}
+        self._cache = cache or get_enrichment_cache()
 
     def get_snapshot(self, mint: str) -> Optional[TokenSnapshot]:
         """Fetch token snapshot for the given mint address.
@@ -60,15 +66,12 @@ class TokenStateProvider:
         Returns:
             TokenSnapshot with available data, or None if fetch fails.
         """
-        # Check cache first
-        cached = self._cache.get(mint)
-        if cached is not None:
-            expire_ts, snapshot = cached
-            if time.time() < expire_ts:
-                return snapshot
-            # Cache expired, remove entry
-            del self._cache[mint]
+        return self._cache.get_or_load(
+            self.CACHE_SOURCE, mint, lambda: self._fetch_snapshot(mint), ttl_sec=self._ttl_sec
+        )
 
+    def _fetch_snapshot(self, mint: str) -> TokenSnapshot:
+        """Fetch from the adapters and merge into a TokenSnapshot."""
         # Fetch from primary adapter
         try:
             primary_data = self._primary_adapter.fetch(mint)
@@ -88,13 +91,7 @@ class TokenStateProvider:
         merged_data = {**primary_data, **secondary_data}
 
         # Build TokenSnapshot from merged data
-        snapshot = self._build_snapshot(mint, merged_data)
-
-        # Update cache
-        expire_ts = time.time() + self._ttl_sec
-        self._cache[mint] = (expire_ts, snapshot)
-
-        return snapshot
+        return self._build_snapshot(mint, merged_data)
 
     def _build_snapshot(self, mint: str, data: Dict[str, Any]) -> TokenSnapshot:
         """Build TokenSnapshot from adapter response data.
@@ -141,19 +138,16 @@ class TokenStateProvider:
         Returns:
             True if an entry was removed, False if no cached entry existed.
         """
-        if mint in self._cache:
-            del self._cache[mint]
-            return True
-        return False
+        return self._cache.invalidate(self.CACHE_SOURCE, mint)
 
     def clear_cache(self) -> None:
         """Clear all cached snapshots."""
-        self._cache.clear()
+        self._cache.clear(self.CACHE_SOURCE)
 
     @property
     def cache_size(self) -> int:
         """Return the number of cached entries."""
-        return len(self._cache)
+        return self._cache.size(self.CACHE_SOURCE)
 
     def get_primary_adapter(self) -> BaseAdapter:
         """Return the primary adapter instance."""
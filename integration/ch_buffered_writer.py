@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""integration/ch_buffered_writer.py
+
+Buffered, batched ClickHouse writer for the paper pipeline hot loop.
+
+Why:
+- insert_signal / insert_wallet_score / insert_trade_reject each build a fresh runner,
+  re-read the allowlist and do one HTTP round-trip per row. In live paper runs those
+  round-trips dominate per-trade latency.
+
+What it does:
+- One queue per (table, column layout): signals_raw rows, forensics_events trade_reject rows
+  and forensics_events wallet_score rows never mix in one insert (JSONEachRow needs identical
+  columns per request).
+- A queue is flushed as ONE multi-row JSONEachRow insert when it reaches max_rows, or when its
+  oldest row is older than max_age_sec (background flusher thread).
+- close() drains every queue (call it on shutdown, e.g. in a finally block).
+- insert_json_each_row(table, rows) has the runner signature, so the writer can be passed
+  wherever a runner is only used for inserts (insert_trade_reject, risk_stage, insert_signal).
+- Backpressure: when more than max_pending_rows rows are buffered (ClickHouse slower than the
+  producer), add() flushes inline on the caller thread; waits and time spent are reported in
+  stats().
+
+Failed inserts keep their rows at the head of the queue and are retried on the next flush
+(the runner already retries transient HTTP errors); close() raises if rows are still pending.
+
+This module does not change CANON schemas; rows are built by the existing write_* helpers.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QueueKey = Tuple[str, Tuple[str, ...]]
+
+
+class BufferedClickHouseWriter:
+    """Per-table row buffers flushed by row count or age as multi-row inserts."""
+
+    def __init__(
+        self,
+        runner: Any,
+        max_rows: int = 500,
+        max_age_sec: float = 1.0,
+        max_pending_rows: int = 50_000,
+        background: bool = True,
+    ):
+        """
+        Args:
+            runner: object with insert_json_each_row(table, rows) (gmee ClickHouseQueryRunner)
+            max_rows: flush a queue once it holds this many rows
+            max_age_sec: flush a queue once its oldest row is this old (background thread)
+            max_pending_rows: total buffered rows above which add() flushes inline
+            background: start the age-based flusher thread
+        """
+        if max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+        self._runner = runner
+        self._max_rows = int(max_rows)
+        self._max_age_sec = float(max_age_sec)
+        self._max_pending_rows = int(max_pending_rows)
+
+        self._queues: Dict[QueueKey, List[Mapping[str, Any]]] = {}
+        self._oldest: Dict[QueueKey, float] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Serializes inserts so a queue's batches reach ClickHouse in order.
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        # Metrics
+        self._rows_written = 0
+        self._inserts = 0
+        self._flush_errors = 0
+        self._backpressure_events = 0
+        self._backpressure_sec = 0.0
+        self._rows_by_table: Dict[str, int] = {}
+        self._last_error: Optional[str] = None
+
+        self._thread: Optional[threading.Thread] = None
+        if background and self._max_age_sec > 0:
+            self._thread = threading.Thread(target=self._run, name="ch-buffered-writer", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+    def add(self, table: str, row: Mapping[str, Any]) -> None:
+        """Buffer one row for `table`. May flush inline (batch full or backpressure)."""
+        if self._closed:
+            raise RuntimeError("BufferedClickHouseWriter is closed")
+        key: QueueKey = (table, tuple(row.keys()))
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = self._queues[key] = []
+            if not q:
+                self._oldest[key] = time.monotonic()
+            q.append(row)
+            self._pending += 1
+            full = len(q) >= self._max_rows
+            over = self._pending > self._max_pending_rows
+
+        if full:
+            self._flush_key(key)
+        if over:
+            started = time.monotonic()
+            self._backpressure_events += 1
+            self.flush()
+            self._backpressure_sec += time.monotonic() - started
+
+    def insert_json_each_row(self, table: str, rows: List[Mapping[str, Any]]) -> None:
+        """Runner-compatible insert: buffer rows instead of sending them now."""
+        for row in rows:
+            self.add(table, row)
+
+    @property
+    def runner(self) -> Any:
+        """Underlying runner (for queries and writes that must not be delayed)."""
+        return self._runner
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def flush(self) -> None:
+        """Flush every non-empty queue now."""
+        with self._lock:
+            keys = [k for k, q in self._queues.items() if q]
+        for key in keys:
+            self._flush_key(key)
+
+    def close(self) -> None:
+        """Stop the background flusher and drain all queues.
+
+        Safe to call more than once. Raises RuntimeError if rows could not be written.
+        """
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(1.0, self._max_age_sec * 2))
+            self._thread = None
+        self.flush()
+        if self._pending:
+            raise RuntimeError(
+                f"ClickHouse buffered writer closed with {self._pending} unwritten rows: {self._last_error}"
+            )
+
+    def __enter__(self) -> "BufferedClickHouseWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+            queues = {f"{t}[{len(cols)}]": len(q) for (t, cols), q in self._queues.items() if q}
+        return {
+            "rows_pending": pending,
+            "rows_written": self._rows_written,
+            "rows_by_table": dict(self._rows_by_table),
+            "inserts": self._inserts,
+            "flush_errors": self._flush_errors,
+            "backpressure_events": self._backpressure_events,
+            "backpressure_sec": round(self._backpressure_sec, 6),
+            "queues": queues,
+            "last_error": self._last_error,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _flush_key(self, key: QueueKey) -> None:
+        with self._io_lock:
+            with self._lock:
+                rows = self._queues.get(key) or []
+                if not rows:
+                    return
+                self._queues[key] = []
+                self._oldest.pop(key, None)
+
+            table = key[0]
+            try:
+                self._runner.insert_json_each_row(table, rows)
+            except Exception as e:
+                self._flush_errors += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"[ch_writer] insert into {table} failed ({len(rows)} rows): {e}")
+                with self._lock:
+                    # Put the batch back in front of anything buffered meanwhile.
+                    self._queues[key] = rows + self._queues.get(key, [])
+                    self._oldest[key] = self._oldest.get(key, time.monotonic())
+                return
+
+            with self._lock:
+                self._pending -= len(rows)
+            self._inserts += 1
+            self._rows_written += len(rows)
+            self._rows_by_table[table] = self._rows_by_table.get(table, 0) + len(rows)
+
+    def _run(self) -> None:
+        tick = max(0.01, self._max_age_sec / 2.0)
+        while not self._closed:
+            self._wake.wait(timeout=tick)
+            if self._closed:
+                return
+            now = time.monotonic()
+            with self._lock:
+                due = [k for k, t0 in self._oldest.items() if now - t0 >= self._max_age_sec]
+            for key in due:
+                self._flush_key(key)
@@ -41,4 +41,7 @@ class ClickHouseConfig:
 
 
 def make_runner(cfg: ClickHouseConfig) -> ClickHouseQueryRunner:
-    return ClickHouseQueryRunner(base_url=cfg.url, user=cfg.user, password=cfg.password)
+    """Runner with pooled keep-alive connections and HTTP compression (integration/ch_pooled_runner.py)."""
+    from integration.ch_pooled_runner import PooledClickHouseQueryRunner
+
+    return PooledClickHouseQueryRunner.from_url(cfg.url, user=cfg.user, password=cfg.password)
@@ -0,0 +1,273 @@
+"""integration/columnar_replay.py
+
+Columnar Parquet replay for paper_pipeline (--columnar).
+
+The row replay path builds one dict per Parquet row, normalizes it into a frozen Trade and
+runs apply_gates() per trade. On full-history replays most rows die in the token gates
+(liquidity / volume / spread), so the per-row object churn is pure overhead.
+
+This module evaluates each ColumnBatch (integration.parquet_io) with NumPy instead:
+  1) normalization validation (required columns, side, ts, price > 0, size_usd > 0)
+  2) snapshot join: inline snapshot fields or TokenSnapshotStore lookup per unique mint
+  3) token gates from cfg["token_profile"]["gates"], first failing reason per row
+     (same order and reason codes as gates._token_gates)
+
+Rows are then handled as:
+- invalid rows            -> trade_normalizer.normalize_trade_record() (exact reject dicts)
+- token-gate survivors    -> normalize_trade_record() -> Trade (full apply_gates still runs)
+- token-gate rejects and
+  --only-buy SELL rows    -> counted in a PrefilteredRows aggregate, no Trade is built
+
+When a downstream stage needs every normalized Trade (sim/execution preflight, signals dump,
+ClickHouse reject writes) the caller passes materialize_all=True and only step 1 is used.
+
+No external calls; deterministic.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+from .parquet_io import ColumnBatch
+from .reject_reasons import (
+    MAX_SPREAD_FAIL,
+    MIN_LIQUIDITY_FAIL,
+    MIN_VOLUME_24H_FAIL,
+    MISSING_SNAPSHOT,
+    SINGLE_HOLDER_FAIL,
+    TOP10_HOLDERS_FAIL,
+)
+from .trade_normalizer import Reject, _opt_float, normalize_trade_record
+from .trade_types import Trade
+
+# Rows per DuckDB/Arrow batch; large enough to amortize per-batch Python work.
+COLUMNAR_BATCH_SIZE = 65536
+
+REQUIRED_COLUMNS = ("ts", "wallet", "mint", "side", "price", "size_usd", "platform", "tx_hash")
+
+# Reason codes (0 = passed token gates). Index into _REASONS.
+_REASONS: Tuple[Optional[str], ...] = (
+    None,
+    MISSING_SNAPSHOT,
+    MIN_LIQUIDITY_FAIL,
+    MIN_VOLUME_24H_FAIL,
+    MAX_SPREAD_FAIL,
+    TOP10_HOLDERS_FAIL,
+    SINGLE_HOLDER_FAIL,
+)
+_R_MISSING, _R_LIQ, _R_VOL, _R_SPREAD, _R_TOP10, _R_SINGLE = range(1, 7)
+# Pseudo-reason for --only-buy filtering (not a reject).
+_R_FILTERED = len(_REASONS)
+
+
+@dataclass(frozen=True)
+class PrefilteredRows:
+    """Rows resolved inside one batch without building Trade objects.
+
+    counts: ((explicit_mode, wallet, reason), n); reason None means filtered out by --only-buy.
+    Every row here passed normalization.
+    """
+
+    rows: int
+    counts: List[Tuple[Tuple[Optional[str], str, Optional[str]], int]]
+
+
+ReplayItem = Union[Trade, Reject, PrefilteredRows]
+
+
+def _side_codes(batch: ColumnBatch) -> Any:
+    """Per-row side: 1=BUY, 2=SELL, 0=invalid (normalize_trade_record semantics)."""
+    codes, uniques = batch.codes("side")
+    table = np.zeros(len(uniques) + 1, dtype=np.int8)
+    for i, u in enumerate(uniques):
+        s = str(u).strip().lower()
+        if s in {"buy", "b"}:
+            table[i] = 1
+        elif s in {"sell", "s"}:
+            table[i] = 2
+    # codes == -1 (null) -> str(None) is not a valid side -> last slot (0)
+    return table[codes]
+
+
+def _ts_ok(batch: ColumnBatch) -> Any:
+    """Per-row `str(ts or "").strip() != ""`."""
+    codes, uniques = batch.codes("ts")
+    table = np.zeros(len(uniques) + 1, dtype=bool)
+    for i, u in enumerate(uniques):
+        table[i] = bool(str(u or "").strip())
+    return table[codes]
+
+
+def _mode_codes(batch: ColumnBatch) -> Tuple[Any, List[Optional[str]]]:
+    """Per-row explicit mode (stripped string or None), as codes into a value list."""
+    n = batch.num_rows
+    if "mode" not in batch:
+        return np.full(n, -1, dtype=np.int64), []
+    codes, uniques = batch.codes("mode")
+    values: List[Optional[str]] = []
+    for u in uniques:
+        values.append((u.strip() or None) if isinstance(u, str) else None)
+    return codes, values
+
+
+def _snapshot_fields(store: Any, mints: List[Any]) -> Dict[str, Tuple[Any, Any]]:
+    """Store lookups per unique mint -> {field: (values, present)} plus has_snapshot."""
+    k = len(mints)
+    out = {f: (np.zeros(k + 1), np.zeros(k + 1, dtype=bool)) for f in (
+        "liquidity_usd", "volume_24h_usd", "spread_bps", "top10_holders_pct", "single_holder_pct",
+    )}
+    has = np.zeros(k + 1, dtype=bool)
+    for i, m in enumerate(mints):
+        snap = store.get(str(m)) if store is not None else None
+        if snap is None:
+            continue
+        has[i] = True
+        for f, (vals, present) in out.items():
+            v = _opt_float(getattr(snap, f, None))
+            if v is not None:
+                vals[i] = v
+                present[i] = True
+    out["_has"] = (has, has)
+    return out
+
+
+def token_gate_reasons(cfg: Dict[str, Any], batch: ColumnBatch, store: Any) -> Any:
+    """Vectorized gates._token_gates(): per-row reason code (0 = passed)."""
+    n = batch.num_rows
+    gates = (((cfg.get("token_profile") or {}).get("gates")) or {})
+
+    # Inline snapshot (any of the trade's own snapshot fields present) takes precedence.
+    def _trade_col(name: str) -> Tuple[Any, Any]:
+        if name in batch:
+            return batch.floats(name)
+        return np.zeros(n), np.zeros(n, dtype=bool)
+
+    t_liq, t_liq_p = _trade_col("liquidity_usd")
+    t_vol, t_vol_p = _trade_col("volume_24h_usd")
+    t_spr, t_spr_p = _trade_col("spread_bps")
+    inline = t_liq_p | t_vol_p | t_spr_p
+
+    mint_codes, mints = batch.codes("mint")
+    snap = _snapshot_fields(store, mints)
+
+    def _field(name: str, trade_vals: Any, trade_present: Any) -> Tuple[Any, Any]:
+        s_vals, s_present = snap[name]
+        s_vals, s_present = s_vals[mint_codes], s_present[mint_codes]
+        if trade_vals is None:
+            # top10/single: inline snapshots never carry them
+            return np.where(inline, 0.0, s_vals), s_present & ~inline
+        return np.where(inline, trade_vals, s_vals), np.where(inline, trade_present, s_present)
+
+    liq, liq_p = _field("liquidity_usd", t_liq, t_liq_p)
+    vol, vol_p = _field("volume_24h_usd", t_vol, t_vol_p)
+    spr, spr_p = _field("spread_bps", t_spr, t_spr_p)
+    top10, top10_p = _field("top10_holders_pct", None, None)
+    single, single_p = _field("single_holder_pct", None, None)
+
+    reason = np.zeros(n, dtype=np.int8)
+
+    def _first(mask: Any, code: int) -> None:
+        np.copyto(reason, code, where=(reason == 0) & mask)
+
+    has_snap = inline | snap["_has"][0][mint_codes]
+    _first(~has_snap, _R_MISSING)
+
+    min_liq = gates.get("min_liquidity_usd")
+    if min_liq is not None:
+        _first(~liq_p, _R_MISSING)
+        _first(liq_p & (liq < float(min_liq)), _R_LIQ)
+
+    min_vol = gates.get("min_volume_24h_usd")
+    if min_vol is not None:
+        _first(~vol_p, _R_MISSING)
+        _first(vol_p & (vol < float(min_vol)), _R_VOL)
+
+    max_spread = gates.get("max_spread_bps")
+    if max_spread is not None:
+        _first(~spr_p, _R_MISSING)
+        _first(spr_p & (spr > float(max_spread)), _R_SPREAD)
+
+    max_top10 = gates.get("max_top10_holders_pct")
+    if max_top10 is not None:
+        _first(top10_p & (top10 > float(max_top10)), _R_TOP10)
+
+    max_single = gates.get("max_single_holder_pct")
+    if max_single is not None:
+        _first(single_p & (single > float(max_single)), _R_SINGLE)
+
+    return reason
+
+
+def normalized_mask(batch: ColumnBatch) -> Tuple[Any, Any]:
+    """Vectorized trade_normalizer validation -> (valid mask, side codes)."""
+    n = batch.num_rows
+    if any(c not in batch for c in REQUIRED_COLUMNS):
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int8)
+    side = _side_codes(batch)
+    price, price_p = batch.floats("price")
+    size, size_p = batch.floats("size_usd")
+    # `price <= 0` is False for NaN, matching the row normalizer.
+    valid = (side != 0) & _ts_ok(batch) & price_p & ~(price <= 0) & size_p & ~(size <= 0)
+    return valid, side
+
+
+def iter_columnar_items(
+    batches: Iterable[ColumnBatch],
+    cfg: Dict[str, Any],
+    store: Any,
+    only_buy: bool = False,
+    materialize_all: bool = False,
+    get_cfg: Optional[Callable[[], Dict[str, Any]]] = None,
+) -> Iterator[ReplayItem]:
+    """Yield Trade / reject dict / PrefilteredRows items for the paper pipeline loop.
+
+    Trades and rejects keep their input order; a batch's PrefilteredRows aggregate is
+    yielded after the batch's materialized rows. Line numbers count from 1 across batches,
+    as in the row replay path. With get_cfg, each batch's token gates use the config it
+    returns when the batch is evaluated (hot reloads), else the fixed cfg.
+    """
+    offset = 0
+    for batch in batches:
+        n = batch.num_rows
+        valid, side = normalized_mask(batch)
+
+        prefiltered = np.zeros(n, dtype=bool)
+        reason = np.zeros(n, dtype=np.int8)
+        # Rows carrying an `extra` struct may set the mode bucket; keep them on the row path.
+        if not materialize_all and "extra" not in batch and valid.any():
+            reason = token_gate_reasons(get_cfg() if get_cfg is not None else cfg, batch, store)
+            if only_buy:
+                # Filtering happens before the gates in the pipeline loop.
+                reason = np.where(side == 2, _R_FILTERED, reason).astype(np.int8)
+            prefiltered = valid & (reason != 0)
+
+        keep = np.flatnonzero(~prefiltered)
+        for i, rec in zip(keep.tolist(), batch.rows(keep.tolist())):
+            yield normalize_trade_record(rec, lineno=offset + i + 1)
+
+        if prefiltered.any():
+            yield _aggregate(batch, prefiltered, reason)
+        offset += n
+
+
+def _aggregate(batch: ColumnBatch, mask: Any, reason: Any) -> PrefilteredRows:
+    idx = np.flatnonzero(mask)
+    mode_codes, modes = _mode_codes(batch)
+    wallet_codes, wallets = batch.codes("wallet")
+
+    key = np.stack([mode_codes[idx], wallet_codes[idx], reason[idx].astype(np.int64)], axis=1)
+    uniq, counts = np.unique(key, axis=0, return_counts=True)
+
+    out: List[Tuple[Tuple[Optional[str], str, Optional[str]], int]] = []
+    for (m, w, r), c in zip(uniq.tolist(), counts.tolist()):
+        explicit_mode = modes[m] if m >= 0 else None
+        wallet = str(wallets[w]) if w >= 0 else "None"
+        reason_str = None if r == _R_FILTERED else _REASONS[r]
+        out.append(((explicit_mode, wallet, reason_str), int(c)))
+    return PrefilteredRows(rows=int(idx.size), counts=out)
@@ -85,34 +85,59 @@ def load_params_base(path: str = "strategy/config/params_base.yaml") -> LoadedCo
 # -------------------------------------------------------------------------
 
 from typing import Optional
-from config.hot_reload import ConfigReloader
+from config.hot_reload import ConfigReloader, ConfigSnapshot
 from config.runtime_schema import RuntimeConfig
 
 _RELOADER: Optional[ConfigReloader] = None
-_STATIC_RUNTIME_CONFIG: Optional[RuntimeConfig] = None
+_STATIC_SNAPSHOT = ConfigSnapshot(generation=0, runtime=RuntimeConfig())
 
 
 def init_reloader(path: str, hot_reload: bool = False) -> None:
-    """Initialize the configuration reloader singleton."""
-    global _RELOADER, _STATIC_RUNTIME_CONFIG
+    """Initialize the configuration reloader singleton.
+
+    The reloader is kept in static mode too (it just never watches), so both
+    modes publish snapshots the same way.
+    """
+    global _RELOADER
     
     if hot_reload:
         # Start hot-reload watcher
         _RELOADER = ConfigReloader(path)
         _RELOADER.start_watching()
     else:
-        # Load once and cache as static
-        _RELOADER = None
-        # We need to load the file to get RuntimeConfig defaults or values
-        # We can reuse ConfigReloader logic temporarily or just load
+        # Load once; the reloader's validation logic keeps both modes consistent
         try:
-             # Use the reloader's validation logic to ensure consistency
-             loader = ConfigReloader(path)
-             _STATIC_RUNTIME_CONFIG = loader.get_config()
-             loader.stop_watching() # Just to be safe, though not started
+             _RELOADER = ConfigReloader(path)
         except Exception:
              # Fallback to defaults if file missing or invalid (though load_params_base should have caught it)
-             _STATIC_RUNTIME_CONFIG = RuntimeConfig()
+             _RELOADER = None
+
+
+def set_base_config(base_cfg: Dict[str, Any]) -> ConfigSnapshot:
+    """Publish base_cfg merged with the runtime overrides.
+
+    The reloader re-merges on every reload, so readers get a pre-merged config
+    from get_config_snapshot() instead of calling apply_runtime_overrides()
+    themselves.
+    """
+    global _STATIC_SNAPSHOT
+    merge = lambda runtime: apply_runtime_overrides(base_cfg, runtime)
+    if _RELOADER:
+        return _RELOADER.set_merge(merge)
+    runtime = RuntimeConfig()
+    _STATIC_SNAPSHOT = ConfigSnapshot(
+        generation=_STATIC_SNAPSHOT.generation + 1,
+        runtime=runtime,
+        config=merge(runtime),
+    )
+    return _STATIC_SNAPSHOT
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """Latest published config snapshot (lock-free)."""
+    if _RELOADER:
+        return _RELOADER.snapshot
+    return _STATIC_SNAPSHOT
 
 
 def get_runtime_config() -> RuntimeConfig:
@@ -121,13 +146,15 @@ def get_runtime_config() -> RuntimeConfig:
         conf = _RELOADER.get_config()
         if conf:
             return conf
-    
-    if _STATIC_RUNTIME_CONFIG:
-        return _STATIC_RUNTIME_CONFIG
         
     return RuntimeConfig()
 
 
+def get_config_generation() -> int:
+    """Generation of the published config (changes only when a new snapshot is published)."""
+    return get_config_snapshot().generation
+
+
 def stop_reloader() -> None:
     """Stop the reloader thread if running."""
     if _RELOADER:
@@ -11,11 +11,11 @@ import json
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from strategy.coordinated_actions import (
+    CoordinationDetector,
     CoordinationTrade,
-    detect_coordination,
     REJECT_COORDINATION_INVALID_INPUT,
 )
 
@@ -31,15 +31,19 @@ class CoordinationResult:
 class CoordinationStage:
     """Sliding window coordination detection stage.
     
-    Maintains a buffer of trades within the window and computes
-    coordination scores for each wallet.
+    Keeps trades within the window in a streaming CoordinationDetector,
+    which updates scores as each trade arrives.
     """
     window_sec: float = 60.0
     enabled: bool = False
     coordination_threshold: float = 0.7
     
     # Internal state
-    _buffer: List[CoordinationTrade] = field(default_factory=list, repr=False)
+    _detector: Optional[CoordinationDetector] = field(default=None, repr=False)
+    
+    def __post_init__(self) -> None:
+        if self._detector is None:
+            self._detector = CoordinationDetector(window_sec=self.window_sec)
     
     def add_trade(self, trade: CoordinationTrade) -> Optional[CoordinationResult]:
         """Add a trade to the buffer and return coordination result.
@@ -53,22 +57,12 @@ class CoordinationStage:
         if not self.enabled:
             return None
         
-        # Add to buffer
-        self._buffer.append(trade)
-        
-        # Remove trades outside window
-        max_ts = trade["ts_block"]
-        self._buffer = [
-            t for t in self._buffer
-            if max_ts - t["ts_block"] <= self.window_sec
-        ]
-        
         try:
-            # Detect coordination
-            scores = detect_coordination(self._buffer, self.window_sec)
+            # Add to window (older trades expire) and score the trade's wallet
+            self._detector.add(trade)
             
             wallet = trade["wallet"]
-            score = scores.get(wallet, 0.0)
+            score = self._detector.score(wallet)
             
             return CoordinationResult(wallet=wallet, coordination_score=score)
             
@@ -83,7 +77,7 @@ class CoordinationStage:
         Returns:
             Dictionary with coordination metrics.
         """
-        if not self.enabled or not self._buffer:
+        if not self.enabled or not len(self._detector):
             return {
                 "coordination_score_avg": 0.0,
                 "coordination_score_max": 0.0,
@@ -91,7 +85,7 @@ class CoordinationStage:
             }
         
         try:
-            scores = detect_coordination(self._buffer, self.window_sec)
+            scores = self._detector.scores()
             
             if not scores:
                 return {
@@ -119,8 +113,8 @@ class CoordinationStage:
             }
     
     def reset(self) -> None:
-        """Clear the buffer."""
-        self._buffer.clear()
+        """Clear the window."""
+        self._detector.reset()
 
 
 def run_coordination_stage(
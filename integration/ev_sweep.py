@@ -14,11 +14,15 @@ Hard rules:
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
 import json
+import math
 import sys
-from datetime import datetime, timezone
-from typing import Any, Dict, List, TextIO
+from typing import Any, Dict, List, TextIO, Tuple
+
+from integration.tick_index import TickIndex
+from integration.ts_parse import TsCache
 
 # Schema version for results.v1
 RESULTS_SCHEMA_VERSION = "results.v1"
@@ -91,34 +95,6 @@ def _get(obj: Any, key: str, default: Any = None) -> Any:
     return default
 
 
-def _ts_to_seconds(ts: Any) -> float:
-    """Parse trade ts into seconds (deterministic)."""
-    if ts is None:
-        return 0.0
-    
-    try:
-        return float(ts)
-    except Exception:
-        pass
-    
-    s = str(ts).strip()
-    if not s:
-        return 0.0
-    
-    if s.endswith("Z"):
-        s2 = s[:-1] + "+00:00"
-    else:
-        s2 = s
-    
-    try:
-        dt = datetime.fromisoformat(s2)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.timestamp()
-    except Exception:
-        return 0.0
-
-
 def compute_edge_bps(trade: Any, token_snap: Any, wallet_profile: Any, cfg: Dict[str, Any], mode_name: str) -> int:
     """Deterministic proxy for +EV gate (copied from sim_preflight.py)."""
     from integration.sim_preflight import _clamp
@@ -156,49 +132,105 @@ def compute_edge_bps(trade: Any, token_snap: Any, wallet_profile: Any, cfg: Dict
     return int(edge_bps)
 
 
-def _simulate_exit(
-    entry_price: float,
-    entry_ts_sec: float,
-    future_ticks: List[Any],
-    cfg_mode: Dict[str, Any],
-) -> tuple[float, str]:
-    """Simulate deterministic exit."""
-    tp_pct = float(cfg_mode.get("tp_pct", 0.0))
-    sl_pct = float(cfg_mode.get("sl_pct", 0.0))
-    hold_sec_max = int(cfg_mode.get("hold_sec_max", 0))
+# Exit reasons always reported, in this order; any others follow sorted by name.
+EXIT_REASONS = ("TP", "SL", "TIME")
+
+
+def _add_exact(partials: List[float], x: float) -> None:
+    """Add x to a list of non-overlapping partials whose exact sum is the running total.
+
+    Shewchuk's algorithm (as used by math.fsum); math.fsum(partials) is then the
+    correctly rounded total, independent of the order the values were added in.
+    """
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+class ThresholdCurve:
+    """Sweep metrics for any min_edge_bps from one pass over evaluated entries.
     
-    tp_level = entry_price * (1.0 + tp_pct)
-    sl_level = entry_price * (1.0 + sl_pct)
+    Entries are added once with their edge and simulated outcome, then sorted by
+    edge; suffix sums make each threshold an O(log n) lookup, so a sweep costs one
+    simulation regardless of how many thresholds are requested.
     
-    window_end = entry_ts_sec + float(hold_sec_max)
+    PnL and notional suffix sums are exact (correctly rounded, as math.fsum), so
+    totals do not depend on the order entries are summed in; exit-reason keys
+    are emitted in a fixed order (EXIT_REASONS, then others sorted).
     
-    last_price = entry_price
-    saw_tick = False
+    Gate rule (unchanged): threshold 0 enters everything; threshold > 0 enters
+    entries with edge_bps >= threshold (which already excludes negative edges).
+    """
     
-    for tick in future_ticks:
-        ts_sec = _ts_to_seconds(_get(tick, "ts", 0))
-        if ts_sec <= entry_ts_sec:
-            continue
-        if ts_sec > window_end:
-            break
-        
-        px_raw = _get(tick, "price", None)
-        try:
-            px = float(px_raw)
-        except Exception:
-            continue
+    def __init__(self) -> None:
+        self.skipped_missing_snap = 0
+        self.skipped_missing_wallet = 0
+        self._rows: List[Tuple[int, float, float, str]] = []
+        self._edges: List[int] = []
+        # Suffix sums over rows sorted by edge: index i covers rows[i:].
+        self._pnl: List[float] = [0.0]
+        self._notional: List[float] = [0.0]
+        self._wins: List[int] = [0]
+        self._exits: Dict[str, List[int]] = {k: [0] for k in EXIT_REASONS}
+    
+    def add(self, edge_bps: int, pnl_usd: float, notional: float, reason: str) -> None:
+        self._rows.append((int(edge_bps), float(pnl_usd), float(notional), reason))
+    
+    def build(self) -> None:
+        rows = sorted(self._rows, key=lambda r: r[0])
+        n = len(rows)
+        self._edges = [r[0] for r in rows]
+        reasons = list(EXIT_REASONS) + sorted({r[3] for r in rows} - set(EXIT_REASONS))
+        pnl = [0.0] * (n + 1)
+        notional = [0.0] * (n + 1)
+        wins = [0] * (n + 1)
+        exits = {k: [0] * (n + 1) for k in reasons}
+        pnl_parts: List[float] = []
+        notional_parts: List[float] = []
+        for i in range(n - 1, -1, -1):
+            _, p, q, reason = rows[i]
+            _add_exact(pnl_parts, p)
+            _add_exact(notional_parts, q)
+            pnl[i] = math.fsum(pnl_parts)
+            notional[i] = math.fsum(notional_parts)
+            wins[i] = wins[i + 1] + (1 if p > 0 else 0)
+            for k, col in exits.items():
+                col[i] = col[i + 1] + (1 if k == reason else 0)
+        self._pnl, self._notional, self._wins, self._exits = pnl, notional, wins, exits
+    
+    def sim_metrics(self, threshold: int) -> Dict[str, Any]:
+        n = len(self._edges)
+        i = 0 if threshold <= 0 else bisect.bisect_left(self._edges, threshold)
+        entered = n - i
+        pnl_total = self._pnl[i]
+        notional_total = self._notional[i]
+        wins = self._wins[i]
         
-        saw_tick = True
-        last_price = px
+        winrate = (wins / entered) if entered else 0.0
+        roi_total = (pnl_total / notional_total) if notional_total else 0.0
+        avg_pnl = (pnl_total / entered) if entered else 0.0
         
-        if px >= tp_level:
-            return px, "TP"
-        if px <= sl_level:
-            return px, "SL"
-    
-    if not saw_tick:
-        return entry_price, "TIME"
-    return last_price, "TIME"
+        return {
+            "positions_total": int(entered),
+            "positions_closed": int(entered),
+            "winrate": float(winrate),
+            "roi_total": float(roi_total),
+            "avg_pnl_usd": float(avg_pnl),
+            "skipped_by_reason": {
+                "missing_snapshot": int(self.skipped_missing_snap),
+                "missing_wallet_profile": int(self.skipped_missing_wallet),
+                "ev_below_threshold": int(i),
+            },
+            "exit_reason_counts": {k: int(col[i]) for k, col in self._exits.items()},
+        }
 
 
 def run_ev_sweep(
@@ -238,23 +270,23 @@ def run_ev_sweep(
         if wallet:
             wp_by_wallet[wallet] = row
     
-    # Build tick index per mint
+    # Build tick index per mint (ticks without a parseable price never affect an exit)
     from collections import defaultdict
+    ts_cache = TsCache()
     ticks_by_mint: Dict[str, List[Any]] = defaultdict(list)
     for t in trades:
         mint = _get(t, "mint", "") or ""
         if not mint:
             continue
-        ts_sec = _ts_to_seconds(_get(t, "ts", 0))
+        ts_sec = ts_cache(_get(t, "ts", 0))
         px_raw = _get(t, "price", None)
         try:
-            px = float(px_raw) if px_raw is not None else 0.0
+            px = float(px_raw)
         except Exception:
-            px = 0.0
-        ticks_by_mint[mint].append((ts_sec, px, t))
+            continue
+        ticks_by_mint[mint].append((ts_sec, px))
     
-    for mint, arr in ticks_by_mint.items():
-        arr.sort(key=lambda x: x[0])
+    tick_index = TickIndex.from_ticks(ticks_by_mint)
     
     # Identify entry candidates (BUY trades)
     entries: List[Dict[str, Any]] = []
@@ -274,7 +306,7 @@ def run_ev_sweep(
         except Exception:
             continue
         
-        entry_ts_sec = _ts_to_seconds(_get(t, "ts", 0))
+        entry_ts_sec = ts_cache(_get(t, "ts", 0))
         
         extra = _get(t, "extra", None)
         mode = "U"
@@ -292,98 +324,57 @@ def run_ev_sweep(
             "mode": mode,
         })
     
-    # Run sweep for each threshold
-    sweep_rows = []
-    for threshold in thresholds_bps:
-        entered = 0
-        skipped_missing_snap = 0
-        skipped_missing_wallet = 0
-        skipped_ev_below = 0
-        pnl_total = 0.0
-        notional_total = 0.0
-        wins = 0
-        exit_counts = {"TP": 0, "SL": 0, "TIME": 0}
+    # Evaluate every entry once: the edge and the simulated exit do not depend on min_edge_bps.
+    curve = ThresholdCurve()
+    for entry in entries:
+        snap = snap_by_mint.get(entry["mint"])
+        if snap is None:
+            curve.skipped_missing_snap += 1
+            continue
         
-        for entry in entries:
-            mint = entry["mint"]
-            wallet = entry["wallet"]
-            
-            snap = snap_by_mint.get(mint)
-            if snap is None:
-                skipped_missing_snap += 1
-                continue
-            
-            wp = wp_by_wallet.get(wallet)
-            if wp is None:
-                skipped_missing_wallet += 1
-                continue
-            
-            # Compute edge
-            edge_bps = compute_edge_bps(
-                trade=entry["trade"],
-                token_snap=snap,
-                wallet_profile=wp,
-                cfg=cfg,
-                mode_name=entry["mode"],
-            )
-            
-            # Skip if threshold > 0 AND (edge is negative OR edge is below threshold)
-            if threshold > 0 and (edge_bps < 0 or edge_bps < threshold):
-                skipped_ev_below += 1
-                continue
-            
-            # Simulate exit
-            fut = ticks_by_mint.get(mint, [])
-            mode_cfg = (cfg.get("modes") or {}).get(entry["mode"], {})
-            exit_price, reason = _simulate_exit(
-                entry_price=entry["entry_price"],
-                entry_ts_sec=entry["entry_ts_sec"],
-                future_ticks=[tick[2] for tick in fut],
-                cfg_mode=mode_cfg,
-            )
-            
-            # PnL
-            notional_raw = _get(entry["trade"], "qty_usd", None)
-            if notional_raw is None:
-                notional_raw = _get(entry["trade"], "size_usd", None)
-            try:
-                notional = float(notional_raw) if notional_raw is not None else 1.0
-            except Exception:
-                notional = 1.0
-            if notional <= 0:
-                notional = 1.0
-            
-            pnl_usd = ((exit_price / entry["entry_price"]) - 1.0) * notional
-            
-            entered += 1
-            pnl_total += pnl_usd
-            notional_total += notional
-            exit_counts[reason] = exit_counts.get(reason, 0) + 1
-            if pnl_usd > 0:
-                wins += 1
+        wp = wp_by_wallet.get(entry["wallet"])
+        if wp is None:
+            curve.skipped_missing_wallet += 1
+            continue
         
-        winrate = (wins / entered) if entered else 0.0
-        roi_total = (pnl_total / notional_total) if notional_total else 0.0
-        avg_pnl = (pnl_total / entered) if entered else 0.0
+        # Compute edge
+        edge_bps = compute_edge_bps(
+            trade=entry["trade"],
+            token_snap=snap,
+            wallet_profile=wp,
+            cfg=cfg,
+            mode_name=entry["mode"],
+        )
         
-        sim_metrics = {
-            "positions_total": int(entered),
-            "positions_closed": int(entered),
-            "winrate": float(winrate),
-            "roi_total": float(roi_total),
-            "avg_pnl_usd": float(avg_pnl),
-            "skipped_by_reason": {
-                "missing_snapshot": int(skipped_missing_snap),
-                "missing_wallet_profile": int(skipped_missing_wallet),
-                "ev_below_threshold": int(skipped_ev_below),
-            },
-            "exit_reason_counts": exit_counts,
-        }
+        # Simulate exit
+        mode_cfg = (cfg.get("modes") or {}).get(entry["mode"], {})
+        exit_price, reason = tick_index.simulate_exit(
+            entry["mint"],
+            entry_price=entry["entry_price"],
+            entry_ts_sec=entry["entry_ts_sec"],
+            cfg_mode=mode_cfg,
+        )
         
-        sweep_rows.append({
-            "value": int(threshold),
-            "sim_metrics": sim_metrics,
-        })
+        # PnL
+        notional_raw = _get(entry["trade"], "qty_usd", None)
+        if notional_raw is None:
+            notional_raw = _get(entry["trade"], "size_usd", None)
+        try:
+            notional = float(notional_raw) if notional_raw is not None else 1.0
+        except Exception:
+            notional = 1.0
+        if notional <= 0:
+            notional = 1.0
+        
+        pnl_usd = ((exit_price / entry["entry_price"]) - 1.0) * notional
+        curve.add(edge_bps, pnl_usd, notional, reason)
+    
+    curve.build()
+    
+    sweep_rows = [
+        {"value": int(threshold), "sim_metrics": curve.sim_metrics(threshold)}
+        for threshold in thresholds_bps
+    ]
     
     # Build fixture info from config
     fixture = {
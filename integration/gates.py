@@ -6,12 +6,18 @@ Goals:
 - Deterministic & tiny (no external API calls).
 - "No missing" for token gates: requires a local TokenSnapshot cache (or inline fields).
 - Returns structured reject reasons so we can aggregate why signals were not emitted.
+
+Gates are compiled from the config into a flat, ordered list of GateSteps with
+thresholds parsed once (GatePlan). apply_gates() looks its plan up by the gate
+config values; hot loops keep a GatePlanCache keyed by config version instead.
 """
 
 from __future__ import annotations
 
+import hashlib
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from .trade_types import Trade
 from .token_snapshot_store import TokenSnapshot
@@ -34,7 +40,7 @@ from .reject_reasons import (
 )
 
 # Import simulation check from honeypot_filter
-from strategy.honeypot_filter import check_simulation_security, is_honeypot_safe
+from strategy.honeypot_filter import simulation_verdict
 from .reject_reasons import HONEYPOT_DETECTED
 
 
@@ -49,17 +55,243 @@ class GateDecision:
         return self.reasons[0] if self.reasons else None
 
 
+# A gate check appends its reasons/details and returns True if it rejected.
+GateCheck = Callable[[Trade, Optional[TokenSnapshot], List[str], Dict[str, Any]], bool]
+
+
+class GateStep(NamedTuple):
+    name: str
+    check: GateCheck
+
+
+# Everything _compile_steps() reads from the config, in order.
+_TOKEN_GATES = (
+    # (snapshot/trade field, config key, reason, is_min, required)
+    ("liquidity_usd", "min_liquidity_usd", MIN_LIQUIDITY_FAIL, True, True),
+    ("volume_24h_usd", "min_volume_24h_usd", MIN_VOLUME_24H_FAIL, True, True),
+    ("spread_bps", "max_spread_bps", MAX_SPREAD_FAIL, False, True),
+    ("top10_holders_pct", "max_top10_holders_pct", TOP10_HOLDERS_FAIL, False, False),
+    ("single_holder_pct", "max_single_holder_pct", SINGLE_HOLDER_FAIL, False, False),
+)
+_WALLET_FILTERS = (
+    # (trade field, config key, reason, cast)
+    ("wallet_winrate_30d", "min_wallet_winrate_30d", WALLET_MIN_WINRATE_FAIL, float),
+    ("wallet_roi_30d_pct", "min_wallet_roi_30d_pct", WALLET_MIN_ROI_FAIL, float),
+    ("wallet_trades_30d", "min_wallet_trades_30d", WALLET_MIN_TRADES_FAIL, int),
+)
+
+
 def apply_gates(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSnapshot]) -> GateDecision:
-    reasons: List[str] = []
-    details: Dict[str, Any] = {"mint": trade.mint, "tx_hash": trade.tx_hash}
+    return _shared_plans.get(cfg).evaluate(trade, snapshot)
+
+
+class GatePlan:
+    """
+    Gates compiled for one config: GateSteps in canonical (apply_gates) order.
+
+    evaluate() runs every step and returns exactly what apply_gates() returns.
+
+    evaluate(short_circuit=True) tries steps by observed reject rate (highest
+    first, re-ranked every REORDER_EVERY such evaluations) and stops at the
+    first reject. It then runs the canonically earlier steps that were skipped,
+    up to the first one that rejects, so `passed` and `primary_reason` still
+    match apply_gates(); `reasons`/`details` only cover the steps that ran.
+    Only short-circuit evaluations feed the reject statistics.
+    """
+
+    REORDER_EVERY = 1024
+
+    def __init__(self, steps: Sequence[GateStep], config_hash: str = ""):
+        self.steps: Tuple[GateStep, ...] = tuple(steps)
+        self.config_hash = config_hash
+        self._checks = tuple(step.check for step in self.steps)
+        n = len(self.steps)
+        self._evaluated = [0] * n
+        self._rejected = [0] * n
+        self._order: Tuple[int, ...] = tuple(range(n))
+        self._pos = list(range(n))  # step index -> position in _order
+        # Short-circuit runs that stopped at each _order position (n = none rejected);
+        # folded into _evaluated on re-rank, so the hot path does one increment.
+        self._stops = [0] * (n + 1)
+        self._until_reorder = self.REORDER_EVERY
+
+    def evaluate(self, trade: Trade, snapshot: Optional[TokenSnapshot], short_circuit: bool = False) -> GateDecision:
+        details: Dict[str, Any] = {"mint": trade.mint, "tx_hash": trade.tx_hash}
+        reasons: List[str] = []
+        checks = self._checks
+
+        if not short_circuit:
+            for check in checks:
+                check(trade, snapshot, reasons, details)
+            return GateDecision(passed=(len(reasons) == 0), reasons=reasons, details=details)
+
+        self._until_reorder -= 1
+        if self._until_reorder <= 0:
+            self._rerank()
+
+        order, positions = self._order, self._pos  # replaced, never mutated, by _rerank()
+        for i in order:
+            if checks[i](trade, snapshot, reasons, details):
+                break
+        else:
+            self._stops[len(checks)] += 1
+            return GateDecision(passed=True, reasons=reasons, details=details)
+
+        pos = positions[i]
+        self._stops[pos] += 1
+        self._rejected[i] += 1
+
+        # The canonical primary reason may belong to an earlier step that was skipped.
+        ran = order[:pos]
+        earlier: List[str] = []
+        for j in range(i):
+            if j in ran:
+                continue
+            self._evaluated[j] += 1
+            if checks[j](trade, snapshot, earlier, details):
+                self._rejected[j] += 1
+                break
+        if earlier:
+            reasons = earlier + reasons
+        return GateDecision(passed=False, reasons=reasons, details=details)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-step short-circuit counters, in current evaluation order."""
+        self._fold_stops()
+        return [
+            {
+                "name": self.steps[i].name,
+                "evaluated": self._evaluated[i],
+                "rejected": self._rejected[i],
+                "reject_rate": self._rejected[i] / self._evaluated[i] if self._evaluated[i] else 0.0,
+            }
+            for i in self._order
+        ]
+
+    def _fold_stops(self) -> None:
+        stops = self._stops
+        remaining = sum(stops)
+        for pos, i in enumerate(self._order):
+            self._evaluated[i] += remaining  # every run that got this far evaluated step i
+            remaining -= stops[pos]
+        self._stops = [0] * len(stops)
+
+    def _rerank(self) -> None:
+        self._until_reorder = self.REORDER_EVERY
+        self._fold_stops()
+        ev, rj = self._evaluated, self._rejected
+        # Laplace-smoothed reject rate; sorted() is stable, so ties keep canonical order.
+        order = tuple(sorted(range(len(self.steps)), key=lambda i: -(rj[i] + 1) / (ev[i] + 2)))
+        positions = [0] * len(order)
+        for pos, i in enumerate(order):
+            positions[i] = pos
+        self._order, self._pos = order, positions
+
+
+def _gate_inputs(cfg: Dict[str, Any]) -> Tuple[Any, ...]:
+    """The raw config values the gates read (the compile cache key); order matches _TOKEN_GATES/_WALLET_FILTERS."""
+    token_profile = cfg.get("token_profile") or {}
+    gates = token_profile.get("gates") or {}
+    security_cfg = token_profile.get("security") or {}
+    hard = ((cfg.get("signals") or {}).get("hard_filters")) or {}
+    return (
+        gates.get("min_liquidity_usd"),
+        gates.get("min_volume_24h_usd"),
+        gates.get("max_spread_bps"),
+        gates.get("max_top10_holders_pct"),
+        gates.get("max_single_holder_pct"),
+        security_cfg.get("enabled", True),
+        security_cfg.get("max_tax_bps", 1000),
+        security_cfg.get("require_honeypot_safe", False),
+        hard.get("min_wallet_winrate_30d"),
+        hard.get("min_wallet_roi_30d_pct"),
+        hard.get("min_wallet_trades_30d"),
+    )
+
+
+def gate_config_hash(cfg: Dict[str, Any]) -> str:
+    """sha256 over the config values the gates read."""
+    return hashlib.sha256(repr(_gate_inputs(cfg)).encode("utf-8")).hexdigest()
 
-    _token_gates(cfg=cfg, trade=trade, snapshot=snapshot, reasons=reasons, details=details)
-    _security_gate(cfg=cfg, trade=trade, snapshot=snapshot, reasons=reasons, details=details)
-    _simulation_gate(cfg=cfg, trade=trade, snapshot=snapshot, reasons=reasons, details=details)
-    _honeypot_gate(cfg=cfg, trade=trade, snapshot=snapshot, reasons=reasons, details=details)
-    _wallet_hard_filters(cfg=cfg, trade=trade, reasons=reasons, details=details)
 
-    return GateDecision(passed=(len(reasons) == 0), reasons=reasons, details=details)
+def compile_gate_plan(cfg: Dict[str, Any]) -> GatePlan:
+    """Compile cfg into a GatePlan (thresholds are parsed here, not per trade)."""
+    return _compile_plan(_gate_inputs(cfg))
+
+
+def _compile_plan(inputs: Tuple[Any, ...]) -> GatePlan:
+    config_hash = hashlib.sha256(repr(inputs).encode("utf-8")).hexdigest()
+    return GatePlan(_compile_steps(inputs), config_hash=config_hash)
+
+
+class GatePlanCache:
+    """
+    GatePlans keyed by the config values the gates read, so a plan (and its
+    reject statistics) survives config reloads that do not touch the gates.
+
+    With a config generation (config_loader.get_config_generation()) the cfg is only
+    re-read when the generation changes; without one it is re-read on every get().
+    """
+
+    def __init__(self, max_plans: int = 8):
+        self._plans: Dict[Any, GatePlan] = {}
+        self._max_plans = max_plans
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._current: Optional[GatePlan] = None
+        self.compiles = 0
+
+    def get(self, cfg: Dict[str, Any], version: Optional[int] = None) -> GatePlan:
+        current = self._current
+        if version is not None and version == self._version and current is not None:
+            return current
+
+        inputs = _gate_inputs(cfg)
+        key: Any = inputs
+        try:
+            plan = self._plans.get(key)
+        except TypeError:  # unhashable config values (lists etc.)
+            key = repr(inputs)
+            plan = self._plans.get(key)
+        if plan is None:
+            with self._lock:
+                plan = self._plans.get(key)
+                if plan is None:
+                    plan = _compile_plan(inputs)
+                    self.compiles += 1
+                    if len(self._plans) >= self._max_plans:
+                        # Oldest compiled plan goes first.
+                        del self._plans[next(iter(self._plans))]
+                    self._plans[key] = plan
+        if version is not None:
+            self._version, self._current = version, plan
+        return plan
+
+
+def _compile_steps(inputs: Tuple[Any, ...]) -> List[GateStep]:
+    token_limits = inputs[:5]
+    security_enabled, max_tax, require_honeypot_safe = inputs[5:8]
+    wallet_limits = inputs[8:]
+
+    steps = [GateStep("missing_snapshot", _check_missing_snapshot)]
+
+    # Token gates (snapshot preferred; liquidity/volume/spread fall back to inline trade fields)
+    for (field, key, reason, is_min, required), limit in zip(_TOKEN_GATES, token_limits):
+        if limit is not None:
+            steps.append(_token_threshold_step(field, key, float(limit), reason, is_min, required))
+
+    if bool(security_enabled):  # Default enabled
+        steps.append(GateStep("security", _check_security))
+
+    steps.append(_simulation_step(max_tax))
+    steps.append(_honeypot_step(bool(require_honeypot_safe)))
+
+    # Wallet hard filters
+    for (field, key, reason, cast), limit in zip(_WALLET_FILTERS, wallet_limits):
+        if limit is not None:
+            steps.append(_wallet_floor_step(field, key, cast(limit), reason, cast))
+
+    return steps
 
 
 def _extract_security_data(snapshot: Optional[TokenSnapshot]) -> Tuple[bool, Optional[str]]:
@@ -108,65 +340,39 @@ def _extract_security_data(snapshot: Optional[TokenSnapshot]) -> Tuple[bool, Opt
     return True, None
 
 
-def _token_gates(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> None:
-    gates = (((cfg.get("token_profile") or {}).get("gates")) or {})
-
+def _check_missing_snapshot(trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> bool:
     # Require snapshot for token gates (P0.1)
     if snapshot is None:
         reasons.append(MISSING_SNAPSHOT)
         details["missing_snapshot_for_mint"] = trade.mint
-        return
-
-    # Pull values (snapshot preferred; fallback to inline trade fields if present)
-    liq = snapshot.liquidity_usd if snapshot.liquidity_usd is not None else trade.liquidity_usd
-    vol24 = snapshot.volume_24h_usd if snapshot.volume_24h_usd is not None else trade.volume_24h_usd
-    spread = snapshot.spread_bps if snapshot.spread_bps is not None else trade.spread_bps
-    top10 = snapshot.top10_holders_pct if snapshot.top10_holders_pct is not None else None
-    single = snapshot.single_holder_pct if snapshot.single_holder_pct is not None else None
-
-    min_liq = gates.get("min_liquidity_usd")
-    if min_liq is not None:
-        if liq is None:
-            reasons.append(MISSING_SNAPSHOT)
-            details["missing_field"] = "liquidity_usd"
-        elif float(liq) < float(min_liq):
-            reasons.append(MIN_LIQUIDITY_FAIL)
-            details["liquidity_usd"] = float(liq)
-            details["min_liquidity_usd"] = float(min_liq)
-
-    min_vol = gates.get("min_volume_24h_usd")
-    if min_vol is not None:
-        if vol24 is None:
-            reasons.append(MISSING_SNAPSHOT)
-            details["missing_field"] = "volume_24h_usd"
-        elif float(vol24) < float(min_vol):
-            reasons.append(MIN_VOLUME_24H_FAIL)
-            details["volume_24h_usd"] = float(vol24)
-            details["min_volume_24h_usd"] = float(min_vol)
-
-    max_spread = gates.get("max_spread_bps")
-    if max_spread is not None:
-        if spread is None:
-            reasons.append(MISSING_SNAPSHOT)
-            details["missing_field"] = "spread_bps"
-        elif float(spread) > float(max_spread):
-            reasons.append(MAX_SPREAD_FAIL)
-            details["spread_bps"] = float(spread)
-            details["max_spread_bps"] = float(max_spread)
-
-    max_top10 = gates.get("max_top10_holders_pct")
-    if max_top10 is not None and top10 is not None:
-        if float(top10) > float(max_top10):
-            reasons.append(TOP10_HOLDERS_FAIL)
-            details["top10_holders_pct"] = float(top10)
-            details["max_top10_holders_pct"] = float(max_top10)
-
-    max_single = gates.get("max_single_holder_pct")
-    if max_single is not None and single is not None:
-        if float(single) > float(max_single):
-            reasons.append(SINGLE_HOLDER_FAIL)
-            details["single_holder_pct"] = float(single)
-            details["max_single_holder_pct"] = float(max_single)
+        return True
+    return False
+
+
+def _token_threshold_step(field: str, key: str, limit: float, reason: str, is_min: bool, required: bool) -> GateStep:
+    """min_*/max_* token gate on snapshot.<field>; `required` gates fall back to trade.<field> and reject if both are missing."""
+
+    def check(trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> bool:
+        if snapshot is None:
+            return False  # reported once by the missing_snapshot step
+        value = getattr(snapshot, field)
+        if value is None:
+            if not required:
+                return False
+            value = getattr(trade, field)
+            if value is None:
+                reasons.append(MISSING_SNAPSHOT)
+                details["missing_field"] = field
+                return True
+        value = float(value)
+        if (value < limit) if is_min else (value > limit):
+            reasons.append(reason)
+            details[field] = value
+            details[key] = limit
+            return True
+        return False
+
+    return GateStep(key, check)
 
 
 def _security_gate(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> None:
@@ -184,6 +390,10 @@ def _security_gate(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSn
     if not enabled:
         return
 
+    _check_security(trade, snapshot, reasons, details)
+
+
+def _check_security(trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> bool:
     # Extract and validate security data from snapshot
     is_safe, reason = _extract_security_data(snapshot)
 
@@ -198,9 +408,11 @@ def _security_gate(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSn
                 "mint_authority": security.get("mint_authority"),
                 "top_holders_pct": security.get("top_holders_pct"),
             }
+        return True
+    return False
 
 
-def _simulation_gate(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> None:
+def _simulation_step(max_tax: Any) -> GateStep:
     """Check simulation results from snapshot.extra["simulation"].
 
     This gate validates:
@@ -208,20 +420,26 @@ def _simulation_gate(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[Token
     - simulation.buy_tax_bps: Reject if exceeds threshold
     - simulation.sell_tax_bps: Reject if exceeds threshold
     """
-    # Use the pure function from honeypot_filter
-    is_safe, reason = check_simulation_security(snapshot, cfg)
 
-    if not is_safe and reason:
-        reasons.append(reason)
-        # Add simulation details to the output
-        if snapshot and snapshot.extra and snapshot.extra.get("simulation"):
-            sim = snapshot.extra["simulation"]
-            details["simulation"] = {
-                "success": sim.get("success"),
-                "error": sim.get("error"),
-                "buy_tax_bps": sim.get("buy_tax_bps"),
-                "sell_tax_bps": sim.get("sell_tax_bps"),
-            }
+    def check(trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> bool:
+        # Use the pure function from honeypot_filter
+        is_safe, reason = simulation_verdict(snapshot, max_tax)
+
+        if not is_safe and reason:
+            reasons.append(reason)
+            # Add simulation details to the output
+            if snapshot and snapshot.extra and snapshot.extra.get("simulation"):
+                sim = snapshot.extra["simulation"]
+                details["simulation"] = {
+                    "success": sim.get("success"),
+                    "error": sim.get("error"),
+                    "buy_tax_bps": sim.get("buy_tax_bps"),
+                    "sell_tax_bps": sim.get("sell_tax_bps"),
+                }
+            return True
+        return False
+
+    return GateStep("simulation", check)
 
 
 def passes_honeypot_gate(snapshot: Optional[TokenSnapshot], cfg: Dict[str, Any]) -> Tuple[bool, str]:
@@ -242,118 +460,72 @@ def passes_honeypot_gate(snapshot: Optional[TokenSnapshot], cfg: Dict[str, Any])
     if not require_honeypot_safe:
         return True, "honeypot_check_skipped"
 
+    return _honeypot_verdict(snapshot)
+
+
+def _honeypot_verdict(snapshot: Optional[TokenSnapshot]) -> Tuple[bool, str]:
+    """passes_honeypot_gate() once require_honeypot_safe is known to be set."""
     # STRICT: require_honeypot_safe -> reject when snapshot/security data missing
     if snapshot is None:
         return False, HONEYPOT_DETECTED
 
-
-    # Extract simulation data
-    sim_success = True
-    buy_tax_bps = None
-    sell_tax_bps = None
-    is_freezable = False
-    snapshot_extra = None
-
-    if snapshot is not None:
-        snapshot_extra = snapshot.extra
-        if snapshot_extra is not None:
-            sim = snapshot_extra.get("simulation")
-            if sim is not None:
-                sim_success = sim.get("success", True)
-                buy_tax_bps = sim.get("buy_tax_bps")
-                sell_tax_bps = sim.get("sell_tax_bps")
-
-            security = snapshot_extra.get("security")
-            if security is not None:
-                is_freezable = security.get("freeze_authority", False)
-
-                # EARLY REJECT: explicit honeypot flag in snapshot.extra (matches honeypot_gate_smoke expectations)
-                # Some fixtures mark honeypots via boolean flags instead of taxes; treat any explicit flag as unsafe.
-                hp_flag = False
-                # allow flags either at snapshot_extra level or inside snapshot_extra["security"]
-                if snapshot_extra.get("honeypot") is True:
-                    hp_flag = True
-                if snapshot_extra.get("honeypot_detected") is True:
-                    hp_flag = True
-                if snapshot_extra.get("is_honeypot") is True:
-                    hp_flag = True
-
-                if security is not None:
-                    if security.get("honeypot") is True:
-                        hp_flag = True
-                    if security.get("honeypot_detected") is True:
-                        hp_flag = True
-                    if security.get("is_honeypot") is True:
-                        hp_flag = True
-                    if security.get("scam") is True:
-                        hp_flag = True
-
-                if hp_flag:
+    snapshot_extra = snapshot.extra
+    if snapshot_extra is not None:
+        security = snapshot_extra.get("security")
+        if security is not None:
+            # EARLY REJECT: explicit honeypot flag in snapshot.extra (matches honeypot_gate_smoke expectations)
+            # Some fixtures mark honeypots via boolean flags instead of taxes; treat any explicit flag as unsafe.
+            # Flags may sit either at snapshot_extra level or inside snapshot_extra["security"].
+            for key in ("honeypot", "honeypot_detected", "is_honeypot"):
+                if snapshot_extra.get(key) is True:
+                    return False, HONEYPOT_DETECTED
+            for key in ("honeypot", "honeypot_detected", "is_honeypot", "scam"):
+                if security.get(key) is True:
                     return False, HONEYPOT_DETECTED
 
-    # Use honeypot_filter to check safety
-    is_safe = is_honeypot_safe(
-        mint=snapshot.mint if snapshot else "",
-        snapshot_extra=snapshot_extra,
-        simulation_success=sim_success,
-        buy_tax_bps=buy_tax_bps,
-        sell_tax_bps=sell_tax_bps,
-        is_freezable=is_freezable,
-    )
+    # honeypot_filter.is_honeypot_safe() used to run here, but without a cfg its
+    # honeypot module is disabled and it always passes; only the flags above decide.
+    return True, "ok"
 
-    if is_safe:
-        return True, "ok"
-    else:
-        return False, HONEYPOT_DETECTED
 
-
-def _honeypot_gate(cfg: Dict[str, Any], trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> None:
+def _honeypot_step(require_honeypot_safe: bool) -> GateStep:
     """PR-K.3: Honeypot safety gate integration.
 
-    Validates token safety using honeypot_filter.is_honeypot_safe().
-    Only active when config.require_honeypot_safe == true.
+    Only active when config.require_honeypot_safe == true; always records
+    details["honeypot_gate"].
     """
-    passed, reason = passes_honeypot_gate(snapshot, cfg)
 
-    if not passed:
+    def check(trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> bool:
+        if require_honeypot_safe:
+            passed, reason = _honeypot_verdict(snapshot)
+        else:
+            passed, reason = True, "honeypot_check_skipped"
+
+        details["honeypot_gate"] = {"passed": passed, "reason": reason}
+        if not passed:
+            reasons.append(reason)
+            return True
+        return False
+
+    return GateStep("honeypot", check)
+
+
+def _wallet_floor_step(field: str, key: str, limit: Any, reason: str, cast: Callable[[Any], Any]) -> GateStep:
+    """Wallet hard filter: reject if trade.<field> is missing or below limit."""
+
+    def check(trade: Trade, snapshot: Optional[TokenSnapshot], reasons: List[str], details: Dict[str, Any]) -> bool:
+        value = getattr(trade, field)
+        if value is not None:
+            value = cast(value)
+            if not value < limit:
+                return False
         reasons.append(reason)
-        details["honeypot_gate"] = {"passed": False, "reason": reason}
-    else:
-        details["honeypot_gate"] = {"passed": True, "reason": reason}
-
-
-def _wallet_hard_filters(cfg: Dict[str, Any], trade: Trade, reasons: List[str], details: Dict[str, Any]) -> None:
-    hard = (((cfg.get("signals") or {}).get("hard_filters")) or {})
-
-    min_wr = hard.get("min_wallet_winrate_30d")
-    if min_wr is not None:
-        if trade.wallet_winrate_30d is None:
-            reasons.append(WALLET_MIN_WINRATE_FAIL)
-            details["wallet_winrate_30d"] = None
-            details["min_wallet_winrate_30d"] = float(min_wr)
-        elif float(trade.wallet_winrate_30d) < float(min_wr):
-            reasons.append(WALLET_MIN_WINRATE_FAIL)
-            details["wallet_winrate_30d"] = float(trade.wallet_winrate_30d)
-            details["min_wallet_winrate_30d"] = float(min_wr)
-
-    min_roi = hard.get("min_wallet_roi_30d_pct")
-    if min_roi is not None:
-        if trade.wallet_roi_30d_pct is None:
-            reasons.append(WALLET_MIN_ROI_FAIL)
-            details["wallet_roi_30d_pct"] = None
-            details["min_wallet_roi_30d_pct"] = float(min_roi)
-        elif float(trade.wallet_roi_30d_pct) < float(min_roi):
-            reasons.append(WALLET_MIN_ROI_FAIL)
-            details["wallet_roi_30d_pct"] = float(trade.wallet_roi_30d_pct)
-            details["min_wallet_roi_30d_pct"] = float(min_roi)
-
-    min_tr = hard.get("min_wallet_trades_30d")
-    if min_tr is not None:
-        if trade.wallet_trades_30d is None:
-            reasons.append(WALLET_MIN_TRADES_FAIL)
-            details["wallet_trades_30d"] = None
-            details["min_wallet_trades_30d"] = int(min_tr)
-        elif int(trade.wallet_trades_30d) < int(min_tr):
-            reasons.append(WALLET_MIN_TRADES_FAIL)
-            details["wallet_trades_30d"] = int(trade.wallet_trades_30d)
-            details["min_wallet_trades_30d"] = int(min_tr)
+        details[field] = value
+        details[key] = limit
+        return True
+
+    return GateStep(key, check)
+
+
+# Plans behind apply_gates() (configs that differ in gate values get separate plans).
+_shared_plans = GatePlanCache(max_plans=32)
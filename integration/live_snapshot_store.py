@@ -4,38 +4,119 @@ Live token snapshot store that fetches price data from Jupiter API.
 
 P0 goals:
 - HTTP GET calls to Jupiter API for real-time price data.
-- In-memory TTL cache (default 30 seconds) per mint.
+- EnrichmentCache TTL cache (default 30 seconds) per mint; concurrent misses
+  for one mint share a single request.
 - Returns TokenSnapshot with price data in extra field.
 - Fail-safe: Returns None on any network error.
+
+Prefetch mode (prefetch=True):
+- get() records per-mint access activity (last seen, decayed access score).
+- A background worker refreshes the hottest recently seen mints in batched
+  requests before their snapshots expire.
+- get() never blocks on HTTP for a mint seen within hot_window_sec: it serves
+  the last good snapshot (tagged with snapshot_age_sec / stale) or None.
 """
 
 from __future__ import annotations
 
 import sys
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from requests.exceptions import RequestException
 
+from ingestion.enrichment_cache import EnrichmentCache, get_enrichment_cache
 from integration.token_snapshot_store import TokenSnapshot
 
 
+@dataclass
+class MintActivity:
+    """Access statistics for one mint (prefetch mode)."""
+    last_seen: float
+    score: float = 0.0  # access count, halved every hot_window_sec
+    accesses: int = 0
+    fetched_at: Optional[float] = None
+
+    def score_at(self, now: float, half_life_sec: float) -> float:
+        return self.score * 0.5 ** (max(0.0, now - self.last_seen) / half_life_sec)
+
+
 class LiveTokenSnapshotStore:
     """Fetches and caches live token snapshots from Jupiter API."""
 
     JUPITER_PRICE_URL = "https://api.jup.ag/price/v2"
+    CACHE_SOURCE = "live_snapshot"
+    MAX_IDS_PER_REQUEST = 100
 
-    def __init__(self, ttl_seconds: int = 30):
+    def __init__(
+        self,
+        ttl_seconds: int = 30,
+        cache: Optional[EnrichmentCache] = None,
+        prefetch: bool = False,
+        hot_window_sec: float = 60.0,
+        refresh_ahead_sec: float = 5.0,
+        max_stale_sec: float = 300.0,
+        max_hot_mints: int = 500,
+        batch_size: int = MAX_IDS_PER_REQUEST,
+        interval_sec: float = 1.0,
+    ):
         """Initialize the store with TTL cache.
 
         Args:
             ttl_seconds: Time-to-live for cached data in seconds (default: 30).
+            cache: EnrichmentCache to use (default: the process-wide one).
+            prefetch: Keep recently seen mints warm from a background worker.
+            hot_window_sec: A mint seen within this window is kept warm.
+            refresh_ahead_sec: Refresh a warm mint this long before it expires.
+            max_stale_sec: How long past its TTL a snapshot may still be served.
+            max_hot_mints: Cap on warm mints (highest access score first).
+            batch_size: Mints per Jupiter request (at most MAX_IDS_PER_REQUEST).
+            interval_sec: Prefetch worker tick.
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_timestamps: Dict[str, float] = {}
+        self._cache = cache or get_enrichment_cache()
         self._ttl_seconds = ttl_seconds
+        self._cache_source = self.CACHE_SOURCE
+
+        self._prefetch = prefetch
+        self._hot_window_sec = float(hot_window_sec)
+        self._refresh_ahead_sec = float(refresh_ahead_sec)
+        self._max_hot_mints = int(max_hot_mints)
+        self._batch_size = max(1, min(int(batch_size), self.MAX_IDS_PER_REQUEST))
+        self._interval_sec = float(interval_sec)
+        # Activity older than this is forgotten (it no longer ranks anyway).
+        self._forget_after_sec = 10 * self._hot_window_sec
+
+        self._lock = threading.Lock()
+        self._activity: Dict[str, MintActivity] = {}
+        self.stats: Dict[str, int] = {
+            "blocking_fetches": 0,
+            "deferred_misses": 0,
+            "served_stale": 0,
+            "prefetch_batches": 0,
+            "prefetched": 0,
+            "prefetch_errors": 0,
+            "prefetch_missing": 0,
+        }
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        if prefetch:
+            # Last good snapshots stay servable for max_stale_sec past their TTL. The
+            # cache may be shared, so use a source of our own instead of rewriting
+            # (and clearing) the policy other stores rely on.
+            self._cache_source = f"{self.CACHE_SOURCE}:stale={float(max_stale_sec):g}"
+            policy = replace(self._cache.policy(self.CACHE_SOURCE), stale_ttl_sec=max_stale_sec)
+            if self._cache.policy(self._cache_source) != policy:
+                self._cache.register_source(self._cache_source, policy)
+            self._worker = threading.Thread(
+                target=self._prefetch_loop, name="live-snapshot-prefetch", daemon=True
+            )
+            self._worker.start()
 
     def get(self, mint: str) -> Optional[TokenSnapshot]:
         """Fetch and cache token data for the given mint.
@@ -50,46 +131,209 @@ class LiveTokenSnapshotStore:
             self._log_error("get called with empty mint")
             return None
 
-        # Check cache validity
         now = time.time()
-        cached = self._cache.get(mint)
-        cached_ts = self._cache_timestamps.get(mint)
+        if self._prefetch:
+            seen_recently = self._record_access(mint, now)
+            cached = self._cache.get(self._cache_source, mint, allow_stale=True)
+            if cached is not None:
+                return self._snapshot_from_cached(mint, cached, now)
+            if seen_recently:
+                # The worker owns this mint now; never block the gate path on it.
+                self._bump("deferred_misses")
+                self._wake.set()
+                return None
+
+        # Cached response, or one shared fetch (errors are not cached)
+        cached = self._cache.get_or_load(
+            self._cache_source, mint, lambda: self._load_one(mint), ttl_sec=self._ttl_seconds
+        )
+        if cached is None:
+            return None
+        return self._snapshot_from_cached(mint, cached, time.time())
+
+    def touch(self, mint: str) -> None:
+        """Record interest in a mint without reading it (prefetch mode only)."""
+        if self._prefetch and mint:
+            self._record_access(mint, time.time())
+            self._wake.set()
+
+    def hot_mints(self, now: Optional[float] = None) -> List[str]:
+        """Mints the prefetcher keeps warm, highest access score first."""
+        now = time.time() if now is None else now
+        horizon = now - self._hot_window_sec
+        with self._lock:
+            ranked = [
+                (a.score_at(now, self._hot_window_sec), mint)
+                for mint, a in self._activity.items()
+                if a.last_seen >= horizon
+            ]
+        ranked.sort(reverse=True)
+        return [mint for _, mint in ranked[: self._max_hot_mints]]
+
+    def activity(self, mint: str) -> Optional[MintActivity]:
+        """Access statistics for a mint (None if not seen recently)."""
+        with self._lock:
+            return self._activity.get(mint)
+
+    def prefetch_once(self, now: Optional[float] = None) -> int:
+        """Refresh warm mints that expire within refresh_ahead_sec; returns mints refreshed."""
+        now = time.time() if now is None else now
+        self._forget_cold(now)
+        due_before = now + self._refresh_ahead_sec
+        due: List[str] = []
+        for mint in self.hot_mints(now):
+            a = self.activity(mint)
+            if a is None or a.fetched_at is None or a.fetched_at + self._ttl_seconds <= due_before:
+                due.append(mint)
 
-        if cached is not None and cached_ts is not None:
-            if now - cached_ts < self._ttl_seconds:
-                return self._build_snapshot(mint, cached)
+        refreshed = 0
+        for i in range(0, len(due), self._batch_size):
+            batch = due[i : i + self._batch_size]
+            body = self._fetch(batch)
+            self._bump("prefetch_batches")
+            if body is None:
+                # Keep serving the last good snapshots; retried next tick.
+                self._bump("prefetch_errors")
+                continue
+            fetched_at = time.time()
+            for mint in batch:
+                data = self._split_response(body, mint)
+                if data is None:
+                    # No price in this response: keep the last good snapshot.
+                    self._bump("prefetch_missing")
+                    continue
+                self._store(mint, data, fetched_at)
+                refreshed += 1
+        self._bump("prefetched", refreshed)
+        return refreshed
 
-        # Fetch fresh data from Jupiter API
+    def close(self) -> None:
+        """Stop the prefetch worker (no-op without prefetch)."""
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=5.0)
+            self._worker = None
+
+    def _prefetch_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._interval_sec)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.prefetch_once()
+            except Exception as e:
+                self._log_error(f"prefetch failed: {e}")
+
+    def _bump(self, name: str, n: int = 1) -> None:
+        """Add to a stats counter (updated from the gate path and the worker)."""
+        with self._lock:
+            self.stats[name] += n
+
+    def _record_access(self, mint: str, now: float) -> bool:
+        """Update access stats; True if the mint was already seen within hot_window_sec."""
+        with self._lock:
+            a = self._activity.get(mint)
+            if a is None:
+                a = self._activity[mint] = MintActivity(last_seen=now)
+                seen_recently = False
+            else:
+                seen_recently = now - a.last_seen <= self._hot_window_sec
+                a.score = a.score_at(now, self._hot_window_sec)
+                a.last_seen = now
+            a.score += 1.0
+            a.accesses += 1
+            return seen_recently
+
+    def _forget_cold(self, now: float) -> None:
+        horizon = now - self._forget_after_sec
+        with self._lock:
+            cold = [mint for mint, a in self._activity.items() if a.last_seen < horizon]
+            for mint in cold:
+                del self._activity[mint]
+
+    def _load_one(self, mint: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Blocking single-mint fetch (cache loader); returns (fetched_at, response) or None."""
+        self._bump("blocking_fetches")
+        body = self._fetch([mint])
+        if body is None:
+            return None
+        fetched_at = time.time()
+        if self._prefetch:
+            with self._lock:
+                a = self._activity.get(mint)
+                if a is not None:
+                    a.fetched_at = fetched_at
+        return fetched_at, body
+
+    def _store(self, mint: str, data: Dict[str, Any], fetched_at: float) -> None:
+        self._cache.set(self._cache_source, mint, (fetched_at, data), ttl_sec=self._ttl_seconds)
+        with self._lock:
+            a = self._activity.get(mint)
+            if a is not None:
+                a.fetched_at = fetched_at
+
+    @staticmethod
+    def _split_response(body: Dict[str, Any], mint: str) -> Optional[Dict[str, Any]]:
+        """One mint's slice of a batched price response, in single-mint response shape.
+
+        None when the mint is absent from the response or its entry is null.
+        """
+        entry = (body.get("data") or {}).get(mint)
+        if not entry:
+            return None
+        return {"data": {mint: entry}}
+
+    def _fetch(self, mints: List[str]) -> Optional[Dict[str, Any]]:
+        """GET the Jupiter price response for up to MAX_IDS_PER_REQUEST mints (None on error)."""
+        ids = ",".join(mints)
         try:
             response = requests.get(
                 self.JUPITER_PRICE_URL,
-                params={"ids": mint},
+                params={"ids": ids},
                 timeout=5,
             )
             response.raise_for_status()
             data = response.json()
 
-            self._log_request(f"GET {self.JUPITER_PRICE_URL}?ids={mint} -> 200")
-
-            # Cache the result
-            self._cache[mint] = data
-            self._cache_timestamps[mint] = now
+            self._log_request(f"GET {self.JUPITER_PRICE_URL}?ids={ids} -> 200")
 
-            return self._build_snapshot(mint, data)
+            return data
 
         except RequestException as e:
-            self._log_error(f"HTTP error for mint {mint}: {e}")
+            self._log_error(f"HTTP error for mints {ids}: {e}")
             return None
         except (ValueError, KeyError) as e:
-            self._log_error(f"Parse error for mint {mint}: {e}")
+            self._log_error(f"Parse error for mints {ids}: {e}")
             return None
 
-    def _build_snapshot(self, mint: str, data: Dict[str, Any]) -> TokenSnapshot:
+    def _snapshot_from_cached(
+        self, mint: str, cached: Tuple[float, Dict[str, Any]], now: float
+    ) -> TokenSnapshot:
+        fetched_at, data = cached
+        age = max(0.0, now - fetched_at)
+        stale = age > self._ttl_seconds
+        if stale:
+            self._bump("served_stale")
+        return self._build_snapshot(mint, data, fetched_at=fetched_at, age_sec=age, stale=stale)
+
+    def _build_snapshot(
+        self,
+        mint: str,
+        data: Dict[str, Any],
+        fetched_at: float,
+        age_sec: float = 0.0,
+        stale: bool = False,
+    ) -> TokenSnapshot:
         """Build a TokenSnapshot from Jupiter API response.
 
         Args:
             mint: The token mint address.
             data: The parsed JSON response from Jupiter API.
+            fetched_at: Unix time the response was fetched (ts_snapshot).
+            age_sec: Snapshot age when served.
+            stale: True if served past its TTL.
 
         Returns:
             TokenSnapshot with price data extracted.
@@ -99,7 +343,7 @@ class LiveTokenSnapshotStore:
 
         # Jupiter API v2 response format: {"data": {<mint>: {"price": "..."}}}
         data_body = data.get("data", {})
-        mint_data = data_body.get(mint, {})
+        mint_data = data_body.get(mint) or {}
 
         price = mint_data.get("price")
         if price is not None:
@@ -110,10 +354,13 @@ class LiveTokenSnapshotStore:
 
         # Include the raw mint data in extra for debugging
         extra["jupiter_raw"] = mint_data
+        extra["snapshot_age_sec"] = round(age_sec, 3)
+        extra["stale"] = stale
 
+        ts = datetime.fromtimestamp(fetched_at, tz=timezone.utc).replace(tzinfo=None)
         return TokenSnapshot(
             mint=mint,
-            ts_snapshot=datetime.utcnow().isoformat() + "Z",
+            ts_snapshot=ts.isoformat() + "Z",
             liquidity_usd=None,  # Jupiter price API doesn't provide liquidity
             extra=extra if extra else None,
         )
@@ -128,5 +375,4 @@ class LiveTokenSnapshotStore:
 
     def clear_cache(self) -> None:
         """Clear all cached data."""
-        self._cache.clear()
-        self._cache_timestamps.clear()
+        self._cache.clear(self._cache_source)
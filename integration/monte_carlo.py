@@ -2,19 +2,43 @@
 # integration/monte_carlo.py
 # Monte Carlo Harness for robustness verification.
 # Executes strategy simulation multiple times with controlled randomization.
+#
+# Engines:
+# - "numpy" (default when NumPy is installed): runs are simulated in blocks; each
+#   block draws its runs x trades perturbation matrix from its own seeded Generator
+#   and gets capital paths from cumprod and drawdowns from maximum.accumulate.
+#   Blocks can be split across processes; results depend only on (seed, runs, trades).
+# - "python": the per-run reference loop (run_simulation) with random.Random(seed + i).
+# The two engines use different random streams, so their quantiles agree in
+# distribution, not digit for digit.
 
 import argparse
 import json
+import multiprocessing
 import random
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from strategy.statistics import calculate_quantiles, calculate_win_probability, calculate_max_drawdown
 
+ENGINES = ("auto", "numpy", "python")
+
+# Upper bound on runs x trades cells per vectorized block (~16 MB per float64 matrix).
+_BLOCK_CELLS = 2_000_000
+_BLOCK_RUNS_MAX = 256
+
+# Per-process state set by _init_worker (side signs + sim params).
+_WORKER: Dict[str, Any] = {}
+
 
 def load_jsonl(file_path: str) -> List[Dict]:
     """Load JSONL file and return list of dicts."""
@@ -74,8 +98,8 @@ def run_simulation(
     """
     rng = random.Random(seed)
 
-    # Make a copy of trades to avoid modifying original
-    iteration_trades = [t.copy() for t in trades]
+    # Trades are only read, so a shallow list copy is enough to shuffle
+    iteration_trades = list(trades)
 
     # Optionally shuffle trade order
     if shuffle:
@@ -166,6 +190,143 @@ def run_simulation(
     }
 
 
+def _sim_params(config: Dict[str, Any]) -> Dict[str, float]:
+    """Scalar settings used by the vectorized engine (same defaults as run_simulation)."""
+    sim_config = config.get("simulation", {})
+    rand_config = config.get("pipeline", {}).get("randomization", {})
+    noise_lo, noise_hi = rand_config.get("price_noise_range", [0.0, 0.02])
+    return {
+        "initial_capital": float(sim_config.get("initial_capital", 10000.0)),
+        "position_size_pct": float(sim_config.get("position_size_pct", 0.5)),
+        "stop_loss_pct": float(sim_config.get("stop_loss_pct", 0.05)),
+        "take_profit_pct": float(sim_config.get("take_profit_pct", 0.10)),
+        "noise_lo": float(noise_lo),
+        "noise_hi": float(noise_hi),
+    }
+
+
+def _block_runs(n_trades: int) -> int:
+    return max(1, min(_BLOCK_RUNS_MAX, _BLOCK_CELLS // max(1, n_trades)))
+
+
+def simulate_block(
+    side_sign: Any,
+    params: Dict[str, float],
+    seed: int,
+    block: int,
+    runs: int,
+    shuffle: bool = True,
+) -> Tuple[Any, Any, Any]:
+    """Simulate `runs` iterations at once.
+
+    Same model as run_simulation: position = capital * position_size_pct (capped at
+    capital), trade return = +/- uniform(-1, 1) * price_noise_pct clipped to
+    [-stop_loss_pct, take_profit_pct], so capital compounds as a cumprod. Slippage and
+    latency jitter do not enter PnL there, so no matrices are drawn for them.
+
+    Args:
+        side_sign: float array of +1 (buy) / -1 (sell) per trade.
+        block: Block index; the Generator is seeded from (seed, block).
+
+    Returns:
+        (final_capital, roi_pct, max_drawdown_pct) arrays of length runs.
+    """
+    # SeedSequence needs non-negative entropy; fold negative seeds into uint64.
+    rng = np.random.default_rng(np.random.SeedSequence(seed % (1 << 64), spawn_key=(block,)))
+    initial = params["initial_capital"]
+    n = len(side_sign)
+
+    noise_pct = rng.uniform(params["noise_lo"], params["noise_hi"], runs)
+    if n == 0:
+        final = np.full(runs, initial)
+        max_dd = np.zeros(runs)
+    else:
+        change = rng.uniform(-1.0, 1.0, (runs, n))
+        if shuffle:
+            change *= rng.permuted(np.tile(side_sign, (runs, 1)), axis=1)
+        else:
+            change *= side_sign
+        change *= noise_pct[:, None]
+        np.clip(change, -params["stop_loss_pct"], params["take_profit_pct"], out=change)
+
+        change *= min(params["position_size_pct"], 1.0)
+        change += 1.0
+        capital = np.cumprod(change, axis=1)
+        capital *= initial
+        final = capital[:, -1].copy()
+
+        peak = np.maximum.accumulate(capital, axis=1)
+        np.maximum(peak, initial, out=peak)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = np.where(peak > 0, (peak - capital) / peak, 0.0)
+        max_dd = np.maximum(dd.max(axis=1), 0.0)
+
+    roi = (final - initial) / initial * 100 if initial > 0 else np.zeros(runs)
+    return final, roi, max_dd * 100
+
+
+def _init_worker(side_sign: Any, params: Dict[str, float], seed: int, runs: int, shuffle: bool) -> None:
+    _WORKER.update(side_sign=side_sign, params=params, seed=seed, runs=runs, shuffle=shuffle)
+
+
+def _run_block(block: int) -> Tuple[int, Any, Any, Any]:
+    w = _WORKER
+    size = _block_runs(len(w["side_sign"]))
+    runs = min(size, w["runs"] - block * size)
+    return (block, *simulate_block(w["side_sign"], w["params"], w["seed"], block, runs, w["shuffle"]))
+
+
+def run_vectorized(
+    trades: List[Dict],
+    config: Dict[str, Any],
+    runs: int,
+    seed: int,
+    shuffle: bool = True,
+    workers: int = 1,
+    progress: Optional[Any] = None,
+) -> Tuple[Any, Any, Any]:
+    """Run all iterations with the NumPy engine.
+
+    Args:
+        workers: Processes to split blocks across (results do not depend on it).
+        progress: Optional callback(done_runs) called as blocks finish.
+
+    Returns:
+        (final_capital, roi_pct, max_drawdown_pct) arrays of length runs, in run order.
+    """
+    if np is None:
+        raise RuntimeError("numpy engine requires numpy")
+
+    side_sign = np.asarray([1.0 if t.get("side", "buy") == "buy" else -1.0 for t in trades], dtype=np.float64)
+    params = _sim_params(config)
+    size = _block_runs(len(side_sign))
+    n_blocks = (runs + size - 1) // size
+
+    final = np.empty(runs)
+    roi = np.empty(runs)
+    dd = np.empty(runs)
+    init_args = (side_sign, params, seed, runs, shuffle)
+
+    def _collect(results: Any) -> None:
+        done = 0
+        for block, f, r, d in results:
+            lo = block * size
+            final[lo:lo + len(f)] = f
+            roi[lo:lo + len(r)] = r
+            dd[lo:lo + len(d)] = d
+            done += len(f)
+            if progress is not None:
+                progress(done)
+
+    if workers <= 1 or n_blocks <= 1:
+        _init_worker(*init_args)
+        _collect(_run_block(b) for b in range(n_blocks))
+    else:
+        with multiprocessing.Pool(processes=min(workers, n_blocks), initializer=_init_worker, initargs=init_args) as pool:
+            _collect(pool.imap_unordered(_run_block, range(n_blocks)))
+    return final, roi, dd
+
+
 class MonteCarloRunner:
     """Monte Carlo simulation harness for strategy robustness verification."""
 
@@ -176,6 +337,8 @@ class MonteCarloRunner:
         runs: int = 1000,
         seed: int = 42,
         shuffle: bool = True,
+        engine: str = "auto",
+        workers: int = 1,
     ):
         """
         Initialize the Monte Carlo runner.
@@ -186,12 +349,23 @@ class MonteCarloRunner:
             runs: Number of simulation runs.
             seed: Master random seed.
             shuffle: Whether to shuffle trade order each iteration.
+            engine: "numpy", "python", or "auto" (numpy if installed).
+            workers: Processes for the numpy engine.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+        if engine == "auto":
+            engine = "numpy" if np is not None else "python"
+        if engine == "numpy" and np is None:
+            raise RuntimeError("numpy engine requires numpy")
+
         self.trades_path = trades_path
         self.config_path = config_path
         self.runs = runs
         self.seed = seed
         self.shuffle = shuffle
+        self.engine = engine
+        self.workers = workers
 
         # Load data once
         self.trades = load_jsonl(trades_path)
@@ -239,6 +413,10 @@ class MonteCarloRunner:
         self.roi_values = []
         self.dd_values = []
 
+        if self.engine == "numpy":
+            self._run_all_vectorized(verbose)
+            return self._summary()
+
         # Run iterations
         for i in range(self.runs):
             result = self.run_iteration(i)
@@ -251,6 +429,35 @@ class MonteCarloRunner:
                 progress = ((i + 1) / self.runs) * 100
                 print(f"[monte_carlo] Progress: {progress:.0f}%", file=sys.stderr)
 
+        return self._summary()
+
+    def _run_all_vectorized(self, verbose: bool) -> None:
+        step = max(1, self.runs // 10)
+        reported = [0]
+
+        def _progress(done: int) -> None:
+            if verbose and self.runs > 10 and done // step > reported[0]:
+                reported[0] = done // step
+                print(f"[monte_carlo] Progress: {done / self.runs * 100:.0f}%", file=sys.stderr)
+
+        final, roi, dd = run_vectorized(
+            self.trades,
+            self.config,
+            runs=self.runs,
+            seed=self.seed,
+            shuffle=self.shuffle,
+            workers=self.workers,
+            progress=_progress,
+        )
+        initial = _sim_params(self.config)["initial_capital"]
+        self.roi_values = roi.tolist()
+        self.dd_values = dd.tolist()
+        self.results = [
+            {"total_pnl": f - initial, "roi_pct": r, "max_drawdown_pct": d, "final_capital": f}
+            for f, r, d in zip(final.tolist(), self.roi_values, self.dd_values)
+        ]
+
+    def _summary(self) -> Dict:
         # Calculate statistics
         roi_quantiles = calculate_quantiles(self.roi_values, [5, 50, 95])
         dd_quantiles = calculate_quantiles(self.dd_values, [5, 50, 95])
@@ -288,6 +495,13 @@ def main():
     parser.add_argument(
         "--quiet", action="store_true", help="Suppress progress output"
     )
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="auto",
+        help="Simulation engine (auto = numpy if installed)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Processes for the numpy engine"
+    )
 
     args = parser.parse_args()
 
@@ -302,6 +516,8 @@ def main():
         runs=args.runs,
         seed=args.seed,
         shuffle=args.shuffle,
+        engine=args.engine,
+        workers=args.workers,
     )
 
     # Run all iterations
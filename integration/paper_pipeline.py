@@ -12,6 +12,8 @@ What it does:
 - For passing BUY trades:
   - inserts into signals_raw (via integration/write_signal.py helpers)
   - emits a minimal wallet_score event (for traceability)
+- Per-trade ClickHouse rows (signals, wallet scores, rejects) are buffered and sent as
+  multi-row inserts (integration/ch_buffered_writer.py), drained at the end of the run
 
 P0.1 additions vs P0:
 - JSONL parsing/validation moved into integration/trade_normalizer.py
@@ -25,23 +27,34 @@ import argparse
 import json
 import os
 import sys
+import time
 import uuid
 from dataclasses import replace
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Union
 
-from integration.config_loader import load_params_base, init_reloader, stop_reloader, get_runtime_config, apply_runtime_overrides
+from integration.config_loader import (
+    load_params_base,
+    init_reloader,
+    stop_reloader,
+    set_base_config,
+    get_config_snapshot,
+)
 from integration.mode_registry import resolve_modes
 from integration.ch_client import ClickHouseConfig, make_runner
+from integration.ch_buffered_writer import BufferedClickHouseWriter
 from integration.trade_types import Trade
 from integration.trade_normalizer import load_trades_jsonl, normalize_trade_record
 from integration.token_snapshot_store import TokenSnapshot, TokenSnapshotStore
 from integration.run_trace import get_run_trace_id
-from integration.gates import apply_gates
+from integration.gates import GatePlanCache
 from integration.reject_reasons import INVALID_TRADE, MISSING_SNAPSHOT, RISK_COOLDOWN, RISK_MODE_LIMIT, RISK_WALLET_TIER_LIMIT
-from integration.parquet_io import ParquetReadConfig, iter_parquet_records
+from integration.parquet_io import ParquetReadConfig, iter_parquet_records, iter_parquet_column_batches
 from integration.allowlist_loader import load_allowlist
+from integration.columnar_replay import COLUMNAR_BATCH_SIZE, PrefilteredRows, iter_columnar_items
+from ingestion.enrichment_cache import configure_enrichment_cache_from_config
+from ops.panic import PanicWatcher
 
 # PR-F.1: Conditional import for RpcSource (live ingestion)
 try:
@@ -86,6 +99,21 @@ from integration.signals_dump import write_signals_jsonl_atomic
 # PR-8.1: signals dump schema version
 SIGNALS_SCHEMA_VERSION = "signals.v1"
 
+# Buffered ClickHouse writer of the current run (non-dry-run only); drained in main()'s finally.
+_CH_WRITER: Optional[BufferedClickHouseWriter] = None
+
+
+def _close_ch_writer() -> None:
+    """Drain the run's buffered ClickHouse writes on shutdown (no-op if already closed)."""
+    global _CH_WRITER
+    writer, _CH_WRITER = _CH_WRITER, None
+    if writer is None or writer.closed:
+        return
+    try:
+        writer.close()
+    except Exception as e:
+        print(f"ERROR: clickhouse_drain_failed: {e}", file=sys.stderr)
+
 
 def _mk_allowlist_version_row(
     ts: str,
@@ -204,17 +232,20 @@ def _get_sim_results_per_trade(
     Returns a dict mapping (wallet, mint) -> {exit_reason, pnl_usd, roi}.
     """
     from collections import defaultdict
-    from integration.sim_preflight import _ts_to_seconds, _simulate_exit, compute_edge_bps
+    from integration.sim_preflight import compute_edge_bps
+    from integration.tick_index import TickIndex
+    from integration.ts_parse import TsCache
 
     min_edge_bps = int(cfg.get("min_edge_bps", 0))
 
     # Build tick index per mint
+    ts_cache = TsCache()
     ticks_by_mint: Dict[str, list] = defaultdict(list)
     for t in trades_norm:
         mint = str(getattr(t, "mint", "") or "")
         if not mint:
             continue
-        ts_sec = _ts_to_seconds(getattr(t, "ts", ""))
+        ts_sec = ts_cache(getattr(t, "ts", ""))
         px_raw = getattr(t, "price", None)
         try:
             px = float(px_raw)
@@ -222,8 +253,7 @@ def _get_sim_results_per_trade(
             continue
         ticks_by_mint[mint].append((ts_sec, px))
 
-    for mint, arr in ticks_by_mint.items():
-        arr.sort(key=lambda x: x[0])
+    tick_index = TickIndex.from_ticks(ticks_by_mint)
 
     results: Dict[tuple, Dict[str, Any]] = {}
 
@@ -243,7 +273,7 @@ def _get_sim_results_per_trade(
         except Exception:
             continue
 
-        entry_ts_sec = _ts_to_seconds(getattr(t, "ts", ""))
+        entry_ts_sec = ts_cache(getattr(t, "ts", ""))
 
         # Get snapshot
         snap = None
@@ -275,11 +305,10 @@ def _get_sim_results_per_trade(
 
         # Simulate exit
         mode_cfg = (cfg.get("modes") or {}).get(mode, {})
-        fut = ticks_by_mint.get(mint, [])
-        exit_price, exit_reason = _simulate_exit(
+        exit_price, exit_reason = tick_index.simulate_exit(
+            mint,
             entry_price=entry_price,
             entry_ts_sec=entry_ts_sec,
-            future_ticks=fut,
             cfg_mode=mode_cfg,
         )
 
@@ -338,6 +367,12 @@ def main() -> int:
         help="Optional JSON mapping of target_col->source_col for parquet rename (e.g. {'ts':'block_ts'}).",
     )
     ap.add_argument("--parquet-limit", type=int, default=None, help="Optional limit for parquet replay")
+    ap.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Columnar parquet replay: vectorized normalization + token gates per batch; "
+        "only surviving rows become Trade objects. Requires --trades-parquet and numpy.",
+    )
     # PR-F.1: Live ingestion source arguments
     ap.add_argument(
         "--source-type",
@@ -366,6 +401,11 @@ def main() -> int:
         action="store_true",
         help="Use live Jupiter API for token snapshots instead of file-based store",
     )
+    ap.add_argument(
+        "--live-snapshot-prefetch",
+        action="store_true",
+        help="With --live-snapshots: keep recently traded mints warm from a background worker (serves last good snapshot)",
+    )
     ap.add_argument(
         "--wallet-profiles",
         default="",
@@ -434,6 +474,9 @@ def main() -> int:
     ap.add_argument("--bitquery-source", default="", help="Path to Bitquery fixture or 'live'")
     # PR-Y.5: Config Hot-Reload
     ap.add_argument("--hot-reload-config", action="store_true", help="Enable dynamic configuration reloading")
+    # Buffered ClickHouse writes (non-dry-run)
+    ap.add_argument("--ch-batch-rows", type=int, default=500, help="Flush a ClickHouse table buffer at this many rows")
+    ap.add_argument("--ch-flush-sec", type=float, default=1.0, help="Flush a ClickHouse table buffer once its oldest row is this old")
     # PR-PM.5: Risk Regime Integration
     ap.add_argument(
         "--regime-input",
@@ -460,6 +503,7 @@ def main() -> int:
     try:
         return _main_inner(args)
     finally:
+        _close_ch_writer()
         stop_reloader()
 
 def _main_inner(args) -> int:
@@ -499,11 +543,21 @@ def _main_inner(args) -> int:
             file=sys.stderr,
         )
         return 1
+
+    if args.live_snapshot_prefetch and not args.live_snapshots:
+        print(
+            "[ERROR] --live-snapshot-prefetch requires --live-snapshots.",
+            file=sys.stderr,
+        )
+        return 1
     
     # Load config normally
     loaded = load_params_base(args.config)
     cfg = loaded.config
 
+    # Process-wide enrichment cache (disk tier from run.enrichment_cache)
+    configure_enrichment_cache_from_config(cfg)
+
     def _log(msg: str) -> None:
         """Human logs.
 
@@ -520,9 +574,15 @@ def _main_inner(args) -> int:
     ch_cfg = ClickHouseConfig()
 
     # Runner is only needed when writing to ClickHouse.
+    # Per-trade rows (signals, wallet scores, rejects) go through one buffered writer
+    # instead of one HTTP insert each; run-level events below are written directly.
+    global _CH_WRITER
     runner = None
+    ch_writer: Optional[BufferedClickHouseWriter] = None
     if not args.dry_run:
         runner = make_runner(ch_cfg)
+        ch_writer = BufferedClickHouseWriter(runner, max_rows=args.ch_batch_rows, max_age_sec=args.ch_flush_sec)
+        _CH_WRITER = ch_writer
 
     resolved_modes = resolve_modes(cfg)
 
@@ -596,14 +656,25 @@ def _main_inner(args) -> int:
 
     _log(f"[ok] wrote forensics_events config_version: {loaded.config_hash[:12]}… trace={run_trace_id}")
 
+    # Allowlist is read once per run for the per-trade writers (not once per signal).
+    allowlist_cache: list = []
+
+    def _run_allowlist() -> Any:
+        if not allowlist_cache:
+            allowlist_cache.append(load_allowlist(args.allowlist))
+        return allowlist_cache[0]
+
     # 2) Snapshot store (can be empty if file missing, but then gates will reject)
     # PR-F.2: Use live snapshot store if --live-snapshots is set
     if args.live_snapshots:
         if not HAS_LIVE_SNAPSHOT_STORE:
             _log("[error] LiveTokenSnapshotStore not available. Install required dependencies.")
             return 1
-        store = LiveTokenSnapshotStore()
-        _log("[ok] using live token snapshots from Jupiter API")
+        store = LiveTokenSnapshotStore(prefetch=args.live_snapshot_prefetch)
+        _log(
+            "[ok] using live token snapshots from Jupiter API"
+            + (" (prefetch)" if args.live_snapshot_prefetch else "")
+        )
     else:
         store = TokenSnapshotStore(args.token_snapshot)
         try:
@@ -644,6 +715,12 @@ def _main_inner(args) -> int:
         _log("[info] provide exactly one input: --trades-jsonl OR --trades-parquet. Done.")
         return 0
 
+    if args.columnar and not args.trades_parquet:
+        _log("[error] --columnar requires --trades-parquet.")
+        return 1
+
+    collect_for_sim = bool(args.summary_json and (args.sim_preflight or args.execution_preflight))
+
     # Build an iterator of Trade/Reject from either source.
     def _iter_inputs():
         # PR-Y.4: Bitquery Source
@@ -815,6 +892,22 @@ def _main_inner(args) -> int:
                 yield {"_reject": True, "lineno": 0, "reason": INVALID_TRADE, "detail": f"bad_parquet_colmap:{e}"}
                 return
 
+        if args.columnar:
+            pcfg = ParquetReadConfig(
+                path=args.trades_parquet, limit=args.parquet_limit, batch_size=COLUMNAR_BATCH_SIZE, colmap=colmap
+            )
+            # Gate-rejected rows are only counted unless a later stage needs every Trade.
+            materialize_all = collect_for_sim or bool(args.signals_out) or runner is not None
+            yield from iter_columnar_items(
+                iter_parquet_column_batches(pcfg),
+                cfg=cfg,
+                get_cfg=lambda: get_config_snapshot().config or cfg,
+                store=store,
+                only_buy=bool(args.only_buy),
+                materialize_all=materialize_all,
+            )
+            return
+
         pcfg = ParquetReadConfig(path=args.trades_parquet, limit=args.parquet_limit, colmap=colmap)
         for i, rec in enumerate(iter_parquet_records(pcfg), start=1):
             if not isinstance(rec, dict):
@@ -869,37 +962,67 @@ def _main_inner(args) -> int:
     # PR-8.1: signals dump collection
     signal_rows: list[dict] = []
 
-    collect_for_sim = bool(args.summary_json and (args.sim_preflight or args.execution_preflight))
     trades_norm_for_sim = []  # Trade objects only (includes future ticks)
 
     # Track lineno for each trade for signals dump
     trade_lineno = 0
 
+    gate_plans = GatePlanCache()
+
+    # PR-Y.5: the reloader publishes cfg pre-merged with runtime overrides;
+    # per trade we only compare the snapshot generation.
+    set_base_config(cfg)
+    cfg_generation = -1
+
+    # PR-Z.1: Kill-switch (only in non-dry-run mode); per trade we read a cached flag.
+    panic_watcher = None if args.dry_run else PanicWatcher().start()
+
+    # Test helper: slow down pipeline if requested
+    try:
+        test_sleep_sec = float(os.environ.get("PAPER_PIPELINE_SLEEP_SEC") or 0.0)
+    except ValueError:
+        test_sleep_sec = 0.0
+
     for item in _iter_inputs():
-        # PR-Y.5: Update config from reloader (cheap thread-safe read)
-        runtime_conf = get_runtime_config()
-        # Update cfg (shadowing outer scope for this iteration)
-        cfg = apply_runtime_overrides(cfg, runtime_conf)
-        
-        # Test helper: slow down pipeline if requested
-        test_sleep = os.environ.get("PAPER_PIPELINE_SLEEP_SEC")
-        if test_sleep:
-            import time
-            try:
-                time.sleep(float(test_sleep))
-            except ValueError:
-                pass
+        config_snapshot = get_config_snapshot()
+        if config_snapshot.generation != cfg_generation:
+            cfg, cfg_generation = config_snapshot.config, config_snapshot.generation
+
+        # PR-Z.1: Kill-switch check (covers columnar batches and single rows alike)
+        if panic_watcher is not None and panic_watcher.active:
+            _log("[panic] KILL SWITCH ACTIVE. HALTING PIPELINE.")
+            break
+
+        if test_sleep_sec:
+            time.sleep(test_sleep_sec)
+
+        # Columnar replay: rows already resolved by vectorized normalization + token gates.
+        if isinstance(item, PrefilteredRows):
+            total_lines += item.rows
+            trade_lineno += item.rows
+            normalized_ok += item.rows
+            for (explicit_mode, wallet, reason), n in item.counts:
+                mode_bucket = pick_mode(explicit_mode)
+                tier_bucket = "__missing_wallet_profile__"
+                if wallet_store is not None:
+                    wp_for_tier = wallet_store.get(wallet)
+                    if wp_for_tier is not None:
+                        tier_bucket = resolve_tier(wp_for_tier, cfg)
+                counter = "filtered_out" if reason is None else "rejected_by_gates"
+                for bucket in (mode_counts[mode_bucket], tier_counts[tier_bucket]):
+                    bucket["total_lines"] += n
+                    bucket["normalized_ok"] += n
+                    bucket[counter] += n
+                if reason is None:
+                    filtered_out += n
+                else:
+                    rejected_by_gates += n
+                    reject_counts[reason] += n
+            continue
 
         total_lines += 1
         trade_lineno += 1
 
-        # PR-Z.1: Kill-switch check (only in non-dry-run mode)
-        if not args.dry_run:
-            from ops.panic import check_panic
-            if check_panic():
-                logger.critical("KILL SWITCH ACTIVE. HALTING PIPELINE.")
-                break
-
         explicit_mode: Optional[str] = None
         if isinstance(item, dict):
             m = item.get("mode")
@@ -955,9 +1078,9 @@ def _main_inner(args) -> int:
                 )
                 signal_rows.append(signal_row)
 
-            if runner is not None:
+            if ch_writer is not None:
                 insert_trade_reject(
-                    runner=runner,
+                    runner=ch_writer,
                     chain=args.chain,
                     env=args.env,
                     trace_id=run_trace_id,
@@ -1005,7 +1128,9 @@ def _main_inner(args) -> int:
         # Prefer inline snapshot, else pull from local store
         snap = _snapshot_from_trade_inline(t) or store.get(t.mint)
 
-        decision = apply_gates(cfg=cfg, trade=t, snapshot=snap)
+        # Compiled gates, recompiled only when the config version changes; only
+        # passed/primary_reason are consumed here, so the plan may short-circuit.
+        decision = gate_plans.get(cfg, version=cfg_generation).evaluate(t, snap, short_circuit=True)
         if not decision.passed:
             reject_counts[decision.primary_reason or "rejected"] += 1
             rejected_by_gates += 1
@@ -1051,9 +1176,9 @@ def _main_inner(args) -> int:
                 signal_rows.append(signal_row)
 
             # Emit queryable reject event (CH only)
-            if runner is not None:
+            if ch_writer is not None:
                 insert_trade_reject(
-                    runner=runner,
+                    runner=ch_writer,
                     chain=args.chain,
                     env=args.env,
                     trace_id=run_trace_id,
@@ -1086,7 +1211,7 @@ def _main_inner(args) -> int:
                     trades=[t],
                     portfolio=portfolio,
                     cfg=cfg,
-                    runner=runner,
+                    runner=ch_writer,
                     trace_id=run_trace_id,
                     chain=args.chain,
                     env=args.env,
@@ -1255,6 +1380,8 @@ def _main_inner(args) -> int:
                 require_allowlist=bool(args.require_allowlist),
                 log_allowlist_version=False,
                 dry_run=False,
+                runner=ch_writer,
+                allowlist=_run_allowlist() if args.allowlist else None,
             )
         wrote_signals += 1
 
@@ -1276,9 +1403,21 @@ def _main_inner(args) -> int:
                 allowlist_path=args.allowlist,
                 log_allowlist_version=False,
                 dry_run=False,
+                runner=ch_writer,
+                allowlist=_run_allowlist() if args.allowlist else None,
             )
         wrote_scores += 1
 
+    if panic_watcher is not None:
+        panic_watcher.stop()
+
+    if ch_writer is not None:
+        ch_writer.close()
+
+    if args.live_snapshots:
+        store.close()
+        _log(f"[ok] live snapshot stats: {store.stats}")
+
     summary = {
         "ok": True,
         "run_trace_id": run_trace_id,
@@ -1303,6 +1442,8 @@ def _main_inner(args) -> int:
     # Normalize defaultdict to plain dict for JSON.
     summary["mode_counts"] = {k: dict(v) for k, v in mode_counts.items()}
     summary["tier_counts"] = {k: dict(v) for k, v in tier_counts.items()}
+    if ch_writer is not None:
+        summary["clickhouse_writer"] = ch_writer.stats()
 
     if args.summary_json and args.sim_preflight:
         summary["sim_metrics"] = preflight_and_simulate(
@@ -4,31 +4,82 @@ Distributed Backtest Harness CLI.
 
 Orchestrates parallel backtests across multiple CPU cores.
 1. Generates parameter grid from config.
-2. Distributes tasks to worker processes.
-3. Aggregates results and selects best configuration.
+2. Loads and normalizes trades ONCE, builds the tick index and resolves the
+   snapshot / wallet-profile gate inputs (sim_preflight.prepare_replay), and
+   writes the result as a replay pack: one .npy file per column, which every
+   worker memory-maps read-only (pages are shared through the OS page cache).
+3. Workers receive only parameter dicts and run sim_preflight.simulate_replay
+   (the same +EV gate and TP/SL/TIME exits as preflight_and_simulate).
+4. Results stream back as they finish into a BestTracker (select_best).
+
+Without NumPy the pack is a single pickle that each worker loads once at start.
 
 Usage:
     python -m integration.parallel_backtest \
-        --grid <yaml> --trades <jsonl> --workers <int> --out <json>
+        --grid <yaml> --trades <jsonl> --workers <int> --out <json> \
+        [--config <strategy yaml>] [--token-snapshot <csv|parquet>] [--wallet-profiles <csv|parquet>]
+
+Grid keys:
+    tp_pct / sl_pct / hold_sec_max      applied to every mode in cfg["modes"]
+    dotted keys (e.g. modes.U.tp_pct)   set at that path
+    anything else (e.g. min_edge_bps)   set at the top level of cfg
 
 Output:
     optimization_results.v1.json
 """
 
 import argparse
+import copy
 import json
+import math
+import multiprocessing
+import pickle
 import yaml
 import sys
 import os
+import tempfile
 import time
-import concurrent.futures
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from strategy.optimization.grid_gen import generate_grid, select_best
+from integration.sim_preflight import (
+    SKIP_MISSING_SNAPSHOT,
+    SKIP_MISSING_WALLET_PROFILE,
+    SimEntry,
+    SimReplay,
+    prepare_replay,
+    simulate_replay,
+)
+from integration.tick_index import TickIndex
+from integration.token_snapshot_store import TokenSnapshotStore
+from integration.trade_normalizer import load_trades_jsonl
+from integration.wallet_profile_store import WalletProfileStore
+from strategy.optimization.grid_gen import BestTracker, generate_grid
+from strategy.tuning import _set_nested
+
+PACK_VERSION = "sim_replay_pack.v1"
+
+# Grid keys without a dot that configure exits apply to every mode.
+MODE_PARAMS = ("tp_pct", "sl_pct", "hold_sec_max")
+
+DEFAULT_BASE_CFG: Dict[str, Any] = {
+    "min_edge_bps": 0,
+    "modes": {"U": {"tp_pct": 0.05, "sl_pct": -0.05, "hold_sec_max": 60}},
+}
+
+_SKIP_CODES = {None: 0, SKIP_MISSING_SNAPSHOT: 1, SKIP_MISSING_WALLET_PROFILE: 2}
+_SKIP_BY_CODE = {v: k for k, v in _SKIP_CODES.items()}
+
+# Per-process state set by _init_worker (replay pack + base cfg).
+_WORKER: Dict[str, Any] = {}
 
 
 def load_yaml(file_path: Path) -> Dict[str, Any]:
@@ -37,44 +88,239 @@ def load_yaml(file_path: Path) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
-def run_backtest_task(config: Dict[str, Any], trades_path: str) -> Dict[str, Any]:
+def load_trades(trades_path: str) -> List[Any]:
+    """Load and normalize trades JSONL; rejected lines are dropped."""
+    trades = []
+    for t in load_trades_jsonl(trades_path):
+        if isinstance(t, dict) and t.get("_reject"):
+            continue
+        trades.append(t)
+    return trades
+
+
+def write_replay_pack(replay: SimReplay, pack_dir: str) -> None:
+    """Write a prepared replay as memory-mappable columns (or a pickle without NumPy)."""
+    os.makedirs(pack_dir, exist_ok=True)
+    if np is None:
+        with open(os.path.join(pack_dir, "replay.pkl"), "wb") as f:
+            pickle.dump(replay, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return
+
+    mints: List[str] = []
+    offsets = [0]
+    ts_cols = []
+    px_cols = []
+    for mint, mt in replay.tick_index.items():
+        mints.append(mint)
+        ts_cols.append(np.asarray(mt.ts, dtype=np.float64))
+        px_cols.append(np.asarray(mt.px, dtype=np.float64))
+        offsets.append(offsets[-1] + len(mt))
+    mint_ids = {m: i for i, m in enumerate(mints)}
+
+    modes = sorted({e.mode for e in replay.entries})
+    mode_ids = {m: i for i, m in enumerate(modes)}
+    tiers = sorted({e.tier for e in replay.entries if e.tier is not None})
+    tier_ids = {t: i for i, t in enumerate(tiers)}
+
+    # Entries may reference a mint without ticks only if its price failed to parse,
+    # which prepare_replay already drops; keep -1 as a guard anyway.
+    entries = replay.entries
+    columns = {
+        "tick_offsets": np.asarray(offsets, dtype=np.int64),
+        "tick_ts": np.concatenate(ts_cols) if ts_cols else np.empty(0, dtype=np.float64),
+        "tick_px": np.concatenate(px_cols) if px_cols else np.empty(0, dtype=np.float64),
+        "entry_mint": np.asarray([mint_ids.get(e.mint, -1) for e in entries], dtype=np.int32),
+        "entry_ts": np.asarray([e.ts_sec for e in entries], dtype=np.float64),
+        "entry_price": np.asarray([e.price for e in entries], dtype=np.float64),
+        "entry_notional": np.asarray([e.notional for e in entries], dtype=np.float64),
+        "entry_mode": np.asarray([mode_ids[e.mode] for e in entries], dtype=np.int32),
+        "entry_tier": np.asarray([tier_ids[e.tier] if e.tier is not None else -1 for e in entries], dtype=np.int32),
+        "entry_skip": np.asarray([_SKIP_CODES[e.skip] for e in entries], dtype=np.int8),
+        "entry_win_p": np.asarray([e.win_p for e in entries], dtype=np.float64),
+        "entry_costs_bps": np.asarray([e.costs_bps for e in entries], dtype=np.int64),
+    }
+    # Tag timestamps let SimReplay.window() recompute the by_mode / by_tier flags.
+    if replay.mode_tag_ts is not None:
+        columns["mode_tag_ts"] = np.asarray(replay.mode_tag_ts, dtype=np.float64)
+    if replay.tier_tag_ts is not None:
+        columns["tier_tag_ts"] = np.asarray(replay.tier_tag_ts, dtype=np.float64)
+    for name, arr in columns.items():
+        np.save(os.path.join(pack_dir, f"{name}.npy"), arr)
+
+    meta = {
+        "version": PACK_VERSION,
+        "mints": mints,
+        "modes": modes,
+        "tiers": tiers,
+        "any_mode_tag": replay.any_mode_tag,
+        "any_tier_tag": replay.any_tier_tag,
+    }
+    with open(os.path.join(pack_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def load_replay_pack(pack_dir: str) -> SimReplay:
+    """Open a replay pack; tick columns stay memory-mapped (read-only, shared between processes)."""
+    pkl = os.path.join(pack_dir, "replay.pkl")
+    if os.path.exists(pkl):
+        with open(pkl, "rb") as f:
+            return pickle.load(f)
+    if np is None:
+        raise RuntimeError(f"replay pack {pack_dir} needs numpy")
+
+    with open(os.path.join(pack_dir, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != PACK_VERSION:
+        raise RuntimeError(f"unsupported replay pack version: {meta.get('version')!r}")
+
+    def col(name: str) -> Any:
+        return np.load(os.path.join(pack_dir, f"{name}.npy"), mmap_mode="r")
+
+    def tag_col(name: str) -> Optional[List[float]]:
+        path = os.path.join(pack_dir, f"{name}.npy")
+        return np.load(path).tolist() if os.path.exists(path) else None
+
+    mints = meta["mints"]
+    tick_index = TickIndex.from_arrays(mints, col("tick_offsets"), col("tick_ts"), col("tick_px"))
+
+    # Entry rows are small (BUYs only); materialize them once per process.
+    modes = meta["modes"]
+    tiers = meta["tiers"]
+    entries = [
+        SimEntry(
+            mint=mints[m] if m >= 0 else "",
+            ts_sec=ts,
+            price=px,
+            notional=notional,
+            mode=modes[mode],
+            tier=tiers[tier] if tier >= 0 else None,
+            skip=_SKIP_BY_CODE[skip],
+            win_p=win_p,
+            costs_bps=costs,
+        )
+        for m, ts, px, notional, mode, tier, skip, win_p, costs in zip(
+            col("entry_mint").tolist(),
+            col("entry_ts").tolist(),
+            col("entry_price").tolist(),
+            col("entry_notional").tolist(),
+            col("entry_mode").tolist(),
+            col("entry_tier").tolist(),
+            col("entry_skip").tolist(),
+            col("entry_win_p").tolist(),
+            col("entry_costs_bps").tolist(),
+        )
+    ]
+    return SimReplay(
+        tick_index,
+        entries,
+        any_mode_tag=bool(meta.get("any_mode_tag")),
+        any_tier_tag=bool(meta.get("any_tier_tag")),
+        mode_tag_ts=tag_col("mode_tag_ts"),
+        tier_tag_ts=tag_col("tier_tag_ts"),
+    )
+
+
+def apply_params(base_cfg: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of base_cfg with one grid point applied (see module docstring for key rules)."""
+    cfg = copy.deepcopy(base_cfg)
+    for key, value in params.items():
+        if "." in key:
+            _set_nested(cfg, key, value)
+        elif key in MODE_PARAMS:
+            modes = cfg.get("modes")
+            if not isinstance(modes, dict) or not modes:
+                modes = cfg["modes"] = {"U": {}}
+            for mode_cfg in modes.values():
+                mode_cfg[key] = value
+        else:
+            cfg[key] = value
+    return cfg
+
+
+def _sharpe(returns: List[float]) -> float:
+    """Per-position Sharpe: mean / stdev of returns (population), 0.0 if undefined."""
+    n = len(returns)
+    if n < 2:
+        return 0.0
+    mean = sum(returns) / n
+    var = sum((r - mean) ** 2 for r in returns) / n
+    if var <= 0.0:
+        return 0.0
+    return mean / math.sqrt(var)
+
+
+def run_backtest_task(
+    config: Dict[str, Any],
+    replay: Optional[SimReplay] = None,
+    base_cfg: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
     """
     Worker function to run a single backtest simulation.
-    
-    In a real scenario, this would import and run the full backtest pipeline.
-    For this harness implementation, we simulate execution with a lightweight model
-    that produces deterministic results based on parameters.
-    
+
     Args:
-        config: Parameter configuration dict
-        trades_path: Path to trades file (unused in simulation but part of interface)
-        
+        config: Parameter configuration dict (one grid point)
+        replay: Prepared replay (default: the worker's memory-mapped pack)
+        base_cfg: Strategy config the params are applied to (default: the worker's)
+
     Returns:
         Result dict including params and metrics
     """
-    # Simulate processing time (ms)
-    # time.sleep(0.01) 
-    
-    # Extract params
-    tp = config.get("tp_pct", 0.05)
-    sl = config.get("sl_pct", -0.05)
-    
-    # Simulate metric calculation (deterministic formula for testing)
-    # Higher TP is better, tighter SL is worse (just a mock relationship)
-    sharpe = (tp * 100) - (abs(sl) * 50)
-    roi_total = sharpe * 0.1
-    
+    if replay is None:
+        replay = _WORKER["replay"]
+    if base_cfg is None:
+        base_cfg = _WORKER.get("base_cfg", DEFAULT_BASE_CFG)
+
+    returns: List[float] = []
+    sim = simulate_replay(replay, apply_params(base_cfg, config), returns_out=returns)
+
     return {
         "params": config,
         "metrics": {
-            "sharpe": round(sharpe, 4),
-            "roi_total": round(roi_total, 4),
-            "trades_count": 100
+            "sharpe": round(_sharpe(returns), 6),
+            "roi_total": round(sim["roi_total"], 6),
+            "winrate": round(sim["winrate"], 6),
+            "avg_pnl_usd": round(sim["avg_pnl_usd"], 6),
+            "trades_count": sim["positions_closed"],
+            "exit_reason_counts": sim["exit_reason_counts"],
+            "skipped_by_reason": sim["skipped_by_reason"],
         },
         "status": "completed"
     }
 
 
+def _init_worker(pack_dir: str, base_cfg: Dict[str, Any]) -> None:
+    _WORKER["replay"] = load_replay_pack(pack_dir)
+    _WORKER["base_cfg"] = base_cfg
+
+
+def _run_indexed(item: Tuple[int, Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+    idx, config = item
+    try:
+        return idx, run_backtest_task(config)
+    except Exception as e:
+        return idx, {"params": config, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+def iter_backtests(
+    grid: List[Dict[str, Any]],
+    pack_dir: str,
+    base_cfg: Dict[str, Any],
+    workers: int,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (grid_index, result) in completion order."""
+    if workers <= 1:
+        _init_worker(pack_dir, base_cfg)
+        for item in enumerate(grid):
+            yield _run_indexed(item)
+        return
+
+    # Small chunks keep results streaming while amortizing IPC on 10k-point grids.
+    chunksize = max(1, min(64, len(grid) // (workers * 8)))
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(pack_dir, base_cfg)) as pool:
+        for res in pool.imap_unordered(_run_indexed, enumerate(grid), chunksize=chunksize):
+            yield res
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Distributed Backtest Harness: Parallel Grid Search"
@@ -91,12 +337,42 @@ def main():
         required=True,
         help="Path to historical trades JSONL"
     )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Base strategy config YAML (min_edge_bps, modes); grid params override it"
+    )
+    parser.add_argument(
+        "--token-snapshot",
+        type=str,
+        default=None,
+        help="Token snapshot CSV/Parquet for the +EV gate"
+    )
+    parser.add_argument(
+        "--wallet-profiles",
+        type=str,
+        default=None,
+        help="Wallet profiles CSV/Parquet for the +EV gate"
+    )
     parser.add_argument(
         "--workers",
         type=int,
         default=os.cpu_count(),
         help="Number of parallel workers"
     )
+    parser.add_argument(
+        "--metric",
+        type=str,
+        default="sharpe",
+        help="Metric to maximize when selecting the best config"
+    )
+    parser.add_argument(
+        "--pack-dir",
+        type=str,
+        default=None,
+        help="Keep the replay pack in this directory (default: temporary, removed on exit)"
+    )
     parser.add_argument(
         "--out",
         type=str,
@@ -108,73 +384,93 @@ def main():
         action="store_true",
         help="Enable verbose output to stderr"
     )
-    
+
     args = parser.parse_args()
-    
+
     # Load grid config
     grid_path = Path(args.grid)
     if not grid_path.exists():
         print(f"Error: Grid file not found: {grid_path}", file=sys.stderr)
         sys.exit(1)
-        
+    if not Path(args.trades).exists():
+        print(f"Error: Trades file not found: {args.trades}", file=sys.stderr)
+        sys.exit(1)
+
     param_ranges = load_yaml(grid_path)
     grid = generate_grid(param_ranges)
-    
+    base_cfg = load_yaml(Path(args.config)) if args.config else DEFAULT_BASE_CFG
+
+    snapshot_store = None
+    if args.token_snapshot:
+        snapshot_store = TokenSnapshotStore(args.token_snapshot)
+        snapshot_store.load()
+    wallet_store = None
+    if args.wallet_profiles:
+        if args.wallet_profiles.lower().endswith(".parquet"):
+            wallet_store = WalletProfileStore.from_parquet(args.wallet_profiles)
+        else:
+            wallet_store = WalletProfileStore.from_csv(args.wallet_profiles)
+
+    start_time = time.time()
+    replay = prepare_replay(load_trades(args.trades), snapshot_store, wallet_store)
+
     if args.verbose:
+        print(f"Prepared {len(replay.entries)} entries over {len(replay.tick_index)} mints", file=sys.stderr)
         print(f"Generated {len(grid)} configurations to test", file=sys.stderr)
         print(f"Starting execution with {args.workers} workers...", file=sys.stderr)
-        
-    start_time = time.time()
-    results = []
-    
-    # Parallel Execution
-    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as executor:
-        # Submit all tasks
-        futures = {executor.submit(run_backtest_task, config, args.trades): config for config in grid}
-        
+
+    results_by_idx: Dict[int, Dict[str, Any]] = {}
+    tracker = BestTracker(metric=args.metric)
+
+    with tempfile.TemporaryDirectory(prefix="replay_pack_") as tmp_dir:
+        pack_dir = args.pack_dir or tmp_dir
+        write_replay_pack(replay, pack_dir)
+        del replay
+
         # Collect results as they complete
-        for future in concurrent.futures.as_completed(futures):
-            try:
-                res = future.result()
-                results.append(res)
-            except Exception as e:
-                print(f"Worker exception: {e}", file=sys.stderr)
-                
+        for idx, res in iter_backtests(grid, pack_dir, base_cfg, args.workers or 1):
+            if res.get("status") != "completed":
+                print(f"Worker exception: {res.get('error')}", file=sys.stderr)
+                continue
+            results_by_idx[idx] = res
+            tracker.add(res, order=idx)
+
     elapsed = time.time() - start_time
-    
+    results = [results_by_idx[i] for i in sorted(results_by_idx)]
+
     if args.verbose:
         print(f"Completed {len(results)} backtests in {elapsed:.2f}s", file=sys.stderr)
-        
-    # Select best
-    best_result, best_val = select_best(results, metric="sharpe")
-    
+
+    best_result, best_val = tracker.best, tracker.value
+
     # Output structure
     output = {
         "version": "optimization_results.v1",
         "timestamp": int(time.time()),
         "total_configs": len(grid),
         "successful_runs": len(results),
+        "metric": args.metric,
         "best_result": best_result,
         "elapsed_sec": round(elapsed, 2),
         "all_results": results
     }
-    
+
     # Write to file
     out_path = Path(args.out)
     with open(out_path, "w") as f:
         json.dump(output, f, indent=2)
-        
+
     if args.verbose:
         print(f"Wrote results to {out_path}", file=sys.stderr)
         if best_result:
-            print(f"Best Config (Sharpe {best_val}): {best_result['params']}", file=sys.stderr)
-            
+            print(f"Best Config ({args.metric} {best_val}): {best_result['params']}", file=sys.stderr)
+
     # Print JSON summary to stdout
     print(json.dumps({
         "status": "success",
         "total": len(results),
         "elapsed": round(elapsed, 2),
-        "best_metric": best_val
+        "best_metric": best_val if best_result is not None else None
     }))
 
 
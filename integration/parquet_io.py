@@ -16,12 +16,33 @@ Optional columns supported:
 
 If your parquet uses different column names, pass a mapping dict and we will rename
 columns on the fly.
+
+Columnar replay (paper_pipeline --columnar):
+- iter_parquet_column_batches() yields ColumnBatch objects instead of one dict per row.
+- With pyarrow installed, batches are Arrow record batches streamed from DuckDB and numeric
+  columns are exposed as NumPy arrays without per-row Python objects.
+- Without pyarrow, batches are built from DuckDB fetchmany() tuples (same values, slower).
+- NumPy is required for columnar replay.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pc = None  # type: ignore
+
+from .trade_normalizer import _opt_float
 
 
 @dataclass(frozen=True)
@@ -32,20 +53,18 @@ class ParquetReadConfig:
     colmap: Optional[Dict[str, str]] = None  # target_col -> source_col
 
 
-def iter_parquet_records(cfg: ParquetReadConfig) -> Iterator[Dict[str, Any]]:
-    """Yield dict rows from a Parquet file.
-
-    Uses DuckDB's read_parquet() and fetchmany() to stream.
-
-    Raises RuntimeError with a friendly message if duckdb isn't available.
-    """
-
+def _import_duckdb() -> Any:
     try:
         import duckdb  # type: ignore
     except Exception as e:
         raise RuntimeError(
             "duckdb is required for Parquet replay. Install with: pip install -r requirements.txt"
         ) from e
+    return duckdb
+
+
+def _execute_read(duckdb: Any, cfg: ParquetReadConfig) -> Any:
+    """Run the read_parquet() query for cfg and return the DuckDB cursor."""
 
     con = duckdb.connect(database=":memory:")
 
@@ -63,7 +82,18 @@ def iter_parquet_records(cfg: ParquetReadConfig) -> Iterator[Dict[str, Any]]:
     if cfg.limit is not None:
         q += f" LIMIT {int(cfg.limit)}"
 
-    cur = con.execute(q, [cfg.path])
+    return con.execute(q, [cfg.path])
+
+
+def iter_parquet_records(cfg: ParquetReadConfig) -> Iterator[Dict[str, Any]]:
+    """Yield dict rows from a Parquet file.
+
+    Uses DuckDB's read_parquet() and fetchmany() to stream.
+
+    Raises RuntimeError with a friendly message if duckdb isn't available.
+    """
+
+    cur = _execute_read(_import_duckdb(), cfg)
     colnames = [d[0] for d in cur.description]
 
     while True:
@@ -73,3 +103,131 @@ def iter_parquet_records(cfg: ParquetReadConfig) -> Iterator[Dict[str, Any]]:
         for row in rows:
             yield {colnames[i]: row[i] for i in range(len(colnames))}
 
+
+
+class ColumnBatch:
+    """One batch of Parquet rows held column-wise.
+
+    Accessors are cached per column:
+    - pylist(name): Python values, identical to what iter_parquet_records() puts in row dicts
+    - floats(name): (float64 values, present mask) following trade_normalizer._opt_float
+    - codes(name):  (int64 codes, uniques) dictionary encoding; null -> -1
+    - rows(indices): row dicts for the selected rows only
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        num_rows: int,
+        arrow_batch: Any = None,
+        tuples: Optional[Sequence[Tuple[Any, ...]]] = None,
+    ):
+        self.names: List[str] = list(names)
+        self.num_rows = int(num_rows)
+        self._arrow = arrow_batch
+        self._tuples = tuples
+        self._pos = {n: i for i, n in enumerate(self.names)}
+        self._pylists: Dict[str, List[Any]] = {}
+        self._floats: Dict[str, Tuple[Any, Any]] = {}
+        self._codes: Dict[str, Tuple[Any, List[Any]]] = {}
+
+    @classmethod
+    def from_arrow(cls, batch: Any) -> "ColumnBatch":
+        return cls(batch.schema.names, batch.num_rows, arrow_batch=batch)
+
+    @classmethod
+    def from_tuples(cls, names: Sequence[str], rows: Sequence[Tuple[Any, ...]]) -> "ColumnBatch":
+        return cls(names, len(rows), tuples=rows)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._pos
+
+    def pylist(self, name: str) -> List[Any]:
+        vals = self._pylists.get(name)
+        if vals is None:
+            if self._arrow is not None:
+                vals = self._arrow.column(self._pos[name]).to_pylist()
+            else:
+                i = self._pos[name]
+                vals = [row[i] for row in (self._tuples or ())]
+            self._pylists[name] = vals
+        return vals
+
+    def floats(self, name: str) -> Tuple[Any, Any]:
+        cached = self._floats.get(name)
+        if cached is not None:
+            return cached
+        out = None
+        if self._arrow is not None:
+            col = self._arrow.column(self._pos[name])
+            t = col.type
+            if pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t):
+                present = np.asarray(col.is_valid().to_numpy(zero_copy_only=False), dtype=bool)
+                values = pc.fill_null(col.cast(pa.float64()), 0.0).to_numpy(zero_copy_only=False)
+                out = (np.asarray(values, dtype=np.float64), present)
+        if out is None:
+            parsed = [_opt_float(x) for x in self.pylist(name)]
+            present = np.fromiter((x is not None for x in parsed), dtype=bool, count=len(parsed))
+            values = np.fromiter((0.0 if x is None else x for x in parsed), dtype=np.float64, count=len(parsed))
+            out = (values, present)
+        self._floats[name] = out
+        return out
+
+    def codes(self, name: str) -> Tuple[Any, List[Any]]:
+        cached = self._codes.get(name)
+        if cached is not None:
+            return cached
+        if self._arrow is not None:
+            col = self._arrow.column(self._pos[name])
+            enc = col if pa.types.is_dictionary(col.type) else col.dictionary_encode()
+            idx = pc.fill_null(enc.indices.cast(pa.int64()), -1).to_numpy(zero_copy_only=False)
+            out = (np.asarray(idx, dtype=np.int64), enc.dictionary.to_pylist())
+        else:
+            seen: Dict[Any, int] = {}
+            uniques: List[Any] = []
+            idx = np.empty(self.num_rows, dtype=np.int64)
+            for i, v in enumerate(self.pylist(name)):
+                if v is None:
+                    idx[i] = -1
+                    continue
+                c = seen.get(v)
+                if c is None:
+                    c = len(uniques)
+                    seen[v] = c
+                    uniques.append(v)
+                idx[i] = c
+            out = (idx, uniques)
+        self._codes[name] = out
+        return out
+
+    def rows(self, indices: Sequence[int]) -> List[Dict[str, Any]]:
+        if self._arrow is not None:
+            return self._arrow.take(pa.array(list(indices), type=pa.int64())).to_pylist()
+        tuples = self._tuples or ()
+        names = self.names
+        return [{names[j]: tuples[i][j] for j in range(len(names))} for i in indices]
+
+
+def iter_parquet_column_batches(cfg: ParquetReadConfig) -> Iterator[ColumnBatch]:
+    """Yield ColumnBatch objects from a Parquet file (columnar replay).
+
+    Raises RuntimeError if duckdb or numpy isn't available.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for columnar Parquet replay (pip install numpy)")
+
+    cur = _execute_read(_import_duckdb(), cfg)
+
+    if pa is not None:
+        to_reader = getattr(cur, "to_arrow_reader", None) or getattr(cur, "fetch_record_batch")
+        for batch in to_reader(cfg.batch_size):
+            if batch.num_rows:
+                yield ColumnBatch.from_arrow(batch)
+        return
+
+    colnames = [d[0] for d in cur.description]
+    while True:
+        rows = cur.fetchmany(cfg.batch_size)
+        if not rows:
+            break
+        yield ColumnBatch.from_tuples(colnames, rows)
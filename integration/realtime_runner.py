@@ -14,14 +14,23 @@ Design goals:
 - Clean stdout (logs to stderr)
 - Deterministic in smoke tests (mock source)
 - Graceful error handling with retry
+
+Concurrent polling (max_concurrency > 1):
+- poll_new_records fans out over a bounded thread pool, so a round costs roughly
+  ceil(wallets / max_concurrency) RPC latencies instead of one per wallet
+- optional per-endpoint request budgets (execution.queues.RateLimiter, keyed by endpoint_of(wallet))
+- polled records are consumed in tracked-wallet order on the loop thread, so the signal
+  engine, risk limits and portfolio see the same sequence as in sequential mode
 """
 
 from __future__ import annotations
 
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from integration.config_loader import load_params_base
 from integration.gates import apply_gates
@@ -32,6 +41,11 @@ from integration.token_snapshot_store import TokenSnapshot
 from integration.trade_types import Trade
 from integration.helpers import write_signal
 from strategy.signal_engine import decide_entry
+from execution.queues import RateLimiter
+from ingestion.enrichment_cache import configure_enrichment_cache_from_config
+
+# Endpoint key used for rate budgets when no endpoint_of mapping is given.
+DEFAULT_ENDPOINT = "rpc"
 
 
 @dataclass
@@ -45,6 +59,10 @@ class RealtimeRunner:
         portfolio: Portfolio state (persists across iterations).
         last_signatures: Dict[wallet -> last_processed_signature].
         interval_sec: Poll interval in seconds.
+        max_concurrency: Parallel poll_new_records calls per round (1 = sequential).
+        rate_limiter: Optional per-endpoint request budget shared by all poll workers.
+        endpoint_of: Maps a wallet to its RPC endpoint key for rate budgets.
+        last_round_stats: Counters for the most recent polling round.
     """
 
     config: Dict[str, Any]
@@ -56,6 +74,15 @@ class RealtimeRunner:
     ))
     last_signatures: Dict[str, str] = field(default_factory=dict)
     interval_sec: int = 5
+    max_concurrency: int = 1
+    rate_limiter: Optional[RateLimiter] = None
+    endpoint_of: Optional[Callable[[str], str]] = None
+    last_round_stats: Dict[str, Any] = field(default_factory=dict)
+    _budget_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Process-wide enrichment cache (disk tier from run.enrichment_cache)
+        configure_enrichment_cache_from_config(self.config)
 
     def run_loop(self, max_iterations: Optional[int] = None) -> None:
         """Run the main processing loop.
@@ -72,32 +99,89 @@ class RealtimeRunner:
 
         print(f"[RealtimeRunner] Starting loop for {len(tracked_wallets)} wallets", file=sys.stderr)
 
-        while True:
-            iteration += 1
-            if max_iterations is not None and iteration > max_iterations:
-                print(f"[RealtimeRunner] Reached max iterations ({max_iterations})", file=sys.stderr)
-                break
-
-            for wallet in tracked_wallets:
-                self._process_wallet(wallet)
-
-            time.sleep(self.interval_sec)
-
-    def _process_wallet(self, wallet: str) -> None:
-        """Process new records for a single wallet."""
-        last_sig = self.last_signatures.get(wallet)
+        executor: Optional[ThreadPoolExecutor] = None
+        if self.max_concurrency > 1:
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="wallet-poll")
 
+        try:
+            while True:
+                iteration += 1
+                if max_iterations is not None and iteration > max_iterations:
+                    print(f"[RealtimeRunner] Reached max iterations ({max_iterations})", file=sys.stderr)
+                    break
+
+                if executor is None:
+                    for wallet in tracked_wallets:
+                        self._process_wallet(wallet)
+                else:
+                    self.poll_round(tracked_wallets, executor)
+
+                time.sleep(self.interval_sec)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def poll_round(self, wallets: List[str], executor: ThreadPoolExecutor) -> None:
+        """Poll all wallets concurrently and process their records in wallet order."""
+        started = time.monotonic()
+        futures = [executor.submit(self._poll_wallet, wallet) for wallet in wallets]
+        errors = 0
+        records_total = 0
+        # Futures are drained in submission order: an ordered hand-off to the signal engine.
+        # Early wallets are processed while later polls are still in flight.
+        for wallet, fut in zip(wallets, futures):
+            records, err = fut.result()
+            if err is not None:
+                errors += 1
+                print(f"[RealtimeRunner] RPC error for {wallet}: {err}", file=sys.stderr)
+                continue
+            records_total += len(records or [])
+            self._handle_records(wallet, records)
+
+        self.last_round_stats = {
+            "wallets": len(wallets),
+            "errors": errors,
+            "records": records_total,
+            "duration_sec": round(time.monotonic() - started, 6),
+        }
+
+    def _acquire_budget(self, wallet: str) -> None:
+        """Block until the wallet's endpoint has request budget left."""
+        if self.rate_limiter is None:
+            return
+        endpoint = self.endpoint_of(wallet) if self.endpoint_of is not None else DEFAULT_ENDPOINT
+        while True:
+            # RateLimiter is not thread-safe; serialize bucket updates.
+            with self._budget_lock:
+                if self.rate_limiter.can_proceed(endpoint):
+                    return
+                wait = self.rate_limiter.get_wait_time(endpoint)
+            time.sleep(max(wait, 0.001))
+
+    def _poll_wallet(self, wallet: str) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Exception]]:
+        """Fetch new records for one wallet (worker thread). Returns (records, error)."""
+        self._acquire_budget(wallet)
         try:
             records = self.source.poll_new_records(
                 wallet=wallet,
-                stop_at_signature=last_sig,
+                stop_at_signature=self.last_signatures.get(wallet),
                 limit=50,
             )
         except Exception as e:
-            print(f"[RealtimeRunner] RPC error for {wallet}: {e}", file=sys.stderr)
+            return None, e
+        return records, None
+
+    def _process_wallet(self, wallet: str) -> None:
+        """Process new records for a single wallet."""
+        records, err = self._poll_wallet(wallet)
+        if err is not None:
+            print(f"[RealtimeRunner] RPC error for {wallet}: {err}", file=sys.stderr)
             time.sleep(1)
             return
+        self._handle_records(wallet, records)
 
+    def _handle_records(self, wallet: str, records: Optional[List[Dict[str, Any]]]) -> None:
+        """Advance the wallet cursor and run each record through the pipeline."""
         if not records:
             return
 
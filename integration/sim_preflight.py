@@ -24,9 +24,12 @@ This module performs no I/O.
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
-from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, NamedTuple, Optional, Tuple
+
+from integration.tick_index import TickIndex
+from integration.ts_parse import TsCache
 
 SIM_SCHEMA_VERSION = "sim_metrics.v1"
 
@@ -50,45 +53,6 @@ def _get(obj: Any, key: str, default: Any = None) -> Any:
     return default
 
 
-def _ts_to_seconds(ts: Any) -> float:
-    """Parse trade ts into seconds.
-
-    Supported:
-    - numeric strings / numbers: treated as unix seconds
-    - ISO-like strings: parsed as UTC (naive -> UTC)
-
-    Deterministic: no current time.
-    """
-    if ts is None:
-        return 0.0
-
-    # numeric
-    try:
-        return float(ts)
-    except Exception:
-        pass
-
-    s = str(ts).strip()
-    if not s:
-        return 0.0
-
-    # Handle common 'Z'
-    if s.endswith("Z"):
-        s2 = s[:-1] + "+00:00"
-    else:
-        s2 = s
-
-    # fromisoformat accepts "YYYY-MM-DD HH:MM:SS(.mmm)" and "T" separator
-    try:
-        dt = datetime.fromisoformat(s2)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.timestamp()
-    except Exception:
-        # Stable fallback: compare lexicographically elsewhere; here we return 0.
-        return 0.0
-
-
 def compute_edge_bps(
     trade: Any,
     token_snap: Any,
@@ -121,13 +85,31 @@ def compute_edge_bps(
     if p_model is not None:
         win_p = _clamp(p_model, 0.0, 1.0)
     else:
-        win_p_raw = _get(wallet_profile, "winrate_30d", 0.0)
+        win_p = _wallet_win_p(wallet_profile)
+    return _edge_bps(win_p, _snap_costs_bps(token_snap), cfg, mode_name)
+
+
+def _wallet_win_p(wallet_profile: Any) -> float:
+    win_p_raw = _get(wallet_profile, "winrate_30d", 0.0)
+    try:
+        win_p = float(win_p_raw) if win_p_raw is not None else 0.0
+    except Exception:
+        win_p = 0.0
+    return _clamp(win_p, 0.0, 1.0)
+
+
+def _snap_costs_bps(token_snap: Any) -> int:
+    costs_bps = 0
+    spread = _get(token_snap, "spread_bps", None)
+    if spread is not None:
         try:
-            win_p = float(win_p_raw) if win_p_raw is not None else 0.0
+            costs_bps = int(float(spread))
         except Exception:
-            win_p = 0.0
-        win_p = _clamp(win_p, 0.0, 1.0)
+            costs_bps = 0
+    return costs_bps
 
+
+def _edge_bps(win_p: float, costs_bps: int, cfg: Dict[str, Any], mode_name: str) -> int:
     modes = cfg.get("modes") if isinstance(cfg, dict) else None
     mode_cfg = (modes or {}).get(mode_name, {}) if isinstance(modes, dict) else {}
 
@@ -142,14 +124,6 @@ def compute_edge_bps(
 
     gross_edge_pct = (win_p * tp) - ((1.0 - win_p) * sl)
 
-    costs_bps = 0
-    spread = _get(token_snap, "spread_bps", None)
-    if spread is not None:
-        try:
-            costs_bps = int(float(spread))
-        except Exception:
-            costs_bps = 0
-
     edge_bps = int(round(gross_edge_pct * 10_000)) - costs_bps
     return int(edge_bps)
 
@@ -162,6 +136,9 @@ def _simulate_exit(
 ) -> Tuple[float, str]:
     """Simulate deterministic exit.
 
+    Reference (linear scan) implementation; the simulators use
+    integration.tick_index.TickIndex, which must stay result-identical to this.
+
     Args:
       future_ticks: list of (ts_sec, price), sorted by ts_sec and filtered to same mint.
 
@@ -199,32 +176,102 @@ def _simulate_exit(
     return last_price, "TIME"
 
 
-def preflight_and_simulate(
-    trades_norm: List[Any],
-    cfg: Dict[str, Any],
-    token_snapshot_store: Any,
-    wallet_profile_store: Any,
-) -> Dict[str, Any]:
-    """Run +EV preflight + deterministic TP/SL/TIME simulation.
+class SimEntry(NamedTuple):
+    """BUY entry candidate with its config-independent +EV gate inputs resolved."""
 
-    Args:
-      trades_norm: normalized trades (Trade objects or dicts). Includes both entries and future ticks.
+    mint: str
+    ts_sec: float
+    price: float
+    notional: float
+    mode: str
+    tier: Optional[str]
+    skip: Optional[str]  # SKIP_MISSING_SNAPSHOT / SKIP_MISSING_WALLET_PROFILE, else None
+    win_p: float
+    costs_bps: int
 
-    Returns:
-      sim_metrics dict (schema_version="sim_metrics.v1").
+
+class SimReplay:
+    """Trades prepared once (tick index + entry candidates) for many simulate_replay() runs.
+
+    window() returns a view over a ts range that shares the tick index, so a
+    walk-forward run prepares its trades once instead of once per window.
     """
-    min_edge_bps = int(cfg.get("min_edge_bps", 0))
+
+    __slots__ = ("tick_index", "entries", "any_mode_tag", "any_tier_tag", "mode_tag_ts", "tier_tag_ts", "ts_end", "_by_ts")
+
+    def __init__(
+        self,
+        tick_index: TickIndex,
+        entries: List[SimEntry],
+        any_mode_tag: bool = False,
+        any_tier_tag: bool = False,
+        mode_tag_ts: Optional[List[float]] = None,
+        tier_tag_ts: Optional[List[float]] = None,
+        ts_end: Optional[float] = None,
+    ) -> None:
+        self.tick_index = tick_index
+        self.entries = entries
+        self.any_mode_tag = any_mode_tag
+        self.any_tier_tag = any_tier_tag
+        # Sorted ts of ticks carrying extra.mode / extra.wallet_tier (None = unknown),
+        # used to recompute the by_mode / by_tier flags for a window.
+        self.mode_tag_ts = mode_tag_ts
+        self.tier_tag_ts = tier_tag_ts
+        # Exclusive upper bound on tick ts for exits (None = no bound).
+        self.ts_end = ts_end
+        self._by_ts: Optional[Tuple[List[float], List[SimEntry]]] = None
+
+    def window(self, start_sec: float, end_sec: float) -> "SimReplay":
+        """Return the replay restricted to trades with start_sec <= ts < end_sec.
+
+        Equivalent to prepare_replay() over just those trades: entries are sliced
+        by ts and exits ignore ticks at or after end_sec.
+        """
+        if self._by_ts is None:
+            entries = self.entries
+            ts = [e.ts_sec for e in entries]
+            if any(ts[i] > ts[i + 1] for i in range(len(ts) - 1)):
+                entries = sorted(entries, key=lambda e: e.ts_sec)
+                ts = [e.ts_sec for e in entries]
+            self._by_ts = (ts, entries)
+        entry_ts, entries = self._by_ts
+        lo = bisect_left(entry_ts, start_sec)
+        hi = bisect_left(entry_ts, end_sec, lo)
+
+        def tagged(tag_ts: Optional[List[float]], fallback: bool) -> bool:
+            if tag_ts is None:
+                return fallback
+            return bisect_left(tag_ts, end_sec) > bisect_left(tag_ts, start_sec)
+
+        ts_end = end_sec if self.ts_end is None else min(end_sec, self.ts_end)
+        return SimReplay(
+            self.tick_index,
+            entries[lo:hi],
+            any_mode_tag=tagged(self.mode_tag_ts, self.any_mode_tag),
+            any_tier_tag=tagged(self.tier_tag_ts, self.any_tier_tag),
+            ts_end=ts_end,
+        )
+
+
+def prepare_replay(
+    trades_norm: Iterable[Any],
+    token_snapshot_store: Any,
+    wallet_profile_store: Any,
+) -> SimReplay:
+    """Parse trades, build the tick index and resolve store lookups (everything cfg-independent)."""
+    trades_norm = list(trades_norm)
 
     # Prepare per-mint tick index from the same trades list.
+    ts_cache = TsCache()
     ticks_by_mint: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
-    any_mode_tag = False
-    any_tier_tag = False
+    mode_tag_ts: List[float] = []
+    tier_tag_ts: List[float] = []
 
     for t in trades_norm:
         mint = str(_get(t, "mint", "") or "")
         if not mint:
             continue
-        ts_sec = _ts_to_seconds(_get(t, "ts", ""))
+        ts_sec = ts_cache(_get(t, "ts", ""))
         px_raw = _get(t, "price", None)
         try:
             px = float(px_raw)
@@ -235,31 +282,13 @@ def preflight_and_simulate(
         extra = _get(t, "extra", None)
         if isinstance(extra, Mapping):
             if isinstance(extra.get("mode"), str):
-                any_mode_tag = True
+                mode_tag_ts.append(ts_sec)
             if isinstance(extra.get("wallet_tier"), str):
-                any_tier_tag = True
-
-    for mint, arr in ticks_by_mint.items():
-        arr.sort(key=lambda x: x[0])
-
-    # Aggregate counters
-    exit_reason_counts: Dict[str, int] = {"TP": 0, "SL": 0, "TIME": 0}
-    skipped_by_reason: Dict[str, int] = {
-        SKIP_MISSING_SNAPSHOT: 0,
-        SKIP_MISSING_WALLET_PROFILE: 0,
-        SKIP_EV_BELOW_THRESHOLD: 0,
-    }
-
-    total_pnl_usd = 0.0
-    total_notional_usd = 0.0
-    positions_total = 0
-    positions_closed = 0
-    wins = 0
+                tier_tag_ts.append(ts_sec)
 
-    # Optional group aggregations
-    by_mode: Dict[str, Dict[str, Any]] = defaultdict(lambda: _new_bucket())
-    by_tier: Dict[str, Dict[str, Any]] = defaultdict(lambda: _new_bucket())
+    tick_index = TickIndex.from_ticks(ticks_by_mint)
 
+    entries: List[SimEntry] = []
     for t in trades_norm:
         # Entry candidates are BUY trades
         side = str(_get(t, "side", "")).upper()
@@ -277,28 +306,7 @@ def preflight_and_simulate(
         except Exception:
             continue
 
-        entry_ts_sec = _ts_to_seconds(_get(t, "ts", ""))
-
-        # +EV gate (SKIP/ENTER)
-        snap = None
-        if token_snapshot_store is not None:
-            if hasattr(token_snapshot_store, "get_latest"):
-                snap = token_snapshot_store.get_latest(mint)
-            elif hasattr(token_snapshot_store, "get"):
-                snap = token_snapshot_store.get(mint)
-
-        if snap is None:
-            # SKIP missing_snapshot
-            skipped_by_reason[SKIP_MISSING_SNAPSHOT] = int(skipped_by_reason.get(SKIP_MISSING_SNAPSHOT, 0)) + 1
-            continue
-
-        wp = None
-        if wallet_profile_store is not None and hasattr(wallet_profile_store, "get"):
-            wp = wallet_profile_store.get(wallet)
-        if wp is None:
-            # SKIP missing_wallet_profile
-            skipped_by_reason[SKIP_MISSING_WALLET_PROFILE] = int(skipped_by_reason.get(SKIP_MISSING_WALLET_PROFILE, 0)) + 1
-            continue
+        entry_ts_sec = ts_cache(_get(t, "ts", ""))
 
         extra = _get(t, "extra", None)
         mode = "U"
@@ -311,7 +319,104 @@ def preflight_and_simulate(
             if isinstance(tr, str) and tr.strip():
                 tier = tr
 
-        edge_bps = compute_edge_bps(trade=t, token_snap=snap, wallet_profile=wp, cfg=cfg, mode_name=mode)
+        # PnL uses notional = trade.qty_usd if present else 1.0 (in this repo: size_usd)
+        notional_raw = _get(t, "qty_usd", None)
+        if notional_raw is None:
+            notional_raw = _get(t, "size_usd", None)
+        try:
+            notional = float(notional_raw) if notional_raw is not None else 1.0
+        except Exception:
+            notional = 1.0
+        if notional <= 0:
+            notional = 1.0
+
+        # +EV gate inputs (SKIP reasons that do not depend on cfg)
+        snap = None
+        if token_snapshot_store is not None:
+            if hasattr(token_snapshot_store, "get_latest"):
+                snap = token_snapshot_store.get_latest(mint)
+            elif hasattr(token_snapshot_store, "get"):
+                snap = token_snapshot_store.get(mint)
+
+        skip: Optional[str] = None
+        wp = None
+        if snap is None:
+            skip = SKIP_MISSING_SNAPSHOT
+        else:
+            if wallet_profile_store is not None and hasattr(wallet_profile_store, "get"):
+                wp = wallet_profile_store.get(wallet)
+            if wp is None:
+                skip = SKIP_MISSING_WALLET_PROFILE
+
+        entries.append(SimEntry(
+            mint=mint,
+            ts_sec=entry_ts_sec,
+            price=entry_price,
+            notional=notional,
+            mode=mode,
+            tier=tier,
+            skip=skip,
+            win_p=_wallet_win_p(wp) if skip is None else 0.0,
+            costs_bps=_snap_costs_bps(snap) if skip is None else 0,
+        ))
+
+    mode_tag_ts.sort()
+    tier_tag_ts.sort()
+    return SimReplay(
+        tick_index,
+        entries,
+        any_mode_tag=bool(mode_tag_ts),
+        any_tier_tag=bool(tier_tag_ts),
+        mode_tag_ts=mode_tag_ts,
+        tier_tag_ts=tier_tag_ts,
+    )
+
+
+def simulate_replay(
+    replay: SimReplay,
+    cfg: Dict[str, Any],
+    returns_out: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Run the +EV gate and TP/SL/TIME exits for one cfg over a prepared replay.
+
+    Args:
+      returns_out: if given, per-position returns (exit_price / entry_price - 1) are appended.
+
+    Returns:
+      sim_metrics dict (schema_version="sim_metrics.v1").
+    """
+    min_edge_bps = int(cfg.get("min_edge_bps", 0))
+    tick_index = replay.tick_index
+    any_mode_tag = replay.any_mode_tag
+    any_tier_tag = replay.any_tier_tag
+    ts_end = replay.ts_end
+
+    # Aggregate counters
+    exit_reason_counts: Dict[str, int] = {"TP": 0, "SL": 0, "TIME": 0}
+    skipped_by_reason: Dict[str, int] = {
+        SKIP_MISSING_SNAPSHOT: 0,
+        SKIP_MISSING_WALLET_PROFILE: 0,
+        SKIP_EV_BELOW_THRESHOLD: 0,
+    }
+
+    total_pnl_usd = 0.0
+    total_notional_usd = 0.0
+    positions_total = 0
+    positions_closed = 0
+    wins = 0
+
+    # Optional group aggregations
+    by_mode: Dict[str, Dict[str, Any]] = defaultdict(lambda: _new_bucket())
+    by_tier: Dict[str, Dict[str, Any]] = defaultdict(lambda: _new_bucket())
+
+    for e in replay.entries:
+        if e.skip is not None:
+            # SKIP missing_snapshot / missing_wallet_profile
+            skipped_by_reason[e.skip] = int(skipped_by_reason.get(e.skip, 0)) + 1
+            continue
+
+        mode = e.mode
+        edge_bps = _edge_bps(e.win_p, e.costs_bps, cfg, mode)
         if edge_bps < min_edge_bps:
             # SKIP ev_below_threshold
             # reason string intentionally stable for grep/tests
@@ -322,22 +427,16 @@ def preflight_and_simulate(
         positions_total += 1
 
         # Exit simulation
+        entry_price = e.price
+        notional = e.notional
         mode_cfg = (cfg.get("modes") or {}).get(mode, {})
-        fut = ticks_by_mint.get(mint, [])
-        exit_price, reason = _simulate_exit(entry_price=entry_price, entry_ts_sec=entry_ts_sec, future_ticks=fut, cfg_mode=mode_cfg)
-
-        # PnL uses notional = trade.qty_usd if present else 1.0 (in this repo: size_usd)
-        notional_raw = _get(t, "qty_usd", None)
-        if notional_raw is None:
-            notional_raw = _get(t, "size_usd", None)
-        try:
-            notional = float(notional_raw) if notional_raw is not None else 1.0
-        except Exception:
-            notional = 1.0
-        if notional <= 0:
-            notional = 1.0
+        exit_price, reason = tick_index.simulate_exit(
+            e.mint, entry_price=entry_price, entry_ts_sec=e.ts_sec, cfg_mode=mode_cfg, ts_end=ts_end
+        )
 
         pnl_usd = ((exit_price / entry_price) - 1.0) * notional
+        if returns_out is not None:
+            returns_out.append((exit_price / entry_price) - 1.0)
 
         positions_closed += 1
         total_pnl_usd += pnl_usd
@@ -350,8 +449,8 @@ def preflight_and_simulate(
         # Group buckets
         if any_mode_tag:
             _bucket_add(by_mode[mode], pnl_usd=pnl_usd, notional=notional, win=(pnl_usd > 0), reason=reason)
-        if any_tier_tag and tier is not None:
-            _bucket_add(by_tier[tier], pnl_usd=pnl_usd, notional=notional, win=(pnl_usd > 0), reason=reason)
+        if any_tier_tag and e.tier is not None:
+            _bucket_add(by_tier[e.tier], pnl_usd=pnl_usd, notional=notional, win=(pnl_usd > 0), reason=reason)
 
     winrate = (wins / positions_closed) if positions_closed else 0.0
     roi_total = (total_pnl_usd / total_notional_usd) if total_notional_usd else 0.0
@@ -384,6 +483,24 @@ def preflight_and_simulate(
     return out
 
 
+def preflight_and_simulate(
+    trades_norm: List[Any],
+    cfg: Dict[str, Any],
+    token_snapshot_store: Any,
+    wallet_profile_store: Any,
+) -> Dict[str, Any]:
+    """Run +EV preflight + deterministic TP/SL/TIME simulation.
+
+    Args:
+      trades_norm: normalized trades (Trade objects or dicts). Includes both entries and future ticks.
+
+    Returns:
+      sim_metrics dict (schema_version="sim_metrics.v1").
+    """
+    replay = prepare_replay(trades_norm, token_snapshot_store, wallet_profile_store)
+    return simulate_replay(replay, cfg)
+
+
 def _new_bucket() -> Dict[str, Any]:
     return {
         "positions_closed": 0,
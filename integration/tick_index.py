@@ -0,0 +1,197 @@
+"""integration/tick_index.py
+
+Shared per-mint tick index for the deterministic TP/SL/TIME exit simulation.
+
+The simulators (sim_preflight, ev_sweep, paper_pipeline signals enrichment) used to
+scan a mint's whole tick list from the start for every BUY entry, which made a replay
+O(entries x ticks) on busy mints. This index keeps each mint's ticks in sorted
+arrays so an exit is resolved by:
+
+  1) bisect to the first tick with ts > entry_ts and to the last tick with ts <= window_end
+     (and, for a walk-forward window view, ts < the window's end)
+  2) first-crossing search for the TP / SL levels inside that window
+     (short Python head scan, then NumPy chunks that double in size)
+
+Semantics are identical to integration.sim_preflight._simulate_exit (the reference):
+- ticks with the same ts keep their input order (stable sort)
+- TP is checked before SL on the same tick
+- TIME closes at the last tick in the window, or at entry_price if the window is empty
+
+NumPy is optional: without it the crossing search falls back to a plain loop over the
+window, which is still bisect-bounded.
+
+This module performs no I/O.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+# Ticks checked one by one before switching to vectorized chunks.
+# Most exits trigger within the first few ticks, where NumPy call overhead dominates.
+_HEAD_SCAN = 32
+
+
+class MintTicks:
+    """Sorted (ts_sec, price) arrays for one mint."""
+
+    __slots__ = ("ts", "px", "_px_arr")
+
+    def __init__(self, ticks: Sequence[Tuple[float, float]]):
+        ordered = sorted(ticks, key=lambda x: x[0])
+        self.ts: List[float] = [float(t[0]) for t in ordered]
+        self.px: List[float] = [float(t[1]) for t in ordered]
+        self._px_arr = np.asarray(self.px, dtype=np.float64) if np is not None else None
+
+    @classmethod
+    def from_sorted(cls, ts: Sequence[float], px: Sequence[float]) -> "MintTicks":
+        """Wrap ts-sorted columns without copying (lists or NumPy arrays, e.g. memory-mapped)."""
+        mt = cls.__new__(cls)
+        mt.ts = ts  # type: ignore[assignment]
+        mt.px = px  # type: ignore[assignment]
+        if np is not None and isinstance(px, np.ndarray):
+            mt._px_arr = px
+        else:
+            mt._px_arr = np.asarray(px, dtype=np.float64) if np is not None else None
+        return mt
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def window(self, entry_ts_sec: float, window_end: float) -> Tuple[int, int]:
+        """Index range [lo, hi) of ticks with entry_ts_sec < ts <= window_end."""
+        lo = bisect_right(self.ts, entry_ts_sec)
+        hi = bisect_right(self.ts, window_end, lo)
+        return lo, hi
+
+    def first_crossing(self, lo: int, hi: int, tp_level: float, sl_level: float) -> int:
+        """Return the first index in [lo, hi) with px >= tp_level or px <= sl_level, else -1."""
+        px = self.px
+        head = min(hi, lo + _HEAD_SCAN)
+        for i in range(lo, head):
+            p = px[i]
+            if p >= tp_level or p <= sl_level:
+                return i
+        if head >= hi:
+            return -1
+
+        arr = self._px_arr
+        if arr is None:
+            for i in range(head, hi):
+                p = px[i]
+                if p >= tp_level or p <= sl_level:
+                    return i
+            return -1
+
+        start = head
+        chunk = _HEAD_SCAN * 4
+        while start < hi:
+            stop = min(hi, start + chunk)
+            seg = arr[start:stop]
+            hits = np.flatnonzero((seg >= tp_level) | (seg <= sl_level))
+            if hits.size:
+                return start + int(hits[0])
+            start = stop
+            chunk *= 2
+        return -1
+
+    def simulate_exit(
+        self,
+        entry_price: float,
+        entry_ts_sec: float,
+        tp_pct: float,
+        sl_pct: float,
+        hold_sec_max: int,
+        ts_end: Optional[float] = None,
+    ) -> Tuple[float, str]:
+        """Resolve (exit_price, reason) for one entry; reason in {TP,SL,TIME}.
+
+        ts_end: if given, ticks with ts >= ts_end are ignored (as if the index
+        had been built from trades before ts_end only).
+        """
+        tp_level = entry_price * (1.0 + tp_pct)
+        sl_level = entry_price * (1.0 + sl_pct)
+        window_end = entry_ts_sec + float(hold_sec_max)
+
+        lo, hi = self.window(entry_ts_sec, window_end)
+        if ts_end is not None and hi > lo:
+            hi = min(hi, bisect_left(self.ts, ts_end, lo, hi))
+        if lo >= hi:
+            return entry_price, "TIME"
+
+        i = self.first_crossing(lo, hi, tp_level, sl_level)
+        if i < 0:
+            return float(self.px[hi - 1]), "TIME"
+        px = float(self.px[i])
+        if px >= tp_level:
+            return px, "TP"
+        return px, "SL"
+
+
+class TickIndex:
+    """Per-mint MintTicks built once per run and shared by all entries."""
+
+    def __init__(self) -> None:
+        self._by_mint: Dict[str, MintTicks] = {}
+
+    @classmethod
+    def from_ticks(cls, ticks_by_mint: Mapping[str, Iterable[Tuple[float, float]]]) -> "TickIndex":
+        """Build from {mint: [(ts_sec, price), ...]} (any order; sorted here)."""
+        index = cls()
+        for mint, ticks in ticks_by_mint.items():
+            index._by_mint[mint] = MintTicks(list(ticks))
+        return index
+
+    @classmethod
+    def from_arrays(
+        cls,
+        mints: Sequence[str],
+        offsets: Sequence[int],
+        ts: Sequence[float],
+        px: Sequence[float],
+    ) -> "TickIndex":
+        """Build from mint-grouped columns: mint i owns rows offsets[i]:offsets[i+1], sorted by ts.
+
+        Slices of NumPy (or memory-mapped) arrays are views, so nothing is copied or re-sorted.
+        """
+        index = cls()
+        for i, mint in enumerate(mints):
+            lo, hi = int(offsets[i]), int(offsets[i + 1])
+            index._by_mint[mint] = MintTicks.from_sorted(ts[lo:hi], px[lo:hi])
+        return index
+
+    def items(self) -> Iterable[Tuple[str, MintTicks]]:
+        return self._by_mint.items()
+
+    def __len__(self) -> int:
+        return len(self._by_mint)
+
+    def __contains__(self, mint: object) -> bool:
+        return mint in self._by_mint
+
+    def get(self, mint: str) -> Optional[MintTicks]:
+        return self._by_mint.get(mint)
+
+    def simulate_exit(
+        self,
+        mint: str,
+        entry_price: float,
+        entry_ts_sec: float,
+        cfg_mode: Mapping[str, Any],
+        ts_end: Optional[float] = None,
+    ) -> Tuple[float, str]:
+        """Drop-in for sim_preflight._simulate_exit keyed by mint instead of a tick list."""
+        tp_pct = float(cfg_mode.get("tp_pct", 0.0))
+        sl_pct = float(cfg_mode.get("sl_pct", 0.0))
+        hold_sec_max = int(cfg_mode.get("hold_sec_max", 0))
+
+        ticks = self._by_mint.get(mint)
+        if ticks is None:
+            return entry_price, "TIME"
+        return ticks.simulate_exit(entry_price, entry_ts_sec, tp_pct, sl_pct, hold_sec_max, ts_end)
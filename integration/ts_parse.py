@@ -0,0 +1,129 @@
+"""integration/ts_parse.py
+
+Shared trade timestamp parser for the simulators (sim_preflight, ev_sweep, walk_forward,
+paper_pipeline signals enrichment).
+
+Accepted inputs (trade_types contract):
+- numbers / numeric strings: unix seconds, or unix milliseconds when |value| >= 1e11
+- ISO-8601 / 'YYYY-MM-DD HH:MM:SS[.mmm]' with optional 'Z' or offset (naive -> UTC)
+- None / empty / unparseable -> 0.0
+
+Each simulator parses every trade's ts at least twice (tick index + entry), and replay
+inputs repeat the same ts strings many times. TsCache memoizes parsed strings for one
+run; TsCache.column() parses a whole column, with NumPy when available (numeric columns
+are converted in one shot, string columns are parsed once per distinct value).
+
+Deterministic: no current time.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Union
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+# Epoch values at or above this magnitude are milliseconds (1e11 s is year ~5138).
+MS_THRESHOLD = 1e11
+
+
+def _from_number(v: float) -> float:
+    if v >= MS_THRESHOLD or v <= -MS_THRESHOLD:
+        return v / 1000.0
+    return v
+
+
+def _parse_str(s: str) -> float:
+    try:
+        return _from_number(float(s))
+    except ValueError:
+        pass
+
+    s = s.strip()
+    if not s:
+        return 0.0
+
+    # Handle common 'Z'
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+
+    # fromisoformat accepts "YYYY-MM-DD HH:MM:SS(.mmm)" and "T" separator
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def ts_to_seconds(ts: Any) -> float:
+    """Parse one trade ts into unix seconds (uncached)."""
+    if ts is None:
+        return 0.0
+    if isinstance(ts, str):
+        return _parse_str(ts)
+    try:
+        return _from_number(float(ts))
+    except Exception:
+        pass
+    return _parse_str(str(ts))
+
+
+class TsCache:
+    """Per-run memo of ts string -> unix seconds."""
+
+    __slots__ = ("_memo",)
+
+    def __init__(self) -> None:
+        self._memo: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def __call__(self, ts: Any) -> float:
+        if ts.__class__ is str:
+            v = self._memo.get(ts)
+            if v is None:
+                v = self._memo[ts] = _parse_str(ts)
+            return v
+        return ts_to_seconds(ts)
+
+    def column(self, values: Iterable[Any]) -> Union["np.ndarray", List[float]]:
+        """Parse a sequence of ts values; ndarray[float64] with NumPy, else a list."""
+        if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+            return self._numeric(values)
+        vals = values if isinstance(values, list) else list(values)
+        if np is None or not vals:
+            return [self(v) for v in vals]
+
+        classes = {v.__class__ for v in vals}
+        if classes <= {int, float}:
+            return self._numeric(np.asarray(vals, dtype=np.float64))
+
+        arr = np.asarray(vals, dtype=object)
+        out = np.empty(len(arr), dtype=np.float64)
+        is_str = np.fromiter((v.__class__ is str for v in arr), dtype=bool, count=len(arr))
+        if is_str.all():
+            uniq, inv = np.unique(arr.astype(str), return_inverse=True)
+            out[:] = np.fromiter((self(u) for u in uniq.tolist()), dtype=np.float64, count=len(uniq))[inv]
+            return out
+        for i, v in enumerate(arr.tolist()):
+            out[i] = self(v)
+        return out
+
+    @staticmethod
+    def _numeric(arr: "np.ndarray") -> "np.ndarray":
+        out = arr.astype(np.float64)
+        big = np.abs(out) >= MS_THRESHOLD
+        if big.any():
+            out = np.where(big, out / 1000.0, out)
+        return out
+
+
+def ts_column_to_seconds(values: Iterable[Any]) -> Union["np.ndarray", List[float]]:
+    """Parse a whole ts column with a fresh cache (see TsCache.column)."""
+    return TsCache().column(values)
@@ -5,6 +5,13 @@ PR-D.1: Walk-Forward Backtest Harness.
 
 This module slices trades into temporal windows and runs simulations for each window.
 
+Trades are parsed, sorted and indexed once (sim_preflight.prepare_replay); each
+window is a SimReplay.window() view found by bisect, sharing the per-mint tick
+arrays, so a run costs O(N log N + windows x entries_per_window) instead of
+re-grouping and re-sorting every window. With workers > 1 the prepared replay is
+written as a replay pack (integration.parallel_backtest) that pool workers
+memory-map, and windows run in parallel; results are identical to workers=1.
+
 Hard rules:
 - No network, no randomness, no time.now - deterministic
 - stdout must be empty for success
@@ -16,40 +23,21 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
+import shutil
 import sys
+import tempfile
+from bisect import bisect_left
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
+from integration.ts_parse import TsCache
+
 # Schema version for results.v1
 RESULTS_SCHEMA_VERSION = "results.v1"
 
-
-def _ts_to_seconds(ts: Any) -> float:
-    """Parse trade ts into seconds (deterministic)."""
-    if ts is None:
-        return 0.0
-
-    try:
-        return float(ts)
-    except Exception:
-        pass
-
-    s = str(ts).strip()
-    if not s:
-        return 0.0
-
-    if s.endswith("Z"):
-        s2 = s[:-1] + "+00:00"
-    else:
-        s2 = s
-
-    try:
-        dt = datetime.fromisoformat(s2)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.timestamp()
-    except Exception:
-        return 0.0
+# Per-process state set by _init_worker (replay pack + cfg).
+_WORKER: Dict[str, Any] = {}
 
 
 def _seconds_to_iso(ts_sec: float) -> str:
@@ -86,10 +74,11 @@ def _normalize_trades(trades: List[Dict[str, Any]]) -> List[Any]:
 
     Creates simple objects with ts attribute for consistent access.
     """
+    ts_cache = TsCache()
     normalized = []
     for t in trades:
         ts = _get(t, "ts", 0)
-        ts_sec = _ts_to_seconds(ts)
+        ts_sec = ts_cache(ts)
         # Create a simple object-like dict with ts_sec for sorting
         t["_ts_sec"] = ts_sec
         normalized.append(t)
@@ -127,6 +116,45 @@ def generate_windows(
     return windows
 
 
+def _init_worker(pack_dir: str, cfg: Dict[str, Any]) -> None:
+    from integration.parallel_backtest import load_replay_pack
+
+    _WORKER["replay"] = load_replay_pack(pack_dir)
+    _WORKER["cfg"] = cfg
+
+
+def _simulate_window(window: Tuple[float, float]) -> Dict[str, Any]:
+    from integration.sim_preflight import simulate_replay
+
+    start_sec, end_sec = window
+    return simulate_replay(_WORKER["replay"].window(start_sec, end_sec), _WORKER["cfg"])
+
+
+def _iter_window_metrics(
+    replay: Any,
+    cfg: Dict[str, Any],
+    windows: List[Tuple[float, float]],
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """sim_metrics for each window, in window order."""
+    from integration.sim_preflight import simulate_replay
+
+    if workers <= 1 or len(windows) <= 1:
+        return [simulate_replay(replay.window(s, e), cfg) for s, e in windows]
+
+    from integration.parallel_backtest import write_replay_pack
+
+    pack_dir = tempfile.mkdtemp(prefix="walk_forward_pack_")
+    try:
+        write_replay_pack(replay, pack_dir)
+        workers = min(workers, len(windows))
+        chunksize = max(1, len(windows) // (workers * 4))
+        with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(pack_dir, cfg)) as pool:
+            return list(pool.imap(_simulate_window, windows, chunksize=chunksize))
+    finally:
+        shutil.rmtree(pack_dir, ignore_errors=True)
+
+
 def run_walk_forward(
     trades_jsonl: str,
     config_path: str,
@@ -134,6 +162,7 @@ def run_walk_forward(
     step_days: int,
     token_snapshot_csv: str,
     wallet_profiles_csv: str,
+    workers: int = 1,
 ) -> Dict[str, Any]:
     """Run walk-forward backtest across temporal windows.
 
@@ -144,6 +173,7 @@ def run_walk_forward(
         step_days: Step size in days
         token_snapshot_csv: Path to token snapshot CSV
         wallet_profiles_csv: Path to wallet profiles CSV
+        workers: Processes used to simulate windows (1 = in-process)
 
     Returns:
         Results dict with schema results.v1
@@ -170,37 +200,26 @@ def run_walk_forward(
     if not trades_norm:
         raise ValueError("No trades found in input file")
 
-    # Get global min/max ts
-    min_ts_sec = min(_get(t, "_ts_sec", 0) for t in trades_norm)
-    max_ts_sec = max(_get(t, "_ts_sec", 0) for t in trades_norm)
+    # Trades are sorted, so windows are contiguous slices of trade_ts
+    trade_ts = [_get(t, "_ts_sec", 0) for t in trades_norm]
+    min_ts_sec = trade_ts[0]
+    max_ts_sec = trade_ts[-1]
 
-    # Generate windows
-    windows = generate_windows(min_ts_sec, max_ts_sec, window_days, step_days)
+    # Generate windows, skipping empty ones
+    windows = [
+        (start, end)
+        for start, end in generate_windows(min_ts_sec, max_ts_sec, window_days, step_days)
+        if bisect_left(trade_ts, end) > bisect_left(trade_ts, start)
+    ]
 
-    # Import preflight_and_simulate
-    from integration.sim_preflight import preflight_and_simulate
+    # Parse, group and sort ticks once; every window shares the index
+    from integration.sim_preflight import prepare_replay
+
+    replay = prepare_replay(trades_norm, token_snapshot_store, wallet_profile_store)
 
     # Run simulation for each window
     sweep_rows = []
-    for window_start_sec, window_end_sec in windows:
-        # Filter trades to this window: start <= t.ts < end
-        window_trades = [
-            t for t in trades_norm
-            if _get(t, "_ts_sec", 0) >= window_start_sec and _get(t, "_ts_sec", 0) < window_end_sec
-        ]
-
-        # Skip empty windows
-        if not window_trades:
-            continue
-
-        # Run preflight and simulate
-        sim_metrics = preflight_and_simulate(
-            trades_norm=window_trades,
-            cfg=cfg,
-            token_snapshot_store=token_snapshot_store,
-            wallet_profile_store=wallet_profile_store,
-        )
-
+    for (window_start_sec, _), sim_metrics in zip(windows, _iter_window_metrics(replay, cfg, windows, workers)):
         # Extract window_start_date ISO string
         window_start_date = _seconds_to_iso(window_start_sec)
 
@@ -298,6 +317,12 @@ def _main() -> None:
         required=True,
         help="Output path for results JSON",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to simulate windows (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -308,6 +333,9 @@ def _main() -> None:
     if args.step_days <= 0:
         print(f"ERROR: step-days must be positive", file=sys.stderr)
         sys.exit(1)
+    if args.workers <= 0:
+        print(f"ERROR: workers must be positive", file=sys.stderr)
+        sys.exit(1)
 
     try:
         result = run_walk_forward(
@@ -317,6 +345,7 @@ def _main() -> None:
             step_days=args.step_days,
             token_snapshot_csv=args.token_snapshot,
             wallet_profiles_csv=args.wallet_profiles,
+            workers=args.workers,
         )
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
@@ -26,7 +26,7 @@ import sys
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
@@ -88,7 +88,14 @@ def insert_signal(
     require_allowlist: bool = False,
     log_allowlist_version: bool = True,
     dry_run: bool = False,
+    runner: Any = None,
+    allowlist: Optional[Tuple[List[str], str]] = None,
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Build and insert one signals_raw row.
+
+    Hot-loop callers pass a long-lived `runner` (e.g. BufferedClickHouseWriter) and a
+    preloaded `allowlist` (wallets, hash) so neither is rebuilt per signal.
+    """
     traced_wallet = traced_wallet.strip()
 
     allowlist_hash: Optional[str] = None
@@ -96,7 +103,7 @@ def insert_signal(
     allowlist_row: Optional[Dict[str, Any]] = None
 
     if allowlist_path:
-        wallets, allowlist_hash = load_allowlist(allowlist_path)
+        wallets, allowlist_hash = allowlist if allowlist is not None else load_allowlist(allowlist_path)
         allowlist_count = len(wallets)
         if require_allowlist and traced_wallet not in set(wallets):
             raise SystemExit(f"Wallet not in allowlist: {traced_wallet}")
@@ -141,7 +148,8 @@ def insert_signal(
             print(json.dumps(allowlist_row, ensure_ascii=False, indent=2), file=sys.stderr)
         return row, allowlist_row
 
-    runner = make_runner(cfg)
+    if runner is None:
+        runner = make_runner(cfg)
     if allowlist_row:
         runner.insert_json_each_row("forensics_events", [allowlist_row])
     runner.insert_json_each_row("signals_raw", [row])
@@ -21,7 +21,7 @@ import sys
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
@@ -80,7 +80,13 @@ def insert_wallet_score(
     allowlist_path: str = "",
     log_allowlist_version: bool = True,
     dry_run: bool = False,
+    runner: Any = None,
+    allowlist: Optional[Tuple[List[str], str]] = None,
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Build and insert one forensics_events(kind=wallet_score) row.
+
+    `runner` and `allowlist` (wallets, hash) may be passed in to reuse them across calls.
+    """
     allowlist_row: Optional[Dict[str, Any]] = None
     allowlist_hash: Optional[str] = None
 
@@ -91,7 +97,7 @@ def insert_wallet_score(
     }
 
     if allowlist_path:
-        wallets, allowlist_hash = load_allowlist(allowlist_path)
+        wallets, allowlist_hash = allowlist if allowlist is not None else load_allowlist(allowlist_path)
         details["allowlist_hash"] = allowlist_hash
         if log_allowlist_version:
             allowlist_row = _mk_allowlist_version_row(
@@ -129,7 +135,8 @@ def insert_wallet_score(
             print(json.dumps(allowlist_row, ensure_ascii=False, indent=2), file=sys.stderr)
         return row, allowlist_row
 
-    runner = make_runner(cfg)
+    if runner is None:
+        runner = make_runner(cfg)
     if allowlist_row:
         runner.insert_json_each_row("forensics_events", [allowlist_row])
     runner.insert_json_each_row("forensics_events", [row])
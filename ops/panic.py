@@ -9,6 +9,10 @@ Emergency stop mechanism for immediate strategy shutdown:
 - Blocks further actions until manual reset
 
 Activation via flag file (default /tmp/strategy_panic.flag)
+
+Hot loops should use PanicWatcher: a background thread keeps a cached boolean
+current (inotify when inotify_simple is installed, timed polling otherwise),
+so the per-trade check is an attribute read instead of a stat() call.
 """
 
 from __future__ import annotations
@@ -16,8 +20,15 @@ from __future__ import annotations
 import logging
 import os
 import sys
+import threading
 from typing import Optional
 
+try:  # Optional: event-driven flag watching on Linux
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # pragma: no cover - fall back to timed polling
+    INotify = None
+    inotify_flags = None
+
 # Configure logging to stderr only (no print() in ops/)
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler(sys.stderr))
@@ -162,6 +173,96 @@ def require_no_panic(
         raise PanicShutdown(reason)
 
 
+class PanicWatcher:
+    """Cached panic flag refreshed by a background watcher thread.
+
+    `active` is a plain attribute, cheap enough to read once per trade. With
+    inotify the flag's directory is watched and `active` flips as soon as the
+    flag is created/removed; otherwise (or if the watch cannot be set up) the
+    flag is re-checked every `poll_interval_sec`. Either way the flag is also
+    re-checked at least every `poll_interval_sec`.
+
+    Usage:
+        watcher = PanicWatcher(flag_path).start()
+        ...
+        if watcher.active: halt()
+        ...
+        watcher.stop()
+    """
+
+    def __init__(
+        self,
+        flag_path: str = DEFAULT_PANIC_FLAG_PATH,
+        poll_interval_sec: float = 0.25,
+        use_inotify: bool = True,
+    ):
+        self.flag_path = flag_path
+        self.poll_interval_sec = poll_interval_sec
+        self.active = is_panic_active(flag_path)
+        self.backend = "poll"
+        self._inotify = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if use_inotify and INotify is not None:
+            watch_dir = os.path.dirname(os.path.abspath(flag_path))
+            mask = (
+                inotify_flags.CREATE
+                | inotify_flags.DELETE
+                | inotify_flags.MOVED_FROM
+                | inotify_flags.MOVED_TO
+            )
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(watch_dir, mask)
+                self.backend = "inotify"
+            except OSError as e:
+                logger.warning(f"panic: inotify watch on {watch_dir} failed ({e}), polling instead")
+                self._close_inotify()
+
+    def start(self) -> "PanicWatcher":
+        """Start the watcher thread (idempotent). Returns self."""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="PanicWatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release the inotify handle."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._close_inotify()
+
+    def _run(self) -> None:
+        timeout_ms = max(1, int(self.poll_interval_sec * 1000))
+        while not self._stop_event.is_set():
+            if self._inotify is not None:
+                try:
+                    self._inotify.read(timeout=timeout_ms)
+                except OSError:
+                    self._stop_event.wait(self.poll_interval_sec)
+            else:
+                self._stop_event.wait(self.poll_interval_sec)
+            self.active = is_panic_active(self.flag_path)
+
+    def _close_inotify(self) -> None:
+        if self._inotify is not None:
+            try:
+                self._inotify.close()
+            except OSError:
+                pass
+            self._inotify = None
+
+    def __enter__(self) -> "PanicWatcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
 # Self-test
 if __name__ == "__main__":
     import tempfile
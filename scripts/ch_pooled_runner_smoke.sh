@@ -0,0 +1,149 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# scripts/ch_pooled_runner_smoke.sh
+#
+# Pooled ClickHouse transport smoke (no ClickHouse needed; local HTTP/1.1 stub server):
+# - keep-alive: many queries/inserts reuse one TCP connection
+# - large request bodies are sent gzip-compressed and decoded by the server
+# - gzip responses are decoded; query_json / iter_query_tsv stream rows
+# - a server-closed idle connection is transparently reopened
+# - retryable 503 is retried, 400 fails fast with the CANON error message
+#
+# Success output (stderr, exactly):
+#   [ch_pooled_runner_smoke] OK ✅
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "${ROOT_DIR}"
+
+python3 - <<'PY'
+import gzip
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from integration.ch_client import ClickHouseConfig, make_runner
+from integration.ch_pooled_runner import PooledClickHouseQueryRunner
+
+
+def fail(msg):
+    print(f"[ch_pooled_runner_smoke] FAIL: {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+STATE = {"conns": set(), "bodies": [], "encodings": [], "fail_503": 0, "close_next": False}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *a):
+        pass
+
+    def do_POST(self):
+        STATE["conns"].add(self.client_address)
+        raw = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        enc = self.headers.get("Content-Encoding", "")
+        STATE["encodings"].append(enc)
+        sql = (gzip.decompress(raw) if enc == "gzip" else raw).decode("utf-8")
+        STATE["bodies"].append(sql)
+        qs = parse_qs(urlsplit(self.path).query)
+
+        if STATE["fail_503"]:
+            STATE["fail_503"] -= 1
+            return self._reply(503, b"busy")
+        if "BAD" in sql:
+            return self._reply(400, b"Code: 62. Syntax error")
+
+        if "JSONEachRow" in sql and sql.startswith("SELECT"):
+            n = int(sql.split()[1])
+            out = "".join(json.dumps({"i": i, "s": "é" * 3}) + "\n" for i in range(n)).encode("utf-8")
+        elif "TabSeparated" in sql:
+            n = int(sql.split()[1])
+            out = "".join(f"{i}\tx\n" for i in range(n)).encode("utf-8")
+        else:
+            out = b"1\n" if sql.startswith("SELECT") else b""
+
+        gz = qs.get("enable_http_compression") == ["1"] and "gzip" in self.headers.get("Accept-Encoding", "")
+        self._reply(200, gzip.compress(out) if gz else out, gz)
+
+    def _reply(self, code, body, gz=False):
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        if STATE["close_next"]:
+            STATE["close_next"] = False
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+
+srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=srv.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{srv.server_address[1]}"
+
+# make_runner() builds the pooled runner from the URL.
+r = make_runner(ClickHouseConfig(url=url, user="u", password="p"))
+if not isinstance(r, PooledClickHouseQueryRunner) or r.port != srv.server_address[1]:
+    fail("make_runner must return a pooled runner for CLICKHOUSE_URL")
+
+# 1) Keep-alive reuse across inserts and queries.
+for i in range(20):
+    r.insert_json_each_row("signals_raw", [{"signal_id": f"s{i}", "ts": "2024-01-01 00:00:00.000"}])
+if r.select_int("SELECT 1") != 1:
+    fail("select_int")
+if len(STATE["conns"]) != 1:
+    fail(f"expected 1 TCP connection, got {len(STATE['conns'])}")
+if r.pool_stats()["connections_created"] != 1:
+    fail(f"pool stats: {r.pool_stats()}")
+
+# 2) Request compression only for large bodies.
+rows = [{"event_id": str(i), "details_json": "x" * 100} for i in range(200)]
+r.insert_json_each_row("forensics_events", rows)
+if STATE["encodings"][-1] != "gzip" or STATE["encodings"][0] != "":
+    fail(f"request encodings: {STATE['encodings'][0]!r} / {STATE['encodings'][-1]!r}")
+if STATE["bodies"][-1].count("\n") != 201:
+    fail("compressed insert body mangled")
+
+# 3) Compressed, streamed responses.
+got = r.query_json("SELECT 5000 FORMAT JSONEachRow")
+if len(got) != 5000 or got[-1] != {"i": 4999, "s": "é" * 3}:
+    fail("query_json stream")
+tsv = list(r.iter_query_tsv("SELECT 3000"))
+if len(tsv) != 3000 or tsv[0] != "0\tx":
+    fail(f"iter_query_tsv: {tsv[:2]}")
+if r.query_tsv("SELECT 2").splitlines() != ["0\tx", "1\tx"]:
+    fail("query_tsv")
+
+# 4) Server closes the connection -> next call reconnects transparently.
+STATE["close_next"] = True
+r.select_int("SELECT 1")
+r.select_int("SELECT 1")
+if len(STATE["conns"]) != 2:
+    fail(f"reconnect: {len(STATE['conns'])} connections")
+
+# 5) Retry policy matches the CANON runner.
+STATE["fail_503"] = 1
+if r.select_int("SELECT 1") != 1:
+    fail("503 retry")
+try:
+    r.execute_raw("SELECT BAD")
+    fail("400 must raise")
+except RuntimeError as e:
+    if "ClickHouse error 400" not in str(e):
+        fail(f"error message: {e}")
+
+# 6) URL parsing.
+u = PooledClickHouseQueryRunner.from_url("https://a:b@ch.example:9443/?database=gmee")
+if (u.scheme, u.host, u.port, u.user, u.password, u.database) != ("https", "ch.example", 9443, "a", "b", "gmee"):
+    fail("from_url parsing")
+
+r.close()
+srv.shutdown()
+PY
+
+echo "[ch_pooled_runner_smoke] OK ✅" >&2
@@ -0,0 +1,138 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# scripts/ch_writer_smoke.sh
+#
+# Buffered ClickHouse writer smoke (no ClickHouse needed; fake runner records inserts):
+# - rows are grouped per (table, column layout) and flushed at max_rows as one insert
+# - the background flusher sends partial batches after max_age_sec
+# - failed inserts are retried, close() drains everything
+# - backpressure (max_pending_rows) flushes inline and is reported in stats()
+# - insert_trade_reject / insert_signal accept the writer as runner
+#
+# Success output (stderr, exactly):
+#   [ch_writer_smoke] OK ✅
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "${ROOT_DIR}"
+
+python3 - <<'PY'
+import sys
+import time
+
+from integration.ch_buffered_writer import BufferedClickHouseWriter
+from integration.ch_client import ClickHouseConfig
+from integration.write_signal import insert_signal
+from integration.write_trade_reject import insert_trade_reject
+
+
+def fail(msg):
+    print(f"[ch_writer_smoke] FAIL: {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+class FakeRunner:
+    def __init__(self, fail_first=0):
+        self.inserts = []
+        self.fail_first = fail_first
+
+    def insert_json_each_row(self, table, rows):
+        if self.fail_first:
+            self.fail_first -= 1
+            raise RuntimeError("ch down")
+        cols = {tuple(r.keys()) for r in rows}
+        if len(cols) != 1:
+            fail(f"mixed column layouts in one insert: {cols}")
+        self.inserts.append((table, list(rows)))
+
+
+# 1) Count-based flush, per-layout queues.
+r = FakeRunner()
+w = BufferedClickHouseWriter(r, max_rows=3, max_age_sec=60)
+for i in range(7):
+    w.add("signals_raw", {"signal_id": i, "ts": "t"})
+    w.add("forensics_events", {"event_id": i, "kind": "trade_reject"})
+w.add("forensics_events", {"event_id": 99, "kind": "wallet_score", "attempt_id": None})
+if [len(rows) for _, rows in r.inserts] != [3, 3, 3, 3]:
+    fail(f"count flush: {[(t, len(rows)) for t, rows in r.inserts]}")
+w.close()
+by_table = w.stats()["rows_by_table"]
+if by_table != {"signals_raw": 7, "forensics_events": 8}:
+    fail(f"drain on close: {by_table}")
+if [row["signal_id"] for t, rows in r.inserts if t == "signals_raw" for row in rows] != list(range(7)):
+    fail("signals_raw order not preserved")
+w.close()  # idempotent
+try:
+    w.add("signals_raw", {"signal_id": 0})
+    fail("add after close must raise")
+except RuntimeError:
+    pass
+
+# 2) Age-based flush by the background thread.
+r = FakeRunner()
+w = BufferedClickHouseWriter(r, max_rows=1000, max_age_sec=0.05)
+w.add("signals_raw", {"signal_id": 1})
+deadline = time.time() + 2.0
+while not r.inserts and time.time() < deadline:
+    time.sleep(0.01)
+if len(r.inserts) != 1:
+    fail("age flush did not happen")
+w.close()
+
+# 3) Failed insert is retried; close drains.
+r = FakeRunner(fail_first=1)
+w = BufferedClickHouseWriter(r, max_rows=2, background=False)
+w.add("signals_raw", {"signal_id": 1})
+w.add("signals_raw", {"signal_id": 2})
+w.add("signals_raw", {"signal_id": 3})
+w.close()
+st = w.stats()
+if st["flush_errors"] != 1 or st["rows_written"] != 3 or st["rows_pending"] != 0:
+    fail(f"retry: {st}")
+if [row["signal_id"] for _, rows in r.inserts for row in rows] != [1, 2, 3]:
+    fail("retry must keep row order")
+
+# 4) Close raises when rows cannot be written.
+r = FakeRunner(fail_first=10)
+w = BufferedClickHouseWriter(r, max_rows=100, background=False)
+w.add("signals_raw", {"signal_id": 1})
+try:
+    w.close()
+    fail("close must raise with unwritten rows")
+except RuntimeError:
+    pass
+
+# 5) Backpressure.
+r = FakeRunner()
+w = BufferedClickHouseWriter(r, max_rows=100, max_pending_rows=5, background=False)
+for i in range(12):
+    w.add("t%d" % (i % 4), {"i": i})
+st = w.stats()
+if st["backpressure_events"] < 1 or st["rows_pending"] > 5:
+    fail(f"backpressure: {st}")
+w.close()
+if w.stats()["rows_written"] != 12:
+    fail("backpressure drain")
+
+# 6) Existing writers accept the buffered writer as runner.
+r = FakeRunner()
+w = BufferedClickHouseWriter(r, max_rows=100, background=False)
+for i in range(3):
+    insert_trade_reject(runner=w, chain="solana", env="paper", trace_id="tr", stage="gates", reason="min_liquidity_fail")
+    insert_signal(
+        cfg=ClickHouseConfig(), chain="solana", env="paper", source="wallet_copy", traced_wallet="W",
+        token_mint="M", pool_id="", ts=f"2024-01-01 00:00:0{i}.000", trace_id="tr", signal_id="",
+        payload={}, allowlist_path="any.yaml", log_allowlist_version=False, runner=w,
+        allowlist=(["W"], "h"), require_allowlist=True,
+    )
+if r.inserts:
+    fail("nothing should be sent before the flush")
+w.close()
+tables = sorted((t, len(rows)) for t, rows in r.inserts)
+if tables != [("forensics_events", 3), ("signals_raw", 3)]:
+    fail(f"writers via buffered runner: {tables}")
+if '"allowlist_hash":"h"' not in r.inserts[[t for t, _ in r.inserts].index("signals_raw")][1][0]["payload_json"]:
+    fail("preloaded allowlist hash not used")
+PY
+
+echo "[ch_writer_smoke] OK ✅" >&2
@@ -107,6 +107,23 @@ if [ "${RANDOM_DEGREES}" != "0_0" ]; then
     exit 1
 fi
 
+# Incremental builder fed one trade at a time matches the batch build
+cd "${PROJECT_ROOT}"
+python3 - "${FIXTURE_FILE}" <<'PY' || { echo "ERROR: incremental graph mismatch" >&2; exit 1; }
+import json
+import sys
+
+from strategy.clustering import CoTradeGraphBuilder, build_co_trade_graph
+
+trades = [json.loads(line) for line in open(sys.argv[1]) if line.strip()]
+batch = build_co_trade_graph(trades, window_sec=45).to_dict()
+builder = CoTradeGraphBuilder(window_sec=45)
+for t in sorted(trades, key=lambda t: t["ts"]):
+    builder.add_trade(t)
+assert builder.graph().to_dict() == batch, builder.graph().to_dict()
+assert builder.late_trades == 0
+PY
+
 # Cleanup
 rm -f "${OUTPUT_FILE}"
 
@@ -93,8 +93,8 @@ fi
 # 1. Modify config (VALID)
 echo "[test] Modifying config (Valid Update)..."
 # Update edge_threshold_base and position_pct
-# We use sed to replace values in the file.
-sed -i '' 's/edge_threshold_base: 0.05/edge_threshold_base: 0.04/' "$CONFIG_FILE"
+# We use sed to replace values in the file (-i.bak works with both GNU and BSD sed).
+sed -i.bak 's/edge_threshold_base: 0.05/edge_threshold_base: 0.04/' "$CONFIG_FILE" && rm -f "$CONFIG_FILE.bak"
 # Wait for reload
 sleep 2
 
@@ -119,7 +119,7 @@ fi
 # 2. Modify config (INVALID)
 echo "[test] Modifying config (Invalid Update)..."
 # Set invalid value (e.g. edge_threshold_base > 1.0)
-sed -i '' 's/edge_threshold_base: 0.04/edge_threshold_base: 2.5/' "$CONFIG_FILE"
+sed -i.bak 's/edge_threshold_base: 0.04/edge_threshold_base: 2.5/' "$CONFIG_FILE" && rm -f "$CONFIG_FILE.bak"
 sleep 2
 
 if grep -q "Reload FAILED" /tmp/hot_reload_test/stderr.log; then
@@ -131,9 +131,55 @@ else
     exit 1
 fi
 
+# 3. Snapshots: generation bumps on reload, config arrives pre-merged
+echo "[test] Verifying config snapshots..."
+if python3 - "$CONFIG_FILE" <<'PY'
+import sys
+
+from config.hot_reload import ConfigReloader
+from integration.config_loader import apply_runtime_overrides
+
+path = sys.argv[1]
+text = open(path).read().replace("edge_threshold_base: 2.5", "edge_threshold_base: 0.05")
+open(path, "w").write(text)
+
+base = {"signals": {"edge_threshold_base": 0.9}, "risk": {}}
+reloader = ConfigReloader(path)
+snap = reloader.set_merge(lambda rt: apply_runtime_overrides(base, rt))
+assert snap is reloader.snapshot and snap.config["signals"]["edge_threshold_base"] == 0.05, snap
+assert base["signals"]["edge_threshold_base"] == 0.9, "base config mutated"
+
+open(path, "w").write(text.replace("edge_threshold_base: 0.05", "edge_threshold_base: 0.03"))
+reloader._check_file()
+new = reloader.snapshot
+assert new.generation == snap.generation + 1, (snap.generation, new.generation)
+assert new.config["signals"]["edge_threshold_base"] == 0.03 and new.runtime.edge_threshold_base == 0.03
+assert snap.config["signals"]["edge_threshold_base"] == 0.05, "published snapshot changed"
+
+# Published configs are deep-frozen; copies are plain mutable dicts
+import copy
+try:
+    new.config["signals"]["edge_threshold_base"] = 1.0
+except TypeError:
+    pass
+else:
+    raise AssertionError("snapshot config is mutable")
+assert isinstance(new.config, dict)
+mutable = copy.deepcopy(new.config)
+mutable["signals"]["edge_threshold_base"] = 1.0
+assert type(mutable["signals"]) is dict and new.config["signals"]["edge_threshold_base"] == 0.03
+PY
+then
+    echo "[ok] Snapshot generation and pre-merged config verified"
+else
+    echo "[fail] Snapshot check failed"
+    kill $PID
+    exit 1
+fi
+
 # Cleanup
 echo "[ok] Smoke test passed."
-kill $PID
+kill $PID 2>/dev/null || true
 rm -rf /tmp/hot_reload_test
 exit 0
 
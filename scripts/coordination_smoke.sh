@@ -11,5 +11,6 @@ python3 scripts/coordination_test_clustered.py
 python3 scripts/coordination_test_random.py
 python3 scripts/coordination_test_disabled.py
 python3 scripts/coordination_test_determinism.py
+python3 scripts/coordination_test_streaming.py
 
 echo "[coordination_smoke] OK"
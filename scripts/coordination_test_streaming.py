@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# scripts/coordination_test_streaming.py
+
+import sys
+import json
+
+sys.path.insert(0, '.')
+
+from strategy.coordinated_actions import CoordinationDetector, detect_coordination
+
+FIXTURES_DIR = 'integration/fixtures/coordination'
+
+trades = []
+for name in ('trades_clustered.jsonl', 'trades_random.jsonl'):
+    with open(f'{FIXTURES_DIR}/{name}') as f:
+        trades.extend(json.loads(line) for line in f if line.strip())
+trades.sort(key=lambda t: t["ts_block"])
+
+# Feed the streaming detector one trade at a time and compare with the batch scores
+detector = CoordinationDetector(window_sec=60.0)
+for t in trades:
+    detector.add(t)
+
+batch = detect_coordination(trades, window_sec=60.0)
+streamed = detector.scores()
+
+print(f"[coordination_smoke] Streaming scores: {streamed}")
+
+if streamed.keys() == batch.keys() and all(abs(streamed[w] - batch[w]) < 1e-9 for w in batch):
+    print('[coordination_smoke] Streaming: PASSED (matches batch detection)')
+else:
+    print(f'[coordination_smoke] Streaming: FAILED (batch={batch})')
+    sys.exit(1)
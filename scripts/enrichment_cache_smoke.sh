@@ -0,0 +1,121 @@
+#!/bin/bash
+# scripts/enrichment_cache_smoke.sh
+# Smoke test for the tiered enrichment cache (ingestion/enrichment_cache.py)
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+ROOT_DIR="$(cd "$(dirname "${SCRIPT_DIR}")" && pwd)"
+
+echo "[enrichment_cache_smoke] Starting enrichment cache smoke test..." >&2
+
+python3 << PYTHON_TEST
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, '$ROOT_DIR')
+
+from ingestion.enrichment_cache import EnrichmentCache, SourcePolicy
+
+passed = 0
+failed = 0
+
+def test_case(name, condition, msg=""):
+    global passed, failed
+    if condition:
+        print(f"  [enrichment_cache] {name}: PASS", file=sys.stderr)
+        passed += 1
+    else:
+        print(f"  [enrichment_cache] {name}: FAIL {msg}", file=sys.stderr)
+        failed += 1
+
+# Test 1: concurrent misses share one loader call
+cache = EnrichmentCache(policies={"src": SourcePolicy(ttl_sec=60)})
+calls = []
+def slow_loader():
+    calls.append(1)
+    time.sleep(0.2)
+    return {"v": 1}
+results = []
+threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("src", "k", slow_loader))) for _ in range(8)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+test_case("single_flight_threads", len(calls) == 1 and results == [{"v": 1}] * 8, f"calls={len(calls)}")
+m = cache.metrics("src")
+test_case("metrics_coalesced", m["loads"] == 1 and m["coalesced"] == 7, str(m))
+test_case("fresh_hit", cache.get_or_load("src", "k", slow_loader) == {"v": 1} and len(calls) == 1)
+
+# Test 2: a loader error reaches every waiter and is not cached
+def failing_loader():
+    raise RuntimeError("boom")
+try:
+    cache.get_or_load("src", "bad", failing_loader)
+    raised = False
+except RuntimeError:
+    raised = True
+test_case("loader_error_raised", raised and cache.get("src", "bad") is None)
+
+# Test 3: async misses on one loop share one task
+acalls = []
+async def aloader():
+    acalls.append(1)
+    await asyncio.sleep(0.05)
+    return "meta"
+async def fan_out():
+    return await asyncio.gather(*(cache.aget_or_load("async", "mint", aloader) for _ in range(10)))
+out = asyncio.run(fan_out())
+test_case("single_flight_async", len(acalls) == 1 and out == ["meta"] * 10, f"calls={len(acalls)}")
+
+# Test 4: stale value served while one background refresh runs
+cache.register_source("swr", SourcePolicy(ttl_sec=0.1, stale_ttl_sec=60))
+version = [0]
+def versioned_loader():
+    version[0] += 1
+    return version[0]
+test_case("swr_initial", cache.get_or_load("swr", "k", versioned_loader) == 1)
+time.sleep(0.15)
+test_case("swr_serves_stale", cache.get_or_load("swr", "k", versioned_loader) == 1)
+deadline = time.time() + 2.0
+while cache.get("swr", "k") != 2 and time.time() < deadline:
+    time.sleep(0.01)
+test_case("swr_refreshed", cache.get("swr", "k") == 2 and version[0] == 2, f"version={version[0]}")
+
+# Test 5: memory tier is bounded by max_entries
+cache.register_source("lru", SourcePolicy(ttl_sec=60, max_entries=3))
+for i in range(10):
+    cache.set("lru", f"k{i}", i)
+test_case("lru_bounded", cache.size("lru") == 3 and cache.get("lru", "k9") == 9 and cache.get("lru", "k0") is None)
+cache.close()
+
+# Test 6: disk tier survives a restart; non-persistent sources stay in memory
+disk_dir = tempfile.mkdtemp()
+disk_path = os.path.join(disk_dir, "enrichment.sqlite")
+warm = EnrichmentCache(disk_path=disk_path)
+warm.get_or_load("solanafm", "mintA", lambda: {"symbol": "AAA"})
+warm.set("pyth", "SOL", 150.0)
+warm.close()
+warm = EnrichmentCache(disk_path=disk_path)
+def must_not_load():
+    raise AssertionError("loader called after warm restart")
+test_case("disk_warm_restart", warm.get_or_load("solanafm", "mintA", must_not_load) == {"symbol": "AAA"})
+test_case("disk_hit_counted", warm.metrics("solanafm")["disk_hits"] == 1)
+test_case("memory_only_source", warm.get("pyth", "SOL") is None)
+test_case("disk_invalidate", warm.invalidate("solanafm", "mintA") and warm.get("solanafm", "mintA") is None)
+warm.close()
+
+print(f"\n[enrichment_cache_smoke] Tests: {passed} passed, {failed} failed", file=sys.stderr)
+
+if failed > 0:
+    sys.exit(1)
+else:
+    print("[enrichment_cache_smoke] OK", file=sys.stderr)
+    sys.exit(0)
+PYTHON_TEST
+
+echo "[enrichment_cache_smoke] Smoke test completed." >&2
@@ -197,4 +197,23 @@ if [[ "${ENTERED_100}" != "1" ]]; then
   exit 1
 fi
 
+# Assertion 8: dense sweep is consistent with the 3-threshold run (one simulation, many thresholds)
+python3 - "${SNAP}" "${WPROF}" "${TRADES}" "${CFG}" "${OUT_TMP}" <<'PY' || fail "dense sweep mismatch"
+import json
+import sys
+
+import yaml
+
+from integration.ev_sweep import run_ev_sweep
+
+snap, wprof, trades, cfg_path, out = sys.argv[1:]
+cfg = yaml.safe_load(open(cfg_path, "r", encoding="utf-8")) or {}
+dense = run_ev_sweep(list(range(0, 501)), snap, wprof, trades, cfg)["sweeps"][0]["rows"]
+by_value = {r["value"]: r["sim_metrics"] for r in dense}
+for r in json.load(open(out, "r", encoding="utf-8"))["sweeps"][0]["rows"]:
+    assert by_value[r["value"]] == r["sim_metrics"], r["value"]
+entered = [r["sim_metrics"]["positions_total"] for r in dense]
+assert all(a >= b for a, b in zip(entered[1:], entered[2:])), "entered must not grow with threshold"
+PY
+
 echo "[ev_sweep] OK ✅" >&2
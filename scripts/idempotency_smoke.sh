@@ -92,6 +92,28 @@ try:
     removed = manager2.prune()
     test_case("prune_removes_expired", removed >= 1)
 
+    # Test 8b: WAL replay across restarts (including a torn last line) and compaction
+    wal_dir = tempfile.mkdtemp()
+    wal_file = os.path.join(wal_dir, "state.jsonl")
+    m = IdempotencyManager(state_file=wal_file, ttl_sec=60, compact_min_records=100)
+    for i in range(500):
+        m.acquire_lock(key=f"k{i}")
+    for i in range(1, 500):
+        m.release_lock(key=f"k{i}")
+    m.close()
+    with open(wal_file) as f:
+        wal_lines = sum(1 for _ in f)
+    test_case("wal_compacted", wal_lines < 1000, f"lines={wal_lines}")
+    with open(wal_file, "a") as f:
+        f.write('{"key": "torn", "op": "acq')
+    m = IdempotencyManager(state_file=wal_file, ttl_sec=60)
+    test_case("wal_replay_live", m.check(key="k0") and not m.check(key="k1") and len(m) == 1)
+    test_case("wal_append_after_torn_line", m.acquire_lock(key="after_torn") == True)
+    m.close()
+    m = IdempotencyManager(state_file=wal_file, ttl_sec=60)
+    test_case("wal_replay_after_torn_line", m.check(key="after_torn") and not m.check(key="torn"))
+    m.close()
+
     print("[idempotency_smoke] Testing ReorgGuard...", file=sys.stderr)
 
     from execution.reorg_guard import ReorgGuard
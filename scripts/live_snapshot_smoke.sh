@@ -157,6 +157,80 @@ if result3.extra.get('price') != 2.45:
     log(f"FAIL: JUP price mismatch, expected 2.45, got {result3.extra.get('price')}")
     sys.exit(1)
 
+# Prefetch mode: batched refresh ahead of expiry, stale serving, no blocking for warm mints
+log("Testing prefetch mode...")
+import time
+
+calls = {"n": 0, "fail": False}
+
+def counting_get(url, **kwargs):
+    calls["n"] += 1
+    if calls["fail"]:
+        raise RequestException("jupiter down")
+    return MockResponse(MOCK_DATA)
+
+requests.get = counting_get
+TEST_MINT_3 = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC
+
+pstore = LiveTokenSnapshotStore(ttl_seconds=1, prefetch=True, refresh_ahead_sec=0.5, interval_sec=3600)
+for _ in range(3):
+    pstore.get(TEST_MINT)
+pstore.get(TEST_MINT_2)
+assert calls["n"] == 2, f"expected 2 blocking fetches, got {calls['n']}"
+assert pstore.hot_mints() == [TEST_MINT, TEST_MINT_2], pstore.hot_mints()
+assert pstore.prefetch_once() == 0, "nothing should be due yet"
+time.sleep(0.6)
+assert pstore.prefetch_once() == 2 and calls["n"] == 3, "due mints should refresh in one batch"
+
+calls["fail"] = True
+time.sleep(1.1)
+assert pstore.prefetch_once() == 0 and pstore.stats["prefetch_errors"] == 1, pstore.stats
+stale = pstore.get(TEST_MINT)
+assert stale is not None and stale.extra["stale"] is True and stale.extra["price"] == 1.23, stale
+assert stale.extra["snapshot_age_sec"] > 1.0, stale.extra
+
+# A mint missing from the batch response keeps its last snapshot
+def partial_get(url, **kwargs):
+    calls["n"] += 1
+    return MockResponse({"data": {TEST_MINT_2: MOCK_DATA["data"][TEST_MINT_2], TEST_MINT: None}})
+
+requests.get = partial_get
+assert pstore.prefetch_once() == 1 and pstore.stats["prefetch_missing"] == 1, pstore.stats
+kept = pstore.get(TEST_MINT)
+assert kept is not None and kept.extra["price"] == 1.23 and kept.extra["stale"] is True, kept
+requests.get = counting_get
+
+# First sight blocks once (and fails); a repeat within the hot window must not block
+assert pstore.get(TEST_MINT_3) is None
+blocking = pstore.stats["blocking_fetches"]
+calls["fail"] = False
+assert pstore.get(TEST_MINT_3) is None and pstore.stats["blocking_fetches"] == blocking, pstore.stats
+deadline = time.time() + 3.0
+snap = None
+while snap is None and time.time() < deadline:
+    time.sleep(0.05)
+    snap = pstore.get(TEST_MINT_3)
+assert snap is not None and snap.extra["price"] == 1.0, "worker should fill the deferred mint"
+assert pstore.stats["blocking_fetches"] == blocking, pstore.stats
+pstore.close()
+log(f"Prefetch test passed: stats={pstore.stats}")
+
+# Prefetch stores sharing one cache keep their own stale policy and entries
+from ingestion.enrichment_cache import EnrichmentCache
+shared = EnrichmentCache()
+plain = LiveTokenSnapshotStore(ttl_seconds=30, cache=shared)
+assert plain.get(TEST_MINT) is not None
+a_store = LiveTokenSnapshotStore(cache=shared, prefetch=True, max_stale_sec=10, interval_sec=3600)
+a_store.get(TEST_MINT)
+b_store = LiveTokenSnapshotStore(cache=shared, prefetch=True, max_stale_sec=600, interval_sec=3600)
+n = calls["n"]
+assert a_store.get(TEST_MINT) is not None and plain.get(TEST_MINT) is not None and calls["n"] == n, "entries were cleared"
+assert shared.policy(a_store._cache_source).stale_ttl_sec == 10 and shared.policy(b_store._cache_source).stale_ttl_sec == 600
+assert shared.policy(LiveTokenSnapshotStore.CACHE_SOURCE).stale_ttl_sec == 0 and not shared.policy(a_store._cache_source).persist
+for st in (a_store, b_store):
+    st.close()
+log("Shared-cache prefetch isolation passed")
+
 log("All tests passed!")
 PYTHON_SCRIPT
 
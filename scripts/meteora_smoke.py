@@ -10,7 +10,9 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ingestion.dex.meteora.layouts import LB_PAIR_LAYOUT, LbPairState, decode_lb_pair
+from ingestion.dex.accounts import account_buffers
+from ingestion.dex.meteora.layouts import LB_PAIR_LAYOUT, LB_PAIR_FIELDS, LbPairState, decode_lb_pair, decode_lb_pairs
+from ingestion.dex import fastmath
 from ingestion.dex.meteora.math import BIN_ID_OFFSET, MeteoraMath
 
 RED = '\033[0;31m'
@@ -119,6 +121,17 @@ def main():
     assert abs(price_high - 10000.0) < 100.0, f'High price round-trip failed: {price_high}'
     print(f"  Price 10000 -> BinID: {bin_id_high}, back to {price_high:.2f} (OK)")
     
+    # Fast (table) path agrees with the Decimal reference, scalar and vectorized
+    fastmath.set_verification(True)
+    ids = [BIN_ID_OFFSET + d for d in range(-5000, 5001, 37)]
+    for step in (1, 20, 100):
+        for bin_id in ids:
+            MeteoraMath.get_price_from_id(bin_id, step, 9, 6)
+        batch = MeteoraMath.get_prices_from_ids(ids, step, 9, 6)
+        assert list(batch) == [MeteoraMath.get_price_from_id(i, step, 9, 6) for i in ids]
+    fastmath.set_verification(False)
+    print(f"  Fast path vs Decimal reference: {3 * len(ids)} bins (OK)")
+    
     print("  Math tests: PASSED")
     print("")
     
@@ -174,7 +187,24 @@ def main():
     print("  Decoder tests: PASSED")
     print("")
     
-    # Test 4: Fixture file
+    # Test 4: Batch decode of a getMultipleAccounts response
+    log_info("Testing batch decode...")
+    
+    import base64
+    accounts = [raw_data, synthetic_data + bytes(64), None, raw_data[:100]]
+    response = {"result": {"context": {"slot": 1}, "value": [
+        None if a is None else {"data": [base64.b64encode(a).decode(), "base64"]} for a in accounts
+    ]}}
+    pools = decode_lb_pairs(account_buffers(response))
+    assert pools.index == [0, 1], f'decoded rows: {pools.index}'
+    assert sorted(pools.errors) == [2, 3], f'errors: {pools.errors}'
+    assert pools["active_id"] == [8391113, 8391115], pools["active_id"]
+    assert pools.row(0) == result.to_dict() and tuple(pools.columns) == LB_PAIR_FIELDS
+    assert pools["token_x_mint"][0] is result.token_x_mint, "pubkey string not interned"
+    print(f"  decode_lb_pairs: {len(pools)} decoded, {len(pools.errors)} errors (OK)")
+    print("")
+    
+    # Test 5: Fixture file
     log_info("Testing fixture file...")
     fixture_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
                                  "integration", "fixtures", "meteora", "lb_pair_sol_usdc.hex")
@@ -58,6 +58,40 @@ if [ "$OUTPUT" != "$OUTPUT2" ]; then
   fail "Same seed should produce identical output"
 fi
 
+# Verify the numpy engine gives the same result with a process pool
+if python3 -c "import numpy" 2>/dev/null; then
+  echo "[monte_carlo_smoke] Verifying numpy engine across workers..." >&2
+  OUTPUT_POOL=$(python3 "${ROOT_DIR}/integration/monte_carlo.py" \
+    --trades "${ROOT_DIR}/integration/fixtures/monte_carlo/trades.jsonl" \
+    --config "${ROOT_DIR}/integration/fixtures/monte_carlo/config.yaml" \
+    --runs 600 \
+    --seed 42 \
+    --engine numpy \
+    --workers 2 \
+    --quiet 2>/dev/null)
+  OUTPUT_SINGLE=$(python3 "${ROOT_DIR}/integration/monte_carlo.py" \
+    --trades "${ROOT_DIR}/integration/fixtures/monte_carlo/trades.jsonl" \
+    --config "${ROOT_DIR}/integration/fixtures/monte_carlo/config.yaml" \
+    --runs 600 \
+    --seed 42 \
+    --engine numpy \
+    --quiet 2>/dev/null)
+  if [ "$OUTPUT_POOL" != "$OUTPUT_SINGLE" ]; then
+    fail "numpy engine results depend on worker count"
+  fi
+fi
+
+# Verify the python reference engine still runs
+if ! python3 "${ROOT_DIR}/integration/monte_carlo.py" \
+  --trades "${ROOT_DIR}/integration/fixtures/monte_carlo/trades.jsonl" \
+  --config "${ROOT_DIR}/integration/fixtures/monte_carlo/config.yaml" \
+  --runs 10 \
+  --seed 42 \
+  --engine python \
+  --quiet 2>/dev/null | python3 -c "import sys, json; d=json.load(sys.stdin); assert d['runs'] == 10 and 'p50' in d['roi_pct']" 2>/dev/null; then
+  fail "python engine output invalid"
+fi
+
 echo "[monte_carlo_smoke] Output JSON:" >&2
 echo "$OUTPUT" >&2
 
@@ -102,7 +102,24 @@ from ingestion.dex.orca.math import (
 print('[orca_smoke] Convenience functions OK')
 "
 
-# Test 7: Verify layout constants
+# Test 7: Fast tick/sqrt-price math agrees with the Decimal reference
+echo "[orca_smoke] Checking fast math against Decimal reference..."
+python3 -c "
+from ingestion.dex import fastmath
+from ingestion.dex.orca.math import OrcaMath, MAX_TICK_INDEX
+fastmath.set_verification(True)
+ticks = list(range(-MAX_TICK_INDEX, MAX_TICK_INDEX + 1, 4099))
+for tick in ticks:
+    sqrt_price = OrcaMath.tick_to_sqrt_price_x64(tick)
+    price = OrcaMath.sqrt_price_x64_to_price(sqrt_price, 9, 6)
+    OrcaMath.tick_to_price(tick, 9, 6)
+    OrcaMath.price_to_sqrt_price_x64(price, 9, 6)
+assert list(OrcaMath.ticks_to_prices(ticks, 9, 6)) == [OrcaMath.tick_to_price(t, 9, 6) for t in ticks]
+OrcaMath.sqrt_prices_x64_to_prices([OrcaMath.tick_to_sqrt_price_x64(t) for t in ticks], 9, 6)
+print(f'[orca_smoke] Fast math matches reference for {len(ticks)} ticks (OK)')
+"
+
+# Test 8: Verify layout constants
 echo "[orca_smoke] Checking WHIRLPOOL_LAYOUT..."
 python3 -c "
 from ingestion.dex.orca.layouts import WHIRLPOOL_LAYOUT
@@ -110,5 +127,26 @@ print(f'[orca_smoke] WHIRLPOOL_LAYOUT size: {WHIRLPOOL_LAYOUT.size} bytes (OK)')
 assert WHIRLPOOL_LAYOUT.size > 0, 'Layout should have positive size'
 "
 
+# Test 9: Batch decode matches single-account decode
+echo "[orca_smoke] Checking batch decode..."
+python3 -c "
+import os
+import sys
+from dataclasses import astuple
+try:
+    import base58
+except ImportError:
+    print('[orca_smoke] base58 not installed, skipping batch decode check')
+    sys.exit(0)
+from ingestion.dex.orca.layouts import WHIRLPOOL_LAYOUT, WHIRLPOOL_CORE_LAYOUT, decode_whirlpool, decode_whirlpools
+accounts = [os.urandom(8 + WHIRLPOOL_LAYOUT.size), os.urandom(8 + WHIRLPOOL_CORE_LAYOUT.size), None, b'short']
+pools = decode_whirlpools(accounts)
+assert pools.index == [0, 1] and sorted(pools.errors) == [2, 3], (pools.index, pools.errors)
+for k, i in enumerate(pools.index):
+    assert tuple(pools.row(k).values()) == astuple(decode_whirlpool(accounts[i]))
+assert pools['oracle_a'][1] == '', 'core layout has no oracles'
+print(f'[orca_smoke] Batch decode: {len(pools)} pools (OK)')
+"
+
 echo "[orca_smoke] All smoke tests passed!"
 echo "[orca_smoke] OK"
@@ -303,6 +303,38 @@ with open("integration/fixtures/order_manager/mock_price_ticks.jsonl", "r") as f
 assert len(ticks) > 0
 print(f"[order_manager_smoke] Test 13 passed: Loaded {len(ticks)} price ticks", file=sys.stderr)
 
+# Test 14: Tick-driven triggers via the per-mint index (TTL > TP > SL, other mints untouched)
+print("[order_manager_smoke] Test 14: on_tick triggers...", file=sys.stderr)
+import asyncio
+
+manager6 = OrderManager(dry_run=True)
+t0 = datetime.now(timezone.utc)
+MINT_A = "So11111111111111111111111111111111111111112"
+MINT_B = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+for sid, mint, ttl, tp, sl in [
+    ("t_tp", MINT_A, 3600, 105.0, 97.0),
+    ("t_sl", MINT_A, 3600, 110.0, 99.0),
+    ("t_ttl", MINT_A, 10, 105.0, 97.0),
+    ("t_far", MINT_A, 3600, 120.0, 80.0),
+    ("t_other", MINT_B, 3600, 101.0, 99.0),
+]:
+    manager6.on_fill(
+        signal_id=sid, mint=mint, entry_price=100.0, size_usd=100.0,
+        entry_ts=t0, ttl_seconds=ttl, tp_price=tp, sl_price=sl,
+    )
+
+actions = asyncio.run(manager6.on_tick(MINT_A, 100.0, t0 + timedelta(seconds=5)))
+assert actions == [], actions
+actions = asyncio.run(manager6.on_tick(MINT_A, 106.0, t0 + timedelta(seconds=20)))
+assert [(a.signal_id, a.reason) for a in actions] == [("t_tp", TP_HIT), ("t_ttl", TTL_EXPIRED)], actions
+actions = asyncio.run(manager6.on_tick(MINT_A, 98.0, t0 + timedelta(seconds=30)))
+assert [(a.signal_id, a.reason) for a in actions] == [("t_sl", SL_HIT)], actions
+assert manager6.update_brackets("t_far", sl_price=98.5)
+actions = asyncio.run(manager6.on_tick(MINT_A, 98.0, t0 + timedelta(seconds=40)))
+assert [(a.signal_id, a.reason) for a in actions] == [("t_far", SL_HIT)], actions
+assert [p.signal_id for p in manager6.get_active_positions()] == ["t_other"]
+print("[order_manager_smoke] Test 14 passed: on_tick triggers work", file=sys.stderr)
+
 print("[order_manager_smoke] All tests passed successfully! ✅", file=sys.stderr)
 PYTHON
 
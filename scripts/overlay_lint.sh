@@ -92,6 +92,18 @@ bash scripts/sim_preflight_smoke.sh
 echo "[overlay_lint] running sim preflight negative smoke..." >&2
 bash scripts/sim_preflight_negative_smoke.sh
 
+echo "[overlay_lint] running tick index smoke..." >&2
+bash scripts/tick_index_smoke.sh
+
+echo "[overlay_lint] running ts_parse smoke..." >&2
+bash scripts/ts_parse_smoke.sh
+
+echo "[overlay_lint] running ClickHouse buffered writer smoke..." >&2
+bash scripts/ch_writer_smoke.sh
+
+echo "[overlay_lint] running ClickHouse pooled runner smoke..." >&2
+bash scripts/ch_pooled_runner_smoke.sh
+
 echo "[overlay_lint] running daily metrics smoke..." >&2
 bash scripts/daily_metrics_smoke.sh
 
@@ -173,6 +185,9 @@ bash scripts/inference_smoke.sh
 echo "[overlay_lint] running realtime smoke..." >&2
 bash scripts/realtime_smoke.sh
 
+echo "[overlay_lint] running realtime concurrent polling smoke..." >&2
+bash scripts/realtime_concurrent_smoke.sh
+
 echo "[overlay_lint] running queues smoke..." >&2
 bash scripts/queues_smoke.sh
 
@@ -279,6 +294,9 @@ bash scripts/rpc_smoke.sh
 echo "[overlay_lint] running rpc failover smoke..." >&2
 bash scripts/rpc_failover_smoke.sh
 
+echo "[overlay_lint] running enrichment cache smoke..." >&2
+bash scripts/enrichment_cache_smoke.sh
+
 echo "[overlay_lint] running pyth smoke..." >&2
 bash scripts/pyth_smoke.sh
 
@@ -380,6 +398,9 @@ bash scripts/solanafm_smoke.sh
 echo "[overlay_lint] running meteora_dlmm smoke..." >&2
 bash scripts/meteora_dlmm_smoke.sh
 
+echo "[overlay_lint] running slippage_curve smoke..." >&2
+bash scripts/slippage_curve_smoke.sh
+
 echo "[overlay_lint] running wallet_behavior smoke..." >&2
 bash scripts/wallet_behavior_smoke.sh
 
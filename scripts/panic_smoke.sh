@@ -21,6 +21,7 @@ from ops.panic import (
     clear_panic_flag,
     require_no_panic,
     PanicShutdown,
+    PanicWatcher,
 )
 
 tmpdir = Path(tempfile.mkdtemp(prefix="panic_smoke_"))
@@ -55,6 +56,24 @@ print("[panic_smoke] Test 4 PASS: clear -> inactive")
 require_no_panic(str(sentinel))
 print("[panic_smoke] Test 5 PASS: require_no_panic passes when inactive")
 
+# 6) PanicWatcher keeps a cached flag current (inotify if available, else polling)
+import time
+
+def wait_for(watcher, expected):
+    deadline = time.time() + 2.0
+    while watcher.active != expected and time.time() < deadline:
+        time.sleep(0.01)
+    return watcher.active == expected
+
+for use_inotify in (True, False):
+    with PanicWatcher(str(sentinel), poll_interval_sec=0.05, use_inotify=use_inotify) as watcher:
+        assert watcher.active is False
+        create_panic_flag(str(sentinel), "watcher test")
+        assert wait_for(watcher, True), f"{watcher.backend}: flag not seen"
+        clear_panic_flag(str(sentinel))
+        assert wait_for(watcher, False), f"{watcher.backend}: clear not seen"
+    print(f"[panic_smoke] Test 6 PASS: PanicWatcher ({watcher.backend}) tracks the flag")
+
 print("[panic_smoke] OK ✅")
 PY
 
@@ -5,12 +5,15 @@ CLI entrypoint for the realtime paper runner.
 
 Usage:
     python scripts/paper_realtime.py --config <config.yaml> --allowlist <wallets.txt> [--interval-sec 5] [--dry-run]
+        [--max-concurrency 32] [--rpc-rps 50]
 
 Options:
     --config: Path to strategy config YAML
     --allowlist: Path to wallet allowlist (one wallet per line)
     --interval-sec: Poll interval in seconds [default: 5]
     --dry-run: Run without executing paper trades
+    --max-concurrency: Parallel wallet polls per round [default: 1, sequential]
+    --rpc-rps: RPC request budget per second across poll workers [default: unlimited]
 """
 
 import argparse
@@ -20,6 +23,7 @@ from typing import List, Optional
 
 from integration.config_loader import load_params_base
 from integration.realtime_runner import RealtimeRunner
+from execution.queues import RateLimiter
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,6 +32,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--allowlist", type=str, required=True, help="Path to wallet allowlist (one wallet per line)")
     parser.add_argument("--interval-sec", type=int, default=5, help="Poll interval in seconds [default: 5]")
     parser.add_argument("--dry-run", action="store_true", help="Run without executing paper trades")
+    parser.add_argument("--max-concurrency", type=int, default=1, help="Parallel wallet polls per round [default: 1]")
+    parser.add_argument("--rpc-rps", type=int, default=0, help="RPC requests per second budget [default: unlimited]")
     return parser.parse_args()
 
 
@@ -92,6 +98,8 @@ def main() -> None:
         source=source,
         snapshot_store=snapshot_store,
         interval_sec=args.interval_sec,
+        max_concurrency=args.max_concurrency,
+        rate_limiter=RateLimiter(limit=args.rpc_rps, window_sec=1.0) if args.rpc_rps > 0 else None,
     )
 
     print("[paper_realtime] Starting realtime runner...", file=sys.stderr)
@@ -131,6 +131,20 @@ if [[ "$HAVE_DUCKDB" -eq 1 ]]; then
     --token-snapshot integration/fixtures/token_snapshot.sample.csv \
     --only-buy)"
   _assert_counts "parquet_sample" "$summary_json" "$EXPECTED_FILE"
+
+  # Columnar replay must produce the same counts as the row replay (needs numpy).
+  if python3 -c "import numpy" 2>/dev/null; then
+    summary_json="$(_run_pipeline_summary_json "Parquet sample columnar (dry-run)" python3 -m integration.paper_pipeline \
+      --dry-run \
+      --summary-json \
+      --columnar \
+      --trades-parquet "$OUT_PARQUET" \
+      --token-snapshot integration/fixtures/token_snapshot.sample.csv \
+      --only-buy)"
+    _assert_counts "parquet_sample" "$summary_json" "$EXPECTED_FILE"
+  else
+    echo "[paper_runner_smoke] WARN: numpy not available -> skipping columnar parquet smoke" >&2
+  fi
 fi
 
 summary_json="$(_run_pipeline_summary_json "Edgecases JSONL (dry-run)" python3 -m integration.paper_pipeline \
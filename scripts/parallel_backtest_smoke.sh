@@ -1,6 +1,7 @@
 #!/bin/bash
 # Smoke test for Distributed Backtest Harness
-# Tests: Parallel execution, grid generation, result aggregation
+# Tests: Parallel execution, grid generation, result aggregation,
+#        real sim parity (preflight_and_simulate), replay pack round-trip
 
 set -e
 
@@ -8,22 +9,35 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 FIXTURE_DIR="$PROJECT_ROOT/integration/fixtures/parallel"
 OUTPUT_FILE="/tmp/optimization_results.json"
+OUTPUT_FILE_SEQ="/tmp/optimization_results.seq.json"
+
+cd "$PROJECT_ROOT"
 
 echo "[parallel_backtest_smoke] Starting distributed backtest smoke test..." >&2
 
 # Clean up any previous output
-rm -f "$OUTPUT_FILE"
+rm -f "$OUTPUT_FILE" "$OUTPUT_FILE_SEQ"
+
+run_backtest() {
+    python3 -m integration.parallel_backtest \
+        --grid "$FIXTURE_DIR/tuning_grid.yaml" \
+        --trades "$FIXTURE_DIR/trades_sample.jsonl" \
+        --config "$FIXTURE_DIR/base_config.yaml" \
+        --token-snapshot "$FIXTURE_DIR/token_snapshot.csv" \
+        --wallet-profiles "$FIXTURE_DIR/wallet_profiles.csv" \
+        --workers "$1" \
+        --out "$2"
+}
 
 # Run parallel backtest
 # Grid: tp[0.05, 0.10] * sl[-0.05, -0.02] = 4 combinations
 # Workers: 2
 echo "[parallel_backtest_smoke] Running parallel backtest with 2 workers..." >&2
-python3 -m integration.parallel_backtest \
-    --grid "$FIXTURE_DIR/tuning_grid.yaml" \
-    --trades "$FIXTURE_DIR/trades_sample.jsonl" \
-    --workers 2 \
-    --out "$OUTPUT_FILE" \
-    --verbose > /dev/null
+STDOUT=$(run_backtest 2 "$OUTPUT_FILE")
+if [ "$(printf '%s\n' "$STDOUT" | wc -l)" != "1" ]; then
+    echo "[parallel_backtest_smoke] FAIL: stdout must be exactly one JSON line" >&2
+    exit 1
+fi
 
 # Verify output file exists
 if [ ! -f "$OUTPUT_FILE" ]; then
@@ -31,6 +45,9 @@ if [ ! -f "$OUTPUT_FILE" ]; then
     exit 1
 fi
 
+echo "[parallel_backtest_smoke] Running in-process backtest (1 worker)..." >&2
+run_backtest 1 "$OUTPUT_FILE_SEQ" > /dev/null
+
 # Test 1: Verify correct number of results (4)
 echo "[parallel_backtest_smoke] Verifying result count..." >&2
 TOTAL_CONFIGS=$(python3 -c "import json; print(json.load(open('$OUTPUT_FILE'))['total_configs'])")
@@ -47,51 +64,78 @@ if [ "$SUCCESS_RUNS" != "4" ]; then
 fi
 echo "[parallel_backtest_smoke] Processed 4 configurations ✓" >&2
 
-# Test 2: Verify best result selection (Sharpe maximization)
-# In our simulation: Sharpe = (tp*100) - (abs(sl)*50)
-# Configs:
-# 1. tp=0.05, sl=-0.05 -> 5 - 2.5 = 2.5
-# 2. tp=0.05, sl=-0.02 -> 5 - 1.0 = 4.0
-# 3. tp=0.10, sl=-0.05 -> 10 - 2.5 = 7.5
-# 4. tp=0.10, sl=-0.02 -> 10 - 1.0 = 9.0  <-- BEST
-echo "[parallel_backtest_smoke] Verifying best result selection..." >&2
-
-BEST_SHARPE=$(python3 -c "
-import json
-data = json.load(open('$OUTPUT_FILE'))
-print(data['best_result']['metrics']['sharpe'])
-")
-
-BEST_TP=$(python3 -c "
-import json
-data = json.load(open('$OUTPUT_FILE'))
-print(data['best_result']['params']['tp_pct'])
-")
-
-BEST_SL=$(python3 -c "
+# Test 2: Metrics come from the real sim and match preflight_and_simulate run directly;
+# worker count does not change results; best = max Sharpe (tp=0.10, sl=-0.05 on this fixture).
+echo "[parallel_backtest_smoke] Verifying sim parity and best result selection..." >&2
+python3 - "$OUTPUT_FILE" "$OUTPUT_FILE_SEQ" "$FIXTURE_DIR" <<'PY'
 import json
-data = json.load(open('$OUTPUT_FILE'))
-print(data['best_result']['params']['sl_pct'])
-")
-
-if [ "$BEST_SHARPE" != "9.0" ]; then
-    echo "[parallel_backtest_smoke] FAIL: Expected best Sharpe 9.0, got $BEST_SHARPE" >&2
-    exit 1
-fi
-
-if [ "$BEST_TP" != "0.1" ]; then
-    echo "[parallel_backtest_smoke] FAIL: Expected best TP 0.1, got $BEST_TP" >&2
-    exit 1
-fi
-
-if [ "$BEST_SL" != "-0.02" ]; then
-    echo "[parallel_backtest_smoke] FAIL: Expected best SL -0.02, got $BEST_SL" >&2
-    exit 1
-fi
-echo "[parallel_backtest_smoke] Best config verified (Sharpe 9.0) ✓" >&2
+import sys
+import tempfile
+
+import yaml
+
+import integration.parallel_backtest as pb
+from integration.sim_preflight import preflight_and_simulate, prepare_replay, simulate_replay
+from integration.token_snapshot_store import TokenSnapshotStore
+from integration.wallet_profile_store import WalletProfileStore
+
+
+def fail(msg):
+    print(f"[parallel_backtest_smoke] FAIL: {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+par = json.load(open(sys.argv[1]))
+seq = json.load(open(sys.argv[2]))
+fx = sys.argv[3]
+
+if par["all_results"] != seq["all_results"] or par["best_result"] != seq["best_result"]:
+    fail("2 workers and 1 worker disagree")
+
+base_cfg = yaml.safe_load(open(f"{fx}/base_config.yaml"))
+store = TokenSnapshotStore(f"{fx}/token_snapshot.csv")
+store.load()
+wallets = WalletProfileStore.from_csv(f"{fx}/wallet_profiles.csv")
+trades = pb.load_trades(f"{fx}/trades_sample.jsonl")
+
+for res in par["all_results"]:
+    cfg = pb.apply_params(base_cfg, res["params"])
+    if cfg["modes"]["U"]["hold_sec_max"] != 25 or cfg["modes"]["U"]["tp_pct"] != res["params"]["tp_pct"]:
+        fail(f"apply_params: {cfg}")
+    sim = preflight_and_simulate(trades, cfg, store, wallets)
+    m = res["metrics"]
+    if m["trades_count"] != sim["positions_closed"] or m["exit_reason_counts"] != sim["exit_reason_counts"]:
+        fail(f"sim parity {res['params']}: {m} vs {sim}")
+    if m["roi_total"] != round(sim["roi_total"], 6) or m["skipped_by_reason"] != sim["skipped_by_reason"]:
+        fail(f"sim parity {res['params']}: roi/skips")
+
+best = par["best_result"]
+if best["params"] != {"tp_pct": 0.1, "sl_pct": -0.05}:
+    fail(f"best params {best['params']}")
+if best["metrics"]["sharpe"] != max(r["metrics"]["sharpe"] for r in par["all_results"]):
+    fail("best is not max sharpe")
+
+# Replay pack round-trip (memory-mapped columns, and the pickle fallback without NumPy).
+replay = prepare_replay(trades, store, wallets)
+cfg = pb.apply_params(base_cfg, {"tp_pct": 0.1, "sl_pct": -0.02, "hold_sec_max": 15})
+want = simulate_replay(replay, cfg)
+for use_np in (True, False):
+    saved = pb.np
+    if not use_np:
+        pb.np = None
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            pb.write_replay_pack(replay, d)
+            got = simulate_replay(pb.load_replay_pack(d), cfg)
+    finally:
+        pb.np = saved
+    if got != want:
+        fail(f"replay pack round-trip (numpy={use_np}): {got} vs {want}")
+PY
+echo "[parallel_backtest_smoke] Sim parity and best config verified ✓" >&2
 
 # Cleanup
-rm -f "$OUTPUT_FILE"
+rm -f "$OUTPUT_FILE" "$OUTPUT_FILE_SEQ"
 
 echo "[parallel_backtest_smoke] All parallel backtest tests passed!" >&2
 echo "[parallel_backtest_smoke] OK ✅"
@@ -27,6 +27,7 @@ logger = logging.getLogger(__name__)
 # Add project root to path
 sys.path.insert(0, '.')
 
+from ingestion.enrichment_cache import EnrichmentCache
 from ingestion.market.pyth import PythClient, PriceData
 from ingestion.market.pyth_ids import FEED_IDS, get_feed_id
 
@@ -66,7 +67,7 @@ def test_price_normalization():
         return mock_resp
     
     # Create client
-    client = PythClient(cache_ttl=60)
+    client = PythClient(cache_ttl=60, cache=EnrichmentCache())
     
     # Fetch SOL/USD
     price_data = client.fetch_price("SOL/USD", http_callable=mock_get)
@@ -107,7 +108,7 @@ def test_price_caching():
         return mock_resp
     
     # Create client with short cache TTL
-    client = PythClient(cache_ttl=1)
+    client = PythClient(cache_ttl=1, cache=EnrichmentCache())
     
     # First call (should hit API)
     price1 = client.fetch_price("SOL/USD", http_callable=mock_get)
@@ -150,7 +151,7 @@ def test_error_handling():
     def mock_fail(url):
         raise Exception("Network error")
     
-    client = PythClient()
+    client = PythClient(cache=EnrichmentCache())
     
     # Should return None, not raise exception
     result = client.fetch_price("SOL/USD", http_callable=mock_fail)
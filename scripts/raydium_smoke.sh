@@ -100,7 +100,27 @@ assert amount_out > 0, 'Amount out should be positive'
 print(f'[raydium_smoke] Math validation: {amount_out} (OK)')
 "
 
-# Test 6: Verify imports in __init__.py
+# Test 6: Batch decode matches single-account decode
+echo "[raydium_smoke] Checking batch decode..."
+python3 -c "
+import os
+import sys
+from dataclasses import astuple
+try:
+    import base58
+except ImportError:
+    print('[raydium_smoke] base58 not installed, skipping batch decode check')
+    sys.exit(0)
+from ingestion.dex.raydium.layouts import AMM_V4_LAYOUT, decode_pool_state, decode_pool_states
+accounts = [os.urandom(8 + AMM_V4_LAYOUT.size) for _ in range(3)] + [None]
+pools = decode_pool_states(accounts)
+assert pools.index == [0, 1, 2] and list(pools.errors) == [3], (pools.index, pools.errors)
+for k in range(3):
+    assert tuple(pools.row(k).values()) == astuple(decode_pool_state(accounts[k]))
+print(f'[raydium_smoke] Batch decode: {len(pools)} pools (OK)')
+"
+
+# Test 7: Verify imports in __init__.py
 echo "[raydium_smoke] Checking package init..."
 python3 -c "
 from ingestion.dex import raydium
@@ -0,0 +1,123 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# scripts/realtime_concurrent_smoke.sh
+#
+# Concurrent wallet polling smoke for RealtimeRunner (mock source, no network):
+# - max_concurrency > 1 produces the same portfolio / cursors as sequential polling
+# - slow polls overlap (round time ~ wallets / workers, not wallets x latency)
+# - per-endpoint RateLimiter budget is respected across workers
+# - a failing wallet does not stall the others
+#
+# Success output (stderr, exactly):
+#   [realtime_concurrent_smoke] OK ✅
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "${ROOT_DIR}"
+
+python3 - <<'PY'
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from execution.queues import RateLimiter
+from integration.portfolio_stub import PortfolioStub
+from integration.realtime_runner import RealtimeRunner
+from integration.token_snapshot_store import TokenSnapshot
+
+
+def fail(msg):
+    print(f"[realtime_concurrent_smoke] FAIL: {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+class SlowSource:
+    """One BUY per wallet per round; deterministic records, fixed latency."""
+
+    def __init__(self, latency=0.0, bad=()):
+        self.latency = latency
+        self.bad = set(bad)
+        self.calls = []
+        self.lock = threading.Lock()
+        self.round = {}
+
+    def poll_new_records(self, wallet, stop_at_signature=None, limit=50):
+        with self.lock:
+            self.calls.append((time.monotonic(), wallet))
+            n = self.round.get(wallet, 0)
+            self.round[wallet] = n + 1
+        time.sleep(self.latency)
+        if wallet in self.bad:
+            raise RuntimeError("rpc timeout")
+        idx = int(wallet[1:])
+        return [{
+            "ts": str(1700000000 + idx), "wallet": wallet, "mint": f"Mint{idx % 7:03d}xxxx",
+            "side": "BUY", "price": 0.001 * (1 + idx % 5), "size_usd": 10.0 + idx,
+            "tx_hash": f"Sig{wallet}r{n}", "platform": "raydium",
+        }]
+
+
+class Store:
+    def get(self, mint):
+        return TokenSnapshot(
+            mint=mint, liquidity_usd=50000.0, volume_24h_usd=100000.0, spread_bps=10.0,
+            extra={"security": {"is_honeypot": False, "freeze_authority": None, "mint_authority": None}},
+        )
+
+
+def make_runner(wallets, source, **kw):
+    cfg = {
+        "tracked_wallets": wallets,
+        "min_edge_bps": 0,
+        "risk": {"limits": {"max_open_positions": 1000, "cooldown_sec": 0}},
+        "token_profile": {"min_liquidity_usd": 10000, "min_volume_24h_usd": 10000, "max_spread_bps": 50},
+    }
+    return RealtimeRunner(
+        config=cfg, source=source, snapshot_store=Store(),
+        portfolio=PortfolioStub(equity_usd=10000.0, peak_equity_usd=10000.0), interval_sec=0, **kw,
+    )
+
+
+wallets = [f"W{i}" for i in range(40)]
+
+# 1) Same results as sequential.
+seq = make_runner(wallets, SlowSource(), max_concurrency=1)
+seq.run_loop(max_iterations=2)
+par = make_runner(wallets, SlowSource(), max_concurrency=8)
+par.run_loop(max_iterations=2)
+for attr in ("open_positions", "equity_usd"):
+    if getattr(seq.portfolio, attr) != getattr(par.portfolio, attr):
+        fail(f"{attr}: sequential={getattr(seq.portfolio, attr)} concurrent={getattr(par.portfolio, attr)}")
+if dict(seq.portfolio.exposure_by_token) != dict(par.portfolio.exposure_by_token):
+    fail("exposure_by_token differs")
+if seq.last_signatures != par.last_signatures:
+    fail("last_signatures differ")
+
+# 2) Overlapping slow polls; failing wallets are isolated.
+src = SlowSource(latency=0.05, bad={"W3", "W17"})
+r = make_runner(wallets, src, max_concurrency=20)
+with ThreadPoolExecutor(max_workers=20) as ex:
+    r.poll_round(wallets, ex)
+st = r.last_round_stats
+if st["errors"] != 2 or st["records"] != 38:
+    fail(f"round stats: {st}")
+if st["duration_sec"] > 40 * 0.05 / 2:
+    fail(f"polls did not overlap: {st['duration_sec']}s")
+if "W3" in r.last_signatures or "W4" not in r.last_signatures:
+    fail("cursor update for failing/healthy wallets")
+
+# 3) Rate budget: 10 req / 0.5s, bucket starts full -> 30 polls need >= 1.0s.
+src = SlowSource()
+r = make_runner(wallets[:30], src, max_concurrency=10, rate_limiter=RateLimiter(limit=10, window_sec=0.5))
+t0 = time.monotonic()
+with ThreadPoolExecutor(max_workers=10) as ex:
+    r.poll_round(wallets[:30], ex)
+elapsed = time.monotonic() - t0
+if elapsed < 0.9:
+    fail(f"rate budget not enforced: 30 polls in {elapsed:.3f}s")
+if len(src.calls) != 30:
+    fail("every wallet must be polled")
+PY
+
+echo "[realtime_concurrent_smoke] OK ✅" >&2
@@ -163,6 +163,59 @@ assert empty_best is None, "Empty router should return None"
 print(f"  Empty router handling: None returned (OK)")
 print("")
 
+# Concurrent mode: deadline, hedging, quote cache
+import time
+
+class MockSlow(LiquiditySource):
+    """Mock source answering after `delays[call]` seconds with rate 102.0"""
+    _is_local_calc = False
+
+    def __init__(self, name, delays):
+        self.name = name
+        self.delays = list(delays)
+        self.calls = 0
+
+    def get_name(self):
+        return self.name
+
+    def get_quote(self, mint_in, mint_out, amount_in):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        time.sleep(delay)
+        return SimulatedQuote(
+            mint_in=mint_in,
+            mint_out=mint_out,
+            amount_in=amount_in,
+            amount_out=int(amount_in * 102.0),
+            price_impact_bps=4,
+            fee_atomic=0,
+        )
+
+fast_router = LiquidityRouter(max_workers=8, deadline_ms=200, hedge_after_ms=50, quote_cache_ttl_ms=5000)
+fast_router.register_source(MockRaydium())
+fast_router.register_source(MockOrca())
+fast_router.register_source(MockSlow("stuck_api", [2.0]))
+hedged = MockSlow("hedged_api", [2.0, 0.01])
+fast_router.register_source(hedged)
+
+started = time.monotonic()
+best = fast_router.find_best_route(SOL, USDC, amount_in)
+elapsed = time.monotonic() - started
+assert elapsed < 1.0, f"deadline not honoured: {elapsed:.3f}s"
+assert best.source_name == "hedged_api", f"Expected hedged_api, got {best.source_name}"
+assert hedged.calls == 2 and fast_router.stats["hedges"] == 2, fast_router.stats
+assert fast_router.stats["deadline_misses"] == 1, fast_router.stats
+names = [q.source_name for q in fast_router.get_all_quotes(SOL, USDC, amount_in, deadline_ms=50)]
+assert names == ["raydium_v4", "orca_whirlpool", "hedged_api"], names
+assert fast_router.stats["cache_hits"] == 3, fast_router.stats
+# Cache is keyed on the exact amount: a different size is re-quoted, never rescaled
+other = fast_router.get_all_quotes(SOL, USDC, amount_in * 2, deadline_ms=50)
+assert fast_router.stats["cache_hits"] == 3, fast_router.stats
+assert all(q.quote.amount_in == amount_in * 2 for q in other), other
+fast_router.close()
+print(f"  Concurrent quotes: best={best.source_name} in {elapsed * 1000:.0f}ms, cache hits OK (OK)")
+print("")
+
 print("  All router tests: PASSED")
 print("")
 print("[router_smoke] All smoke tests passed!")
@@ -30,7 +30,7 @@ sys.path.insert(0, '.')
 
 from ingestion.rpc.client import SmartRpcClient
 from ingestion.rpc.batcher import RpcBatcher, BatchItem
-from ingestion.rpc.cache import RpcCache
+from ingestion.rpc.cache import RpcCache, ttl_for_method
 
 
 def test_batching():
@@ -253,6 +253,168 @@ def test_cache_metrics():
     return True
 
 
+def test_bounded_lru():
+    """Test max_entries / max_bytes bounds with LRU eviction"""
+    logger.info("Testing bounded LRU cache...")
+
+    cache = RpcCache(default_ttl=60, max_entries=100)
+    for i in range(100):
+        cache.set(f'k{i}', i)
+    _ = cache.get('k0')  # k0 becomes most recently used
+    for i in range(100, 150):
+        cache.set(f'k{i}', i)
+
+    assert len(cache) == 100, f"Expected 100 entries, got {len(cache)}"
+    assert cache.get('k0') == 0, "Recently used key must survive LRU eviction"
+    assert cache.get('k1') is None, "Least recently used key must be evicted"
+    metrics = cache.get_metrics()
+    assert metrics['evicted_lru'] == 50, f"Expected 50 LRU evictions, got {metrics['evicted_lru']}"
+
+    cache = RpcCache(default_ttl=60, max_entries=None, max_bytes=4096, size_fn=lambda v: len(v))
+    for i in range(100):
+        cache.set(f'b{i}', 'x' * 100)
+    metrics = cache.get_metrics()
+    assert metrics['bytes'] <= 4096, f"Byte bound exceeded: {metrics['bytes']}"
+    assert metrics['size'] == 40, f"Expected 40 entries under byte bound, got {metrics['size']}"
+
+    logger.info("Bounded LRU check: OK")
+    return True
+
+
+def test_expiry_sweep():
+    """Test that expired entries are swept without being read"""
+    logger.info("Testing expiry sweep...")
+
+    cache = RpcCache(default_ttl=0.05, max_entries=None)
+    for i in range(1000):
+        cache.set(f'old{i}', i)
+    time.sleep(0.1)
+    # Writes sweep expired heap heads incrementally.
+    for i in range(100):
+        cache.set(f'new{i}', i, ttl=60)
+    assert len(cache) < 1000, f"Writes must sweep expired entries, size={len(cache)}"
+    cache.cleanup_expired()
+    assert len(cache) == 100, f"Expected only live entries, got {len(cache)}"
+
+    # Overwriting a key must not let its old heap item expire the new value.
+    cache.set('k', 'v1', ttl=0.01)
+    cache.set('k', 'v2', ttl=60)
+    time.sleep(0.05)
+    cache.cleanup_expired()
+    assert cache.get('k') == 'v2', "Overwritten key expired by stale heap item"
+
+    # Background sweeper.
+    cache = RpcCache(default_ttl=0.05, sweep_interval_sec=0.02)
+    for i in range(200):
+        cache.set(f's{i}', i)
+    deadline = time.time() + 2.0
+    while len(cache) and time.time() < deadline:
+        time.sleep(0.02)
+    cache.stop_sweeper()
+    assert len(cache) == 0, "Background sweeper did not remove expired entries"
+    assert cache.get_metrics()['expired'] == 200
+
+    logger.info("Expiry sweep check: OK")
+    return True
+
+
+def test_ttl_classes():
+    """Test per-method TTL classes used by SmartRpcClient"""
+    logger.info("Testing TTL classes...")
+
+    client = SmartRpcClient(cache_ttl=300)
+    assert client._get_ttl_for_method('getAccountInfo') == SmartRpcClient.TTL_MINT_INFO
+    assert client._get_ttl_for_method('getBalance') == SmartRpcClient.TTL_BALANCE
+    assert client._get_ttl_for_method('getPrice') == SmartRpcClient.TTL_PRICE
+    assert client._get_ttl_for_method('getSomethingElse') == 300
+    assert ttl_for_method('getTransaction', default=5) == SmartRpcClient.TTL_MINT_INFO
+
+    logger.info("TTL classes check: OK")
+    return True
+
+
+def test_nonblocking_batcher():
+    """Test that producers do not wait for HTTP and batches overlap"""
+    logger.info("Testing non-blocking batcher...")
+
+    gate = threading.Event()
+    active = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def slow_http(items):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        gate.wait(2.0)
+        with lock:
+            active[0] -= 1
+        return [{'result': item.params[0]} for item in items]
+
+    batcher = RpcBatcher(max_batch_size=10, batch_delay_ms=5.0, http_callable=slow_http, max_in_flight=4)
+    t0 = time.time()
+    futures = [
+        batcher.queue_request(BatchItem(method='getBalance', params=[f'p{i}'], callback=None))
+        for i in range(40)
+    ]
+    queued_in = time.time() - t0
+    assert queued_in < 0.5, f"queue_request blocked on HTTP ({queued_in:.3f}s)"
+
+    deadline = time.time() + 2.0
+    while peak[0] < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    batcher.flush()
+    assert peak[0] == 4, f"Expected 4 batches in flight, saw {peak[0]}"
+    assert [f.get(1.0) for f in futures] == [{'result': f'p{i}'} for i in range(40)]
+    metrics = batcher.get_metrics()
+    assert metrics['batches_sent'] == 4 and metrics['requests_batched'] == 40, metrics
+    batcher.close()
+
+    logger.info("Non-blocking batcher check: OK")
+    return True
+
+
+def test_coalescing():
+    """Test that identical pending requests share one future"""
+    logger.info("Testing request coalescing...")
+
+    sent = []
+
+    def mock_http(items):
+        sent.extend((item.method, tuple(item.params)) for item in items)
+        return [{'result': {'value': 7}} for _ in items]
+
+    batcher = RpcBatcher(max_batch_size=100, batch_delay_ms=50.0, http_callable=mock_http)
+    results = []
+
+    def worker():
+        f = batcher.queue_request(BatchItem(method='getAccountInfo', params=['MintA'], callback=None))
+        results.append(f)
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    other = batcher.queue_request(BatchItem(method='getAccountInfo', params=['MintB'], callback=None))
+    batcher.flush()
+
+    assert len({id(f) for f in results}) == 1, "Concurrent identical requests must share one future"
+    assert sent.count(('getAccountInfo', ('MintA',))) == 1, f"Expected one wire request, got {sent}"
+    assert other.get(1.0) == {'result': {'value': 7}}
+    assert batcher.get_metrics()['requests_coalesced'] == 19
+
+    # Once answered, the same request goes on the wire again.
+    again = batcher.queue_request(BatchItem(method='getAccountInfo', params=['MintA'], callback=None))
+    batcher.flush()
+    assert again is not results[0] and sent.count(('getAccountInfo', ('MintA',))) == 2
+    batcher.close()
+
+    logger.info("Coalescing check: OK")
+    return True
+
+
 def main():
     """Run all tests"""
     tests = [
@@ -261,6 +423,11 @@ def main():
         ("TTL Expiration", test_ttl_expiration),
         ("Exponential Backoff", test_exponential_backoff),
         ("Cache Metrics", test_cache_metrics),
+        ("Bounded LRU", test_bounded_lru),
+        ("Expiry Sweep", test_expiry_sweep),
+        ("TTL Classes", test_ttl_classes),
+        ("Non-blocking Batcher", test_nonblocking_batcher),
+        ("Coalescing", test_coalescing),
     ]
     
     results = []
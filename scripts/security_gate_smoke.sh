@@ -226,6 +226,42 @@ print(f"  Decision: passed={decision.passed}, reasons={decision.reasons}", file=
 if not decision.passed:
     errors.append(f"TEST 8 FAILED: Expected passed=True, got False. Reasons: {decision.reasons}")
 
+# ============================================
+# TEST 9: Compiled gate plan matches apply_gates (full and short-circuit)
+# ============================================
+print("\nTEST 9: Compiled gate plan parity", file=sys.stderr)
+
+from dataclasses import replace
+from integration.gates import GatePlan, GatePlanCache, compile_gate_plan
+
+strict_cfg = {
+    "token_profile": dict(cfg["token_profile"], security={"enabled": True, "require_honeypot_safe": True}),
+    "signals": {"hard_filters": {"min_wallet_winrate_30d": 0.9, "min_wallet_trades_30d": 10}},
+}
+poor_trade = replace(trade, liquidity_usd=None, spread_bps=500.0, wallet_winrate_30d=0.5)
+snapshots = [good_snapshot, honeypot_snapshot, freeze_snapshot, mint_snapshot, holders_snapshot, no_security_snapshot, None]
+
+GatePlan.REORDER_EVERY = 3  # re-rank often so short-circuit order actually changes
+plans = GatePlanCache()
+for c in (cfg, strict_cfg):
+    for _ in range(5):
+        for t in (trade, poor_trade):
+            for snap in snapshots:
+                expected = apply_gates(cfg=c, trade=t, snapshot=snap)
+                plan = plans.get(c, version=id(c))
+                full = plan.evaluate(t, snap)
+                fast = plan.evaluate(t, snap, short_circuit=True)
+                if (full.passed, full.reasons, full.details) != (expected.passed, expected.reasons, expected.details):
+                    errors.append(f"TEST 9 FAILED: full plan mismatch {full} != {expected}")
+                if (fast.passed, fast.primary_reason) != (expected.passed, expected.primary_reason):
+                    errors.append(f"TEST 9 FAILED: short-circuit mismatch {fast} != {expected}")
+
+if plans.compiles != 2:
+    errors.append(f"TEST 9 FAILED: expected 2 compiles (one per config), got {plans.compiles}")
+if compile_gate_plan(cfg).config_hash != plans.get(cfg).config_hash:
+    errors.append("TEST 9 FAILED: config_hash not deterministic")
+print(f"  Plan stats: {plans.get(strict_cfg).stats()[:3]}", file=sys.stderr)
+
 # ============================================
 # Final result
 # ============================================
@@ -0,0 +1,126 @@
+#!/bin/bash
+# scripts/slippage_curve_smoke.sh
+# Smoke test for depth-aware slippage curves (strategy/slippage_curve.py)
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+ROOT_DIR="$(cd "$(dirname "${SCRIPT_DIR}")" && pwd)"
+
+echo "[slippage_curve_smoke] Starting slippage curve smoke test..." >&2
+
+python3 << PYTHON_TEST
+import math
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, '$ROOT_DIR')
+
+from integration.portfolio_stub import PortfolioStub
+from strategy.amm_math import get_amount_out
+from strategy.risk_engine import compute_position_size_usd
+from strategy.slippage_curve import (
+    SlippageCurveCache,
+    clmm_curve,
+    constant_product_curve,
+    dlmm_curve,
+)
+
+passed = 0
+failed = 0
+
+def test_case(name, condition, msg=""):
+    global passed, failed
+    if condition:
+        print(f"  [slippage_curve] {name}: PASS", file=sys.stderr)
+        passed += 1
+    else:
+        print(f"  [slippage_curve] {name}: FAIL {msg}", file=sys.stderr)
+        failed += 1
+
+def close(a, b, rel=1e-9):
+    return math.isclose(float(a), float(b), rel_tol=rel)
+
+sizes = [1e3, 1e6, 1e9, 1e11, 1e13]
+
+# Test 1: constant product matches amm_math, vectorized and scalar
+cp = constant_product_curve(1e12, 5e9, fee_bps=25)
+outs = list(cp.amount_out_many(sizes))
+test_case("cp_matches_amm_math", all(close(o, get_amount_out(a, 1e12, 5e9, 25)) for a, o in zip(sizes, outs)))
+
+# Test 2: inverse hits the target and matches the closed form
+size = cp.max_size_for_bps(100)
+closed = 1e12 * ((1 - 0.0025) / (1 - 0.01) - 1) / (1 - 0.0025)
+test_case("cp_inverse", close(size, closed) and abs(cp.slippage_bps(size) - 100) < 1e-6, f"size={size}")
+test_case("cp_below_fee", cp.max_size_for_bps(10) == 0.0)
+
+# Test 3: CLMM crossing ticks (positions [-640, 640) and [-128, 128))
+L_wide, L_narrow = 10**9, 4 * 10**9
+ticks = [-640, -128, 128, 640]
+nets = [L_wide, L_narrow, -L_narrow, -L_wide]
+clmm = clmm_curve(2**64, L_wide + L_narrow, 0, ticks, nets, a_to_b=True, fee_bps=30)
+s_128 = 1.0001 ** (-64)
+in_first = (L_wide + L_narrow) * (1 / s_128 - 1)
+test_case("clmm_ranges", len(clmm) == 2 and close(clmm.start_in[1], in_first), repr(clmm))
+test_case("clmm_capacity", clmm.amount_out(1e15) == clmm.capacity_out)
+bps = [31, 50, 100, 1000]
+sizes_for_bps = list(clmm.max_size_for_bps_many(bps))
+def hits_target(s, b):
+    if s < clmm.max_amount_in:
+        return abs(clmm.slippage_bps(s) - b) < 1e-6 * b
+    return close(s, clmm.max_amount_in) and clmm.slippage_bps(s) <= b  # target past capacity
+test_case("clmm_inverse", all(hits_target(s, b) for s, b in zip(sizes_for_bps, bps)), str(sizes_for_bps))
+
+# Test 4: DLMM drains the active bin at mid price, then lower bins
+active = 2**23
+bins = list(range(active - 3, active + 4))
+dlmm = dlmm_curve(active, 10, bins, [0, 0, 0, 5e8, 5e8, 5e8, 5e8], [1e9, 1e9, 1e9, 1e9, 0, 0, 0], swap_for_y=True, fee_bps=25)
+test_case("dlmm_active_bin_fee_only", abs(dlmm.slippage_bps(5e8) - 25) < 1e-6)
+test_case("dlmm_fee_target_takes_active_bin", close(dlmm.max_size_for_bps(25), 1e9 / (1 - 0.0025)))
+test_case("dlmm_monotone", list(dlmm.slippage_bps_many([1e8, 2e9, 3e9, 5e9])) == sorted(dlmm.slippage_bps_many([1e8, 2e9, 3e9, 5e9])))
+
+# Test 5: cache keeps one curve per pool at the newest slot
+cache = SlippageCurveCache(max_pools=2)
+builds = []
+def build():
+    builds.append(1)
+    return cp
+cache.get_or_build("poolA", 100, build)
+cache.get_or_build("poolA", 100, build)
+cache.get_or_build("poolA", 101, build)
+cache.get_or_build("poolA", 99, build)
+test_case("cache_per_slot", len(builds) == 3 and cache.get("poolA", 101) is cp and cache.get("poolA", 99) is None)
+cache.get_or_build("poolB", 1, build)
+cache.get_or_build("poolC", 1, build)
+test_case("cache_lru_bounded", len(cache) == 2 and cache.get("poolA", 101) is None)
+
+# Test 6: position sizing capped by pool depth
+portfolio = PortfolioStub(equity_usd=1_000_000.0, peak_equity_usd=1_000_000.0, open_positions=0,
+                          exposure_by_token=defaultdict(float))
+cfg = {"risk": {"sizing": {"method": "fixed_pct", "fixed_pct_of_bankroll": 2.0, "max_pos_pct": 2.0}},
+       "execution": {"orders": {"max_slippage_bps": 200}}}
+uncapped = compute_position_size_usd(portfolio=portfolio, cfg=cfg)
+shallow = constant_product_curve(50_000.0, 1e9, fee_bps=25)  # input units = USD
+capped = compute_position_size_usd(portfolio=portfolio, cfg=cfg, slippage_curve=shallow)
+test_case("sizing_depth_cap", uncapped == 20_000.0 and close(capped, shallow.max_size_for_bps(200)) and capped < uncapped,
+          f"uncapped={uncapped} capped={capped}")
+
+# Test 7: targets past the last breakpoint never exceed the pool's capacity
+three = dlmm_curve(active, 10, [active - 2, active - 1, active], [0, 0, 0], [500.0, 500.0, 500.0], swap_for_y=True, fee_bps=25)
+cap = three.max_amount_in
+past = [three.max_size_for_bps(b) for b in (60, 1000, 10000)]
+test_case("past_last_breakpoint_clamped", all(s <= cap for s in past) and close(past[-1], cap), f"cap={cap} sizes={past}")
+test_case("past_last_breakpoint_vectorized", all(float(s) <= cap for s in three.max_size_for_bps_many([60, 1000, 10000])))
+deep = compute_position_size_usd(portfolio=portfolio, cfg=cfg, slippage_curve=three, max_slippage_bps=5000, curve_unit_usd=100.0)
+test_case("sizing_capacity_cap", deep <= cap * 100.0, f"size={deep} cap_usd={cap * 100.0}")
+
+print(f"\n[slippage_curve_smoke] Tests: {passed} passed, {failed} failed", file=sys.stderr)
+
+if failed > 0:
+    sys.exit(1)
+else:
+    print("[slippage_curve_smoke] OK", file=sys.stderr)
+    sys.exit(0)
+PYTHON_TEST
+
+echo "[slippage_curve_smoke] Smoke test completed." >&2
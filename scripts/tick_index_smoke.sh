@@ -0,0 +1,92 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# scripts/tick_index_smoke.sh
+#
+# Tick index smoke:
+# - TickIndex.simulate_exit must match the reference sim_preflight._simulate_exit
+#   (linear scan) on seeded random tick streams, with and without NumPy
+# - edge cases: empty window, duplicate ts, TP/SL on the same tick, unknown mint
+#
+# Success output (stderr, exactly):
+#   [tick_index_smoke] OK ✅
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "${ROOT_DIR}"
+
+python3 - <<'PY'
+import random
+import sys
+
+import integration.tick_index as ti
+from integration.sim_preflight import _simulate_exit
+from integration.tick_index import TickIndex
+
+
+def fail(msg):
+    print(f"[tick_index_smoke] FAIL: {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+def make_ticks(rng, n):
+    ticks = []
+    ts = 1_000.0
+    px = 1.0
+    for _ in range(n):
+        ts += rng.choice([0.0, 0.5, 1.0, 3.0, 10.0])
+        px = max(1e-6, px * (1.0 + rng.uniform(-0.03, 0.03)))
+        ticks.append((ts, px))
+    rng.shuffle(ticks)
+    return ticks
+
+
+def check(index, ticks_by_mint, rng, label):
+    modes = [
+        {"tp_pct": 0.05, "sl_pct": -0.05, "hold_sec_max": 30},
+        {"tp_pct": 0.20, "sl_pct": -0.10, "hold_sec_max": 600},
+        {"tp_pct": 0.0, "sl_pct": 0.0, "hold_sec_max": 5},
+        {"tp_pct": 1.0, "sl_pct": -0.9, "hold_sec_max": 0},
+    ]
+    n = 0
+    for mint, ticks in ticks_by_mint.items():
+        ref_ticks = sorted(ticks, key=lambda x: x[0])
+        for entry_ts, entry_px in rng.sample(ref_ticks, min(60, len(ref_ticks))):
+            for cfg_mode in modes:
+                want = _simulate_exit(entry_px, entry_ts, ref_ticks, cfg_mode)
+                got = index.simulate_exit(mint, entry_px, entry_ts, cfg_mode)
+                if want != got:
+                    fail(f"{label}: mint={mint} entry_ts={entry_ts} cfg={cfg_mode} want={want} got={got}")
+                n += 1
+    return n
+
+
+rng = random.Random(42)
+ticks_by_mint = {f"mint{i}": make_ticks(rng, n) for i, n in enumerate([1, 2, 40, 500, 3000])}
+
+checked = check(TickIndex.from_ticks(ticks_by_mint), ticks_by_mint, random.Random(7), "default")
+
+# Force the pure-Python crossing search as well.
+saved_np = ti.np
+ti.np = None
+try:
+    checked += check(TickIndex.from_ticks(ticks_by_mint), ticks_by_mint, random.Random(7), "no_numpy")
+finally:
+    ti.np = saved_np
+
+# Duplicate ts keep input order; TP wins over SL on the same tick.
+idx = TickIndex.from_ticks({"m": [(2.0, 1.5), (1.0, 1.0), (2.0, 0.5)]})
+if idx.simulate_exit("m", 1.0, 1.0, {"tp_pct": 0.1, "sl_pct": -0.1, "hold_sec_max": 10}) != (1.5, "TP"):
+    fail("duplicate ts ordering")
+if idx.simulate_exit("m", 1.0, 1.0, {"tp_pct": -0.9, "sl_pct": 0.9, "hold_sec_max": 10}) != (1.5, "TP"):
+    fail("TP must win over SL on the same tick")
+
+# Empty window / unknown mint -> entry price, TIME.
+if idx.simulate_exit("m", 1.0, 5.0, {"tp_pct": 0.1, "sl_pct": -0.1, "hold_sec_max": 10}) != (1.0, "TIME"):
+    fail("empty window")
+if idx.simulate_exit("missing", 2.0, 0.0, {"tp_pct": 0.1, "sl_pct": -0.1, "hold_sec_max": 10}) != (2.0, "TIME"):
+    fail("unknown mint")
+
+print(f"[tick_index_smoke] checked {checked} exits", file=sys.stderr)
+PY
+
+echo "[tick_index_smoke] OK ✅" >&2
@@ -124,6 +124,38 @@ echo "[token_mapping] fuzzy_name count: $fuzzy_count"
 # Note: --dry-run doesn't create output file, so skip this check
 echo "[token_mapping] Output validation (dry-run mode - file not created)"
 
+# Test 6: Indexed mapping matches a per-market list scan; index file is reused
+echo "[token_mapping] Validating token index..."
+TOKEN_INDEX="/tmp/polymarket_token_index.pkl"
+rm -f "$TOKEN_INDEX"
+(cd "$ROOT_DIR" && python3 - "$POLYMARKET_JSON" "$TOKENS_CSV" "$TOKEN_INDEX" <<'PY'
+import sys
+
+from analysis.token_mapping import build_all_mappings, build_mappings
+from ingestion.pipelines import token_mapping_pipeline as pipeline
+
+markets_path, tokens_path, index_path = sys.argv[1:]
+markets = pipeline.load_polymarket_snapshots(markets_path)
+tokens = pipeline.load_token_snapshots(tokens_path)
+index = pipeline.load_token_index(tokens_path, index_path)
+expected = [m for market in sorted(markets, key=lambda x: x.id) for m in build_mappings(market, tokens)]
+assert build_all_mappings(markets, index) == expected
+assert pipeline.load_token_index(tokens_path, index_path) is index
+pipeline._INDEX_CACHE.clear()
+reloaded = pipeline.load_token_index(tokens_path, index_path)
+assert reloaded is not index and build_all_mappings(markets, reloaded) == expected
+# A THEME_TOKENS / module code change invalidates the pickled index
+pipeline._INDEX_CACHE.clear()
+pipeline._INDEX_CODE_HASH = "changed"
+pipeline.load_token_index(tokens_path, index_path)
+import pickle
+with open(index_path, "rb") as f:
+    assert pickle.load(f)[0][1] == "changed", "stale index was reused"
+PY
+) || { echo "[token_mapping_smoke] ERROR: token index mismatch"; exit 1; }
+rm -f "$TOKEN_INDEX"
+echo "[token_mapping] token index OK"
+
 echo "[token_mapping_smoke] built $mappings_count mappings across $markets_covered markets (max relevance=$top_relevance)"
 echo "[token_mapping_smoke] OK"
 exit 0
@@ -0,0 +1,92 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# scripts/ts_parse_smoke.sh
+#
+# Shared timestamp parser smoke (integration/ts_parse.py):
+# - parity with the previous per-simulator parser for seconds / ISO variants
+# - epoch milliseconds are scaled to seconds
+# - TsCache memoizes strings; column() matches per-value parsing with and without NumPy
+#
+# Success output (stderr, exactly):
+#   [ts_parse_smoke] OK ✅
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "${ROOT_DIR}"
+
+python3 - <<'PY'
+import sys
+from datetime import datetime, timezone
+
+import integration.ts_parse as tp
+from integration.ts_parse import TsCache, ts_column_to_seconds, ts_to_seconds
+
+
+def fail(msg):
+    print(f"[ts_parse_smoke] FAIL: {msg}", file=sys.stderr)
+    sys.exit(1)
+
+
+def legacy(ts):
+    if ts is None:
+        return 0.0
+    try:
+        return float(ts)
+    except Exception:
+        pass
+    s = str(ts).strip()
+    if not s:
+        return 0.0
+    s2 = s[:-1] + "+00:00" if s.endswith("Z") else s
+    try:
+        dt = datetime.fromisoformat(s2)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except Exception:
+        return 0.0
+
+
+cases = [
+    None, "", "   ", "garbage", 1700000000, 1700000000.5, "1700000000", " 1700000000.25 ",
+    "2024-01-01 00:00:00", "2024-01-01T00:00:00", "2024-01-01 00:00:00.123",
+    "2024-01-01T00:00:00Z", "2024-01-01T00:00:00.5Z", "2024-01-01T02:00:00+02:00",
+    " 2024-01-01 00:00:00 ", "2024-13-01 00:00:00",
+]
+for c in cases:
+    if ts_to_seconds(c) != legacy(c):
+        fail(f"parity {c!r}: {ts_to_seconds(c)} != {legacy(c)}")
+
+# Milliseconds (trade_types contract).
+if ts_to_seconds(1700000000123) != 1700000000.123 or ts_to_seconds("1700000000000") != 1700000000.0:
+    fail("ms scaling")
+
+# Memoization.
+cache = TsCache()
+col = ["2024-01-01 00:00:00", "2024-01-01 00:00:01"] * 500 + [None, 1700000000, "1700000000000", "bad"]
+for v in col:
+    cache(v)
+if len(cache) != 4:
+    fail(f"memo size {len(cache)}")
+
+expected = [ts_to_seconds(v) for v in col]
+if tp.np is not None:
+    got = TsCache().column(col)
+    if got.tolist() != expected:
+        fail("numpy column (mixed)")
+    strs = [v for v in col if isinstance(v, str)]
+    if ts_column_to_seconds(strs).tolist() != [ts_to_seconds(v) for v in strs]:
+        fail("numpy column (strings)")
+    nums = tp.np.array([1700000000, 1700000000123, 5], dtype=tp.np.int64)
+    if ts_column_to_seconds(nums).tolist() != [1700000000.0, 1700000000.123, 5.0]:
+        fail("numpy column (numeric)")
+
+saved, tp.np = tp.np, None
+try:
+    if ts_column_to_seconds(col) != expected:
+        fail("pure-python column")
+finally:
+    tp.np = saved
+PY
+
+echo "[ts_parse_smoke] OK ✅" >&2
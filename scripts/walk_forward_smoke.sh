@@ -152,4 +152,33 @@ if [[ "${ROWS_COUNT}" != "2" ]]; then
   fail "sweep rows count=${ROWS_COUNT}, expected 2"
 fi
 
+# Assertion 10: windows match a per-window preflight_and_simulate, in-process and with a pool
+python3 - "${TRADES}" "${CFG}" "${SNAP}" "${WPROF}" <<'PY' || fail "window results differ from per-window simulation"
+import json
+import sys
+
+import yaml
+
+from integration import walk_forward as wf
+from integration.sim_preflight import preflight_and_simulate
+from integration.token_snapshot_store import TokenSnapshotStore
+from integration.wallet_profile_store import WalletProfileStore
+
+trades_path, cfg_path, snap_path, wprof_path = sys.argv[1:5]
+cfg = yaml.safe_load(open(cfg_path)) or {}
+trades = wf._normalize_trades(wf._load_jsonl(trades_path))
+trades.sort(key=lambda t: t["_ts_sec"])
+expected = []
+for start, end in wf.generate_windows(trades[0]["_ts_sec"], trades[-1]["_ts_sec"], 1, 1):
+    window = [t for t in trades if start <= t["_ts_sec"] < end]
+    if window:
+        expected.append(preflight_and_simulate(
+            window, cfg, TokenSnapshotStore.from_csv(snap_path), WalletProfileStore.from_csv(wprof_path),
+        ))
+for workers in (1, 2):
+    res = wf.run_walk_forward(trades_path, cfg_path, 1, 1, snap_path, wprof_path, workers=workers)
+    rows = [{k: v for k, v in r.items() if k != "window_start"} for r in res["sweeps"][0]["rows"]]
+    assert rows == expected, (workers, rows, expected)
+PY
+
 echo "[walk_forward_smoke] OK ✅" >&2
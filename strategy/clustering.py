@@ -4,10 +4,16 @@ strategy/clustering.py
 Pure logic for building wallet co-trade graphs (Leader-Follower relationships).
 No I/O - accepts trades, returns graph structure.
 """
+import bisect
 from dataclasses import dataclass
-from typing import Dict, List, Any, Tuple, Union
+from typing import Dict, Iterable, List, Any, Tuple, Union
 from collections import defaultdict
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
 
 @dataclass
 class GraphNode:
@@ -87,22 +93,189 @@ def _parse_timestamp(ts_val: Union[str, int, float]) -> int:
     return 0
 
 
-def _normalize_trade(trade_dict: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize trade dict to canonical format."""
-    return {
-        "ts": _parse_timestamp(trade_dict.get("ts", 0)),
-        "wallet": str(trade_dict.get("wallet", "")),
-        "mint": str(trade_dict.get("mint", "")),
-        "side": str(trade_dict.get("side", "")).upper(),
-        "tx_hash": str(trade_dict.get("tx_hash", "")),
-        "price": float(trade_dict.get("price", 0)),
-        "size_usd": float(trade_dict.get("size_usd", 0))
-    }
+def _trade_fields(t: Any) -> Tuple[int, str, str, str]:
+    """(ts, wallet, mint, side) of a trade dict or Trade object."""
+    if isinstance(t, dict):
+        return (
+            _parse_timestamp(t.get("ts", 0)),
+            str(t.get("wallet", "")),
+            str(t.get("mint", "")),
+            str(t.get("side", "")).upper(),
+        )
+    return (
+        _parse_timestamp(getattr(t, "ts", 0)),
+        str(getattr(t, "wallet", "")),
+        str(getattr(t, "mint", "")),
+        str(getattr(t, "side", "")).upper(),
+    )
+
+
+# Max leader/follower pairs expanded at once by CoTradeGraphBuilder._pair_numpy.
+_PAIR_CHUNK = 4_000_000
+
+
+class CoTradeGraphBuilder:
+    """
+    Incremental co-trade graph builder.
+
+    A pair of BUYs on the same mint is a co-trade (leader -> follower) when
+    0 < follower.ts - leader.ts <= window_sec. Each mint keeps only the BUYs
+    still inside the window (its tail), so a new BUY is paired with a
+    contiguous ts range found by binary search instead of every earlier BUY.
+
+    Wallets and mints are interned to ints; an edge is one int key
+    (leader_id << 32 | follower_id) with a weight and the set of mint ids it
+    occurred on.
+
+    Batches may be unordered internally, but per mint a batch must not go
+    back in time past the tail: BUYs older than the newest BUY already seen
+    for that mint are counted in `late_trades` and skipped.
+    """
+
+    def __init__(self, window_sec: float = 45.0):
+        self.window_sec = window_sec
+        self.late_trades = 0
+        self._wallet_ids: Dict[str, int] = {}
+        self._wallets: List[str] = []
+        self._mint_ids: Dict[str, int] = {}
+        self._mints: List[str] = []
+        # mint_id -> (ts list, wallet_id list) of BUYs inside the window, ts-sorted
+        self._tails: Dict[int, Tuple[List[int], List[int]]] = {}
+        self._edge_weights: Dict[int, int] = defaultdict(int)
+        self._edge_mints: Dict[int, set] = defaultdict(set)
+
+    def _wallet_id(self, wallet: str) -> int:
+        wid = self._wallet_ids.get(wallet)
+        if wid is None:
+            wid = self._wallet_ids[wallet] = len(self._wallets)
+            self._wallets.append(wallet)
+        return wid
+
+    def _mint_id(self, mint: str) -> int:
+        mid = self._mint_ids.get(mint)
+        if mid is None:
+            mid = self._mint_ids[mint] = len(self._mints)
+            self._mints.append(mint)
+        return mid
+
+    def add_trades(self, trades: Iterable[Any]) -> None:
+        """Add a batch of trades (dicts or Trade objects); non-BUY trades are ignored."""
+        by_mint: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for t in trades:
+            ts, wallet, mint, side = _trade_fields(t)
+            if side != "BUY":
+                continue
+            by_mint[self._mint_id(mint)].append((ts, self._wallet_id(wallet)))
+
+        for mid, buys in by_mint.items():
+            buys.sort(key=lambda b: b[0])
+            self._add_mint_buys(mid, [b[0] for b in buys], [b[1] for b in buys])
+
+    def add_trade(self, trade: Any) -> None:
+        """Add one trade from a stream."""
+        self.add_trades((trade,))
+
+    def _add_mint_buys(self, mid: int, ts_new: List[int], wid_new: List[int]) -> None:
+        tail_ts, tail_wid = self._tails.get(mid, ([], []))
+        if tail_ts and ts_new[0] < tail_ts[-1]:
+            keep = bisect.bisect_left(ts_new, tail_ts[-1])
+            self.late_trades += keep
+            ts_new, wid_new = ts_new[keep:], wid_new[keep:]
+            if not ts_new:
+                return
+
+        ts_all = tail_ts + ts_new
+        wid_all = tail_wid + wid_new
+        first_new = len(tail_ts)
+
+        if np is not None and len(ts_new) > 64:
+            self._pair_numpy(mid, ts_all, wid_all, first_new)
+        else:
+            self._pair_python(mid, ts_all, wid_all, first_new)
+
+        # Keep BUYs a future follower (ts >= newest) could still pair with.
+        cut = bisect.bisect_left(ts_all, ts_all[-1] - self.window_sec)
+        self._tails[mid] = (ts_all[cut:], wid_all[cut:])
+
+    def _pair_python(self, mid: int, ts: List[int], wids: List[int], first_new: int) -> None:
+        window = self.window_sec
+        weights = self._edge_weights
+        edge_mints = self._edge_mints
+        lo = 0
+        hi = 0
+        for j in range(first_new, len(ts)):
+            tj = ts[j]
+            # Leaders are ts in [tj - window, tj): both bounds only move forward.
+            while ts[lo] < tj - window:
+                lo += 1
+            while ts[hi] < tj:
+                hi += 1
+            follower = wids[j]
+            for i in range(lo, hi):
+                key = (wids[i] << 32) | follower
+                weights[key] += 1
+                edge_mints[key].add(mid)
+
+    def _pair_numpy(self, mid: int, ts: List[int], wids: List[int], first_new: int) -> None:
+        ts_arr = np.asarray(ts, dtype=np.float64)
+        wid_arr = np.asarray(wids, dtype=np.int64)
+        followers = np.arange(first_new, len(ts), dtype=np.int64)
+        lo = np.searchsorted(ts_arr, ts_arr[followers] - self.window_sec, side="left")
+        hi = np.searchsorted(ts_arr, ts_arr[followers], side="left")
+        counts = hi - lo
+        cum = np.cumsum(counts)
+        if not len(cum) or cum[-1] == 0:
+            return
+        weights = self._edge_weights
+        edge_mints = self._edge_mints
+        # Expand follower leader ranges [lo, hi) into flat pair arrays, at most
+        # _PAIR_CHUNK pairs at a time (a hot mint can have a huge window).
+        start = 0
+        n = len(followers)
+        while start < n:
+            base = int(cum[start - 1]) if start else 0
+            stop = max(int(np.searchsorted(cum, base + _PAIR_CHUNK, side="right")), start + 1)
+            c = counts[start:stop]
+            total = int(c.sum())
+            if total:
+                rep_followers = np.repeat(followers[start:stop], c)
+                starts = np.repeat(lo[start:stop] - (np.cumsum(c) - c), c)
+                leaders = starts + np.arange(total, dtype=np.int64)
+                keys = (wid_arr[leaders] << 32) | wid_arr[rep_followers]
+                uniq, k = np.unique(keys, return_counts=True)
+                for key, w in zip(uniq.tolist(), k.tolist()):
+                    weights[key] += w
+                    edge_mints[key].add(mid)
+            start = stop
+
+    def graph(self, min_co_trades: int = 1) -> GraphStruct:
+        """Materialize the current graph (nodes = every BUY wallet seen so far)."""
+        graph = GraphStruct()
+        wallets = self._wallets
+        mints = self._mints
+
+        for wallet in wallets:
+            graph.nodes[wallet] = GraphNode(wallet=wallet)
+
+        for key in sorted(self._edge_weights):
+            weight = self._edge_weights[key]
+            leader = wallets[key >> 32]
+            follower = wallets[key & 0xFFFFFFFF]
+            tokens = [mints[m] for m in sorted(self._edge_mints[key])]
+            graph.edge_weights[(leader, follower)] = weight
+            graph.edge_tokens[(leader, follower)] = tokens
 
+            if weight >= min_co_trades:
+                graph.edges.append(GraphEdge(
+                    leader=leader,
+                    follower=follower,
+                    weight=weight,
+                    tokens=list(tokens)
+                ))
+                graph.nodes[leader].out_degree += weight
+                graph.nodes[follower].in_degree += weight
 
-def _get_sort_key(trade: Dict[str, Any]) -> Tuple[int, str]:
-    """Get deterministic sort key for trades."""
-    return (trade["ts"], trade["tx_hash"])
+        return graph
 
 
 def build_co_trade_graph(
@@ -120,87 +293,11 @@ def build_co_trade_graph(
 
     Returns:
         GraphStruct containing nodes, edges, and metrics
+        (edge_tokens holds each edge's distinct mints)
     """
-    # Parse trades if needed
-    parsed_trades = []
-    for t in trades:
-        if isinstance(t, dict):
-            # Already a dict, normalize it
-            parsed_trades.append(_normalize_trade(t))
-        else:
-            # Assume Trade dataclass-like object
-            trade_dict = {
-                "ts": _parse_timestamp(getattr(t, "ts", 0)),
-                "wallet": getattr(t, "wallet", ""),
-                "mint": getattr(t, "mint", ""),
-                "side": str(getattr(t, "side", "")).upper(),
-                "tx_hash": getattr(t, "tx_hash", ""),
-                "price": float(getattr(t, "price", 0)),
-                "size_usd": float(getattr(t, "size_usd", 0))
-            }
-            parsed_trades.append(trade_dict)
-
-    # Filter to only BUY trades and sort deterministically
-    buy_trades = sorted(
-        [t for t in parsed_trades if t["side"] == "BUY"],
-        key=_get_sort_key
-    )
-
-    # Group by mint
-    mint_to_trades: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for trade in buy_trades:
-        mint_to_trades[trade["mint"]].append(trade)
-
-    graph = GraphStruct()
-
-    # Track all unique wallets
-    all_wallets: set = set()
-
-    # Find leader-follower pairs within window
-    for mint, mint_trades in mint_to_trades.items():
-        n = len(mint_trades)
-        for i in range(n):
-            leader = mint_trades[i]
-            all_wallets.add(leader["wallet"])
-            for j in range(i + 1, n):
-                follower = mint_trades[j]
-                all_wallets.add(follower["wallet"])
-                delta = follower["ts"] - leader["ts"]
-
-                if 0 < delta <= window_sec:
-                    # Found a co-trade relationship
-                    edge_key = (leader["wallet"], follower["wallet"])
-                    graph.edge_weights[edge_key] += 1
-                    graph.edge_tokens[edge_key].append(mint)
-
-    # Add all wallets as nodes (even if they have no edges)
-    for wallet in all_wallets:
-        if wallet not in graph.nodes:
-            graph.nodes[wallet] = GraphNode(wallet=wallet)
-
-    # Build filtered edges and update degrees
-    for (leader, follower), weight in graph.edge_weights.items():
-        if weight >= min_co_trades:
-            # Create edge
-            edge = GraphEdge(
-                leader=leader,
-                follower=follower,
-                weight=weight,
-                tokens=list(set(graph.edge_tokens[(leader, follower)]))
-            )
-            graph.edges.append(edge)
-
-            # Create/update nodes
-            if leader not in graph.nodes:
-                graph.nodes[leader] = GraphNode(wallet=leader)
-            if follower not in graph.nodes:
-                graph.nodes[follower] = GraphNode(wallet=follower)
-
-            # Update degrees
-            graph.nodes[leader].out_degree += weight
-            graph.nodes[follower].in_degree += weight
-
-    return graph
+    builder = CoTradeGraphBuilder(window_sec=window_sec)
+    builder.add_trades(trades)
+    return builder.graph(min_co_trades=min_co_trades)
 
 
 def calculate_tier_scores(graph: GraphStruct) -> Dict[str, Dict[str, float]]:
@@ -16,9 +16,21 @@ Algorithm (fixed, no ML):
 - graph_density_score: edges / max_possible_edges for wallets in window
 - volume_anomaly_score: z-score of token volume relative to 1h mean
 - coordination_score = 0.4*temporal + 0.4*graph + 0.2*volume → clamp [0.0, 1.0]
+
+Implementation: per-mint sorted-time sweep with a sparse wallet-pair edge set
+(linear in trades plus edges); CoordinationDetector keeps the window up to date
+as trades arrive and re-scores only touched mints.
 """
 
-from typing import Dict, List, Literal, Any
+import bisect
+import heapq
+from collections import deque
+from typing import Dict, List, Literal, Any, Set, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
 
 
 # Trade event structure for coordination detection
@@ -29,147 +41,315 @@ CoordinationTrade = Dict[str, Any]
 # Validation error constants
 REJECT_COORDINATION_INVALID_INPUT = "coordination_invalid_input"
 
+# Entries closer than this (seconds) link two wallets
+PROXIMITY_SEC = 15.0
+
 
 def _sigmoid(x: float) -> float:
     """Sigmoid function to map z-score to [0, 1] range."""
     return 1.0 / (1.0 + float("inf") if x >= 0 else 0.0)  # Simplified placeholder
 
 
-def _calculate_temporal_proximity_score(
-    trades_by_mint: Dict[str, List[CoordinationTrade]]
-) -> Dict[str, float]:
-    """Calculate temporal proximity score for each wallet.
+def _proximity_density(trades: List[Tuple[float, int, str, float]], proximity_sec: float) -> float:
+    """Share of distinct-wallet pairs in a mint with trades less than proximity_sec apart.
     
-    Fraction of wallet pairs with Δt < 15s in same token.
+    Serves as both the temporal proximity score (fraction of wallet pairs with
+    Δt < 15s) and the graph density score (edges / max_possible_edges), which
+    measure the same thing. One sweep over ts-sorted trades: each trade links
+    to the distinct wallets still inside the proximity window; edges are kept
+    as a sparse set of wallet pairs.
     """
-    temporal_scores: Dict[str, float] = {}
+    if np is not None and len(trades) > 256:
+        return _proximity_density_numpy(trades, proximity_sec)
     
-    for mint, trades in trades_by_mint.items():
-        if len(trades) < 2:
-            continue
-        
-        # Sort by timestamp
-        sorted_trades = sorted(trades, key=lambda t: t["ts_block"])
-        
-        # Calculate pairwise time differences
-        wallets_in_mint = list(set(t["wallet"] for t in sorted_trades))
-        wallet_trade_times: Dict[str, List[float]] = {w: [] for w in wallets_in_mint}
-        
-        for trade in sorted_trades:
-            wallet_trade_times[trade["wallet"]].append(trade["ts_block"])
-        
-        # For each pair of wallets, check if any trades are within 15s
-        total_pairs = 0
-        close_pairs = 0
-        
-        for i, w1 in enumerate(wallets_in_mint):
-            for w2 in wallets_in_mint[i+1:]:
-                total_pairs += 1
-                # Check if any trade from w1 is within 15s of any trade from w2
-                for t1 in wallet_trade_times[w1]:
-                    for t2 in wallet_trade_times[w2]:
-                        if abs(t1 - t2) < 15.0:
-                            close_pairs += 1
-                            break
-                    else:
-                        continue
-                    break
-        
-        if total_pairs > 0:
-            proximity = close_pairs / total_pairs
-            # Add score to all wallets in this mint
-            for w in wallets_in_mint:
-                temporal_scores[w] = max(temporal_scores.get(w, 0.0), proximity)
+    window: deque = deque()
+    in_window: Dict[str, int] = {}
+    edges: Set[Tuple[str, str]] = set()
+    wallets: Set[str] = set()
+    
+    for ts, _, wallet, _ in trades:
+        wallets.add(wallet)
+        while window and ts - window[0][0] >= proximity_sec:
+            _, old = window.popleft()
+            left = in_window[old] - 1
+            if left:
+                in_window[old] = left
+            else:
+                del in_window[old]
+        for other in in_window:
+            if other != wallet:
+                edges.add((other, wallet) if other < wallet else (wallet, other))
+        window.append((ts, wallet))
+        in_window[wallet] = in_window.get(wallet, 0) + 1
     
-    return temporal_scores
+    n = len(wallets)
+    if n < 2:
+        return 0.0
+    return len(edges) / (n * (n - 1) / 2)
 
 
-def _calculate_graph_density_score(
-    trades_by_mint: Dict[str, List[CoordinationTrade]]
-) -> Dict[str, float]:
-    """Calculate graph density score for each wallet.
+# Max trade pairs expanded at once by _proximity_density_numpy.
+_PAIR_CHUNK = 4_000_000
+
+
+def _sorted_unique(keys: Any) -> Any:
+    """np.unique via an in-place sort (faster than the hash path for large int arrays)."""
+    if keys.size == 0:
+        return keys
+    keys.sort()
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def _proximity_density_numpy(trades: List[Tuple[float, int, str, float]], proximity_sec: float) -> float:
+    """_proximity_density on NumPy: searchsorted pair ranges, int edge keys, np.unique."""
+    ids: Dict[str, int] = {}
+    n = len(trades)
+    wid = np.fromiter((ids.setdefault(t[2], len(ids)) for t in trades), dtype=np.int64, count=n)
+    n_wallets = len(ids)
+    if n_wallets < 2:
+        return 0.0
+    ts = np.fromiter((t[0] for t in trades), dtype=np.float64, count=n)
+    
+    # Candidate followers of i: (i, hi[i]). hi is widened by a hair and pairs are then
+    # filtered on ts[j] - ts[i] < proximity_sec, the same comparison as the sweep.
+    reach = ts + proximity_sec
+    hi = np.searchsorted(ts, reach + np.abs(reach) * 1e-12 + 1e-12, side="right")
+    lo = np.arange(1, n + 1, dtype=np.int64)
+    counts = np.maximum(hi - lo, 0)
+    
+    chunks = []
+    cum = np.cumsum(counts)
+    start = 0
+    while start < n:
+        base = int(cum[start - 1]) if start else 0
+        stop = max(int(np.searchsorted(cum, base + _PAIR_CHUNK, side="right")), start + 1)
+        c = counts[start:stop]
+        total = int(c.sum())
+        if total:
+            leaders = np.repeat(np.arange(start, stop, dtype=np.int64), c)
+            offsets = np.repeat(lo[start:stop] - (np.cumsum(c) - c), c)
+            followers = offsets + np.arange(total, dtype=np.int64)
+            keep = (ts[followers] - ts[leaders] < proximity_sec) & (wid[leaders] != wid[followers])
+            a = wid[leaders[keep]]
+            b = wid[followers[keep]]
+            chunks.append(_sorted_unique(np.minimum(a, b) * n_wallets + np.maximum(a, b)))
+        start = stop
+    
+    edges = int(_sorted_unique(np.concatenate(chunks)).size) if chunks else 0
+    return edges / (n_wallets * (n_wallets - 1) / 2)
+
+
+def _volume_anomaly(trades: List[Tuple[float, int, str, float]]) -> float:
+    """Volume anomaly score for a mint.
     
-    Edges / max_possible_edges for wallets in window.
-    An edge exists if Δt < 15s between two wallets trading same token.
+    Z-score of the window volume relative to the mean trade size (window stats
+    as a proxy for 1h stats), mapped with a step: 1.0 for z >= 0, else 0.0;
+    0.0 when there is no spread in sizes (std == 0).
     """
-    graph_scores: Dict[str, float] = {}
+    n = len(trades)
+    if n < 2:
+        return 0.0
+    if np is not None and n > 256:
+        sizes = np.fromiter((t[3] for t in trades), dtype=np.float64, count=n)
+        total = float(sizes.sum())
+        spread = bool(sizes.max() > sizes.min())
+    else:
+        sizes_list = [t[3] for t in trades]
+        total = sum(sizes_list)
+        spread = max(sizes_list) > min(sizes_list)
+    if not spread:
+        return 0.0
+    mean_vol = total / n
+    # Only the sign of z = (total - mean) / std matters for the step mapping.
+    return 1.0 if total - mean_vol >= 0 else 0.0
+
+
+def _validate_trade(trade: CoordinationTrade, i: int) -> None:
+    required_fields = ["ts_block", "wallet", "mint", "side", "size", "price"]
+    for field in required_fields:
+        if field not in trade:
+            raise ValueError(f"Missing required field '{field}' at index {i}")
+    if not isinstance(trade["ts_block"], (int, float)):
+        raise ValueError(f"ts_block must be numeric at index {i}")
+
+
+def _combine_scores(mint_scores: List[Tuple[float, float]]) -> float:
+    """coordination_score from (proximity/density, volume anomaly) of each mint a wallet traded."""
+    proximity = max((p for p, _ in mint_scores), default=0.0)
+    volume = max((v for _, v in mint_scores), default=0.0)
+    # coordination_score = 0.4*temporal + 0.4*graph + 0.2*volume (temporal == graph)
+    score = 0.4 * proximity + 0.4 * proximity + 0.2 * volume
+    # Clamp to [0.0, 1.0]
+    return max(0.0, min(1.0, score))
+
+
+class _MintWindow:
+    """Trades of one mint inside the detector window, with incrementally kept scores.
     
-    for mint, trades in trades_by_mint.items():
-        if len(trades) < 2:
-            continue
-        
-        # Sort by timestamp
-        sorted_trades = sorted(trades, key=lambda t: t["ts_block"])
-        
-        # Get unique wallets
-        wallets = list(set(t["wallet"] for t in sorted_trades))
-        n = len(wallets)
-        
-        if n < 2:
-            continue
-        
-        # Build adjacency matrix
-        wallet_to_idx = {w: i for i, w in enumerate(wallets)}
-        adj = [[False] * n for _ in range(n)]
-        
-        # Check each pair of trades
-        for i, t1 in enumerate(sorted_trades):
-            for j, t2 in enumerate(sorted_trades[i+1:], i+1):
-                if t1["wallet"] != t2["wallet"]:
-                    if abs(t1["ts_block"] - t2["ts_block"]) < 15.0:
-                        idx1 = wallet_to_idx[t1["wallet"]]
-                        idx2 = wallet_to_idx[t2["wallet"]]
-                        adj[idx1][idx2] = True
-                        adj[idx2][idx1] = True
-        
-        # Count edges
-        edges = sum(1 for i in range(n) for j in range(i+1, n) if adj[i][j])
-        max_edges = n * (n - 1) / 2
-        
-        density = edges / max_edges if max_edges > 0 else 0.0
+    edges counts, per wallet pair, the trade pairs less than proximity_sec
+    apart that support it; a pair is an edge while its count is > 0.
+    """
+    
+    __slots__ = ("trades", "wallets", "edges", "sizes", "total")
+    
+    def __init__(self) -> None:
+        self.trades: List[Tuple[float, int, str, float]] = []
+        self.wallets: Dict[str, int] = {}
+        self.edges: Dict[Tuple[str, str], int] = {}
+        self.sizes: Dict[float, int] = {}
+        self.total = 0.0
+    
+    def _link(self, i: int, proximity_sec: float, delta: int) -> None:
+        """Add delta to every edge between trade i and its neighbours within proximity_sec."""
+        trades = self.trades
+        ts, _, wallet, _ = trades[i]
+        # Count neighbour trades per wallet first: one edge update per distinct wallet.
+        near: Dict[str, int] = {}
+        k = i - 1
+        while k >= 0:
+            t = trades[k]
+            if ts - t[0] >= proximity_sec:
+                break
+            near[t[2]] = near.get(t[2], 0) + 1
+            k -= 1
+        k = i + 1
+        n = len(trades)
+        while k < n:
+            t = trades[k]
+            if t[0] - ts >= proximity_sec:
+                break
+            near[t[2]] = near.get(t[2], 0) + 1
+            k += 1
+        near.pop(wallet, None)
         
-        # Add score to all wallets
-        for w in wallets:
-            graph_scores[w] = max(graph_scores.get(w, 0.0), density)
+        edges = self.edges
+        for other, c in near.items():
+            key = (other, wallet) if other < wallet else (wallet, other)
+            left = edges.get(key, 0) + delta * c
+            if left:
+                edges[key] = left
+            else:
+                del edges[key]
+    
+    def add(self, item: Tuple[float, int, str, float], proximity_sec: float) -> None:
+        i = bisect.bisect_left(self.trades, item)
+        self.trades.insert(i, item)
+        self._link(i, proximity_sec, +1)
+        _, _, wallet, size = item
+        self.wallets[wallet] = self.wallets.get(wallet, 0) + 1
+        self.sizes[size] = self.sizes.get(size, 0) + 1
+        self.total += size
     
-    return graph_scores
+    def remove(self, ts: float, seq: int, proximity_sec: float) -> str:
+        i = bisect.bisect_left(self.trades, (ts, seq))
+        self._link(i, proximity_sec, -1)
+        _, _, wallet, size = self.trades.pop(i)
+        _decrement(self.wallets, wallet)
+        _decrement(self.sizes, size)
+        self.total -= size
+        return wallet
+    
+    def scores(self) -> Tuple[float, float]:
+        n = len(self.wallets)
+        density = len(self.edges) / (n * (n - 1) / 2) if n >= 2 else 0.0
+        count = len(self.trades)
+        volume = 0.0
+        if count >= 2 and len(self.sizes) > 1:
+            # Same step as _volume_anomaly: sign of z = (total - mean) / std
+            volume = 1.0 if self.total - self.total / count >= 0 else 0.0
+        return density, volume
 
 
-def _calculate_volume_anomaly_score(
-    trades_by_mint: Dict[str, List[CoordinationTrade]]
-) -> Dict[str, float]:
-    """Calculate volume anomaly score for each wallet.
+def _decrement(counts: Dict[Any, int], key: Any) -> None:
+    if counts[key] > 1:
+        counts[key] -= 1
+    else:
+        del counts[key]
+
+
+class CoordinationDetector:
+    """Streaming coordination detector.
     
-    Z-score of token volume relative to historical mean.
-    Uses current window volume vs. estimated 1h mean (simplified).
+    Keeps trades with latest_ts - ts_block <= window_sec. Each arriving or
+    expiring trade only touches the trades of its mint within proximity_sec
+    (edge multiplicities, wallet and size counts), so score() is cheap enough
+    to gate every trade inline. Trades may arrive out of order; those already
+    outside the window are dropped.
+    
+    scores() matches detect_coordination() over the same trades.
     """
-    volume_scores: Dict[str, float] = {}
     
-    for mint, trades in trades_by_mint.items():
-        if len(trades) < 2:
-            continue
-        
-        # Calculate current window volume
-        current_volume = sum(t["size"] for t in trades)
-        
-        # Simplified: use window stats as proxy for 1h stats
-        # In production, would query historical data
-        volumes = [t["size"] for t in trades]
-        mean_vol = sum(volumes) / len(volumes) if volumes else 0.0
-        std_vol = (sum((v - mean_vol) ** 2 for v in volumes) / len(volumes)) ** 0.5 if len(volumes) > 1 else 0.0
+    def __init__(self, window_sec: float = 60.0, proximity_sec: float = PROXIMITY_SEC):
+        self.window_sec = window_sec
+        self.proximity_sec = proximity_sec
+        self._latest = float("-inf")
+        self._seq = 0
+        self._mints: Dict[str, _MintWindow] = {}
+        self._expiry: List[Tuple[float, int, str]] = []
+        # wallet -> {mint: trades in window}
+        self._wallet_mints: Dict[str, Dict[str, int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._expiry)
+    
+    def add(self, trade: CoordinationTrade) -> bool:
+        """Add one trade; returns False if it is already outside the window.
         
-        if std_vol > 0:
-            z_score = (current_volume - mean_vol) / std_vol
-            # Sigmoid to map z-score to [0, 1]
-            anomaly = 1.0 / (1.0 + float("inf") if z_score < 0 else 1.0)  # Simplified
-        else:
-            anomaly = 0.0
+        Raises:
+            ValueError: If the trade is missing fields or has a non-numeric ts_block.
+        """
+        _validate_trade(trade, self._seq)
+        ts = trade["ts_block"]
+        if ts > self._latest:
+            self._latest = ts
+            self._expire()
+        if self._latest - ts > self.window_sec:
+            return False
         
-        # Add score to all wallets trading this mint
-        for t in trades:
-            volume_scores[t["wallet"]] = max(volume_scores.get(t["wallet"], 0.0), anomaly)
+        mint = trade["mint"]
+        wallet = trade["wallet"]
+        self._seq += 1
+        window = self._mints.get(mint)
+        if window is None:
+            window = self._mints[mint] = _MintWindow()
+        window.add((ts, self._seq, wallet, trade["size"]), self.proximity_sec)
+        heapq.heappush(self._expiry, (ts, self._seq, mint))
+        counts = self._wallet_mints.setdefault(wallet, {})
+        counts[mint] = counts.get(mint, 0) + 1
+        return True
+    
+    def _expire(self) -> None:
+        heap = self._expiry
+        horizon = self._latest - self.window_sec
+        while heap and heap[0][0] < horizon:
+            ts, seq, mint = heapq.heappop(heap)
+            window = self._mints[mint]
+            wallet = window.remove(ts, seq, self.proximity_sec)
+            if not window.trades:
+                del self._mints[mint]
+            counts = self._wallet_mints[wallet]
+            _decrement(counts, mint)
+            if not counts:
+                del self._wallet_mints[wallet]
+    
+    def score(self, wallet: str) -> float:
+        """Current coordination_score of one wallet (0.0 if not in the window)."""
+        mints = self._wallet_mints.get(wallet)
+        if not mints:
+            return 0.0
+        return _combine_scores([self._mints[m].scores() for m in mints])
     
-    return volume_scores
+    def scores(self) -> Dict[str, float]:
+        """Current coordination_score of every wallet in the window."""
+        mint_scores = {mint: window.scores() for mint, window in self._mints.items()}
+        return {
+            wallet: _combine_scores([mint_scores[m] for m in mints])
+            for wallet, mints in self._wallet_mints.items()
+        }
+    
+    def reset(self) -> None:
+        """Drop all trades."""
+        self.__init__(self.window_sec, self.proximity_sec)
 
 
 def detect_coordination(
@@ -193,50 +373,29 @@ def detect_coordination(
         return {}
     
     for i, trade in enumerate(trades_window):
-        required_fields = ["ts_block", "wallet", "mint", "side", "size", "price"]
-        for field in required_fields:
-            if field not in trade:
-                raise ValueError(f"Missing required field '{field}' at index {i}")
-        if not isinstance(trade["ts_block"], (int, float)):
-            raise ValueError(f"ts_block must be numeric at index {i}")
+        _validate_trade(trade, i)
     
     # Get reference timestamp (max ts_block in window)
     max_ts = max(t["ts_block"] for t in trades_window)
     
-    # Filter to trades within window
-    window_trades = [
-        t for t in trades_window
-        if max_ts - t["ts_block"] <= window_sec
-    ]
-    
-    if not window_trades:
-        return {}
-    
-    # Group trades by mint
-    trades_by_mint: Dict[str, List[CoordinationTrade]] = {}
-    for trade in window_trades:
+    # Group trades within window by mint: (ts, seq, wallet, size), sorted by time
+    trades_by_mint: Dict[str, List[Tuple[float, int, str, float]]] = {}
+    wallet_mints: Dict[str, Set[str]] = {}
+    for seq, trade in enumerate(trades_window):
+        if max_ts - trade["ts_block"] > window_sec:
+            continue
         mint = trade["mint"]
-        if mint not in trades_by_mint:
-            trades_by_mint[mint] = []
-        trades_by_mint[mint].append(trade)
-    
-    # Calculate component scores
-    temporal_scores = _calculate_temporal_proximity_score(trades_by_mint)
-    graph_scores = _calculate_graph_density_score(trades_by_mint)
-    volume_scores = _calculate_volume_anomaly_score(trades_by_mint)
-    
-    # Get all unique wallets
-    all_wallets = set(t["wallet"] for t in window_trades)
-    
-    # Combine scores: coordination_score = 0.4*temporal + 0.4*graph + 0.2*volume
-    coordination_scores: Dict[str, float] = {}
-    for wallet in all_wallets:
-        temporal = temporal_scores.get(wallet, 0.0)
-        graph = graph_scores.get(wallet, 0.0)
-        volume = volume_scores.get(wallet, 0.0)
-        
-        score = 0.4 * temporal + 0.4 * graph + 0.2 * volume
-        # Clamp to [0.0, 1.0]
-        coordination_scores[wallet] = max(0.0, min(1.0, score))
+        wallet = trade["wallet"]
+        trades_by_mint.setdefault(mint, []).append((trade["ts_block"], seq, wallet, trade["size"]))
+        wallet_mints.setdefault(wallet, set()).add(mint)
+    
+    # Component scores per mint (sorted-time sweep), then per wallet
+    mint_scores: Dict[str, Tuple[float, float]] = {}
+    for mint, trades in trades_by_mint.items():
+        trades.sort()
+        mint_scores[mint] = (_proximity_density(trades, PROXIMITY_SEC), _volume_anomaly(trades))
     
-    return coordination_scores
+    return {
+        wallet: _combine_scores([mint_scores[m] for m in mints])
+        for wallet, mints in wallet_mints.items()
+    }
@@ -154,6 +154,16 @@ def check_simulation_security(
     Returns:
         Tuple of (passed: bool, reason: Optional[str])
     """
+    security_cfg = (cfg.get("token_profile") or {}).get("security") or {}
+    return simulation_verdict(snapshot, security_cfg.get("max_tax_bps", 1000))
+
+
+def simulation_verdict(snapshot: Optional[Any], max_tax: Any) -> Tuple[bool, Optional[str]]:
+    """
+    check_simulation_security() with max_tax_bps already resolved from config.
+
+    Used directly by compiled gate plans (integration.gates.GatePlan).
+    """
     if snapshot is None:
         return True, None
 
@@ -180,9 +190,6 @@ def check_simulation_security(
     buy_tax = sim.get("buy_tax_bps")
     sell_tax = sim.get("sell_tax_bps")
 
-    security_cfg = (cfg.get("token_profile") or {}).get("security") or {}
-    max_tax = security_cfg.get("max_tax_bps", 1000)
-
     if buy_tax is not None and buy_tax > max_tax:
         return False, f"high_buy_tax: {buy_tax}bps"
 
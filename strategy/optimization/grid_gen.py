@@ -6,7 +6,7 @@ and selects the best configuration based on performance metrics.
 """
 
 import itertools
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 
 
 def generate_grid(param_ranges: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
@@ -39,39 +39,63 @@ def generate_grid(param_ranges: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
     return grid
 
 
+class BestTracker:
+    """
+    Incremental select_best() for results that arrive one at a time
+    (e.g. streamed back from a process pool as they finish).
+
+    Ties on the metric keep the result with the lowest `order` (grid position),
+    so the winner does not depend on completion order.
+    """
+
+    def __init__(self, metric: str = "sharpe"):
+        self.metric = metric
+        self.best: Optional[Dict[str, Any]] = None
+        self.value: float = -float("inf")
+        self._order: Optional[int] = None
+
+    def add(self, res: Dict[str, Any], order: Optional[int] = None) -> bool:
+        """Offer one result; returns True if it became the new best."""
+        metrics = res.get("metrics", {})
+        value = metrics.get(self.metric, -float("inf"))
+
+        # Handle None or non-numeric values gracefully
+        if not isinstance(value, (int, float)):
+            return False
+
+        if value > self.value or (
+            value == self.value
+            and self.best is not None
+            and order is not None
+            and self._order is not None
+            and order < self._order
+        ):
+            self.value = value
+            self.best = res
+            self._order = order
+            return True
+        return False
+
+
 def select_best(
-    results: List[Dict[str, Any]], 
+    results: Iterable[Dict[str, Any]],
     metric: str = "sharpe"
 ) -> Tuple[Optional[Dict[str, Any]], float]:
     """
     Select the best result from a list of backtest results.
     
     Args:
-        results: List of result dicts, each containing 'params' and 'metrics'
+        results: List (or any iterable, consumed once) of result dicts,
+                 each containing 'params' and 'metrics'
         metric: Metric name to maximize (e.g. 'sharpe', 'roi_total')
         
     Returns:
         Tuple of (best_result_dict, best_metric_value)
     """
-    if not results:
-        return None, -float("inf")
-        
-    best_result = None
-    best_value = -float("inf")
-    
-    for res in results:
-        metrics = res.get("metrics", {})
-        value = metrics.get(metric, -float("inf"))
-        
-        # Handle None or non-numeric values gracefully
-        if not isinstance(value, (int, float)):
-            continue
-            
-        if value > best_value:
-            best_value = value
-            best_result = res
-            
-    return best_result, best_value
+    tracker = BestTracker(metric)
+    for i, res in enumerate(results):
+        tracker.add(res, order=i)
+    return tracker.best, tracker.value
 
 
 if __name__ == "__main__":
@@ -26,6 +26,7 @@ from integration.reject_reasons import (
 )
 from integration.trade_types import Trade
 from strategy.regime import adjust_position_size
+from strategy.slippage_curve import SlippageCurve
 
 
 def _check_tier_limits(
@@ -331,6 +332,9 @@ def compute_position_size_usd(
     estimated_payoff: Optional[float] = None,
     trade_mint: Optional[str] = None,
     risk_regime: float = 0.0,  # PR-F.3: Polymarket regime scalar [-1, 1]
+    slippage_curve: Optional[SlippageCurve] = None,
+    curve_unit_usd: float = 1.0,
+    max_slippage_bps: Optional[float] = None,
 ) -> float:
     """Compute position size in USD based on Kelly criterion.
 
@@ -341,6 +345,11 @@ def compute_position_size_usd(
         edge_pct: Pre-computed edge percentage
         estimated_payoff: Win/loss ratio (b = tp_pct / abs(sl_pct))
         trade_mint: Token mint for exposure limiting
+        slippage_curve: Entry pool's curve (strategy/slippage_curve.py); caps
+            the size at the largest swap within max_slippage_bps (and never
+            beyond the pool's max_amount_in)
+        curve_unit_usd: USD value of one input unit of slippage_curve
+        max_slippage_bps: Slippage cap (default: execution.orders.max_slippage_bps)
 
     Returns:
         Position size in USD
@@ -406,6 +415,15 @@ def compute_position_size_usd(
             cfg=adjustment_cfg,
         )
 
+    # Depth cap: largest size the entry pool fills within the slippage limit
+    if slippage_curve is not None:
+        if max_slippage_bps is None:
+            orders = ((cfg.get("execution") or {}).get("orders") or {})
+            max_slippage_bps = float(orders.get("max_slippage_bps", 200))
+        max_size_in = min(slippage_curve.max_size_for_bps(max_slippage_bps), slippage_curve.max_amount_in)
+        max_size_usd = max_size_in * curve_unit_usd
+        position_size = min(position_size, max_size_usd)
+
     return position_size
 
 
@@ -0,0 +1,455 @@
+"""
+strategy/slippage_curve.py - Depth-aware slippage curves
+
+One SlippageCurve per pool and swap direction, built from the pool's actual
+depth instead of the heuristic size/liquidity models in strategy/amm_math.py:
+
+- constant_product_curve(): Raydium-style x*y=k from reserves
+- clmm_curve():             Orca Whirlpool from initialized ticks + liquidity_net
+- dlmm_curve():             Meteora DLMM from per-bin reserves
+
+All three reduce to the same piecewise form. With `u` the pool's price
+coordinate on the input side (1/sqrt(P) when selling token A of a CLMM,
+sqrt(P) when selling token B) a range of constant liquidity L swaps an input
+of e into
+
+    out = e / (u * (u + e / L))
+
+A constant-product pool is a single unbounded range with L = sqrt(x * y);
+a DLMM bin is a range with L = inf (fixed price 1/u^2). A curve keeps the
+cumulative input/output at every range boundary, so evaluating many sizes is
+a searchsorted plus one formula, and the largest size under a slippage target
+is solved per range in closed form (a quadratic).
+
+Units: sizes and amounts are raw input/output token units; slippage is
+(ideal - actual) / ideal in bps including the swap fee, as in
+estimate_slippage_bps(). *_many() methods return ndarrays with NumPy and
+lists without it.
+
+HARD RULES:
+1. Purity: Only math, no RPC calls
+2. Curves are immutable; SlippageCurveCache keeps one per (pool, slot)
+"""
+
+import bisect
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+
+BPS_SCALE = 10000.0
+MAX_SLIPPAGE_BPS = 10000.0
+
+# Orca Whirlpool tick bounds (price = 1.0001 ** tick)
+MIN_TICK_INDEX = -443636
+MAX_TICK_INDEX = 443636
+_Q64 = float(2 ** 64)
+
+# Relative slack when comparing average prices, so a target equal to a flat
+# range's price (e.g. slippage == fee inside a DLMM bin) takes the whole range
+_REL_EPS = 1e-12
+
+# Meteora DLMM: bin id with price 1 (same convention as ingestion.dex.meteora.math)
+DLMM_BIN_ID_OFFSET = 2 ** 23
+
+
+class SlippageCurve:
+    """
+    Swap output and slippage of one pool in one direction, for any size.
+
+    Ranges are given after the fee has been taken from the input:
+    range k starts at cumulative input start_in[k] / output start_out[k],
+    at price coordinate u[k] with 1/liquidity inv_l[k] (0 = fixed price).
+    capacity_in / capacity_out are the totals at the end of the last range
+    (inf for an unbounded constant-product curve).
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        start_in: Sequence[float],
+        start_out: Sequence[float],
+        u: Sequence[float],
+        inv_l: Sequence[float],
+        capacity_in: float,
+        capacity_out: float,
+        fee_bps: float,
+        mid_price: Optional[float] = None,
+    ):
+        if not u:
+            raise ValueError("curve has no liquidity")
+        self.kind = kind
+        self.fee_bps = fee_bps
+        self.fee_factor = 1.0 - fee_bps / BPS_SCALE
+        self.start_in = list(start_in)
+        self.start_out = list(start_out)
+        self.u = list(u)
+        self.inv_l = list(inv_l)
+        self.capacity_in = capacity_in
+        self.capacity_out = capacity_out
+        # Output per input at the current price (slippage reference)
+        self.mid_price = mid_price if mid_price is not None else 1.0 / (self.u[0] * self.u[0])
+
+        # Average output per (post-fee) input at each range end; non-increasing,
+        # kept negated for bisect
+        self._neg_avg_end_list = []
+        for k in range(len(self.u)):
+            end = self.start_in[k + 1] if k + 1 < len(self.u) else capacity_in
+            self._neg_avg_end_list.append(-self._out(end) / end if math.isfinite(end) and end > 0 else 0.0)
+
+        if np is not None:
+            self._start_in = np.array(self.start_in)
+            self._start_out = np.array(self.start_out)
+            self._u = np.array(self.u)
+            self._inv_l = np.array(self.inv_l)
+            self._neg_avg_end = np.array(self._neg_avg_end_list)
+
+    def __len__(self) -> int:
+        return len(self.u)
+
+    def __repr__(self) -> str:
+        return (f"SlippageCurve(kind={self.kind!r}, ranges={len(self.u)}, "
+                f"mid_price={self.mid_price:.6g}, capacity_in={self.capacity_in:.6g})")
+
+    @property
+    def max_amount_in(self) -> float:
+        """Largest input (before fee) the pool can absorb."""
+        return self.capacity_in / self.fee_factor if self.fee_factor > 0 else 0.0
+
+    # -- scalar ---------------------------------------------------------
+
+    def _out(self, d: float) -> float:
+        """Output for post-fee input d."""
+        if d <= 0:
+            return 0.0
+        if d >= self.capacity_in:
+            return self.capacity_out
+        k = bisect.bisect_right(self.start_in, d) - 1
+        e = d - self.start_in[k]
+        u = self.u[k]
+        return self.start_out[k] + e / (u * (u + e * self.inv_l[k]))
+
+    def amount_out(self, amount_in: float) -> float:
+        """Output received for `amount_in` (fee included)."""
+        return self._out(amount_in * self.fee_factor)
+
+    def slippage_bps(self, amount_in: float) -> float:
+        """Slippage of a swap of `amount_in` vs the mid price, in bps (0-10000)."""
+        if amount_in <= 0:
+            return max(0.0, min(MAX_SLIPPAGE_BPS, (1.0 - self._out_rate_at_zero()) * BPS_SCALE))
+        ratio = self.amount_out(amount_in) / (amount_in * self.mid_price)
+        return max(0.0, min(MAX_SLIPPAGE_BPS, (1.0 - ratio) * BPS_SCALE))
+
+    def _out_rate_at_zero(self) -> float:
+        """Output per input for an infinitesimal swap, relative to mid (fee included)."""
+        return self.fee_factor / (self.u[0] * self.u[0] * self.mid_price)
+
+    def _solve(self, r: float) -> float:
+        """Largest post-fee input d <= capacity_in with out(d) >= r * d."""
+        if r <= 0:
+            return self.capacity_in
+        r_cmp = r * (1.0 - _REL_EPS)
+        if r_cmp * self.u[0] * self.u[0] >= 1.0:
+            return 0.0
+        k = bisect.bisect_right(self._neg_avg_end_list, -r_cmp)
+        if k == len(self.u):
+            # Past the last range the pool is drained: input beyond capacity buys nothing
+            return self.capacity_in
+        d = self.start_in[k] + _range_root(
+            self.start_out[k] - r * self.start_in[k], self.u[k], self.inv_l[k], r
+        )
+        return min(d, self.capacity_in)
+
+    def max_size_for_bps(self, max_bps: float) -> float:
+        """Largest `amount_in` whose slippage stays within `max_bps`, capped at max_amount_in."""
+        if self.fee_factor <= 0:
+            return 0.0
+        r = (1.0 - max_bps / BPS_SCALE) * self.mid_price / self.fee_factor
+        return self._solve(r) / self.fee_factor
+
+    # -- vectorized -----------------------------------------------------
+
+    def amount_out_many(self, amounts_in: Sequence[float]):
+        """amount_out() for many sizes at once."""
+        if np is None:
+            return [self.amount_out(float(a)) for a in amounts_in]
+        d = np.asarray(amounts_in, dtype=np.float64) * self.fee_factor
+        k = np.maximum(np.searchsorted(self._start_in, d, side="right") - 1, 0)
+        e = np.maximum(d - self._start_in[k], 0.0)
+        u = self._u[k]
+        out = self._start_out[k] + e / (u * (u + e * self._inv_l[k]))
+        return np.where(d >= self.capacity_in, self.capacity_out, out)
+
+    def slippage_bps_many(self, amounts_in: Sequence[float]):
+        """slippage_bps() for many sizes at once."""
+        if np is None:
+            return [self.slippage_bps(float(a)) for a in amounts_in]
+        a = np.asarray(amounts_in, dtype=np.float64)
+        out = self.amount_out_many(a)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(a > 0, out / (a * self.mid_price), self._out_rate_at_zero())
+        return np.clip((1.0 - ratio) * BPS_SCALE, 0.0, MAX_SLIPPAGE_BPS)
+
+    def max_size_for_bps_many(self, max_bps: Sequence[float]):
+        """max_size_for_bps() for many slippage targets at once."""
+        if np is None or self.fee_factor <= 0:
+            return [self.max_size_for_bps(float(b)) for b in max_bps]
+        r = (1.0 - np.asarray(max_bps, dtype=np.float64) / BPS_SCALE) * self.mid_price / self.fee_factor
+        r_cmp = r * (1.0 - _REL_EPS)
+        k = np.searchsorted(self._neg_avg_end, -r_cmp, side="right")
+        tail = k == len(self.u)
+        kk = np.minimum(k, len(self.u) - 1)
+        start_in = self._start_in[kk]
+        d = start_in + _range_root_np(self._start_out[kk] - r * start_in, self._u[kk], self._inv_l[kk], r)
+        d = np.where(tail | (r <= 0), self.capacity_in, np.minimum(d, self.capacity_in))
+        d = np.where(r_cmp * self.u[0] * self.u[0] >= 1.0, 0.0, d)
+        return d / self.fee_factor
+
+
+def _range_root(a: float, u: float, inv_l: float, r: float) -> float:
+    """
+    Input e into a range where out(S + e) = r * (S + e), given a = out(S) - r * S >= 0.
+
+    a + e / (u * (u + e * inv_l)) = r * e  <=>  alpha*e^2 + beta*e + gamma = 0
+    with alpha = r*u*inv_l, beta = r*u^2 - a*u*inv_l - 1, gamma = -a*u^2;
+    the positive root is taken in its cancellation-free form.
+    """
+    alpha = r * u * inv_l
+    beta = r * u * u - a * u * inv_l - 1.0
+    gamma = -a * u * u
+    sq = math.sqrt(max(beta * beta - 4.0 * alpha * gamma, 0.0))
+    if beta >= 0:
+        den = beta + sq
+        return max(-2.0 * gamma / den, 0.0) if den > 0 else 0.0
+    return max((sq - beta) / (2.0 * alpha), 0.0)
+
+
+def _range_root_np(a, u, inv_l, r):
+    """_range_root() elementwise."""
+    alpha = r * u * inv_l
+    beta = r * u * u - a * u * inv_l - 1.0
+    gamma = -a * u * u
+    sq = np.sqrt(np.maximum(beta * beta - 4.0 * alpha * gamma, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pos = np.where(beta + sq > 0, -2.0 * gamma / (beta + sq), 0.0)
+        neg = (sq - beta) / (2.0 * alpha)
+    return np.maximum(np.where(beta >= 0, pos, neg), 0.0)
+
+
+class _RangeBuilder:
+    """Accumulates constant-liquidity ranges in input-coordinate order."""
+
+    def __init__(self):
+        self.start_in: List[float] = []
+        self.start_out: List[float] = []
+        self.u: List[float] = []
+        self.inv_l: List[float] = []
+        self.total_in = 0.0
+        self.total_out = 0.0
+
+    def add(self, u: float, liquidity: float, amount_in: float, amount_out: float) -> None:
+        if amount_in <= 0 or amount_out <= 0 or liquidity <= 0:
+            return
+        self.start_in.append(self.total_in)
+        self.start_out.append(self.total_out)
+        self.u.append(u)
+        self.inv_l.append(1.0 / liquidity)
+        self.total_in += amount_in
+        self.total_out += amount_out
+
+    def build(self, kind: str, fee_bps: float, mid_price: float) -> SlippageCurve:
+        return SlippageCurve(
+            kind, self.start_in, self.start_out, self.u, self.inv_l,
+            self.total_in, self.total_out, fee_bps, mid_price,
+        )
+
+
+def constant_product_curve(reserve_in: float, reserve_out: float, fee_bps: float = 25) -> SlippageCurve:
+    """
+    Curve of an x*y=k pool (Raydium AMM v4 / CPMM).
+
+    Matches strategy.amm_math.get_amount_out() for every size; the inverse is
+    closed form: max size = reserve_in * (f / (1 - s) - 1) / f.
+    """
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise ValueError("Reserves must be positive")
+    u = math.sqrt(reserve_in / reserve_out)
+    liquidity = math.sqrt(reserve_in * reserve_out)
+    return SlippageCurve(
+        "constant_product", [0.0], [0.0], [u], [1.0 / liquidity],
+        math.inf, float(reserve_out), fee_bps,
+    )
+
+
+def _tick_sqrt_price(tick: int) -> float:
+    return math.pow(1.0001, tick / 2.0)
+
+
+def clmm_curve(
+    sqrt_price_x64: int,
+    liquidity: int,
+    tick_current: int,
+    tick_indices: Sequence[int],
+    liquidity_net: Sequence[int],
+    a_to_b: bool = True,
+    fee_bps: float = 30,
+) -> SlippageCurve:
+    """
+    Curve of a concentrated-liquidity pool (Orca Whirlpool).
+
+    Args:
+        sqrt_price_x64: Current sqrt price as Q64.64 (token B per token A)
+        liquidity: Active liquidity at the current price
+        tick_current: Current tick index
+        tick_indices: Initialized ticks (from the pool's tick arrays), any order
+        liquidity_net: liquidity_net of each initialized tick (signed)
+        a_to_b: True when selling token A (price moves down)
+        fee_bps: Pool fee in bps
+
+    Ranges stop at the last initialized tick in the swap direction; beyond it
+    the remaining liquidity (if any) runs to the tick bound.
+    """
+    if sqrt_price_x64 <= 0:
+        raise ValueError("sqrt_price_x64 must be positive")
+    if len(tick_indices) != len(liquidity_net):
+        raise ValueError("tick_indices and liquidity_net must have the same length")
+
+    s = sqrt_price_x64 / _Q64
+    current = float(liquidity)
+    ticks = sorted(zip(tick_indices, liquidity_net))
+    ranges = _RangeBuilder()
+
+    if a_to_b:
+        # Input A, u = 1/sqrt(P) rises; crossing a tick downward removes its net liquidity
+        boundaries = [(t, net) for t, net in reversed(ticks) if t <= tick_current]
+        boundaries.append((MIN_TICK_INDEX, 0))
+        for tick, net in boundaries:
+            s_next = min(_tick_sqrt_price(tick), s)
+            ranges.add(1.0 / s, current, current * (1.0 / s_next - 1.0 / s), current * (s - s_next))
+            s = s_next
+            current = max(current - float(net), 0.0)
+        mid_price = (sqrt_price_x64 / _Q64) ** 2
+    else:
+        # Input B, u = sqrt(P) rises; crossing a tick upward adds its net liquidity
+        boundaries = [(t, net) for t, net in ticks if t > tick_current]
+        boundaries.append((MAX_TICK_INDEX, 0))
+        for tick, net in boundaries:
+            s_next = max(_tick_sqrt_price(tick), s)
+            ranges.add(s, current, current * (s_next - s), current * (1.0 / s - 1.0 / s_next))
+            s = s_next
+            current = max(current + float(net), 0.0)
+        mid_price = (_Q64 / sqrt_price_x64) ** 2
+
+    return ranges.build("clmm", fee_bps, mid_price)
+
+
+def dlmm_curve(
+    active_id: int,
+    bin_step: int,
+    bin_ids: Sequence[int],
+    amounts_x: Sequence[float],
+    amounts_y: Sequence[float],
+    swap_for_y: bool = True,
+    fee_bps: float = 30,
+    bin_id_offset: int = DLMM_BIN_ID_OFFSET,
+) -> SlippageCurve:
+    """
+    Curve of a bin-liquidity pool (Meteora DLMM).
+
+    Bin k trades at the fixed raw price (1 + bin_step/10000) ** (k - bin_id_offset)
+    (token Y per token X). Selling X (swap_for_y) drains the Y reserves of the
+    active bin and the bins below it; selling Y drains X from the active bin up.
+
+    Args:
+        active_id: Active bin id
+        bin_step: Bin step in bps
+        bin_ids, amounts_x, amounts_y: Per-bin reserves (raw units)
+        swap_for_y: True when selling token X
+        fee_bps: Total swap fee in bps
+        bin_id_offset: Bin id of price 1 (pass 0 for signed on-chain ids)
+    """
+    if bin_step <= 0:
+        raise ValueError("bin_step must be positive")
+    if not (len(bin_ids) == len(amounts_x) == len(amounts_y)):
+        raise ValueError("bin_ids, amounts_x and amounts_y must have the same length")
+
+    base = 1.0 + bin_step / BPS_SCALE
+    log_base = math.log(base)
+    bins = sorted(zip(bin_ids, amounts_x, amounts_y), reverse=swap_for_y)
+    ranges = _RangeBuilder()
+    for bin_id, amount_x, amount_y in bins:
+        if (bin_id > active_id) if swap_for_y else (bin_id < active_id):
+            continue
+        # Output per input in this bin
+        rate = math.exp((bin_id - bin_id_offset) * log_base)
+        if not swap_for_y:
+            rate = 1.0 / rate
+        out = float(amount_y if swap_for_y else amount_x)
+        ranges.add(1.0 / math.sqrt(rate), math.inf, out / rate, out)
+
+    mid_price = math.exp((active_id - bin_id_offset) * log_base)
+    return ranges.build("dlmm", fee_bps, mid_price if swap_for_y else 1.0 / mid_price)
+
+
+class SlippageCurveCache:
+    """
+    Curves keyed by (pool, slot), at most one slot per pool.
+
+    A newer slot replaces the pool's curve; a request for an older slot than
+    the cached one is built but not cached. Pools are evicted LRU beyond
+    max_pools.
+    """
+
+    def __init__(self, max_pools: int = 4096):
+        self.max_pools = max_pools
+        self._lock = threading.Lock()
+        # pool_key -> (slot, curve)
+        self._curves: "OrderedDict[Any, Tuple[int, SlippageCurve]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "builds": 0}
+
+    def __len__(self) -> int:
+        return len(self._curves)
+
+    def get(self, pool: Any, slot: int) -> Optional[SlippageCurve]:
+        with self._lock:
+            entry = self._curves.get(pool)
+            if entry is None or entry[0] != slot:
+                return None
+            self._curves.move_to_end(pool)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, pool: Any, slot: int, curve: SlippageCurve) -> None:
+        with self._lock:
+            entry = self._curves.get(pool)
+            if entry is not None and entry[0] > slot:
+                return
+            self._curves[pool] = (slot, curve)
+            self._curves.move_to_end(pool)
+            while len(self._curves) > self.max_pools:
+                self._curves.popitem(last=False)
+
+    def get_or_build(self, pool: Any, slot: int, build: Callable[[], SlippageCurve]) -> SlippageCurve:
+        """Cached curve for (pool, slot), else build() it (outside the lock) and cache it."""
+        curve = self.get(pool, slot)
+        if curve is not None:
+            return curve
+        curve = build()
+        with self._lock:
+            self.stats["builds"] += 1
+        self.put(pool, slot, curve)
+        return curve
+
+    def invalidate(self, pool: Any) -> bool:
+        with self._lock:
+            return self._curves.pop(pool, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._curves.clear()